@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-16 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_fix_sites_migration'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['user_type', 'is_active', 'date_joined'], name='accounts_user_type_active'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['date_joined'], name='accounts_user_date_joined'),
+        ),
+    ]
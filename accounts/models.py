@@ -27,27 +27,17 @@ class CustomUser(AbstractUser):
 
     def has_active_pro(self):
         """Check if the user has an active pro subscription."""
-        # First check the built-in fields
-        if self.is_pro and self.pro_expiry_date and self.pro_expiry_date > timezone.now():
-            return True
-
-        # Then check for active subscriptions in the subscription model
         try:
-            from subscriptions.models import UserSubscription
-
-            # Check if the user has any active subscription
-            active_subscription = UserSubscription.objects.filter(
-                user=self,
-                status='active',
-                end_date__gte=timezone.now()
-            ).exists()
+            # Resolved once per request and cached between requests
+            from subscriptions.utils import get_subscription_status
+            status = get_subscription_status(self)
 
             # If we found an active subscription but the is_pro flag is not set,
             # update the user's pro status
-            if active_subscription and not self.is_pro:
+            if status.active_subscription and not self.is_pro:
                 self.update_pro_status()
 
-            return active_subscription
+            return status.has_pro
         except Exception as e:
             # If there's any error (like the model doesn't exist), fall back to the is_pro field
             import logging
@@ -105,6 +95,13 @@ class CustomUser(AbstractUser):
     ))
     industry = models.CharField(max_length=100, blank=True, null=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Custom admin user list, filtered by type and status, newest first
+            models.Index(fields=['user_type', 'is_active', 'date_joined'], name='accounts_user_type_active'),
+            models.Index(fields=['date_joined'], name='accounts_user_date_joined'),
+        ]
+
     def __str__(self):
         return self.email
 
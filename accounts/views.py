@@ -299,105 +299,119 @@ def unblock_user(request, blocked_id):
 
 @login_required
 def download_data(request):
-    """View for downloading user data."""
-    user = request.user
+    """
+    View for downloading user data.
 
-    # Create a dictionary with all user data
-    user_data = {
-        'personal_info': {
-            'email': user.email,
-            'username': user.username,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'phone_number': user.phone_number,
-            'bio': user.bio,
-            'location': user.location,
-            'user_type': user.get_user_type_display(),
-            'date_joined': user.date_joined.strftime('%Y-%m-%d %H:%M:%S'),
-            'last_login': user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else None,
-        }
+    The data is streamed as one JSON document, or with ``format=ndjson`` as
+    one record per line; ``compress=gzip`` gzips either.
+    """
+    from django.db.models import Count
+    from jobs.exports import EXPORT_CHUNK_SIZE, export_response, wants_gzip
+
+    user = request.user
+    export_format = 'ndjson' if request.GET.get('format') == 'ndjson' else 'json'
+    date_format = '%Y-%m-%d %H:%M:%S'
+
+    personal_info = {
+        'email': user.email,
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'phone_number': user.phone_number,
+        'bio': user.bio,
+        'location': user.location,
+        'user_type': user.get_user_type_display(),
+        'date_joined': user.date_joined.strftime(date_format),
+        'last_login': user.last_login.strftime(date_format) if user.last_login else None,
     }
+    profile_info = {}
+    record_lists = {}
 
     # Add job seeker specific data
     if user.user_type == 'job_seeker':
         from jobs.models import JobApplication, SavedJob
 
-        # Get applications
-        applications = JobApplication.objects.filter(applicant=user)
-        application_data = []
-        for app in applications:
-            application_data.append({
-                'job_title': app.job.title,
-                'company': app.job.company.name if app.job.company else None,
-                'status': app.get_status_display(),
-                'applied_date': app.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            })
-
-        # Get saved jobs
-        saved_jobs = SavedJob.objects.filter(user=user)
-        saved_job_data = []
-        for saved in saved_jobs:
-            saved_job_data.append({
-                'job_title': saved.job.title,
-                'company': saved.job.company.name if saved.job.company else None,
-                'saved_date': saved.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            })
-
-        user_data['job_seeker_info'] = {
+        def applications():
+            rows = JobApplication.objects.filter(applicant=user).select_related('job__company').order_by('pk')
+            for app in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                yield {
+                    'job_title': app.job.title,
+                    'company': app.job.company.name if app.job.company else None,
+                    'status': app.get_status_display(),
+                    'applied_date': app.applied_at.strftime(date_format),
+                }
+
+        def saved_jobs():
+            rows = SavedJob.objects.filter(user=user).select_related('job__company').order_by('pk')
+            for saved in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                yield {
+                    'job_title': saved.job.title,
+                    'company': saved.job.company.name if saved.job.company else None,
+                    'saved_date': saved.saved_at.strftime(date_format),
+                }
+
+        info_key = 'job_seeker_info'
+        profile_info = {
             'job_title': user.job_title,
             'skills': user.skills,
             'experience': user.experience,
             'education': user.education,
-            'applications': application_data,
-            'saved_jobs': saved_job_data,
         }
+        record_lists = {'applications': applications, 'saved_jobs': saved_jobs}
 
     # Add employer specific data
     elif user.user_type == 'employer':
         from jobs.models import JobListing, Company
 
-        # Get job listings
-        job_listings = JobListing.objects.filter(posted_by=user)
-        job_listing_data = []
-        for job in job_listings:
-            job_listing_data.append({
-                'title': job.title,
-                'company': job.company.name if job.company else None,
-                'status': job.get_status_display(),
-                'created_date': job.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'application_count': job.applications.count(),
-            })
-
-        # Get companies
-        companies = Company.objects.filter(owner=user)
-        company_data = []
-        for company in companies:
-            company_data.append({
-                'name': company.name,
-                'website': company.website,
-                'industry': company.industry,
-                'size': company.get_size_display(),
-                'created_date': company.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            })
-
-        user_data['employer_info'] = {
+        def job_listings():
+            rows = JobListing.objects.filter(posted_by=user).select_related('company').annotate(
+                application_total=Count('applications')
+            ).order_by('pk')
+            for job in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                yield {
+                    'title': job.title,
+                    'company': job.company.name if job.company else None,
+                    'status': job.get_status_display(),
+                    'created_date': job.created_at.strftime(date_format),
+                    'application_count': job.application_total,
+                }
+
+        def companies():
+            rows = Company.objects.filter(owner=user).order_by('pk')
+            for company in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                yield {
+                    'name': company.name,
+                    'website': company.website,
+                    'industry': company.industry,
+                    'size': company.get_company_size_display(),
+                    'created_date': company.created_at.strftime(date_format),
+                }
+
+        info_key = 'employer_info'
+        profile_info = {
             'company_name': user.company_name,
             'company_website': user.company_website,
             'company_description': user.company_description,
             'industry': user.industry,
             'company_size': user.get_company_size_display() if user.company_size else None,
-            'job_listings': job_listing_data,
-            'companies': company_data,
         }
+        record_lists = {'job_listings': job_listings, 'companies': companies}
+
+    if export_format == 'ndjson':
+        def records():
+            yield {'type': 'personal_info', **personal_info}
+            if profile_info:
+                yield {'type': info_key, **profile_info}
+            for name, produce in record_lists.items():
+                for record in produce():
+                    yield {'type': name, **record}
+        data = records()
+    else:
+        data = {'personal_info': personal_info}
+        if profile_info:
+            data[info_key] = dict(profile_info, **{name: produce() for name, produce in record_lists.items()})
 
-    # Convert to JSON
-    import json
-    from django.http import HttpResponse
-
-    response = HttpResponse(json.dumps(user_data, indent=4), content_type='application/json')
-    response['Content-Disposition'] = f'attachment; filename="{user.username}_data.json"'
-
-    return response
+    return export_response(data, export_format, f'{user.username}_data', compress=wants_gzip(request))
 
 @login_required
 @require_POST
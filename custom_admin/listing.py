@@ -0,0 +1,222 @@
+"""
+Listing helpers for the custom admin's management pages.
+
+The user, job, application and notification pages used to hand their whole
+filtered queryset to the template, and searched by OR-ing one queryset per
+field. On a large site every page load read and rendered every row.
+
+``paginate`` pages through a queryset by keyset (cursor) instead of OFFSET.
+Each page is read with a condition such as ``date_joined <= last
+date_joined AND (date_joined, id) < (last date_joined, last id)`` over an
+indexed ordering and a LIMIT. The first term lets the database seek the index
+to the cursor, so the thousandth page costs the same as the first. The ``cursor`` query parameter
+is an opaque token holding the ordering values of the row at the edge of the
+current page, and the direction to move in. ``search_filter`` turns the
+search box into a single ``Q``, so filtering, searching and paging run as one
+query.
+
+Orderings must be on non-null fields. The primary key is appended as a tie
+breaker when it is not already part of the ordering.
+"""
+import base64
+import binascii
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import QueryDict
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 200
+
+CURSOR_PARAM = 'cursor'
+
+
+def search_filter(query, fields):
+    """Return a Q matching rows where any of ``fields`` contains ``query``."""
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': query})
+    return condition
+
+
+def _encode_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values, direction):
+    """Encode ordering values and a direction ('next' or 'previous') as a URL-safe token."""
+    payload = json.dumps({'d': direction, 'v': [_encode_value(v) for v in values]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Return (values, direction) from a cursor token, or None if it is not valid."""
+    if not token:
+        return None
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        data = json.loads(payload)
+        values, direction = data['v'], data['d']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+    if direction not in ('next', 'previous') or not isinstance(values, list):
+        return None
+    return values, direction
+
+
+class KeysetPage:
+    """One page of a keyset-paginated listing."""
+
+    def __init__(self, object_list, per_page, next_cursor=None, previous_cursor=None, params=None):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.params = params if params is not None else QueryDict()
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _query(self, cursor):
+        params = self.params.copy()
+        params[CURSOR_PARAM] = cursor
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        """Query string for the next page, keeping the current filters."""
+        return self._query(self.next_cursor) if self.has_next else ''
+
+    @property
+    def previous_query(self):
+        """Query string for the previous page, keeping the current filters."""
+        return self._query(self.previous_cursor) if self.has_previous else ''
+
+
+class Keyset:
+    """An ordering over a model that can be paged through by keyset."""
+
+    def __init__(self, model, ordering):
+        self.model = model
+        self.fields = []
+        for name in ordering:
+            descending = name.startswith('-')
+            field_name = name.lstrip('-')
+            field = model._meta.pk if field_name == 'pk' else model._meta.get_field(field_name)
+            self.fields.append((field, descending))
+        if not any(field.primary_key for field, _ in self.fields):
+            self.fields.append((model._meta.pk, self.fields[-1][1] if self.fields else True))
+
+    def order_by(self, reverse=False):
+        return [
+            ('-' if descending != reverse else '') + field.name
+            for field, descending in self.fields
+        ]
+
+    def values(self, obj):
+        return [getattr(obj, field.attname) for field, _ in self.fields]
+
+    def after(self, values, reverse=False):
+        """
+        Return a Q for the rows after ``values`` in this ordering.
+
+        ``(a, b) > (x, y)`` is written as ``a > x OR (a = x AND b > y)``,
+        which every database supports. Planners do not seek an index on a
+        through that OR, so the redundant bound ``a >= x`` is ANDed onto it.
+        """
+        values = [field.to_python(value) for (field, _), value in zip(self.fields, values)]
+        condition = Q()
+        for index, (field, descending) in enumerate(self.fields):
+            lookup = 'lt' if descending != reverse else 'gt'
+            term = Q(**{f'{field.name}__{lookup}': values[index]})
+            for (earlier, _), value in zip(self.fields[:index], values):
+                term &= Q(**{earlier.name: value})
+            condition |= term
+        if len(self.fields) > 1:
+            first, descending = self.fields[0]
+            lookup = 'lte' if descending != reverse else 'gte'
+            condition = Q(**{f'{first.name}__{lookup}': values[0]}) & condition
+        return condition
+
+
+def get_per_page(request, default=None):
+    """Page size from ``?per_page=``, capped at MAX_PER_PAGE, else ADMIN_LIST_PER_PAGE."""
+    if default is None:
+        default = getattr(settings, 'ADMIN_LIST_PER_PAGE', DEFAULT_PER_PAGE)
+    try:
+        per_page = int(request.GET.get('per_page', default))
+    except (TypeError, ValueError):
+        per_page = default
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+
+def paginate(request, queryset, ordering, per_page=None):
+    """
+    Return the page of ``queryset`` selected by the request's cursor.
+
+    Args:
+        request: Current request; its ``cursor`` and ``per_page`` parameters are
+            read and its other parameters kept in the page links
+        queryset: Filtered queryset to page through
+        ordering (list): Field names, with '-' for descending, on non-null fields
+        per_page (int, optional): Rows per page, defaults to get_per_page(request)
+
+    Returns:
+        KeysetPage: The rows of the page, fetched in one query
+    """
+    per_page = per_page or get_per_page(request)
+    keyset = Keyset(queryset.model, ordering)
+    cursor = decode_cursor(request.GET.get(CURSOR_PARAM))
+    if cursor is not None and len(cursor[0]) != len(keyset.fields):
+        cursor = None
+
+    backwards = cursor is not None and cursor[1] == 'previous'
+    queryset = queryset.order_by(*keyset.order_by(reverse=backwards))
+    if cursor is not None:
+        try:
+            queryset = queryset.filter(keyset.after(cursor[0], reverse=backwards))
+        except ValidationError:
+            # A cursor with values of the wrong type starts again from the top
+            cursor = None
+            backwards = False
+            queryset = queryset.order_by(*keyset.order_by())
+
+    rows = list(queryset[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    params = request.GET.copy()
+    params.pop(CURSOR_PARAM, None)
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if has_more or backwards:
+            next_cursor = encode_cursor(keyset.values(rows[-1]), 'next')
+        if cursor is not None and (has_more or not backwards):
+            previous_cursor = encode_cursor(keyset.values(rows[0]), 'previous')
+
+    return KeysetPage(rows, per_page, next_cursor, previous_cursor, params)
@@ -1,3 +1,173 @@
-from django.test import TestCase
+from urllib.parse import parse_qs
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Company, JobApplication, JobListing, Notification
+
+from .listing import Keyset, paginate
+
+
+class KeysetPaginationTests(TestCase):
+    """Admin lists page by cursor, one query per page."""
+
+    def setUp(self):
+        self.admin = get_user_model().objects.create_user(
+            username='admin', email='admin@example.com', password='password', user_type='admin'
+        )
+        # Shared timestamps, so the primary key has to break ties
+        joined = timezone.now()
+        for i in range(7):
+            get_user_model().objects.create_user(
+                username=f'user{i}', email=f'user{i}@example.com', password='password',
+                first_name='Ama' if i % 2 else 'Kofi', date_joined=joined
+            )
+        self.factory = RequestFactory()
+
+    def _page(self, query=''):
+        return paginate(self.factory.get('/?' + query), get_user_model().objects.all(), ['-date_joined', '-pk'], per_page=3)
+
+    def test_pages_cover_every_row_once_in_order(self):
+        expected = list(get_user_model().objects.order_by('-date_joined', '-pk').values_list('pk', flat=True))
+        seen = []
+        pages = []
+        page = self._page()
+        self.assertFalse(page.has_previous)
+        while True:
+            pages.append([user.pk for user in page])
+            seen.extend(pages[-1])
+            if not page.has_next:
+                break
+            page = self._page(page.next_query)
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, [expected[i:i + 3] for i in range(0, len(expected), 3)])
+
+        previous = self._page(page.previous_query)
+        self.assertEqual([user.pk for user in previous], pages[1])
+        first = self._page(previous.previous_query)
+        self.assertEqual([user.pk for user in first], pages[0])
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+    def test_later_pages_seek_the_index(self):
+        keyset = Keyset(get_user_model(), ['-date_joined', '-pk'])
+        last = get_user_model().objects.order_by(*keyset.order_by())[3]
+        plan = get_user_model().objects.filter(
+            keyset.after(keyset.values(last))
+        ).order_by(*keyset.order_by())[:4].explain()
+        self.assertIn('USING INDEX accounts_user_date_joined (date_joined<?)', plan)
+        self.assertNotIn('MULTI-INDEX OR', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_links_keep_filters_and_bad_cursors_restart(self):
+        page = paginate(
+            self.factory.get('/', {'search': 'ama', 'cursor': 'not-a-cursor'}),
+            get_user_model().objects.all(), ['-date_joined'], per_page=3
+        )
+        self.assertFalse(page.has_previous)
+        self.assertEqual(parse_qs(page.next_query)['search'], ['ama'])
+
+    def test_user_search_and_filters_run_in_one_query(self):
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('custom_admin:user_management'), {'search': 'ama', 'is_active': 'true'})
+        listing = [q['sql'] for q in queries.captured_queries if 'LIKE' in q['sql']]
+
+        self.assertEqual(len(listing), 1)
+        self.assertIn('LIMIT 51', listing[0])
+        self.assertEqual({user.first_name for user in response.context['users']}, {'Ama'})
+        self.assertEqual(len(response.context['users']), 3)
+
+    def test_lists_do_not_query_per_row(self):
+        employer = get_user_model().objects.get(username='user0')
+        company = Company.objects.create(
+            name='Acme', slug='acme', owner=employer, description='Description',
+            industry='technology', company_size='1-10', headquarters='Accra', status='approved'
+        )
+
+        def add_jobs(start, count):
+            for i in range(start, start + count):
+                job = JobListing.objects.create(
+                    title=f'Job {i}', slug=f'job-{i}', company=company, posted_by=employer,
+                    description='Description', requirements='Requirements', location='Accra', status='published'
+                )
+                JobApplication.objects.create(job=job, applicant=self.admin, resume='resume.pdf')
+                Notification.objects.create(user=employer, notification_type='new_job', title=job.title, message='New job')
+
+        def count_queries(name):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            return len(queries.captured_queries)
+
+        self.client.force_login(self.admin)
+        add_jobs(0, 2)
+        count_queries('custom_admin:job_management')
+        names = ['custom_admin:job_management', 'custom_admin:job_application_management', 'custom_admin:notification_management']
+        few = [count_queries(name) for name in names]
+        add_jobs(2, 6)
+        many = [count_queries(name) for name in names]
+        self.assertEqual(few, many)
+
+
+class AdminDashboardTests(TestCase):
+    """The dashboard counts each table once, whatever is in it."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.admin = get_user_model().objects.create_user(
+            username='admin', email='admin@example.com', password='password', user_type='admin'
+        )
+        self.employer = get_user_model().objects.create_user(
+            username='kofi', email='kofi@example.com', password='password', user_type='employer'
+        )
+        self.company = Company.objects.create(
+            name='Acme', slug='acme', owner=self.employer, description='Description',
+            industry='technology', company_size='1-10', headquarters='Accra', status='approved'
+        )
+
+    def _add_jobs(self, start, count):
+        for i in range(start, start + count):
+            job = JobListing.objects.create(
+                title=f'Job {i}', slug=f'job-{i}', company=self.company, posted_by=self.employer,
+                description='Description', requirements='Requirements', location='Accra',
+                status='published' if i % 2 else 'draft'
+            )
+            seeker = get_user_model().objects.create_user(
+                username=f'seeker{i}', email=f'seeker{i}@example.com', password='password'
+            )
+            JobApplication.objects.create(job=job, applicant=seeker, resume='resume.pdf')
+
+    def test_query_budget_and_distributions(self):
+        self.client.force_login(self.admin)
+        self._add_jobs(0, 2)
+        # Fill the caches the context processors read
+        self.client.get(reverse('custom_admin:dashboard'))
+        # Session, user, three distributions, companies, subscription status
+        # (not cached in the tests' process-local cache), dashboard stats,
+        # recent users and recent jobs with their companies
+        with self.assertNumQueries(10):
+            self.client.get(reverse('custom_admin:dashboard'))
+        self._add_jobs(2, 4)
+        with self.assertNumQueries(10):
+            response = self.client.get(reverse('custom_admin:dashboard'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_users'], get_user_model().objects.count())
+        self.assertEqual(response.context['total_jobs'], 6)
+        self.assertEqual(response.context['total_applications'], 6)
+        self.assertEqual(response.context['user_types'], [
+            {'user_type': user_type, 'count': get_user_model().objects.filter(user_type=user_type).count()}
+            for user_type in ['admin', 'employer', 'job_seeker']
+        ])
+        self.assertEqual(response.context['job_statuses'], [
+            {'status': 'draft', 'count': 3},
+            {'status': 'published', 'count': 3},
+        ])
@@ -6,6 +6,7 @@ from django.utils.translation import gettext_lazy as _
 from django.db import models
 from django.db.models import Count, Sum, Avg
 from django.utils import timezone
+from django.utils.text import slugify
 from datetime import timedelta, datetime
 
 from accounts.models import CustomUser
@@ -15,9 +16,12 @@ from jobs.models import (
     SavedJob, Notification, JobPackage, JobRenewal, JobAnalytics,
     LegalPage, CompanyConnection, CompanyFollower, HeroSection
 )
+from jobs import unread_counts
+from jobs.aggregation import grouped_counts
 from subscriptions.models import SubscriptionPlan, UserSubscription, PaystackConfig
 from subscriptions.ai_models import ResumeAnalysis, JobMatchScore, CompanyMatchScore, ResumeBuilder
 from allauth.socialaccount.models import SocialAccount, SocialToken, SocialApp
+from .listing import paginate, search_filter
 from .models import AdminDashboardStat
 
 def is_admin(user):
@@ -28,26 +32,17 @@ def is_admin(user):
 @user_passes_test(is_admin)
 def admin_dashboard(request):
     """Main admin dashboard view."""
-    # Get counts for dashboard stats
-    total_users = CustomUser.objects.count()
-    total_jobs = JobListing.objects.count()
-    total_applications = JobApplication.objects.count()
+    # Get distributions, and the totals from them, with one query per table
+    user_types, total_users = grouped_counts(CustomUser.objects.all(), 'user_type')
+    job_statuses, total_jobs = grouped_counts(JobListing.objects.all(), 'status')
+    application_statuses, total_applications = grouped_counts(JobApplication.objects.all(), 'status')
     total_companies = Company.objects.count()
 
     # Get recent items
     recent_users = CustomUser.objects.order_by('-date_joined')[:5]
-    recent_jobs = JobListing.objects.order_by('-created_at')[:5]
+    recent_jobs = JobListing.objects.select_related('company').order_by('-created_at')[:5]
     recent_applications = JobApplication.objects.order_by('-applied_at')[:5]
 
-    # Get user type distribution
-    user_types = CustomUser.objects.values('user_type').annotate(count=Count('id'))
-
-    # Get job status distribution
-    job_statuses = JobListing.objects.values('status').annotate(count=Count('id'))
-
-    # Get application status distribution
-    application_statuses = JobApplication.objects.values('status').annotate(count=Count('id'))
-
     # Get custom dashboard stats
     dashboard_stats = AdminDashboardStat.objects.filter(is_active=True)
 
@@ -123,7 +118,10 @@ def user_management(request):
         return redirect('custom_admin:user_management')
 
     # GET request
-    users = CustomUser.objects.all().order_by('-date_joined')
+    users = CustomUser.objects.only(
+        'id', 'username', 'email', 'first_name', 'last_name', 'user_type',
+        'is_active', 'is_staff', 'is_superuser', 'date_joined', 'profile_picture'
+    )
 
     # Filter by user type if provided
     user_type = request.GET.get('user_type')
@@ -139,16 +137,13 @@ def user_management(request):
     # Search functionality
     search_query = request.GET.get('search')
     if search_query:
-        users = users.filter(
-            email__icontains=search_query
-        ) | users.filter(
-            first_name__icontains=search_query
-        ) | users.filter(
-            last_name__icontains=search_query
-        )
+        users = users.filter(search_filter(search_query, ['email', 'first_name', 'last_name']))
+
+    page = paginate(request, users, ['-date_joined', '-pk'])
 
     context = {
-        'users': users,
+        'users': page.object_list,
+        'page': page,
         'user_type': user_type,
         'is_active': is_active,
         'search_query': search_query,
@@ -207,7 +202,10 @@ def job_management(request):
         return redirect('custom_admin:job_management')
 
     # GET request
-    jobs = JobListing.objects.all().order_by('-created_at')
+    jobs = JobListing.objects.select_related('company', 'category').only(
+        'id', 'title', 'location', 'status', 'created_at',
+        'company__id', 'company__name', 'company__logo', 'category__id', 'category__name'
+    ).annotate(application_count=Count('applications'))
 
     # Filter by status if provided
     status = request.GET.get('status')
@@ -222,17 +220,16 @@ def job_management(request):
     # Search functionality
     search_query = request.GET.get('search')
     if search_query:
-        jobs = jobs.filter(
-            title__icontains=search_query
-        ) | jobs.filter(
-            company__name__icontains=search_query
-        )
+        jobs = jobs.filter(search_filter(search_query, ['title', 'company__name']))
+
+    page = paginate(request, jobs, ['-created_at', '-pk'])
 
     # Get all categories for filter dropdown
     categories = JobCategory.objects.all()
 
     context = {
-        'jobs': jobs,
+        'jobs': page.object_list,
+        'page': page,
         'status': status,
         'category_id': category_id,
         'search_query': search_query,
@@ -1292,7 +1289,12 @@ def job_application_management(request):
         return redirect('custom_admin:job_application_management')
 
     # GET request
-    applications = JobApplication.objects.all().order_by('-applied_at')
+    applications = JobApplication.objects.select_related('job__company', 'applicant').only(
+        'id', 'status', 'applied_at', 'cover_letter',
+        'job__id', 'job__title', 'job__location', 'job__job_type', 'job__company__id', 'job__company__name',
+        'applicant__id', 'applicant__email', 'applicant__first_name', 'applicant__last_name',
+        'applicant__profile_picture', 'applicant__resume', 'applicant__phone_number'
+    )
 
     # Filter by status if provided
     status = request.GET.get('status')
@@ -1307,17 +1309,16 @@ def job_application_management(request):
     # Search functionality
     search_query = request.GET.get('search')
     if search_query:
-        applications = applications.filter(
-            job__title__icontains=search_query
-        ) | applications.filter(
-            user__email__icontains=search_query
-        )
+        applications = applications.filter(search_filter(search_query, ['job__title', 'applicant__email']))
+
+    page = paginate(request, applications, ['-applied_at', '-pk'])
 
     # Get all jobs for filter dropdown
-    jobs = JobListing.objects.all().order_by('title')
+    jobs = JobListing.objects.only('id', 'title').order_by('title')
 
     context = {
-        'applications': applications,
+        'applications': page.object_list,
+        'page': page,
         'jobs': jobs,
         'status': status,
         'job_id': job_id,
@@ -1671,16 +1672,77 @@ def job_analytics_management(request):
 
     return render(request, 'custom_admin/job_analytics_management.html', context)
 
+JOB_ANALYTICS_STATUS_NAMES = {
+    'pending': 'Pending',
+    'reviewed': 'Reviewed',
+    'interview': 'Interview',
+    'hired': 'Hired',
+    'rejected': 'Rejected'
+}
+
+
+def _job_analytics_sections(job_queryset, application_queryset):
+    """
+    Build the sections of the job analytics export.
+
+    The summary counts are computed once, in two queries. Each section's rows
+    are produced lazily, so streamed formats query as they are written.
+
+    Returns:
+        list: (title, header, rows) tuples
+    """
+    from django.db.models import Q
+
+    job_totals = job_queryset.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status='active')),
+    )
+    total_applications = application_queryset.count()
+    avg_applications = round(total_applications / job_totals['total'], 1) if job_totals['total'] > 0 else 0
+
+    summary_rows = [
+        ['Total Jobs', job_totals['total']],
+        ['Active Jobs', job_totals['active']],
+        ['Total Applications', total_applications],
+        ['Average Applications per Job', avg_applications],
+    ]
+
+    def category_rows():
+        category_data = job_queryset.values('category__name').annotate(count=Count('id')).order_by('-count')
+        for item in category_data:
+            yield [item['category__name'], item['count']]
+
+    def top_job_rows():
+        top_jobs = job_queryset.select_related('company', 'category').annotate(
+            application_count=Count('applications')
+        ).order_by('-application_count')[:10]
+        for job in top_jobs:
+            yield [job.title, job.company.name, job.category.name if job.category else '', job.application_count]
+
+    def status_rows():
+        status_data = application_queryset.values('status').annotate(count=Count('id')).order_by('status')
+        for item in status_data:
+            yield [JOB_ANALYTICS_STATUS_NAMES.get(item['status'], item['status']), item['count']]
+
+    return [
+        ('Summary Statistics', ['Metric', 'Value'], summary_rows),
+        ('Jobs by Category', ['Category', 'Count'], category_rows()),
+        ('Top 10 Jobs by Applications', ['Job Title', 'Company', 'Category', 'Applications'], top_job_rows()),
+        ('Application Status Distribution', ['Status', 'Count'], status_rows()),
+    ]
+
+
 @login_required
 @user_passes_test(is_admin)
 def export_job_analytics(request):
-    """Export job analytics data in various formats."""
+    """
+    Export job analytics data in various formats.
+
+    CSV and NDJSON are streamed (add ``compress=gzip`` for a gzipped file);
+    Excel and PDF are built in memory.
+    """
     from django.http import HttpResponse
-    from django.db.models import Count
-    from django.utils import timezone
-    import csv
-    import json
-    from datetime import datetime, timedelta
+    from jobs.exports import export_response, wants_gzip
 
     # Get filter parameters
     start_date_str = request.GET.get('start_date')
@@ -1724,60 +1786,34 @@ def export_job_analytics(request):
         except JobCategory.DoesNotExist:
             pass
 
+    filename = f'job_analytics_{start_date}_to_{end_date}'
+    fallback_url = (f"{reverse('custom_admin:export_job_analytics')}?format=csv&start_date={start_date}"
+                    f"&end_date={end_date}&category={selected_category}")
+
     # Prepare data for export
     if export_format == 'csv':
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="job_analytics_{start_date}_to_{end_date}.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow(['Job Analytics Report'])
-        writer.writerow([f'Date Range: {start_date} to {end_date}'])
-        writer.writerow([f'Category: {category_name}'])
-        writer.writerow([])
-
-        # Summary statistics
-        writer.writerow(['Summary Statistics'])
-        writer.writerow(['Total Jobs', job_queryset.count()])
-        writer.writerow(['Active Jobs', job_queryset.filter(status='active').count()])
-        writer.writerow(['Total Applications', application_queryset.count()])
-        avg_applications = round(application_queryset.count() / job_queryset.count(), 1) if job_queryset.count() > 0 else 0
-        writer.writerow(['Average Applications per Job', avg_applications])
-        writer.writerow([])
-
-        # Jobs by Category
-        writer.writerow(['Jobs by Category'])
-        writer.writerow(['Category', 'Count'])
-        category_data = job_queryset.values('category__name').annotate(count=Count('id')).order_by('-count')
-        for item in category_data:
-            writer.writerow([item['category__name'], item['count']])
-        writer.writerow([])
-
-        # Top 10 Jobs by Applications
-        writer.writerow(['Top 10 Jobs by Applications'])
-        writer.writerow(['Job Title', 'Company', 'Category', 'Applications'])
-        top_jobs = job_queryset.annotate(
-            application_count=Count('applications')
-        ).order_by('-application_count')[:10]
-        for job in top_jobs:
-            writer.writerow([job.title, job.company.name, job.category.name, job.application_count])
-        writer.writerow([])
-
-        # Application Status Distribution
-        writer.writerow(['Application Status Distribution'])
-        writer.writerow(['Status', 'Count'])
-        status_data = application_queryset.values('status').annotate(count=Count('id')).order_by('status')
-        status_mapping = {
-            'pending': 'Pending',
-            'reviewed': 'Reviewed',
-            'interview': 'Interview',
-            'hired': 'Hired',
-            'rejected': 'Rejected'
-        }
-        for item in status_data:
-            status_name = status_mapping.get(item['status'], item['status'])
-            writer.writerow([status_name, item['count']])
-
-        return response
+        def rows():
+            yield ['Job Analytics Report']
+            yield [f'Date Range: {start_date} to {end_date}']
+            yield [f'Category: {category_name}']
+            for title, header, section_rows in _job_analytics_sections(job_queryset, application_queryset):
+                yield []
+                yield [title]
+                yield header
+                yield from section_rows
+
+        return export_response(rows(), 'csv', filename, compress=wants_gzip(request))
+
+    elif export_format == 'ndjson':
+        def records():
+            yield {'report': 'Job Analytics Report', 'start_date': start_date, 'end_date': end_date,
+                   'category': category_name}
+            for title, header, section_rows in _job_analytics_sections(job_queryset, application_queryset):
+                keys = [slugify(column).replace('-', '_') for column in header]
+                for row in section_rows:
+                    yield dict(zip(keys, row), section=title)
+
+        return export_response(records(), 'ndjson', filename, compress=wants_gzip(request))
 
     elif export_format == 'excel':
         try:
@@ -1799,79 +1835,17 @@ def export_job_analytics(request):
             worksheet.write(1, 0, f'Date Range: {start_date} to {end_date}')
             worksheet.write(2, 0, f'Category: {category_name}')
 
-            # Summary statistics
-            worksheet.write(4, 0, 'Summary Statistics', header_format)
-            worksheet.write(5, 0, 'Metric', header_format)
-            worksheet.write(5, 1, 'Value', header_format)
-
-            worksheet.write(6, 0, 'Total Jobs', cell_format)
-            worksheet.write(6, 1, job_queryset.count(), cell_format)
-
-            worksheet.write(7, 0, 'Active Jobs', cell_format)
-            worksheet.write(7, 1, job_queryset.filter(status='active').count(), cell_format)
-
-            worksheet.write(8, 0, 'Total Applications', cell_format)
-            worksheet.write(8, 1, application_queryset.count(), cell_format)
-
-            avg_applications = round(application_queryset.count() / job_queryset.count(), 1) if job_queryset.count() > 0 else 0
-            worksheet.write(9, 0, 'Average Applications per Job', cell_format)
-            worksheet.write(9, 1, avg_applications, cell_format)
-
-            # Jobs by Category
-            worksheet.write(11, 0, 'Jobs by Category', header_format)
-            worksheet.write(12, 0, 'Category', header_format)
-            worksheet.write(12, 1, 'Count', header_format)
-
-            category_data = job_queryset.values('category__name').annotate(count=Count('id')).order_by('-count')
-            row = 13
-            for item in category_data:
-                worksheet.write(row, 0, item['category__name'], cell_format)
-                worksheet.write(row, 1, item['count'], cell_format)
-                row += 1
-
-            # Top 10 Jobs by Applications
-            row += 2
-            worksheet.write(row, 0, 'Top 10 Jobs by Applications', header_format)
-            row += 1
-            worksheet.write(row, 0, 'Job Title', header_format)
-            worksheet.write(row, 1, 'Company', header_format)
-            worksheet.write(row, 2, 'Category', header_format)
-            worksheet.write(row, 3, 'Applications', header_format)
-
-            top_jobs = job_queryset.annotate(
-                application_count=Count('applications')
-            ).order_by('-application_count')[:10]
-
-            row += 1
-            for job in top_jobs:
-                worksheet.write(row, 0, job.title, cell_format)
-                worksheet.write(row, 1, job.company.name, cell_format)
-                worksheet.write(row, 2, job.category.name, cell_format)
-                worksheet.write(row, 3, job.application_count, cell_format)
-                row += 1
-
-            # Application Status Distribution
-            row += 2
-            worksheet.write(row, 0, 'Application Status Distribution', header_format)
-            row += 1
-            worksheet.write(row, 0, 'Status', header_format)
-            worksheet.write(row, 1, 'Count', header_format)
-
-            status_data = application_queryset.values('status').annotate(count=Count('id')).order_by('status')
-            status_mapping = {
-                'pending': 'Pending',
-                'reviewed': 'Reviewed',
-                'interview': 'Interview',
-                'hired': 'Hired',
-                'rejected': 'Rejected'
-            }
-
-            row += 1
-            for item in status_data:
-                status_name = status_mapping.get(item['status'], item['status'])
-                worksheet.write(row, 0, status_name, cell_format)
-                worksheet.write(row, 1, item['count'], cell_format)
+            row = 2
+            for title, header, section_rows in _job_analytics_sections(job_queryset, application_queryset):
+                row += 2
+                worksheet.write(row, 0, title, header_format)
                 row += 1
+                for column, value in enumerate(header):
+                    worksheet.write(row, column, value, header_format)
+                for section_row in section_rows:
+                    row += 1
+                    for column, value in enumerate(section_row):
+                        worksheet.write(row, column, value, cell_format)
 
             # Auto-adjust column widths
             worksheet.set_column(0, 0, 30)
@@ -1882,14 +1856,14 @@ def export_job_analytics(request):
             # Create the response
             output.seek(0)
             response = HttpResponse(output.read(), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-            response['Content-Disposition'] = f'attachment; filename="job_analytics_{start_date}_to_{end_date}.xlsx"'
+            response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
 
             return response
 
         except ImportError:
             # If xlsxwriter is not available, fall back to CSV
             messages.warning(request, "Excel export is not available. Falling back to CSV format.")
-            return redirect(f"{reverse('custom_admin:export_job_analytics')}?format=csv&start_date={start_date}&end_date={end_date}&category={selected_category}")
+            return redirect(fallback_url)
 
     elif export_format == 'pdf':
         try:
@@ -1921,95 +1895,23 @@ def export_job_analytics(request):
             content.append(Paragraph(f'Category: {category_name}', styles['Normal']))
             content.append(Spacer(1, 12))
 
-            # Summary statistics
-            content.append(Paragraph('Summary Statistics', styles['Heading2']))
-            data = [
-                ['Metric', 'Value'],
-                ['Total Jobs', str(job_queryset.count())],
-                ['Active Jobs', str(job_queryset.filter(status='active').count())],
-                ['Total Applications', str(application_queryset.count())],
-                ['Average Applications per Job', str(round(application_queryset.count() / job_queryset.count(), 1) if job_queryset.count() > 0 else 0)]
-            ]
-
-            table = Table(data, colWidths=[300, 100])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (1, 0), colors.lightgreen),
-                ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            content.append(table)
-            content.append(Spacer(1, 12))
-
-            # Jobs by Category
-            content.append(Paragraph('Jobs by Category', styles['Heading2']))
-            category_data = job_queryset.values('category__name').annotate(count=Count('id')).order_by('-count')
-            data = [['Category', 'Count']]
-            for item in category_data:
-                data.append([item['category__name'], str(item['count'])])
-
-            table = Table(data, colWidths=[300, 100])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (1, 0), colors.lightgreen),
-                ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            content.append(table)
-            content.append(Spacer(1, 12))
-
-            # Top 10 Jobs by Applications
-            content.append(Paragraph('Top 10 Jobs by Applications', styles['Heading2']))
-            top_jobs = job_queryset.annotate(
-                application_count=Count('jobapplication')
-            ).order_by('-application_count')[:10]
-
-            data = [['Job Title', 'Company', 'Category', 'Applications']]
-            for job in top_jobs:
-                data.append([job.title, job.company.name, job.category.name, str(job.application_count)])
-
-            table = Table(data, colWidths=[150, 100, 100, 100])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (3, 0), colors.lightgreen),
-                ('TEXTCOLOR', (0, 0), (3, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            content.append(table)
-            content.append(Spacer(1, 12))
-
-            # Application Status Distribution
-            content.append(Paragraph('Application Status Distribution', styles['Heading2']))
-            status_data = application_queryset.values('status').annotate(count=Count('id')).order_by('status')
-            status_mapping = {
-                'pending': 'Pending',
-                'reviewed': 'Reviewed',
-                'interview': 'Interview',
-                'hired': 'Hired',
-                'rejected': 'Rejected'
-            }
-
-            data = [['Status', 'Count']]
-            for item in status_data:
-                status_name = status_mapping.get(item['status'], item['status'])
-                data.append([status_name, str(item['count'])])
-
-            table = Table(data, colWidths=[300, 100])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (1, 0), colors.lightgreen),
-                ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            content.append(table)
+            for title, header, section_rows in _job_analytics_sections(job_queryset, application_queryset):
+                content.append(Paragraph(title, styles['Heading2']))
+                data = [header] + [[str(value) for value in section_row] for section_row in section_rows]
+                last_column = len(header) - 1
+                col_widths = [300, 100] if len(header) == 2 else [150] + [100] * last_column
+
+                table = Table(data, colWidths=col_widths)
+                table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (last_column, 0), colors.lightgreen),
+                    ('TEXTCOLOR', (0, 0), (last_column, 0), colors.black),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+                ]))
+                content.append(table)
+                content.append(Spacer(1, 12))
 
             # Build the PDF
             doc.build(content)
@@ -2020,7 +1922,7 @@ def export_job_analytics(request):
 
             # Create the HTTP response
             response = HttpResponse(content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="job_analytics_{start_date}_to_{end_date}.pdf"'
+            response['Content-Disposition'] = f'attachment; filename="{filename}.pdf"'
             response.write(pdf)
 
             return response
@@ -2028,12 +1930,12 @@ def export_job_analytics(request):
         except ImportError:
             # If reportlab is not available, fall back to CSV
             messages.warning(request, "PDF export is not available. Falling back to CSV format.")
-            return redirect(f"{reverse('custom_admin:export_job_analytics')}?format=csv&start_date={start_date}&end_date={end_date}&category={selected_category}")
+            return redirect(fallback_url)
 
     else:
         # Default to CSV if format is not recognized
         messages.warning(request, f"Export format '{export_format}' is not supported. Falling back to CSV format.")
-        return redirect(f"{reverse('custom_admin:export_job_analytics')}?format=csv&start_date={start_date}&end_date={end_date}&category={selected_category}")
+        return redirect(fallback_url)
 
 @login_required
 @user_passes_test(is_admin)
@@ -2405,7 +2307,10 @@ def notification_management(request):
 
         elif action == 'mark_all_read':
             # Mark all unread notifications as read
-            count = Notification.objects.filter(is_read=False).update(is_read=True)
+            unread = Notification.objects.filter(is_read=False)
+            user_ids = set(unread.values_list('user_id', flat=True).distinct())
+            count = unread.update(is_read=True)
+            unread_counts.invalidate(user_ids, kinds=(unread_counts.NOTIFICATIONS,))
             messages.success(request, f"{count} notifications have been marked as read.")
 
         elif action == 'delete':
@@ -2422,7 +2327,10 @@ def notification_management(request):
         return redirect('custom_admin:notification_management')
 
     # GET request
-    notifications = Notification.objects.all().order_by('-created_at')
+    notifications = Notification.objects.select_related('user').only(
+        'id', 'notification_type', 'title', 'message', 'is_read', 'created_at',
+        'user__id', 'user__email', 'user__first_name', 'user__last_name', 'user__profile_picture'
+    )
 
     # Filter by notification type if provided
     notification_type = request.GET.get('notification_type')
@@ -2438,19 +2346,16 @@ def notification_management(request):
     # Search functionality
     search_query = request.GET.get('search')
     if search_query:
-        notifications = notifications.filter(
-            title__icontains=search_query
-        ) | notifications.filter(
-            message__icontains=search_query
-        ) | notifications.filter(
-            user__email__icontains=search_query
-        )
+        notifications = notifications.filter(search_filter(search_query, ['title', 'message', 'user__email']))
+
+    page = paginate(request, notifications, ['-created_at', '-pk'])
 
     # Get all users for the specific user dropdown
-    all_users = CustomUser.objects.all().order_by('first_name', 'last_name')
+    all_users = CustomUser.objects.only('id', 'email', 'first_name', 'last_name').order_by('first_name', 'last_name')
 
     context = {
-        'notifications': notifications,
+        'notifications': page.object_list,
+        'page': page,
         'notification_type': notification_type,
         'is_read': is_read,
         'search_query': search_query,
@@ -6,10 +6,12 @@ from .models import (
     JobCategory, JobListing, JobApplication, SavedJob, Notification,
     JobPackage, JobRenewal, JobAnalytics, TrustedCompany, TeamMember,
     Testimonial, Newsletter, ApplicationMessage, BlockedUser, Company,
-    LegalPage, CompanyConnection, CompanyFollower, SiteSettings, HeroSection
+    LegalPage, CompanyConnection, CompanyFollower, SiteSettings, HeroSection,
+    MailCampaign, MailFailure
 )
 from django.utils.translation import gettext_lazy as _
 from .admin_views import send_newsletter_view
+from .company_stats import refresh_company_stats
 
 @admin.register(JobCategory)
 class JobCategoryAdmin(admin.ModelAdmin):
@@ -68,19 +70,25 @@ class JobListingAdmin(admin.ModelAdmin):
 
     def mark_as_expired(self, request, queryset):
         """Mark selected jobs as expired."""
+        company_ids = set(queryset.values_list('company_id', flat=True))
         updated = queryset.update(status='expired')
+        refresh_company_stats(company_ids)
         self.message_user(request, _(f'{updated} jobs marked as expired.'))
     mark_as_expired.short_description = _('Mark selected jobs as expired')
 
     def mark_as_closed(self, request, queryset):
         """Mark selected jobs as closed."""
+        company_ids = set(queryset.values_list('company_id', flat=True))
         updated = queryset.update(status='closed')
+        refresh_company_stats(company_ids)
         self.message_user(request, _(f'{updated} jobs marked as closed.'))
     mark_as_closed.short_description = _('Mark selected jobs as closed')
 
     def mark_as_published(self, request, queryset):
         """Mark selected jobs as published."""
+        company_ids = set(queryset.values_list('company_id', flat=True))
         updated = queryset.update(status='published')
+        refresh_company_stats(company_ids)
         self.message_user(request, _(f'{updated} jobs marked as published.'))
     mark_as_published.short_description = _('Mark selected jobs as published')
 
@@ -427,13 +435,17 @@ class CompanyConnectionAdmin(admin.ModelAdmin):
 
     def approve_connections(self, request, queryset):
         """Approve selected connection requests."""
+        company_ids = set(queryset.values_list('company_id', flat=True))
         updated = queryset.update(status='approved')
+        refresh_company_stats(company_ids)
         self.message_user(request, _(f'{updated} connection requests approved.'))
     approve_connections.short_description = _('Approve selected connections')
 
     def reject_connections(self, request, queryset):
         """Reject selected connection requests."""
+        company_ids = set(queryset.values_list('company_id', flat=True))
         updated = queryset.update(status='rejected')
+        refresh_company_stats(company_ids)
         self.message_user(request, _(f'{updated} connection requests rejected.'))
     reject_connections.short_description = _('Reject selected connections')
 
@@ -534,4 +546,30 @@ class HeroSectionAdmin(admin.ModelAdmin):
         if obj.mobile_background_image:
             return format_html('<img src="{}" style="max-height: 150px; max-width: 200px;" />', obj.mobile_background_image.url)
         return "No mobile background image"
-    mobile_background_preview.short_description = _('Mobile Background Preview')
\ No newline at end of file
+    mobile_background_preview.short_description = _('Mobile Background Preview')
+
+
+class MailFailureInline(admin.TabularInline):
+    model = MailFailure
+    fields = ('recipient', 'error', 'attempts', 'updated_at')
+    readonly_fields = fields
+    extra = 0
+    can_delete = True
+    show_change_link = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MailCampaign)
+class MailCampaignAdmin(admin.ModelAdmin):
+    """Admin interface for reviewing bulk mailings and their failures."""
+    list_display = ('subject', 'kind', 'status', 'sent_count', 'failed_count', 'created_at', 'completed_at')
+    list_filter = ('kind', 'status', 'created_at')
+    search_fields = ('subject',)
+    readonly_fields = ('kind', 'subject', 'parameters', 'status', 'checkpoint', 'sent_count', 'failed_count',
+                       'created_at', 'updated_at', 'completed_at')
+    inlines = [MailFailureInline]
+
+    def has_add_permission(self, request):
+        return False
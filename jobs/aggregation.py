@@ -0,0 +1,66 @@
+"""
+Count many buckets of a queryset in one query.
+
+Dashboards used to count each status or score band with its own
+``.filter(...).count()``, one round trip per number. ``bucket_counts`` turns
+every bucket into a ``Count('pk', filter=Q(...))`` of a single ``aggregate()``
+call, so a table is read once however many buckets a page shows.
+``grouped_counts`` covers distributions whose values are not known in
+advance, such as a field with values outside its choices, with one
+``GROUP BY`` whose counts also give the total.
+"""
+from django.db.models import Count, Q
+
+
+def choice_buckets(field, values):
+    """
+    Build one bucket per value of ``field``.
+
+    Args:
+        field: Field name, e.g. ``'status'``
+        values: Values to count; a field's choices work too
+
+    Returns:
+        dict: Bucket name (the value) to Q object
+    """
+    buckets = {}
+    for value in values:
+        if isinstance(value, (tuple, list)):
+            value = value[0]
+        buckets[value] = Q(**{field: value})
+    return buckets
+
+
+def bucket_counts(queryset, buckets, total='total', **aggregates):
+    """
+    Count the rows of ``queryset`` in each bucket with one query.
+
+    Args:
+        queryset: Rows to count
+        buckets: Dict of result name to Q object; a row may fall in several buckets
+        total: Result name for the count of all rows, or None to leave it out
+        **aggregates: Further aggregate expressions to compute in the same query
+
+    Returns:
+        dict: Result name to value; counts are 0 for an empty queryset
+    """
+    expressions = {name: Count('pk', filter=condition) for name, condition in buckets.items()}
+    if total:
+        expressions[total] = Count('pk')
+    expressions.update(aggregates)
+    return queryset.order_by().aggregate(**expressions)
+
+
+def grouped_counts(queryset, field):
+    """
+    Count the rows of ``queryset`` per value of ``field`` with one query.
+
+    Args:
+        queryset: Rows to count
+        field: Field to group by
+
+    Returns:
+        tuple: (list of ``{field: value, 'count': n}`` dicts, total row count)
+    """
+    rows = list(queryset.order_by().values(field).annotate(count=Count('pk')).order_by(field))
+    return rows, sum(row['count'] for row in rows)
@@ -1,7 +1,11 @@
+import heapq
+
 from django.db.models import Q
+from django.db.models.functions import Length
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from .models import JobListing, JobApplication
+from .skill_index import parse_skills, annotate_skill_matches
 
 User = get_user_model()
 
@@ -17,7 +21,7 @@ def get_recommended_candidates(job, limit=10):
         List of recommended User objects with match scores
     """
     # Get job skills
-    job_skills = [skill.strip().lower() for skill in job.skills_required.split(',') if skill.strip()]
+    job_skills = parse_skills(job.skills_required)
     
     if not job_skills:
         return []
@@ -30,28 +34,21 @@ def get_recommended_candidates(job, limit=10):
         applications__job=job
     )
     
+    # Only candidates sharing at least one skill are scored, via the skill index
+    candidates = annotate_skill_matches(candidates, job_skills).annotate(
+        experience_length=Length('experience'),
+        education_length=Length('education'),
+    ).values_list('id', 'matched_skill_count', 'experience_length', 'education_length')
+    
     # Calculate match scores for each candidate
     candidate_matches = []
-    for candidate in candidates:
-        # Skip candidates without skills
-        if not candidate.skills:
-            continue
-        
-        # Get candidate skills
-        candidate_skills = [skill.strip().lower() for skill in candidate.skills.split(',') if skill.strip()]
-        
-        # Calculate skill match
-        matching_skills = set(candidate_skills).intersection(set(job_skills))
-        if not matching_skills:
-            continue
-            
-        skills_match = int((len(matching_skills) / len(job_skills)) * 100)
+    for user_id, matched, exp_length, education_length in candidates:
+        skills_match = int((matched / len(job_skills)) * 100)
         
         # Calculate experience match (simplified)
         experience_match = 0
-        if candidate.experience and job.experience_level:
+        if exp_length and job.experience_level:
             # Simple heuristic based on experience text length and job level
-            exp_length = len(candidate.experience)
             if job.experience_level == 'entry' and exp_length > 0:
                 experience_match = 80
             elif job.experience_level == 'mid' and exp_length > 100:
@@ -63,7 +60,7 @@ def get_recommended_candidates(job, limit=10):
         
         # Calculate education match (simplified)
         education_match = 0
-        if candidate.education:
+        if education_length:
             # Simple presence check
             education_match = 80
         
@@ -76,19 +73,27 @@ def get_recommended_candidates(job, limit=10):
         # Only include candidates with at least 50% match
         if overall_match >= 50:
             candidate_matches.append({
-                'user': candidate,
+                'user_id': user_id,
                 'skills_match': skills_match,
                 'experience_match': experience_match,
                 'education_match': education_match,
                 'overall_match': overall_match,
-                'matching_skills': list(matching_skills)
             })
     
-    # Sort by overall match (descending)
-    candidate_matches.sort(key=lambda x: x['overall_match'], reverse=True)
+    # Keep the top matches by overall match (descending)
+    candidate_matches = heapq.nlargest(limit, candidate_matches, key=lambda x: x['overall_match'])
+    
+    users_by_id = User.objects.in_bulk([match['user_id'] for match in candidate_matches])
+    job_skill_set = set(job_skills)
+    for match in candidate_matches:
+        candidate = users_by_id[match.pop('user_id')]
+        match['user'] = candidate
+        match['matching_skills'] = [
+            skill for skill in parse_skills(candidate.skills) if skill in job_skill_set
+        ]
     
     # Return top matches
-    return candidate_matches[:limit]
+    return candidate_matches
 
 def get_candidate_recommendations_for_employer(employer, limit=20):
     """
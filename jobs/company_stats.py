@@ -0,0 +1,130 @@
+"""
+Denormalized company counters.
+
+``Company.job_count``, ``active_job_count``, ``follower_count`` and
+``connection_count`` used to run a ``COUNT`` query each time they were read,
+so a page of company cards issued several queries per company. The counters
+now live in ``CompanyStats`` and are recomputed for the affected company
+once a change to one of its listings, followers or connections commits.
+
+The active job count also depends on the clock: a listing stops being active
+once its deadline passes. ``CompanyStats.next_deadline`` records the earliest
+upcoming deadline, and rows whose deadline has passed are recomputed the next
+time they are read. ``reconcile_company_stats`` rebuilds every row in bulk.
+"""
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .models import Company, CompanyConnection, CompanyFollower, CompanyStats, JobListing
+
+STATS_FIELDS = ['job_count', 'active_job_count', 'follower_count', 'connection_count', 'next_deadline']
+
+
+def compute_company_stats(company_ids):
+    """
+    Count listings, followers and connections for the given companies.
+
+    Companies that no longer exist are skipped.
+
+    Args:
+        company_ids: Iterable of Company primary keys
+
+    Returns:
+        Dict mapping company id to an unsaved CompanyStats instance
+    """
+    company_ids = set(Company.objects.filter(pk__in=company_ids).values_list('pk', flat=True))
+    if not company_ids:
+        return {}
+
+    now = timezone.now()
+    active = Q(status='published') & (Q(application_deadline__gt=now) | Q(application_deadline__isnull=True))
+    stats = {company_id: CompanyStats(company_id=company_id) for company_id in company_ids}
+
+    job_counts = JobListing.objects.filter(company_id__in=company_ids, status='published').values(
+        'company_id'
+    ).annotate(
+        total=Count('pk'),
+        active=Count('pk', filter=active),
+        next_deadline=Min('application_deadline', filter=Q(application_deadline__gt=now)),
+    )
+    for row in job_counts:
+        entry = stats[row['company_id']]
+        entry.job_count = row['total']
+        entry.active_job_count = row['active']
+        entry.next_deadline = row['next_deadline']
+
+    follower_counts = CompanyFollower.objects.filter(company_id__in=company_ids).values(
+        'company_id'
+    ).annotate(total=Count('pk'))
+    for row in follower_counts:
+        stats[row['company_id']].follower_count = row['total']
+
+    connection_counts = CompanyConnection.objects.filter(company_id__in=company_ids, status='approved').values(
+        'company_id'
+    ).annotate(total=Count('pk'))
+    for row in connection_counts:
+        stats[row['company_id']].connection_count = row['total']
+
+    return stats
+
+
+def refresh_company_stats(company_ids):
+    """
+    Recompute and store the counters for the given companies.
+
+    Returns:
+        Dict mapping company id to its saved CompanyStats
+    """
+    stats = compute_company_stats(company_ids)
+    if stats:
+        now = timezone.now()
+        for entry in stats.values():
+            entry.updated_at = now
+        CompanyStats.objects.bulk_create(
+            stats.values(),
+            update_conflicts=True,
+            unique_fields=['company'],
+            update_fields=STATS_FIELDS + ['updated_at'],
+        )
+    return stats
+
+
+def attach_company_stats(companies):
+    """
+    Make sure every company in ``companies`` has fresh stats cached on it.
+
+    Pass companies fetched with ``select_related('stats')``. Missing or stale
+    rows are recomputed together, so a page of companies costs at most a few
+    extra queries however many counters it shows.
+
+    Returns:
+        The companies, for chaining
+    """
+    companies = list(companies)
+    outdated = [
+        company for company in companies
+        if not hasattr(company, 'stats') or company.stats.is_stale
+    ]
+    if outdated:
+        stats = refresh_company_stats([company.pk for company in outdated])
+        for company in outdated:
+            company.stats = stats.get(company.pk) or CompanyStats(company_id=company.pk)
+    return companies
+
+
+def get_company_stats(company):
+    """Return fresh stats for a single company."""
+    return attach_company_stats([company])[0].stats
+
+
+def reconcile_company_stats(batch_size=500):
+    """
+    Rebuild the counters for every company.
+
+    Returns:
+        Number of companies processed
+    """
+    company_ids = list(Company.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(company_ids), batch_size):
+        refresh_company_stats(company_ids[start:start + batch_size])
+    return len(company_ids)
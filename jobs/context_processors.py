@@ -1,20 +1,19 @@
-from .models import Notification, JobCategory, SiteSettings
+from .site_cache import get_categories, get_site_settings
+from .unread_counts import get_unread_counts
 
 def base_context(request):
     """Add common context variables to all templates."""
     context = {}
 
     # Add site settings
-    site_settings = SiteSettings.get_settings()
+    site_settings = get_site_settings()
     context['site_settings'] = site_settings
 
-    # Add unread notifications count for authenticated users
+    # Add unread notification and message counts for authenticated users
     if request.user.is_authenticated:
-        unread_notifications_count = Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).count()
-        context['unread_notifications_count'] = unread_notifications_count
+        unread_counts = get_unread_counts(request.user.pk)
+        context['unread_notifications_count'] = unread_counts.notifications
+        context['unread_messages_count'] = unread_counts.messages
 
         # Check if user has an active pro subscription
         has_pro = False
@@ -30,7 +29,6 @@ def base_context(request):
         context['has_pro'] = has_pro
 
     # Add job categories for navigation
-    categories = JobCategory.objects.all()
-    context['categories'] = categories
+    context['categories'] = get_categories()
 
     return context
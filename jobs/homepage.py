@@ -0,0 +1,87 @@
+"""
+Cached snapshot of the data shown on the home page.
+
+The statistics come from one grouped query over published jobs, so the cost
+of building the snapshot does not grow with the number of categories. The
+snapshot is cached through ``jobs.site_cache``. The signals in
+``jobs.signals`` clear it when a job's status (or another listed field)
+changes, and ``refresh_homepage_snapshot`` rebuilds it on a schedule.
+
+With a process-local cache (LocMemCache) each web worker keeps its own copy,
+so the snapshot is kept no longer than ``SITE_CACHE_LOCAL_TTL`` seconds and
+the management command cannot refresh it for the workers.
+"""
+from django.conf import settings
+from django.db.models import Count
+
+from . import site_cache
+
+HOMEPAGE_SNAPSHOT_KEY = 'site_cache:homepage_snapshot'
+DEFAULT_SNAPSHOT_TIMEOUT = 15 * 60
+
+# Saving any of these JobListing fields can change what the home page shows
+SNAPSHOT_JOB_FIELDS = {'status', 'is_featured', 'category', 'company', 'title', 'created_at'}
+
+
+def _snapshot_timeout():
+    return getattr(settings, 'HOMEPAGE_SNAPSHOT_TIMEOUT', DEFAULT_SNAPSHOT_TIMEOUT)
+
+
+def build_homepage_snapshot():
+    """
+    Build the home page snapshot from the database.
+
+    Returns:
+        Dictionary with the job statistics and the featured/recent jobs,
+        testimonials, team members and trusted companies to display
+    """
+    from .models import JobListing, Testimonial, TeamMember, TrustedCompany
+
+    published = JobListing.objects.filter(status='published')
+
+    # One grouped query gives per-category counts, the total and the set of
+    # companies with open jobs.
+    category_counts = {}
+    company_ids = set()
+    total_jobs = 0
+    rows = published.order_by().values_list('category_id', 'company_id').annotate(count=Count('id'))
+    for category_id, company_id, count in rows:
+        total_jobs += count
+        company_ids.add(company_id)
+        if category_id is not None:
+            category_counts[category_id] = category_counts.get(category_id, 0) + count
+
+    categories = site_cache.get_categories()
+    for category in categories:
+        category_counts.setdefault(category.id, 0)
+
+    return {
+        'total_jobs': total_jobs,
+        'total_companies': len(company_ids),
+        'total_categories': len(categories),
+        'category_counts': category_counts,
+        'featured_jobs': list(
+            published.filter(is_featured=True).select_related('company').order_by('-created_at')[:8]
+        ),
+        'recent_jobs': list(published.select_related('company').order_by('-created_at')[:10]),
+        'testimonials': list(
+            Testimonial.objects.filter(is_active=True).select_related('user').order_by('-created_at')[:5]
+        ),
+        'team_members': list(TeamMember.objects.filter(is_active=True).order_by('order')),
+        'trusted_companies': list(TrustedCompany.objects.filter(is_active=True).order_by('order')),
+    }
+
+
+def get_homepage_snapshot():
+    """Return the cached home page snapshot, building it on a miss."""
+    return site_cache.get_or_load(HOMEPAGE_SNAPSHOT_KEY, build_homepage_snapshot, timeout=_snapshot_timeout())
+
+
+def refresh_homepage_snapshot():
+    """Rebuild the snapshot and replace the cached copy. Returns the snapshot."""
+    site_cache.invalidate(HOMEPAGE_SNAPSHOT_KEY)
+    return get_homepage_snapshot()
+
+
+def invalidate_homepage_snapshot():
+    site_cache.invalidate(HOMEPAGE_SNAPSHOT_KEY)
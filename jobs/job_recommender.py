@@ -1,6 +1,9 @@
+import heapq
+
 from django.db.models import Q
 from django.utils import timezone
 from .models import JobListing
+from .skill_index import parse_skills, annotate_skill_matches
 
 def get_recommended_jobs(user, limit=10):
     """
@@ -14,9 +17,7 @@ def get_recommended_jobs(user, limit=10):
         List of recommended JobListing objects with match scores
     """
     # Get user skills
-    user_skills = []
-    if user.skills:
-        user_skills = [skill.strip().lower() for skill in user.skills.split(',') if skill.strip()]
+    user_skills = parse_skills(user.skills)
 
     if not user_skills:
         return []
@@ -28,45 +29,41 @@ def get_recommended_jobs(user, limit=10):
         Q(application_deadline__lt=timezone.now()) & ~Q(application_deadline=None)
     ).exclude(
         applications__applicant=user
+    ).exclude(
+        Q(slug='') | Q(slug=None)
     )
 
-    # Calculate match scores for each job
-    job_matches = []
-    for job in active_jobs:
-        # Skip jobs without skills or slug
-        if not job.skills_required or not job.slug:
-            continue
+    # Only jobs sharing at least one skill are scored, via the skill index
+    candidates = annotate_skill_matches(active_jobs, user_skills).values_list(
+        'id', 'experience_level', 'matched_skill_count', 'indexed_skill_count'
+    )
 
-        # Get job skills
-        job_skills = [skill.strip().lower() for skill in job.skills_required.split(',') if skill.strip()]
+    # Calculate education match (simplified)
+    education_match = 0
+    if user.education:
+        # Simple presence check
+        education_match = 80
 
-        # Calculate skill match
-        matching_skills = set(user_skills).intersection(set(job_skills))
-        if not matching_skills:
-            continue
+    exp_length = len(user.experience) if user.experience else 0
 
-        skills_match = int((len(matching_skills) / len(job_skills)) * 100)
+    # Calculate match scores for each candidate job
+    job_matches = []
+    for job_id, experience_level, matched, total in candidates:
+        skills_match = int((matched / total) * 100)
 
         # Calculate experience match (simplified)
         experience_match = 0
-        if user.experience and job.experience_level:
+        if exp_length and experience_level:
             # Simple heuristic based on experience text length and job level
-            exp_length = len(user.experience)
-            if job.experience_level == 'entry' and exp_length > 0:
+            if experience_level == 'entry' and exp_length > 0:
                 experience_match = 80
-            elif job.experience_level == 'mid' and exp_length > 100:
+            elif experience_level == 'mid' and exp_length > 100:
                 experience_match = 85
-            elif job.experience_level == 'senior' and exp_length > 200:
+            elif experience_level == 'senior' and exp_length > 200:
                 experience_match = 90
-            elif job.experience_level == 'executive' and exp_length > 300:
+            elif experience_level == 'executive' and exp_length > 300:
                 experience_match = 95
 
-        # Calculate education match (simplified)
-        education_match = 0
-        if user.education:
-            # Simple presence check
-            education_match = 80
-
         # Calculate overall match
         if experience_match == 0 and education_match == 0:
             overall_match = skills_match
@@ -76,16 +73,23 @@ def get_recommended_jobs(user, limit=10):
         # Only include jobs with at least 50% match
         if overall_match >= 50:
             job_matches.append({
-                'job': job,
+                'job_id': job_id,
                 'skills_match': skills_match,
                 'experience_match': experience_match,
                 'education_match': education_match,
                 'overall_match': overall_match,
-                'matching_skills': list(matching_skills)
             })
 
-    # Sort by overall match (descending)
-    job_matches.sort(key=lambda x: x['overall_match'], reverse=True)
+    # Keep the top matches by overall match (descending)
+    job_matches = heapq.nlargest(limit, job_matches, key=lambda x: x['overall_match'])
+
+    jobs_by_id = JobListing.objects.in_bulk([match['job_id'] for match in job_matches])
+    user_skill_set = set(user_skills)
+    for match in job_matches:
+        job = jobs_by_id[match.pop('job_id')]
+        match['job'] = job
+        match['matching_skills'] = [
+            skill for skill in parse_skills(job.skills_required) if skill in user_skill_set
+        ]
 
-    # Return top matches
-    return job_matches[:limit]
+    return job_matches
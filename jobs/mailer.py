@@ -0,0 +1,279 @@
+"""
+Bulk mail dispatch.
+
+The newsletter and expiration warning commands used to send each message on
+its own, and Django opens and closes an SMTP connection for every ``send()``.
+``MailDispatcher`` groups messages into batches of ``MAIL_BATCH_SIZE`` and
+sends each batch over one connection. Batches go out on
+``MAIL_MAX_WORKERS`` threads, paced to at most ``MAIL_RATE_LIMIT`` messages
+per second overall (0 means no limit).
+
+When sending for a ``MailCampaign``, undelivered messages are stored as
+``MailFailure`` rows, which ``retry_failures`` sends again. The campaign's
+``checkpoint`` records the key of the last recipient up to which every batch
+has finished, so an interrupted mailing can resume after it.
+
+The dispatcher uses ``EMAIL_BACKEND`` unless given another backend. The
+``benchmark_mailer`` command measures throughput against the locmem backend
+or a local SMTP server.
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RATE_LIMIT = 0
+
+DispatchResult = namedtuple('DispatchResult', ['sent', 'failed'])
+
+# Outcome of one batch: the keys of its messages, the number sent, and
+# (key, message, error) for each message that was not
+BatchResult = namedtuple('BatchResult', ['keys', 'sent', 'failures'])
+
+
+class RateLimiter:
+    """Space out calls to ``wait()`` so at most ``rate`` return per second, across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def build_message(recipient, subject, body, html_body=None, from_email=None):
+    """Build a plain text message with an optional HTML alternative."""
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=[recipient]
+    )
+    if html_body:
+        message.attach_alternative(html_body, 'text/html')
+    return message
+
+
+def _html_body(message):
+    for alternative in getattr(message, 'alternatives', []):
+        if alternative[1] == 'text/html':
+            return alternative[0]
+    return ''
+
+
+class MailDispatcher:
+    """Send many messages in batches over reused connections."""
+
+    def __init__(self, batch_size=None, max_workers=None, rate_limit=None, backend=None, **backend_options):
+        self._batch_size = batch_size
+        self._max_workers = max_workers
+        self._rate_limit = rate_limit
+        self.backend = backend
+        self.backend_options = backend_options
+
+    @property
+    def batch_size(self):
+        if self._batch_size is not None:
+            return self._batch_size
+        return getattr(settings, 'MAIL_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+    @property
+    def max_workers(self):
+        if self._max_workers is not None:
+            return self._max_workers
+        return getattr(settings, 'MAIL_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+
+    @property
+    def rate_limit(self):
+        if self._rate_limit is not None:
+            return self._rate_limit
+        return getattr(settings, 'MAIL_RATE_LIMIT', DEFAULT_RATE_LIMIT)
+
+    def dispatch(self, messages):
+        """
+        Send messages and yield a BatchResult for each batch, in order.
+
+        Args:
+            messages (iterable): (key, EmailMessage) pairs in ascending key order
+
+        Yields:
+            BatchResult: One per batch. Batches finishing early are held back
+                until those before them are done, so the last key yielded is
+                always a safe resume point.
+        """
+        rate_limiter = RateLimiter(self.rate_limit)
+        batches = self._batches(messages)
+
+        if self.max_workers <= 1:
+            for batch in batches:
+                yield self._send_batch(batch, rate_limiter)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='mailer') as executor:
+            pending = {}
+            finished = {}
+            submitted = 0
+            next_index = 0
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < self.max_workers * 2:
+                    batch = next(batches, None)
+                    if batch is None:
+                        exhausted = True
+                        break
+                    pending[executor.submit(self._send_batch, batch, rate_limiter)] = submitted
+                    submitted += 1
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[pending.pop(future)] = future.result()
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+
+    def send(self, messages, campaign=None):
+        """
+        Send messages, recording progress and failures on ``campaign`` if given.
+
+        Args:
+            messages (iterable): (key, EmailMessage) pairs in ascending key order
+            campaign (MailCampaign, optional): Campaign to update after each batch
+
+        Returns:
+            DispatchResult: Number of messages sent and failed
+        """
+        from .models import MailCampaign, MailFailure
+
+        sent = failed = 0
+        for result in self.dispatch(messages):
+            sent += result.sent
+            failed += len(result.failures)
+            if campaign is None:
+                continue
+
+            MailFailure.objects.bulk_create([
+                MailFailure(
+                    campaign=campaign,
+                    recipient=', '.join(message.to),
+                    subject=message.subject,
+                    body=message.body,
+                    html_body=_html_body(message),
+                    error=error,
+                )
+                for _, message, error in result.failures
+            ])
+            MailCampaign.objects.filter(pk=campaign.pk).update(
+                checkpoint=result.keys[-1],
+                sent_count=F('sent_count') + result.sent,
+                failed_count=F('failed_count') + len(result.failures),
+                updated_at=timezone.now(),
+            )
+
+        if campaign is not None:
+            MailCampaign.objects.filter(pk=campaign.pk).update(status='completed', completed_at=timezone.now())
+            campaign.refresh_from_db()
+        return DispatchResult(sent, failed)
+
+    def retry_failures(self, failures):
+        """
+        Send stored failures again.
+
+        Delivered failures are deleted; the rest have their attempt count and
+        error updated.
+
+        Args:
+            failures: MailFailure queryset
+
+        Returns:
+            DispatchResult: Number of messages sent and failed
+        """
+        from .models import MailCampaign, MailFailure
+
+        messages = [
+            (failure.pk, build_message(failure.recipient, failure.subject, failure.body, failure.html_body))
+            for failure in failures.order_by('pk')
+        ]
+        sent = failed = 0
+        for result in self.dispatch(messages):
+            failed_keys = {key for key, _, _ in result.failures}
+            delivered = MailFailure.objects.filter(pk__in=set(result.keys) - failed_keys)
+            for campaign_id in set(delivered.values_list('campaign_id', flat=True)):
+                count = delivered.filter(campaign_id=campaign_id).count()
+                MailCampaign.objects.filter(pk=campaign_id).update(
+                    sent_count=F('sent_count') + count,
+                    failed_count=F('failed_count') - count,
+                )
+            delivered.delete()
+            for key, _, error in result.failures:
+                MailFailure.objects.filter(pk=key).update(
+                    attempts=F('attempts') + 1, error=error, updated_at=timezone.now()
+                )
+            sent += result.sent
+            failed += len(result.failures)
+        return DispatchResult(sent, failed)
+
+    def _batches(self, messages):
+        batch = []
+        for item in messages:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _send_batch(self, batch, rate_limiter):
+        """Send a batch over one connection, reopening it if a message breaks it."""
+        keys = [key for key, _ in batch]
+        connection = get_connection(self.backend, fail_silently=False, **self.backend_options)
+        sent = 0
+        failures = []
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"Could not open mail connection: {str(e)}")
+            return BatchResult(keys, 0, [(key, message, str(e)) for key, message in batch])
+
+        try:
+            for index, (key, message) in enumerate(batch):
+                rate_limiter.wait()
+                try:
+                    if connection.send_messages([message]):
+                        sent += 1
+                    else:
+                        failures.append((key, message, 'Message was not sent'))
+                except Exception as e:
+                    logger.warning(f"Failed to send mail to {', '.join(message.to)}: {str(e)}")
+                    failures.append((key, message, str(e)))
+                    connection.close()
+                    try:
+                        connection.open()
+                    except Exception as reopen_error:
+                        error = f"Could not reopen mail connection: {str(reopen_error)}"
+                        failures.extend((k, m, error) for k, m in batch[index + 1:])
+                        break
+        finally:
+            connection.close()
+        return BatchResult(keys, sent, failures)
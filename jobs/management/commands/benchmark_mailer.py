@@ -0,0 +1,81 @@
+import time
+
+from django.core import mail
+from django.core.management.base import BaseCommand
+
+from jobs.mailer import MailDispatcher, build_message
+
+LOCMEM_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+SMTP_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+
+class Command(BaseCommand):
+    help = 'Measures bulk mail throughput, batched over shared connections and one connection per message'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--messages',
+            type=int,
+            default=1000,
+            help='Number of messages to send with each method'
+        )
+        parser.add_argument(
+            '--smtp',
+            help='host:port of a local SMTP server to send to, e.g. one started with '
+                 '"python -m aiosmtpd -n -l localhost:8025". Defaults to the in-memory backend.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Messages per connection (defaults to MAIL_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Concurrent batches (defaults to MAIL_MAX_WORKERS)'
+        )
+
+    def handle(self, *args, **options):
+        if options['smtp']:
+            host, _, port = options['smtp'].partition(':')
+            backend = SMTP_BACKEND
+            backend_options = {
+                'host': host, 'port': int(port or 25), 'username': '', 'password': '',
+                'use_tls': False, 'use_ssl': False,
+            }
+        else:
+            backend = LOCMEM_BACKEND
+            backend_options = {}
+            mail.outbox = []
+
+        count = options['messages']
+        body = 'Benchmark message body.\n' * 20
+
+        def messages():
+            for i in range(count):
+                yield i, build_message(f'subscriber{i}@example.com', 'Benchmark', body, f'<p>{body}</p>',
+                                       from_email='benchmark@example.com')
+
+        start = time.perf_counter()
+        for _, message in messages():
+            message.connection = mail.get_connection(backend, **backend_options)
+            message.send()
+        single = time.perf_counter() - start
+
+        dispatcher = MailDispatcher(
+            batch_size=options['batch_size'], max_workers=options['workers'], rate_limit=0,
+            backend=backend, **backend_options
+        )
+        start = time.perf_counter()
+        result = dispatcher.send(messages())
+        batched = time.perf_counter() - start
+
+        self.stdout.write(f'Backend: {backend}')
+        self.stdout.write(f'One connection per message: {count / single:.0f} messages/s')
+        self.stdout.write(
+            f'Batches of {dispatcher.batch_size} on {dispatcher.max_workers} workers: '
+            f'{count / batched:.0f} messages/s ({result.failed} failed)'
+        )
+        self.stdout.write(self.style.SUCCESS(f'Speedup: {single / batched:.1f}x'))
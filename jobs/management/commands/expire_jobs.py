@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from jobs.models import JobListing
+from jobs.company_stats import refresh_company_stats
 from django.utils.translation import gettext_lazy as _
 
 class Command(BaseCommand):
@@ -18,8 +19,13 @@ class Command(BaseCommand):
         count = expired_jobs.count()
         
         if count > 0:
+            company_ids = set(expired_jobs.values_list('company_id', flat=True))
+
             # Update status to expired
             expired_jobs.update(status='expired')
+
+            # update() skips the signals that maintain the company counters
+            refresh_company_stats(company_ids)
             self.stdout.write(self.style.SUCCESS(f'Successfully marked {count} jobs as expired'))
         else:
             self.stdout.write(self.style.SUCCESS('No jobs to expire'))
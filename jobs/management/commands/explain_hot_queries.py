@@ -0,0 +1,125 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from jobs.models import Company, JobApplication, JobCategory, JobListing, Notification
+from messaging.models import Conversation, Message
+from subscriptions.ai_models import JobMatchScore
+from subscriptions.analytics_models import EmployerAnalytics
+from subscriptions.models import UserSubscription
+
+# A table read row by row: "Seq Scan on t" (PostgreSQL) or "SCAN t" without
+# "USING [COVERING] INDEX" (SQLite)
+SEQUENTIAL_SCAN_PATTERNS = (
+    re.compile(r'Seq Scan on (\w+)'),
+    re.compile(r'\bSCAN (\w+)\b(?!\s+USING)'),
+)
+
+
+def sequential_scans(plan):
+    """Return the tables an EXPLAIN plan reads sequentially."""
+    tables = []
+    for pattern in SEQUENTIAL_SCAN_PATTERNS:
+        tables.extend(pattern.findall(plan))
+    return tables
+
+
+def hot_queries(user_id, company_id, category_id, conversation_id):
+    """The querysets behind the busiest pages, labelled by where they run."""
+    now = timezone.now()
+    published = JobListing.objects.filter(status='published')
+    return [
+        ('job_list', published.order_by('-created_at')[:10]),
+        ('job_list exclude_expired', published.filter(
+            Q(application_deadline__isnull=True) | Q(application_deadline__gt=now)
+        ).order_by('-created_at')[:10]),
+        ('category_detail', published.filter(category_id=category_id).order_by('-created_at')[:10]),
+        ('job_detail company_job_count', published.filter(company_id=company_id).order_by()),
+        ('home featured_jobs', published.filter(is_featured=True).order_by('-created_at')[:8]),
+        ('employer_dashboard jobs', JobListing.objects.filter(
+            company__in=Company.objects.filter(owner_id=user_id)
+        ).order_by('-created_at')),
+        ('notifications', Notification.objects.filter(user_id=user_id).order_by('-created_at')[:20]),
+        ('unread notification count', Notification.objects.filter(user_id=user_id, is_read=False).order_by()),
+        ('unread message count', Message.objects.filter(
+            conversation__participants=user_id, is_read=False
+        ).exclude(sender_id=user_id).order_by()),
+        ('conversation_detail messages', Message.objects.filter(conversation_id=conversation_id)),
+        ('subscription status', UserSubscription.objects.filter(
+            user_id=user_id, status='active', end_date__gte=now
+        ).order_by('-end_date')[:1]),
+        ('expire_jobs', published.filter(application_deadline__lt=now).order_by()),
+        ('send_expiration_warnings', published.filter(
+            application_deadline__gt=now, application_deadline__lte=now + timezone.timedelta(days=3)
+        ).order_by('pk')),
+        ('employer analytics jobs by status', JobListing.objects.filter(
+            company_id=company_id, status='published'
+        ).order_by()),
+        ('employer analytics applications by status', JobApplication.objects.filter(
+            job__company_id=company_id, status='pending'
+        ).order_by()),
+        ('job seeker analytics applications by status', JobApplication.objects.filter(
+            applicant_id=user_id, status='shortlisted'
+        ).order_by()),
+        ('job seeker analytics match bands', JobMatchScore.objects.filter(
+            user_id=user_id, overall_match__gte=80
+        ).order_by()),
+        ('employer analytics rolled up trend', EmployerAnalytics.objects.filter(
+            company_id=company_id, date__gte=now.date() - timezone.timedelta(days=365)
+        ).order_by()),
+        ('employer analytics trend since rollup', JobApplication.objects.filter(
+            job__company_id=company_id, applied_at__gte=now - timezone.timedelta(days=1)
+        ).order_by()),
+    ]
+
+
+class Command(BaseCommand):
+    help = ('Runs EXPLAIN on the queries behind the job list, job detail, notifications, inbox and '
+            'analytics pages, and flags the ones that scan a whole table')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-seqscan',
+            action='store_true',
+            help='PostgreSQL only: discourage sequential scans, to check that an index can be used '
+                 'on a small database where the planner would scan anyway'
+        )
+        parser.add_argument(
+            '--fail',
+            action='store_true',
+            help='Exit with an error if any query scans a table'
+        )
+
+    def handle(self, *args, **options):
+        # Any existing rows will do; the plan does not depend on the values
+        user_id = get_user_model().objects.values_list('pk', flat=True).first() or 0
+        company_id = Company.objects.values_list('pk', flat=True).first() or 0
+        category_id = JobCategory.objects.values_list('pk', flat=True).first() or 0
+        conversation_id = Conversation.objects.values_list('pk', flat=True).first() or 0
+
+        queries = hot_queries(user_id, company_id, category_id, conversation_id)
+        flagged = []
+        with transaction.atomic():
+            if options['no_seqscan'] and connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for label, queryset in queries:
+                plan = queryset.explain()
+                tables = sequential_scans(plan)
+                if tables:
+                    flagged.append(label)
+                    self.stdout.write(self.style.WARNING(f'{label}: sequential scan of {", ".join(tables)}'))
+                else:
+                    self.stdout.write(f'{label}: OK')
+                if tables or options['verbosity'] > 1:
+                    for line in plan.splitlines():
+                        self.stdout.write(f'    {line}')
+
+        if flagged and options['fail']:
+            raise CommandError(f'{len(flagged)} queries scan a table: {", ".join(flagged)}')
+        self.stdout.write(self.style.SUCCESS(f'Explained {len(queries)} queries, {len(flagged)} with sequential scans'))
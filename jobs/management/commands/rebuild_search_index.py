@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text index used by job keyword search'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if not backend.has_shadow_index:
+            self.stdout.write(f'{backend.__class__.__name__} searches the job table directly; nothing to rebuild')
+            return
+
+        with transaction.atomic():
+            count = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} job listings'))
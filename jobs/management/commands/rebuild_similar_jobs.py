@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from jobs.similar_jobs import rebuild_similar_jobs
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the similar jobs shown on job detail pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows to insert per batch'
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_similar_jobs(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Stored {count} similar job entries'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs import skill_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the skill index used by the job and candidate recommenders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--jobs-only',
+            action='store_true',
+            help='Only rebuild the job skill index'
+        )
+        parser.add_argument(
+            '--users-only',
+            action='store_true',
+            help='Only rebuild the user skill index'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of index rows to insert per batch'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if not options['users_only']:
+            with transaction.atomic():
+                count = skill_index.rebuild_job_index(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} job skills'))
+
+        if not options['jobs_only']:
+            with transaction.atomic():
+                count = skill_index.rebuild_user_index(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} user skills'))
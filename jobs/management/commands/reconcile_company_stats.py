@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from jobs.company_stats import reconcile_company_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the denormalized job, follower and connection counters for every company'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of companies to recount per batch'
+        )
+
+    def handle(self, *args, **options):
+        count = reconcile_company_stats(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Reconciled stats for {count} companies'))
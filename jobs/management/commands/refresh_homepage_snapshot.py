@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from jobs import site_cache
+from jobs.homepage import refresh_homepage_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the cached home page statistics snapshot'
+
+    def handle(self, *args, **options):
+        if site_cache.is_process_local():
+            # This process has its own cache, so the web workers would keep
+            # serving their copies; those expire after SITE_CACHE_LOCAL_TTL.
+            self.stdout.write(self.style.WARNING(
+                'The default cache is local to each process, so the web workers cannot see a snapshot '
+                'built here. Configure a shared cache (REDIS_URL) to refresh it from this command.'
+            ))
+            return
+        snapshot = refresh_homepage_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f"Home page snapshot refreshed: {snapshot['total_jobs']} jobs, "
+            f"{snapshot['total_companies']} companies, {snapshot['total_categories']} categories"
+        ))
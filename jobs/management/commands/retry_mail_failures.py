@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from jobs.mailer import MailDispatcher
+from jobs.models import MailFailure
+
+
+class Command(BaseCommand):
+    help = 'Sends again the messages that bulk mailings failed to deliver'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--campaign',
+            type=int,
+            default=None,
+            help='Only retry failures from this mail campaign'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='Skip messages that have already failed this many times'
+        )
+
+    def handle(self, *args, **options):
+        failures = MailFailure.objects.filter(attempts__lt=options['max_attempts'])
+        if options['campaign']:
+            failures = failures.filter(campaign_id=options['campaign'])
+
+        result = MailDispatcher().retry_failures(failures)
+        self.stdout.write(self.style.SUCCESS(f'Sent {result.sent} messages ({result.failed} failed again)'))
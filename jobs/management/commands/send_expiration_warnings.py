@@ -1,9 +1,9 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.template.loader import get_template
 from django.conf import settings
-from jobs.models import JobListing
+from jobs.mailer import MailDispatcher, build_message
+from jobs.models import JobListing, MailCampaign
 from django.utils.translation import gettext_lazy as _
 import datetime
 
@@ -17,6 +17,18 @@ class Command(BaseCommand):
             default=3,
             help='Number of days before expiration to send warning'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Messages sent per SMTP connection (defaults to MAIL_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Batches sent concurrently (defaults to MAIL_MAX_WORKERS)'
+        )
 
     def handle(self, *args, **options):
         days_before = options['days']
@@ -31,43 +43,46 @@ class Command(BaseCommand):
             status='published',
             application_deadline__gt=now,
             application_deadline__lte=warning_date
-        )
-        
-        count = 0
-        for job in expiring_jobs:
-            # Send email to the employer
-            if job.company.email:
-                days_left = (job.application_deadline - now).days
-                hours_left = int(((job.application_deadline - now).seconds) / 3600)
-                
+        ).filter(posted_by__isnull=False).exclude(posted_by__email='').select_related('company', 'posted_by').order_by('pk')
+
+        # Load the templates once; only the context changes per job
+        html_template = get_template('emails/job_expiration_warning.html')
+        plain_template = get_template('emails/job_expiration_warning_plain.html')
+
+        def messages():
+            for job in expiring_jobs.iterator():
+                time_left = job.application_deadline - now
+
                 # Prepare the context for the email template
                 context = {
                     'job': job,
-                    'days_left': days_left,
-                    'hours_left': hours_left,
+                    'days_left': time_left.days,
+                    'hours_left': int(time_left.seconds / 3600),
                     'expiration_date': job.application_deadline,
                     'dashboard_url': f"{settings.SITE_URL}/employer/dashboard/",
                     'job_url': f"{settings.SITE_URL}/jobs/{job.slug}/",
                 }
-                
-                # Render the email content from template
-                subject = _('Job Listing Expiration Warning: {0}').format(job.title)
-                html_message = render_to_string('emails/job_expiration_warning.html', context)
-                plain_message = render_to_string('emails/job_expiration_warning_plain.html', context)
-                
-                # Send the email
-                try:
-                    send_mail(
-                        subject=subject,
-                        message=plain_message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[job.company.email],
-                        html_message=html_message,
-                        fail_silently=False,
-                    )
-                    count += 1
-                    self.stdout.write(self.style.SUCCESS(f'Sent expiration warning for job: {job.title}'))
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f'Failed to send email for job {job.id}: {str(e)}'))
-        
-        self.stdout.write(self.style.SUCCESS(f'Successfully sent {count} expiration warning emails'))
+
+                # Warnings go to the employer who posted the job
+                subject = str(_('Job Listing Expiration Warning: {0}').format(job.title))
+                yield job.pk, build_message(
+                    job.posted_by.email, subject, plain_template.render(context), html_template.render(context)
+                )
+
+        if not expiring_jobs.exists():
+            self.stdout.write(self.style.SUCCESS('Successfully sent 0 expiration warning emails'))
+            return
+
+        campaign = MailCampaign.objects.create(
+            kind='expiration_warning',
+            subject=str(_('Job Listing Expiration Warning')),
+            parameters={'days': days_before},
+        )
+        dispatcher = MailDispatcher(batch_size=options['batch_size'], max_workers=options['workers'])
+        result = dispatcher.send(messages(), campaign=campaign)
+
+        if result.failed:
+            self.stdout.write(self.style.ERROR(
+                f'Failed to send {result.failed} expiration warnings; they were saved on campaign {campaign.pk}'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'Successfully sent {result.sent} expiration warning emails'))
@@ -1,11 +1,10 @@
-from django.core.management.base import BaseCommand
-from django.core.mail import send_mail, EmailMultiAlternatives
+from django.core.management.base import BaseCommand, CommandError
 from django.template.loader import render_to_string
-from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 from django.utils import timezone
 
-from jobs.models import Newsletter, JobListing
+from jobs.mailer import MailDispatcher, build_message
+from jobs.models import MailCampaign, Newsletter, JobListing
 import datetime
 
 class Command(BaseCommand):
@@ -42,71 +41,123 @@ class Command(BaseCommand):
             help='Send a test email to this address instead of all subscribers',
             default=None
         )
+        parser.add_argument(
+            '--resume',
+            type=int,
+            help='Continue an interrupted newsletter campaign with this ID',
+            default=None
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Messages sent per SMTP connection (defaults to MAIL_BATCH_SIZE)',
+            default=None
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Batches sent concurrently (defaults to MAIL_MAX_WORKERS)',
+            default=None
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            help='Maximum messages per second, 0 for no limit (defaults to MAIL_RATE_LIMIT)',
+            default=None
+        )
 
     def handle(self, *args, **options):
-        subject = options['subject']
-        custom_message = options['message']
-        days = options['days']
-        limit = options['limit']
-        test_email = options['test_email']
-        
-        # Get active subscribers
-        if test_email:
-            recipients = [test_email]
-            self.stdout.write(self.style.WARNING(f'Sending test email to {test_email}'))
+        dispatcher = MailDispatcher(
+            batch_size=options['batch_size'],
+            max_workers=options['workers'],
+            rate_limit=options['rate'],
+        )
+
+        if options['resume']:
+            try:
+                campaign = MailCampaign.objects.get(pk=options['resume'], kind='newsletter')
+            except MailCampaign.DoesNotExist:
+                raise CommandError(f"Newsletter campaign {options['resume']} does not exist")
+            if campaign.status == 'completed':
+                self.stdout.write(self.style.WARNING(f'Campaign {campaign.pk} has already completed'))
+                return
+            subject = campaign.subject
+            custom_message = campaign.parameters.get('message', '')
+            job_ids = campaign.parameters.get('job_ids', [])
+            self.stdout.write(self.style.WARNING(
+                f'Resuming campaign {campaign.pk} after subscriber {campaign.checkpoint}'
+            ))
         else:
-            subscribers = Newsletter.objects.filter(is_active=True)
-            recipients = [subscriber.email for subscriber in subscribers]
-            self.stdout.write(self.style.SUCCESS(f'Found {len(recipients)} active subscribers'))
-        
-        if not recipients:
-            self.stdout.write(self.style.ERROR('No recipients found. Aborting.'))
-            return
-        
-        # Get recent jobs
-        cutoff_date = timezone.now() - datetime.timedelta(days=days)
-        recent_jobs = JobListing.objects.filter(
-            created_at__gte=cutoff_date,
-            status='published',
-            application_deadline__gt=timezone.now()
-        ).order_by('-is_featured', '-created_at')[:limit]
-        
-        self.stdout.write(self.style.SUCCESS(f'Found {recent_jobs.count()} recent jobs to include'))
-        
-        if not recent_jobs:
+            campaign = None
+            subject = options['subject']
+            custom_message = options['message']
+
+            # Get recent jobs
+            cutoff_date = timezone.now() - datetime.timedelta(days=options['days'])
+            job_ids = list(JobListing.objects.filter(
+                created_at__gte=cutoff_date,
+                status='published',
+                application_deadline__gt=timezone.now()
+            ).order_by('-is_featured', '-created_at').values_list('pk', flat=True)[:options['limit']])
+
+        self.stdout.write(self.style.SUCCESS(f'Found {len(job_ids)} recent jobs to include'))
+
+        if not job_ids:
             self.stdout.write(self.style.ERROR('No recent jobs found. Aborting.'))
             return
-        
+
+        # Keep the order chosen when the campaign started
+        jobs_by_id = JobListing.objects.select_related('company').in_bulk(job_ids)
+        recent_jobs = [jobs_by_id[pk] for pk in job_ids if pk in jobs_by_id]
+
         # Prepare email context
         context = {
             'jobs': recent_jobs,
             'custom_message': custom_message,
             'date': timezone.now(),
+            'subject': subject,
+            'site_url': settings.SITE_URL,
             'unsubscribe_url': f"{settings.SITE_URL}/unsubscribe/",
         }
-        
-        # Render email templates
+
+        # Render email templates once for all subscribers
         html_message = render_to_string('emails/newsletter.html', context)
         plain_message = render_to_string('emails/newsletter_plain.html', context)
-        
-        # Send emails
-        sent_count = 0
-        failed_count = 0
-        
-        for email in recipients:
-            try:
-                msg = EmailMultiAlternatives(
-                    subject=subject,
-                    body=plain_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=[email]
-                )
-                msg.attach_alternative(html_message, "text/html")
-                msg.send()
-                sent_count += 1
-                self.stdout.write(f'Sent newsletter to {email}')
-            except Exception as e:
-                failed_count += 1
-                self.stdout.write(self.style.ERROR(f'Failed to send to {email}: {str(e)}'))
-        
-        self.stdout.write(self.style.SUCCESS(f'Newsletter sent to {sent_count} subscribers ({failed_count} failed)'))
+
+        if options['test_email']:
+            test_email = options['test_email']
+            self.stdout.write(self.style.WARNING(f'Sending test email to {test_email}'))
+            result = dispatcher.send([(0, build_message(test_email, subject, plain_message, html_message))])
+            self.stdout.write(self.style.SUCCESS(f'Newsletter sent to {result.sent} subscribers ({result.failed} failed)'))
+            return
+
+        # Get active subscribers
+        subscribers = Newsletter.objects.filter(is_active=True)
+        if campaign is not None:
+            subscribers = subscribers.filter(pk__gt=campaign.checkpoint)
+        subscriber_count = subscribers.count()
+        self.stdout.write(self.style.SUCCESS(f'Found {subscriber_count} active subscribers'))
+
+        if not subscriber_count:
+            self.stdout.write(self.style.ERROR('No recipients found. Aborting.'))
+            return
+
+        if campaign is None:
+            campaign = MailCampaign.objects.create(
+                kind='newsletter',
+                subject=subject,
+                parameters={'message': custom_message, 'job_ids': job_ids},
+            )
+
+        messages = (
+            (pk, build_message(email, subject, plain_message, html_message))
+            for pk, email in subscribers.order_by('pk').values_list('pk', 'email').iterator()
+        )
+        result = dispatcher.send(messages, campaign=campaign)
+
+        self.stdout.write(self.style.SUCCESS(f'Newsletter sent to {result.sent} subscribers ({result.failed} failed)'))
+        if result.failed:
+            self.stdout.write(self.style.WARNING(
+                f'Failed messages were saved on campaign {campaign.pk}; '
+                f'run "manage.py retry_mail_failures --campaign {campaign.pk}" to send them again'
+            ))
@@ -0,0 +1,106 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Code run in a fresh interpreter to reproduce what a web worker imports
+# before it can serve its first request.
+STARTUP_SCRIPT = """
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+from django.template import engines
+for engine in engines.all():
+    getattr(engine, 'engine', engine).template_libraries
+"""
+
+
+class Command(BaseCommand):
+    help = 'Reports the import time of each module loaded during a cold process start'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Number of modules to show, slowest first'
+        )
+        parser.add_argument(
+            '--min-ms',
+            type=float,
+            default=0.0,
+            help='Only show modules whose cumulative import time is at least this many milliseconds'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Include third-party and standard library modules, not just project modules'
+        )
+
+    def handle(self, *args, **options):
+        env = os.environ.copy()
+        env.setdefault('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)
+
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if result.returncode != 0:
+            raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+
+        timings = self._parse_importtime(result.stderr)
+        if not timings:
+            raise CommandError('No import timings were reported.')
+
+        total_self_ms = sum(self_ms for _, self_ms, _ in timings)
+
+        if not options['all']:
+            project_packages = self._project_packages()
+            timings = [t for t in timings if t[0].split('.')[0] in project_packages]
+
+        timings = [t for t in timings if t[2] >= options['min_ms']]
+        timings.sort(key=lambda t: t[2], reverse=True)
+
+        self.stdout.write(f"{'cumulative ms':>14} {'self ms':>10}  module")
+        for module, self_ms, cumulative_ms in timings[:options['limit']]:
+            self.stdout.write(f'{cumulative_ms:>14.1f} {self_ms:>10.1f}  {module}')
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'Total import time: {total_self_ms:.1f} ms (process start: {elapsed_ms:.1f} ms)'
+        ))
+
+    def _parse_importtime(self, output):
+        """Parse ``-X importtime`` output into (module, self_ms, cumulative_ms) tuples."""
+        timings = []
+        for line in output.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            try:
+                self_us, cumulative_us, module = line[len('import time:'):].split('|')
+                timings.append((module.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+            except ValueError:
+                # Header line ("self [us] | cumulative | imported package")
+                continue
+        return timings
+
+    def _project_packages(self):
+        """Top-level package names of the apps that live in this project."""
+        base_dir = Path(settings.BASE_DIR).resolve()
+        packages = {settings.SETTINGS_MODULE.split('.')[0]}
+        for app_config in apps.get_app_configs():
+            if base_dir in Path(app_config.path).resolve().parents:
+                packages.add(app_config.name.split('.')[0])
+        return packages
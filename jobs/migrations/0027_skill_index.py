@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-16 20:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0026_merge_20250505_0054'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(db_index=True, max_length=255)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indexed_skills', to='jobs.joblisting')),
+            ],
+            options={
+                'verbose_name': 'Job Skill',
+                'verbose_name_plural': 'Job Skills',
+                'unique_together': {('skill', 'job')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UserSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(db_index=True, max_length=255)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indexed_skills', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Skill',
+                'verbose_name_plural': 'User Skills',
+                'unique_together': {('skill', 'user')},
+            },
+        ),
+    ]
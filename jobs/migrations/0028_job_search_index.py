@@ -0,0 +1,59 @@
+from django.db import migrations
+
+FTS_TABLE = 'jobs_joblisting_fts'
+GIN_INDEX_NAME = 'jobs_joblisting_search_gin'
+
+
+def _search_vector():
+    # Must match jobs.search.job_search_vector() for the index to be used.
+    from django.contrib.postgres.search import SearchVector
+    return (
+        SearchVector('title', weight='A', config='english') +
+        SearchVector('skills_required', weight='B', config='english') +
+        SearchVector('description', weight='C', config='english')
+    )
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        JobListing = apps.get_model('jobs', 'JobListing')
+        schema_editor.add_index(JobListing, GinIndex(_search_vector(), name=GIN_INDEX_NAME))
+
+    elif connection.vendor == 'sqlite':
+        from django.db import OperationalError
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                f"title, company, skills, description, tokenize='porter unicode61')"
+            )
+        except OperationalError:
+            # SQLite built without FTS5; job search falls back to icontains.
+            return
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, company, skills, description) "
+            f"SELECT j.id, j.title, COALESCE(c.name, ''), j.skills_required, j.description "
+            f"FROM jobs_joblisting j LEFT JOIN jobs_company c ON c.id = j.company_id"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {GIN_INDEX_NAME}')
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0027_skill_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-16 20:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0028_job_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='Cosine similarity of the two listings')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_entries', to='jobs.joblisting')),
+                ('similar_job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.joblisting')),
+            ],
+            options={
+                'verbose_name': 'Similar Job',
+                'verbose_name_plural': 'Similar Jobs',
+                'ordering': ['job', '-score'],
+                'unique_together': {('job', 'similar_job')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-16 22:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0029_similar_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyStats',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='jobs.company')),
+                ('job_count', models.PositiveIntegerField(default=0, help_text='Published job listings')),
+                ('active_job_count', models.PositiveIntegerField(default=0, help_text='Published listings whose deadline has not passed')),
+                ('follower_count', models.PositiveIntegerField(default=0)),
+                ('connection_count', models.PositiveIntegerField(default=0, help_text='Approved connections')),
+                ('next_deadline', models.DateTimeField(blank=True, help_text='Earliest upcoming deadline among active listings', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Company Stats',
+                'verbose_name_plural': 'Company Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-16 22:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0030_company_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MailCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text='e.g. newsletter, expiration_warning', max_length=50)),
+                ('subject', models.CharField(max_length=255)),
+                ('parameters', models.JSONField(blank=True, default=dict, help_text='Options needed to resume the mailing')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed')], default='running', max_length=20)),
+                ('checkpoint', models.PositiveBigIntegerField(default=0, help_text='Recipients up to this key have been processed')),
+                ('sent_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Mail Campaign',
+                'verbose_name_plural': 'Mail Campaigns',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MailFailure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient', models.EmailField(max_length=254)),
+                ('subject', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('html_body', models.TextField(blank=True)),
+                ('error', models.TextField()),
+                ('attempts', models.PositiveSmallIntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='failures', to='jobs.mailcampaign')),
+            ],
+            options={
+                'verbose_name': 'Mail Failure',
+                'verbose_name_plural': 'Mail Failures',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
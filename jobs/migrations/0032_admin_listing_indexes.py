@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-16 22:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0031_mail_campaigns'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['status', 'applied_at'], name='jobs_app_status_applied'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['status', 'created_at'], name='jobs_listing_status_created'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['notification_type', 'is_read', 'created_at'], name='jobs_notif_type_read_created'),
+        ),
+    ]
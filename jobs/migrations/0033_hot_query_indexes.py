@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-16 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0032_admin_listing_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['status', 'is_featured', 'created_at'], name='jobs_listing_status_featured'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['company', 'status'], name='jobs_listing_company_status'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['category', 'status', 'created_at'], name='jobs_listing_category_status'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['application_deadline'], name='jobs_listing_open_deadline'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'created_at'], name='jobs_notif_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user'], name='jobs_notif_user_unread'),
+        ),
+    ]
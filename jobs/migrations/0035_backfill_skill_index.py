@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-17 09:12
+
+from django.conf import settings
+from django.db import migrations
+
+BATCH_SIZE = 1000
+MAX_SKILL_LENGTH = 255
+
+
+def parse_skills(value):
+    # Frozen copy of jobs.skill_index.parse_skills as of this migration
+    skills = []
+    seen = set()
+    for skill in (value or '').split(','):
+        skill = ' '.join(skill.lower().split())[:MAX_SKILL_LENGTH]
+        if skill and skill not in seen:
+            seen.add(skill)
+            skills.append(skill)
+    return skills
+
+
+def _backfill(model, owner_field, source, skills_field):
+    batch = []
+    for owner_id, value in source.values_list('pk', skills_field).iterator(chunk_size=BATCH_SIZE):
+        batch.extend(model(skill=skill, **{owner_field: owner_id}) for skill in parse_skills(value))
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    model.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def index_skills(apps, schema_editor):
+    JobListing = apps.get_model('jobs', 'JobListing')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    UserSkill = apps.get_model('jobs', 'UserSkill')
+    _backfill(JobSkill, 'job_id', JobListing.objects.exclude(skills_required=''), 'skills_required')
+    _backfill(UserSkill, 'user_id', User.objects.exclude(skills__isnull=True).exclude(skills=''), 'skills')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0034_application_applied_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(index_skills, migrations.RunPython.noop),
+    ]
@@ -85,10 +85,31 @@ class JobListing(models.Model):
         verbose_name = _('Job Listing')
         verbose_name_plural = _('Job Listings')
         ordering = ['-created_at']
+        indexes = [
+            # Custom admin job list, filtered by status, newest first
+            models.Index(fields=['status', 'created_at'], name='jobs_listing_status_created'),
+            # Featured jobs on the home page, newest first
+            models.Index(fields=['status', 'is_featured', 'created_at'], name='jobs_listing_status_featured'),
+            # A company's jobs by status: job detail, employer dashboard and analytics
+            models.Index(fields=['company', 'status'], name='jobs_listing_company_status'),
+            # Public category pages, newest first
+            models.Index(fields=['category', 'status', 'created_at'], name='jobs_listing_category_status'),
+            # Deadlines of published jobs only, for expire_jobs, send_expiration_warnings
+            # and the job list's "exclude expired" filter
+            models.Index(fields=['application_deadline'], condition=models.Q(status='published'),
+                         name='jobs_listing_open_deadline'),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored company, so jobs.signals can recount it when the listing moves
+        instance._loaded_company_id = instance.__dict__.get('company_id')
+        return instance
+
     def get_absolute_url(self):
         return reverse('jobs:job_detail', kwargs={'slug': self.slug})
 
@@ -149,6 +170,12 @@ class JobApplication(models.Model):
         ordering = ['-applied_at']
         # Ensure a user can only apply once to a job
         unique_together = ('job', 'applicant')
+        indexes = [
+            # Custom admin application list, filtered by status, newest first
+            models.Index(fields=['status', 'applied_at'], name='jobs_app_status_applied'),
+            # Analytics trends and rollups, which read applications by day
+            models.Index(fields=['applied_at'], name='jobs_app_applied'),
+        ]
 
     def __str__(self):
         return f"{self.applicant.email} - {self.job.title}"
@@ -191,6 +218,14 @@ class Notification(models.Model):
         verbose_name = _('Notification')
         verbose_name_plural = _('Notifications')
         ordering = ['-created_at']
+        indexes = [
+            # Custom admin notification list, filtered by type and read status
+            models.Index(fields=['notification_type', 'is_read', 'created_at'], name='jobs_notif_type_read_created'),
+            # A user's notifications, newest first
+            models.Index(fields=['user', 'created_at'], name='jobs_notif_user_created'),
+            # A user's unread notifications only, for the unread count and mark-all-read
+            models.Index(fields=['user'], condition=models.Q(is_read=False), name='jobs_notif_user_unread'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.title}"
@@ -396,17 +431,16 @@ class Company(models.Model):
 
     @property
     def job_count(self):
-        return self.jobs.filter(status='published').count()
+        return self.get_stats().job_count
 
     @property
     def active_job_count(self):
-        from django.utils import timezone
-        from django.db.models import Q
-        return self.jobs.filter(
-            status='published'
-        ).filter(
-            Q(application_deadline__gt=timezone.now()) | Q(application_deadline__isnull=True)
-        ).count()
+        return self.get_stats().active_job_count
+
+    def get_stats(self):
+        """Return this company's CompanyStats, computing them if missing or stale."""
+        from .company_stats import get_company_stats
+        return get_company_stats(self)
 
     def is_connected_with_user(self, user):
         """Check if a user is connected with this company."""
@@ -433,12 +467,12 @@ class Company(models.Model):
     @property
     def follower_count(self):
         """Get the number of followers for this company."""
-        return self.followers.count()
+        return self.get_stats().follower_count
 
     @property
     def connection_count(self):
         """Get the number of approved connections for this company."""
-        return self.connections.filter(status='approved').count()
+        return self.get_stats().connection_count
 
 class JobPackage(models.Model):
     """Model for job posting packages."""
@@ -561,7 +595,11 @@ class JobAnalytics(models.Model):
         # Update save count
         self.save_count = self.job.saved_by.count()
 
-        self.save()
+        # Leave the view counters alone; they are written by jobs.view_tracker.
+        self.save(update_fields=[
+            'total_applications', 'application_rate', 'shortlisted_count', 'interview_count',
+            'hired_count', 'applicant_locations', 'save_count'
+        ])
 
 
 class CompanyConnection(models.Model):
@@ -714,8 +752,134 @@ class HeroSection(models.Model):
 
     @classmethod
     def get_section(cls, section_type):
-        """Get the hero section for a specific page type or create a default one if none exists."""
-        section = cls.objects.filter(section_type=section_type, is_active=True).first()
-        if not section:
-            section = cls.objects.create(section_type=section_type, is_active=True)
-        return section
+        """
+        Get the hero section for a specific page type.
+
+        Falls back to an unsaved section with the default texts if none is
+        active, so page views never write; the admin creates the real rows.
+        """
+        from .site_cache import get_or_load, hero_section_key
+
+        def load():
+            section = cls.objects.filter(section_type=section_type, is_active=True).first()
+            return section or cls(section_type=section_type, is_active=True)
+
+        return get_or_load(hero_section_key(section_type), load)
+
+
+class JobSkill(models.Model):
+    """Inverted index entry mapping a normalized skill to a job listing."""
+    skill = models.CharField(max_length=255, db_index=True)
+    job = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name='indexed_skills')
+
+    class Meta:
+        verbose_name = _('Job Skill')
+        verbose_name_plural = _('Job Skills')
+        unique_together = ('skill', 'job')
+
+    def __str__(self):
+        return f"{self.skill} - {self.job_id}"
+
+
+class UserSkill(models.Model):
+    """Inverted index entry mapping a normalized skill to a user profile."""
+    skill = models.CharField(max_length=255, db_index=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='indexed_skills')
+
+    class Meta:
+        verbose_name = _('User Skill')
+        verbose_name_plural = _('User Skills')
+        unique_together = ('skill', 'user')
+
+    def __str__(self):
+        return f"{self.skill} - {self.user_id}"
+
+
+class SimilarJob(models.Model):
+    """Precomputed top-N similar listings for a job, rebuilt by jobs.similar_jobs."""
+    job = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name='similar_entries')
+    similar_job = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(help_text=_('Cosine similarity of the two listings'))
+
+    class Meta:
+        verbose_name = _('Similar Job')
+        verbose_name_plural = _('Similar Jobs')
+        unique_together = ('job', 'similar_job')
+        ordering = ['job', '-score']
+
+    def __str__(self):
+        return f"{self.job_id} -> {self.similar_job_id} ({self.score:.2f})"
+
+
+class CompanyStats(models.Model):
+    """Denormalized counters for a company, maintained by jobs.company_stats."""
+    company = models.OneToOneField(Company, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    job_count = models.PositiveIntegerField(default=0, help_text=_('Published job listings'))
+    active_job_count = models.PositiveIntegerField(default=0,
+                                                   help_text=_('Published listings whose deadline has not passed'))
+    follower_count = models.PositiveIntegerField(default=0)
+    connection_count = models.PositiveIntegerField(default=0, help_text=_('Approved connections'))
+    next_deadline = models.DateTimeField(null=True, blank=True,
+                                         help_text=_('Earliest upcoming deadline among active listings'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Company Stats')
+        verbose_name_plural = _('Company Stats')
+
+    def __str__(self):
+        return f"Stats for company {self.company_id}"
+
+    @property
+    def is_stale(self):
+        """Whether an active listing's deadline has passed since the counters were computed."""
+        return self.next_deadline is not None and self.next_deadline <= timezone.now()
+
+
+class MailCampaign(models.Model):
+    """A bulk mailing sent by jobs.mailer, tracked so it can be resumed."""
+    STATUS_CHOICES = (
+        ('running', _('Running')),
+        ('completed', _('Completed')),
+    )
+
+    kind = models.CharField(max_length=50, help_text=_('e.g. newsletter, expiration_warning'))
+    subject = models.CharField(max_length=255)
+    parameters = models.JSONField(default=dict, blank=True, help_text=_('Options needed to resume the mailing'))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    checkpoint = models.PositiveBigIntegerField(default=0,
+                                                help_text=_('Recipients up to this key have been processed'))
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Mail Campaign')
+        verbose_name_plural = _('Mail Campaigns')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.kind}: {self.subject}"
+
+
+class MailFailure(models.Model):
+    """A message from a mail campaign that could not be delivered, kept for retry."""
+    campaign = models.ForeignKey(MailCampaign, on_delete=models.CASCADE, related_name='failures')
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    error = models.TextField()
+    attempts = models.PositiveSmallIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Mail Failure')
+        verbose_name_plural = _('Mail Failures')
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"{self.recipient} ({self.campaign_id})"
@@ -1,6 +1,9 @@
+import heapq
+
 from django.db.models import Q, Count
 from django.utils import timezone
 from .models import JobListing, SavedJob, JobApplication
+from .skill_index import parse_skills, annotate_skill_matches
 
 def get_recommended_jobs(user, limit=10):
     """
@@ -41,35 +44,42 @@ def get_recommended_jobs(user, limit=10):
     ).values_list('job_id', flat=True)
 
     # Get user's skills from profile
-    user_skills = []
-    if user.skills:
-        user_skills = [skill.strip().lower() for skill in user.skills.split(',')]
+    user_skills = parse_skills(user.skills)
 
     # If user has skills, prioritize jobs matching those skills
     if user_skills:
+        # Only jobs sharing at least one skill are considered, via the skill index
+        candidates = annotate_skill_matches(recommended_jobs, user_skills).values_list(
+            'id', 'matched_skill_count', 'indexed_skill_count'
+        )
+
+        # Keep the top matches by match percentage (descending)
+        top_matches = heapq.nlargest(
+            limit,
+            (
+                (int((matched / total) * 100), job_id)
+                for job_id, matched, total in candidates
+            ),
+            key=lambda x: x[0]
+        )
+
+        jobs_by_id = JobListing.objects.in_bulk([job_id for _, job_id in top_matches])
+        user_skill_set = set(user_skills)
+
         skill_matches = []
-        for job in recommended_jobs:
-            if not job.skills_required:
-                continue
-
-            job_skills = [skill.strip().lower() for skill in job.skills_required.split(',')]
-            matching_skills = set(user_skills).intersection(set(job_skills))
-
-            # Calculate match percentage
-            if matching_skills:
-                skills_match = int((len(matching_skills) / len(job_skills)) * 100)
-                skill_matches.append({
-                    'job': job,
-                    'skills_match': skills_match,
-                    'overall_match': skills_match,
-                    'matching_skills': list(matching_skills)
-                })
-
-        # Sort by match percentage (descending)
-        skill_matches.sort(key=lambda x: x['overall_match'], reverse=True)
+        for skills_match, job_id in top_matches:
+            job = jobs_by_id[job_id]
+            skill_matches.append({
+                'job': job,
+                'skills_match': skills_match,
+                'overall_match': skills_match,
+                'matching_skills': [
+                    skill for skill in parse_skills(job.skills_required) if skill in user_skill_set
+                ]
+            })
 
         # Return top matches
-        return skill_matches[:limit]
+        return skill_matches
 
     # If no skill matches or no skills in profile, try to use saved job categories
     if saved_job_ids:
@@ -110,79 +120,33 @@ def get_similar_jobs(job, limit=4):
     """
     Get jobs similar to the given job based on category, skills, and job type.
 
+    Reads the precomputed similar-jobs table and tops the result up with
+    recent jobs from the same category, then the same job type, if the table
+    has too few open listings for this job.
+
     Args:
         job: The job to find similar jobs for
         limit: Maximum number of similar jobs to return
 
     Returns:
-        QuerySet of similar JobListing objects
+        List of similar JobListing objects
     """
-    # Start with all published jobs except the current one
-    similar_jobs = JobListing.objects.filter(
-        status='published'
-    ).exclude(
-        id=job.id
-    ).exclude(
-        # Exclude jobs that have expired
-        Q(application_deadline__lt=timezone.now()) & ~Q(application_deadline=None)
-    )
-
-    # Get job skills
-    job_skills = [skill.strip().lower() for skill in job.skills_required.split(',')]
-
-    # Calculate skill similarity for each job
-    skill_matches = []
-    for similar_job in similar_jobs:
-        similar_job_skills = [skill.strip().lower() for skill in similar_job.skills_required.split(',')]
-        matching_skills = set(job_skills).intersection(set(similar_job_skills))
-        skill_matches.append((similar_job.id, len(matching_skills)))
-
-    # Sort by number of matching skills (descending)
-    skill_matches.sort(key=lambda x: x[1], reverse=True)
-    skill_match_ids = [job_id for job_id, _ in skill_matches if _ > 0]
-
-    # If we have skill matches, prioritize those
-    if skill_match_ids:
-        from django.db.models import Case, When, Value, IntegerField
-
-        # Create ordering based on skill matches
-        preserved_order = Case(
-            *[When(id=pk, then=Value(i)) for i, pk in enumerate(skill_match_ids)],
-            default=Value(len(skill_match_ids)),
-            output_field=IntegerField()
-        )
-
-        # Apply ordering
-        skill_matched_jobs = similar_jobs.filter(id__in=skill_match_ids).order_by(preserved_order)
-
-        # If we have enough skill matches, return those
-        if skill_matched_jobs.count() >= limit:
-            return skill_matched_jobs[:limit]
-
-        # Otherwise, get remaining jobs from same category
-        remaining = limit - skill_matched_jobs.count()
-        category_matches = similar_jobs.filter(
-            category=job.category
-        ).exclude(
-            id__in=skill_matched_jobs.values_list('id', flat=True)
-        ).order_by('-created_at')[:remaining]
-
-        # Combine the two querysets
-        return list(skill_matched_jobs) + list(category_matches)
-
-    # If no skill matches, prioritize jobs in the same category
-    category_matches = similar_jobs.filter(category=job.category).order_by('-created_at')
-
-    if category_matches.count() >= limit:
-        return category_matches[:limit]
-
-    # If we don't have enough category matches, add jobs of the same type
-    remaining = limit - category_matches.count()
-    type_matches = similar_jobs.filter(
-        job_type=job.job_type
-    ).exclude(
-        id__in=category_matches.values_list('id', flat=True)
-    ).order_by('-created_at')[:remaining]
-
-    # Combine the two querysets
-    return list(category_matches) + list(type_matches)
+    from django.db.models import Case, When, Value, IntegerField
+    from .similar_jobs import get_similar_job_ids, open_jobs
+
+    # Entries may point at jobs closed since the table was built
+    similar_ids = get_similar_job_ids(job)
+    jobs_by_id = open_jobs().filter(id__in=similar_ids).select_related('company').in_bulk()
+    similar_jobs = [jobs_by_id[pk] for pk in similar_ids if pk in jobs_by_id][:limit]
+
+    if len(similar_jobs) < limit:
+        fallback = open_jobs().exclude(
+            id__in=[job.id] + [similar_job.id for similar_job in similar_jobs]
+        ).filter(
+            Q(category_id=job.category_id) | Q(job_type=job.job_type)
+        ).annotate(
+            same_category=Case(When(category_id=job.category_id, then=Value(0)), default=Value(1), output_field=IntegerField())
+        ).select_related('company').order_by('same_category', '-created_at')
+        similar_jobs += list(fallback[:limit - len(similar_jobs)])
+
+    return similar_jobs
@@ -0,0 +1,210 @@
+"""
+Full-text search backends for job listing keyword queries.
+
+``get_search_backend()`` picks a backend for the default database:
+
+* PostgreSQL: ``SearchVector``/``SearchRank`` over a weighted vector that is
+  backed by the GIN expression index created in migration 0028.
+* SQLite: an FTS5 shadow table (``jobs_joblisting_fts``) kept in sync by the
+  signals in ``jobs.signals`` and ranked with ``bm25()``.
+* Anything else, or SQLite builds without FTS5: the original ``icontains``
+  filters, without ranking.
+
+Every backend's ``search()`` filters a ``JobListing`` queryset and annotates
+it with ``search_rank`` (higher is more relevant) so callers can order by it.
+"""
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'jobs_joblisting_fts'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def job_search_vector():
+    """
+    Weighted search vector for a job listing.
+
+    Migration 0028 builds its GIN index from exactly this expression; keep the
+    two in sync or PostgreSQL will stop using the index.
+    """
+    from django.contrib.postgres.search import SearchVector
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+        SearchVector('skills_required', weight='B', config=SEARCH_CONFIG) +
+        SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+class BaseSearchBackend:
+    """Substring search used when no full-text engine is available."""
+
+    # Whether the backend keeps its own copy of job text that must be
+    # refreshed when a listing (or its company's name) changes.
+    has_shadow_index = False
+
+    def search(self, queryset, keyword):
+        return queryset.filter(
+            Q(title__icontains=keyword) |
+            Q(description__icontains=keyword) |
+            Q(company__name__icontains=keyword) |
+            Q(skills_required__icontains=keyword)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    def index_job(self, job):
+        """Add or refresh a single job in the index."""
+
+    def remove_job(self, job_id):
+        """Remove a single job from the index."""
+
+    def rebuild(self):
+        """Rebuild the whole index. Returns the number of jobs indexed."""
+        return 0
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Ranked search with PostgreSQL's built-in full-text search."""
+
+    def search(self, queryset, keyword):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        from .models import Company
+
+        vector = job_search_vector()
+        query = SearchQuery(keyword, search_type='websearch', config=SEARCH_CONFIG)
+
+        # Company names live in another table, so they cannot be part of the
+        # indexed vector; match them through the (small) companies table.
+        matching_companies = Company.objects.filter(name__icontains=keyword).values('pk')
+
+        # Filtering on the aliased vector emits "vector @@ query", which is
+        # what lets the planner use the GIN index.
+        return queryset.alias(
+            search_vector=vector,
+        ).filter(
+            Q(search_vector=query) | Q(company__in=matching_companies)
+        ).annotate(
+            search_rank=SearchRank(vector, query),
+        )
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """Ranked search over an SQLite FTS5 shadow table."""
+
+    has_shadow_index = True
+
+    # bm25() column weights: title, company, skills, description
+    COLUMN_WEIGHTS = (10.0, 4.0, 6.0, 1.0)
+
+    def search(self, queryset, keyword):
+        match = self.build_match_expression(keyword)
+        if not match:
+            return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        table = queryset.model._meta.db_table
+        weights = ', '.join(str(weight) for weight in self.COLUMN_WEIGHTS)
+
+        # bm25() is negative, lower meaning better, so flip it for search_rank.
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    @staticmethod
+    def build_match_expression(keyword):
+        """
+        Turn free text into a safe FTS5 query.
+
+        Each word becomes a quoted prefix term so FTS5 syntax in user input is
+        never interpreted, and "dev" still matches "developer".
+        """
+        tokens = _TOKEN_RE.findall(keyword or '')
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def index_job(self, job):
+        self.remove_job(job.pk)
+        company_name = job.company.name if job.company_id else ''
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, company, skills, description) VALUES (%s, %s, %s, %s, %s)',
+                [job.pk, job.title or '', company_name, job.skills_required or '', job.description or '']
+            )
+
+    def remove_job(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job_id])
+
+    def rebuild(self):
+        from .models import Company, JobListing
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, company, skills, description) '
+                f"SELECT j.id, j.title, COALESCE(c.name, ''), j.skills_required, j.description "
+                f'FROM {JobListing._meta.db_table} j '
+                f'LEFT JOIN {Company._meta.db_table} c ON c.id = j.company_id'
+            )
+            return cursor.rowcount
+
+
+# Until migration 0028 has created the FTS5 table, SQLite falls back to
+# icontains and looks for the table again after this many seconds
+FTS_RECHECK_SECONDS = 60
+
+_backend = None
+_backend_expires = None
+_backend_lock = threading.Lock()
+
+
+def _default_backend_class():
+    """
+    Choose a backend from the database vendor.
+
+    Returns:
+        tuple: (backend class, whether the choice is final). SQLite falls back
+        to ``icontains`` until migration 0028 has created the FTS5 table, so
+        that choice is made again after ``FTS_RECHECK_SECONDS``.
+    """
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend, True
+    if connection.vendor == 'sqlite':
+        if FTS_TABLE in connection.introspection.table_names():
+            return SQLiteFTSBackend, True
+        return BaseSearchBackend, False
+    return BaseSearchBackend, True
+
+
+def get_search_backend():
+    """
+    Return the configured search backend.
+
+    ``JOB_SEARCH_BACKEND`` may name a backend class by dotted path; otherwise
+    one is chosen from the database vendor.
+    """
+    global _backend, _backend_expires
+    if _backend is not None and (_backend_expires is None or time.monotonic() < _backend_expires):
+        return _backend
+    with _backend_lock:
+        if _backend is None or (_backend_expires is not None and time.monotonic() >= _backend_expires):
+            backend_path = getattr(settings, 'JOB_SEARCH_BACKEND', None)
+            if backend_path:
+                backend_class, final = import_string(backend_path), True
+            else:
+                backend_class, final = _default_backend_class()
+            _backend = backend_class()
+            _backend_expires = None if final else time.monotonic() + FTS_RECHECK_SECONDS
+    return _backend
@@ -0,0 +1,181 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import (
+    Company, CompanyConnection, CompanyFollower, HeroSection, JobCategory, JobListing, Notification, SimilarJob,
+    SiteSettings, TeamMember, Testimonial, TrustedCompany
+)
+from . import company_stats, homepage, similar_jobs, site_cache, skill_index, unread_counts
+from .search import get_search_backend
+
+SEARCH_FIELDS = {'title', 'description', 'skills_required', 'company'}
+COMPANY_STATS_JOB_FIELDS = {'status', 'application_deadline', 'company'}
+
+
+@receiver(post_save, sender=JobListing)
+def update_job_skill_index(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Keep the job skill index in sync with the listing's skills."""
+    if raw:
+        return
+    if update_fields is not None and 'skills_required' not in update_fields:
+        return
+    skill_index.index_job(instance)
+
+
+@receiver(post_save, sender=JobListing)
+def update_similar_jobs(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Refresh the precomputed similar jobs once the save commits, reading the skill index it updated."""
+    if raw:
+        return
+    if update_fields is not None and not similar_jobs.SIMILARITY_FIELDS.intersection(update_fields):
+        return
+    job_id = instance.pk
+
+    def refresh():
+        job = JobListing.objects.filter(pk=job_id).first()
+        if job is not None:
+            similar_jobs.refresh_job(job)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(pre_delete, sender=JobListing)
+def refill_similar_jobs_on_delete(sender, instance, **kwargs):
+    """Recompute the lists a deleted listing appeared in once the delete commits."""
+    job_ids = list(SimilarJob.objects.filter(similar_job=instance).values_list('job_id', flat=True))
+    if job_ids:
+        transaction.on_commit(lambda: similar_jobs.refresh_lists(job_ids))
+
+
+@receiver(post_save, sender=JobListing)
+def update_job_search_index(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Keep the full-text search index in sync with the listing's text."""
+    if raw:
+        return
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    get_search_backend().index_job(instance)
+
+
+@receiver(post_delete, sender=JobListing)
+def remove_job_from_search_index(sender, instance, **kwargs):
+    """Drop deleted listings from the full-text search index."""
+    get_search_backend().remove_job(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+def update_company_search_index(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """Re-index a company's listings when its name changes."""
+    if raw or created:
+        return
+    if update_fields is not None and 'name' not in update_fields:
+        return
+    backend = get_search_backend()
+    if not backend.has_shadow_index:
+        return
+    for job in instance.jobs.select_related('company'):
+        backend.index_job(job)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def update_user_skill_index(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Keep the user skill index in sync with the profile's skills."""
+    if raw:
+        return
+    if update_fields is not None and 'skills' not in update_fields:
+        return
+    skill_index.index_user(instance)
+
+
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+def invalidate_site_settings_cache(sender, **kwargs):
+    site_cache.invalidate(site_cache.SITE_SETTINGS_KEY)
+
+
+@receiver(post_save, sender=JobCategory)
+@receiver(post_delete, sender=JobCategory)
+def invalidate_categories_cache(sender, **kwargs):
+    site_cache.invalidate(site_cache.CATEGORIES_KEY, homepage.HOMEPAGE_SNAPSHOT_KEY)
+
+
+@receiver(post_save, sender=HeroSection)
+@receiver(post_delete, sender=HeroSection)
+def invalidate_hero_section_cache(sender, **kwargs):
+    # Clear every page type: a section may have been moved to another one
+    site_cache.invalidate_hero_sections()
+
+
+@receiver(post_save, sender=JobListing)
+def invalidate_homepage_on_job_change(sender, instance, update_fields=None, raw=False, **kwargs):
+    """A job's status (or another displayed field) changed; rebuild the home page snapshot lazily."""
+    if raw:
+        return
+    if update_fields is not None and not homepage.SNAPSHOT_JOB_FIELDS.intersection(update_fields):
+        return
+    homepage.invalidate_homepage_snapshot()
+
+
+@receiver(post_delete, sender=JobListing)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_delete, sender=Testimonial)
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+@receiver(post_save, sender=TrustedCompany)
+@receiver(post_delete, sender=TrustedCompany)
+def invalidate_homepage_snapshot(sender, **kwargs):
+    homepage.invalidate_homepage_snapshot()
+
+
+@receiver(post_save, sender=JobListing)
+def update_company_stats_on_job_change(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Recount the company's listings, once the save commits, when a listing's status, deadline or company changes."""
+    if raw:
+        return
+    if update_fields is not None and not COMPANY_STATS_JOB_FIELDS.intersection(update_fields):
+        return
+    # A listing moved to another company is recounted at both
+    company_ids = sorted({instance.company_id, getattr(instance, '_loaded_company_id', None)} - {None})
+    instance._loaded_company_id = instance.company_id
+    if company_ids:
+        transaction.on_commit(lambda: company_stats.refresh_company_stats(company_ids))
+
+
+@receiver(post_save, sender=CompanyFollower)
+@receiver(post_save, sender=CompanyConnection)
+def update_company_stats(sender, instance, raw=False, **kwargs):
+    """Recount the company's followers or connections once the save commits."""
+    if raw:
+        return
+    company_id = instance.company_id
+    transaction.on_commit(lambda: company_stats.refresh_company_stats([company_id]))
+
+
+@receiver(post_delete, sender=JobListing)
+@receiver(post_delete, sender=CompanyFollower)
+@receiver(post_delete, sender=CompanyConnection)
+def update_company_stats_on_delete(sender, instance, **kwargs):
+    """Recount once the delete commits; if it cascaded from the company itself, there is nothing left to count."""
+    if not instance.company_id:
+        return
+    company_id = instance.company_id
+    transaction.on_commit(lambda: company_stats.refresh_company_stats([company_id]))
+
+
+@receiver(post_save, sender=Notification)
+def update_unread_notification_count(sender, instance, created=False, raw=False, **kwargs):
+    """Count a new unread notification; recount after any other change."""
+    if raw:
+        return
+    if created:
+        unread_counts.notification_created(instance)
+    else:
+        unread_counts.notification_changed(instance)
+
+
+@receiver(post_delete, sender=Notification)
+def update_unread_notification_count_on_delete(sender, instance, **kwargs):
+    """Uncount a deleted unread notification."""
+    unread_counts.notification_deleted(instance)
@@ -0,0 +1,213 @@
+"""
+Precomputed similar-jobs table.
+
+Each open listing is treated as a sparse vector with one dimension per
+normalized skill (weight 1) plus one for its category (weight
+``CATEGORY_WEIGHT``). The ``SIMILAR_JOBS_PER_JOB`` listings with the highest
+cosine similarity are stored in ``SimilarJob``, so ``job_detail`` reads a
+handful of rows instead of scanning the catalogue.
+
+``rebuild_similar_jobs()`` recomputes the whole table with an in-memory
+inverted index: only pairs sharing at least one dimension are ever scored.
+``refresh_job()`` keeps it current when a single listing is published,
+edited or closed, once the save has committed; the lists the listing drops
+out of are recomputed rather than left short.
+
+A listing shares its category dimension with every other listing in the
+category, so a large category would make both paths quadratic. Listings
+that share no skill with a job are only considered if they are among the
+``SIMILAR_JOBS_CATEGORY_CANDIDATES`` most recent in its category.
+"""
+import heapq
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import JobListing, JobSkill, SimilarJob
+from .skill_index import parse_skills
+
+CATEGORY_WEIGHT = 1.0
+DEFAULT_SIMILAR_JOBS_PER_JOB = 10
+DEFAULT_CATEGORY_CANDIDATES = 200
+
+# Saving any of these JobListing fields can change a listing's similarities
+SIMILARITY_FIELDS = {'status', 'skills_required', 'category', 'application_deadline'}
+
+
+def _per_job():
+    return getattr(settings, 'SIMILAR_JOBS_PER_JOB', DEFAULT_SIMILAR_JOBS_PER_JOB)
+
+
+def _category_candidates():
+    return getattr(settings, 'SIMILAR_JOBS_CATEGORY_CANDIDATES', DEFAULT_CATEGORY_CANDIDATES)
+
+
+def open_jobs():
+    """Published listings whose application deadline has not passed."""
+    return JobListing.objects.filter(status='published').exclude(
+        Q(application_deadline__lt=timezone.now()) & ~Q(application_deadline=None)
+    )
+
+
+def _is_open(job):
+    return job.status == 'published' and (
+        job.application_deadline is None or job.application_deadline >= timezone.now()
+    )
+
+
+def _norm(skill_count, has_category):
+    return math.sqrt(skill_count + (CATEGORY_WEIGHT ** 2 if has_category else 0.0))
+
+
+def _cosine(dot, norm_a, norm_b):
+    if not dot or not norm_a or not norm_b:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def rebuild_similar_jobs(batch_size=1000):
+    """
+    Recompute the similar-jobs table for every open listing.
+
+    Returns:
+        Number of rows written
+    """
+    per_job = _per_job()
+    category_candidates = _category_candidates()
+
+    vectors = {}
+    skill_postings = defaultdict(list)
+    category_postings = defaultdict(list)
+    jobs = open_jobs().order_by('-created_at').values_list('pk', 'category_id', 'skills_required')
+    for job_id, category_id, skills_required in jobs:
+        skills = parse_skills(skills_required)
+        vectors[job_id] = (skills, category_id, _norm(len(skills), category_id is not None))
+        for skill in skills:
+            skill_postings[skill].append(job_id)
+        # Most recent first, so this keeps the newest listings of each category
+        if category_id is not None and len(category_postings[category_id]) < category_candidates:
+            category_postings[category_id].append(job_id)
+
+    rows = []
+    for job_id, (skills, category_id, norm) in vectors.items():
+        dots = defaultdict(float)
+        for skill in skills:
+            for other_id in skill_postings[skill]:
+                dots[other_id] += 1.0
+        if category_id is not None:
+            # Listings sharing a skill get the category term even if they are not among the newest
+            for other_id in category_postings[category_id]:
+                dots.setdefault(other_id, 0.0)
+            for other_id in dots:
+                if vectors[other_id][1] == category_id:
+                    dots[other_id] += CATEGORY_WEIGHT ** 2
+        dots.pop(job_id, None)
+
+        scored = ((_cosine(dot, norm, vectors[other_id][2]), other_id) for other_id, dot in dots.items())
+        for score, other_id in heapq.nlargest(per_job, scored):
+            rows.append(SimilarJob(job_id=job_id, similar_job_id=other_id, score=score))
+
+    with transaction.atomic():
+        SimilarJob.objects.all().delete()
+        SimilarJob.objects.bulk_create(rows, batch_size=batch_size)
+
+    return len(rows)
+
+
+def _score_candidates(job):
+    """Cosine similarity between ``job`` and every open listing it shares a dimension with."""
+    skills = parse_skills(job.skills_required)
+    norm = _norm(len(skills), job.category_id is not None)
+
+    condition = Q(pk__in=JobSkill.objects.filter(skill__in=skills).values('job_id'))
+    if job.category_id is not None:
+        recent = open_jobs().filter(category_id=job.category_id).order_by('-created_at').values_list(
+            'pk', flat=True
+        )[:_category_candidates()]
+        condition |= Q(pk__in=list(recent))
+
+    candidates = open_jobs().filter(condition).exclude(pk=job.pk).annotate(
+        matched_skill_count=Count('indexed_skills', filter=Q(indexed_skills__skill__in=skills)),
+        indexed_skill_count=Count('indexed_skills'),
+    ).values_list('pk', 'category_id', 'matched_skill_count', 'indexed_skill_count')
+
+    scores = {}
+    for other_id, category_id, matched, total in candidates:
+        dot = matched
+        if job.category_id is not None and category_id == job.category_id:
+            dot += CATEGORY_WEIGHT ** 2
+        score = _cosine(dot, norm, _norm(total, category_id is not None))
+        if score > 0:
+            scores[other_id] = score
+    return scores
+
+
+def _write_list(job, scores, per_job):
+    top = heapq.nlargest(per_job, scores.items(), key=lambda item: item[1])
+    return [SimilarJob(job_id=job.pk, similar_job_id=other_id, score=score) for other_id, score in top]
+
+
+def refresh_lists(job_ids):
+    """Recompute the stored lists of ``job_ids`` from scratch."""
+    per_job = _per_job()
+
+    with transaction.atomic():
+        SimilarJob.objects.filter(job_id__in=job_ids).delete()
+        rows = []
+        for job in open_jobs().filter(pk__in=job_ids):
+            rows.extend(_write_list(job, _score_candidates(job), per_job))
+        SimilarJob.objects.bulk_create(rows)
+
+
+def refresh_job(job):
+    """
+    Update the table after ``job`` was published, edited or closed.
+
+    The job's own list is recomputed and the job is taken out of every other
+    list. It is then re-inserted into the lists where it now ranks in the top
+    N, and the lists it no longer belongs in are recomputed.
+    """
+    per_job = _per_job()
+
+    with transaction.atomic():
+        previous = set(SimilarJob.objects.filter(similar_job=job).values_list('job_id', flat=True))
+        SimilarJob.objects.filter(Q(job=job) | Q(similar_job=job)).delete()
+
+        scores = _score_candidates(job) if _is_open(job) else {}
+        rows = _write_list(job, scores, per_job)
+
+        # Find the other lists this job now belongs in
+        lists = defaultdict(list)
+        existing = SimilarJob.objects.filter(job_id__in=scores).values_list('job_id', 'score', 'pk')
+        for other_id, score, pk in existing:
+            lists[other_id].append((score, pk))
+
+        inserted = set()
+        evicted = []
+        for other_id, score in scores.items():
+            entries = lists.get(other_id, [])
+            if len(entries) < per_job:
+                inserted.add(other_id)
+            else:
+                weakest_score, weakest_pk = min(entries)
+                if score > weakest_score:
+                    inserted.add(other_id)
+                    evicted.append(weakest_pk)
+        rows.extend(SimilarJob(job_id=other_id, similar_job_id=job.pk, score=scores[other_id]) for other_id in inserted)
+
+        if evicted:
+            SimilarJob.objects.filter(pk__in=evicted).delete()
+
+        SimilarJob.objects.bulk_create(rows, ignore_conflicts=True)
+
+        if previous - inserted:
+            refresh_lists(previous - inserted)
+
+
+def get_similar_job_ids(job):
+    """IDs of the stored similar listings for ``job``, best first."""
+    return list(SimilarJob.objects.filter(job=job).order_by('-score').values_list('similar_job_id', flat=True))
@@ -0,0 +1,108 @@
+"""
+Two-level cache for site-wide objects that change rarely.
+
+Site settings, job categories and hero sections are needed on nearly every
+render. They are kept in a process-local dictionary for
+``SITE_CACHE_LOCAL_TTL`` seconds, backed by Django's cache framework for
+``SITE_CACHE_TIMEOUT`` seconds, and only read from the database on a miss in
+both. The signals in ``jobs.signals`` call ``invalidate()`` when the
+underlying models are saved or deleted; other processes pick up the change
+once their local entry expires, provided the cache framework is shared
+between them (Redis). A process-local cache such as ``LocMemCache`` only
+holds this process's copy, so there entries are kept for
+``SITE_CACHE_LOCAL_TTL`` seconds at most.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+DEFAULT_LOCAL_TTL = 60
+DEFAULT_TIMEOUT = 60 * 60
+
+SITE_SETTINGS_KEY = 'site_cache:site_settings'
+CATEGORIES_KEY = 'site_cache:categories'
+HERO_SECTION_KEY = 'site_cache:hero_section:{}'
+
+_local = {}
+_local_lock = threading.Lock()
+
+
+def _local_ttl():
+    return getattr(settings, 'SITE_CACHE_LOCAL_TTL', DEFAULT_LOCAL_TTL)
+
+
+def is_process_local(alias='default'):
+    """
+    Whether the cache ``alias`` keeps its entries in this process only.
+
+    Entries in such a cache are not seen, or invalidated, by the other web
+    and worker processes.
+    """
+    return isinstance(caches[alias], LocMemCache)
+
+
+def get_or_load(key, loader, timeout=None):
+    """
+    Return the cached value for ``key``, calling ``loader()`` on a miss.
+
+    ``loader`` must not return None, which the cache framework treats as a miss.
+
+    Args:
+        key: Cache key
+        loader: Callable returning the value to cache
+        timeout: Shared cache timeout in seconds (defaults to SITE_CACHE_TIMEOUT,
+            capped at SITE_CACHE_LOCAL_TTL when the cache is process-local)
+
+    Returns:
+        The cached or freshly loaded value
+    """
+    now = time.monotonic()
+    entry = _local.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    value = cache.get(key)
+    if value is None:
+        value = loader()
+        if timeout is None:
+            timeout = getattr(settings, 'SITE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+        if is_process_local():
+            # Other processes never see this process's invalidations
+            timeout = min(timeout, _local_ttl())
+        cache.set(key, value, timeout)
+
+    with _local_lock:
+        _local[key] = (now + _local_ttl(), value)
+    return value
+
+
+def invalidate(*keys):
+    """Drop keys from both the shared and the process-local cache."""
+    cache.delete_many(keys)
+    with _local_lock:
+        for key in keys:
+            _local.pop(key, None)
+
+
+def get_site_settings():
+    """Cached equivalent of ``SiteSettings.get_settings()``."""
+    from .models import SiteSettings
+    return get_or_load(SITE_SETTINGS_KEY, SiteSettings.get_settings)
+
+
+def get_categories():
+    """All job categories as a list, in their default ordering."""
+    from .models import JobCategory
+    return get_or_load(CATEGORIES_KEY, lambda: list(JobCategory.objects.all()))
+
+
+def hero_section_key(section_type):
+    return HERO_SECTION_KEY.format(section_type)
+
+
+def invalidate_hero_sections():
+    from .models import HeroSection
+    invalidate(*[hero_section_key(section_type) for section_type, _ in HeroSection.SECTION_TYPE_CHOICES])
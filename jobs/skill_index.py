@@ -0,0 +1,126 @@
+"""
+Inverted skill index for job and candidate recommendations.
+
+Skills are stored as comma-separated text on ``JobListing.skills_required``
+and ``CustomUser.skills``. This module keeps a normalized copy of those
+skills in the ``JobSkill`` and ``UserSkill`` tables so the recommenders can
+fetch only the jobs (or users) that share at least one skill instead of
+loading and re-parsing the whole catalogue on every request.
+"""
+from django.db.models import Count, Q
+
+from .models import JobSkill, UserSkill
+
+MAX_SKILL_LENGTH = 255
+
+
+def normalize_skill(skill):
+    """Lowercase a skill and collapse internal whitespace."""
+    return ' '.join(skill.lower().split())[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(value):
+    """
+    Split a comma-separated skills string into normalized, unique skills.
+
+    Args:
+        value: Comma-separated skills string (may be None or empty)
+
+    Returns:
+        List of normalized skills in their original order
+    """
+    if not value:
+        return []
+
+    skills = []
+    seen = set()
+    for skill in value.split(','):
+        skill = normalize_skill(skill)
+        if skill and skill not in seen:
+            seen.add(skill)
+            skills.append(skill)
+    return skills
+
+
+def _sync_rows(model, owner_field, owner_id, skills):
+    """Bring the index rows for one owner in line with its current skills."""
+    skills = set(skills)
+    rows = model.objects.filter(**{owner_field: owner_id})
+    existing = set(rows.values_list('skill', flat=True))
+
+    stale = existing - skills
+    if stale:
+        rows.filter(skill__in=stale).delete()
+
+    missing = skills - existing
+    if missing:
+        model.objects.bulk_create(
+            [model(skill=skill, **{owner_field: owner_id}) for skill in missing],
+            ignore_conflicts=True
+        )
+
+
+def index_job(job):
+    """Refresh the index entries for a single job listing."""
+    _sync_rows(JobSkill, 'job_id', job.pk, parse_skills(job.skills_required))
+
+
+def index_user(user):
+    """Refresh the index entries for a single user."""
+    _sync_rows(UserSkill, 'user_id', user.pk, parse_skills(user.skills))
+
+
+def _rebuild(model, owner_field, source, skills_field, batch_size):
+    model.objects.all().delete()
+
+    count = 0
+    batch = []
+    for owner_id, value in source.values_list('pk', skills_field).iterator(chunk_size=batch_size):
+        for skill in parse_skills(value):
+            batch.append(model(skill=skill, **{owner_field: owner_id}))
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch, ignore_conflicts=True)
+            count += len(batch)
+            batch = []
+
+    if batch:
+        model.objects.bulk_create(batch, ignore_conflicts=True)
+        count += len(batch)
+
+    return count
+
+
+def rebuild_job_index(batch_size=1000):
+    """Rebuild the whole job skill index. Returns the number of entries written."""
+    from .models import JobListing
+    return _rebuild(JobSkill, 'job_id', JobListing.objects.exclude(skills_required=''),
+                    'skills_required', batch_size)
+
+
+def rebuild_user_index(batch_size=1000):
+    """Rebuild the whole user skill index. Returns the number of entries written."""
+    from django.contrib.auth import get_user_model
+    User = get_user_model()
+    return _rebuild(UserSkill, 'user_id', User.objects.exclude(skills__isnull=True).exclude(skills=''),
+                    'skills', batch_size)
+
+
+def annotate_skill_matches(queryset, skills):
+    """
+    Restrict a JobListing or user queryset to rows sharing at least one skill.
+
+    The queryset is annotated with ``matched_skill_count`` (skills in common)
+    and ``indexed_skill_count`` (total indexed skills for the row).
+    """
+    # Use a subquery for the candidate set so the counts below are computed
+    # over all of a row's skills, not just the ones that matched.
+    candidate_ids = queryset.model.objects.filter(
+        indexed_skills__skill__in=skills
+    ).values('pk')
+
+    return queryset.filter(
+        pk__in=candidate_ids
+    ).annotate(
+        matched_skill_count=Count('indexed_skills', filter=Q(indexed_skills__skill__in=skills)),
+        indexed_skill_count=Count('indexed_skills'),
+    )
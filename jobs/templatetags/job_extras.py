@@ -1,6 +1,4 @@
 from django import template
-from subscriptions.job_qualification_checker import JobQualificationChecker
-from subscriptions.candidate_matching import CandidateMatchingSystem
 import logging
 
 register = template.Library()
@@ -102,6 +100,7 @@ def qualification_match(job, user):
         return None
         
     try:
+        from subscriptions.job_qualification_checker import JobQualificationChecker
         checker = JobQualificationChecker()
         match_percentage = checker.calculate_job_match_percentage(user, job)
         return int(match_percentage)
@@ -140,6 +139,7 @@ def match_percentage_badge(job, user):
         return {'display': False}
         
     try:
+        from subscriptions.job_qualification_checker import JobQualificationChecker
         checker = JobQualificationChecker()
         match_data = checker.get_detailed_match_data(user, job)
         
@@ -1,3 +1,752 @@
-from django.test import TestCase
+import gzip
+import importlib
+import json
+import time
+from io import StringIO
+from unittest import mock
+from datetime import timedelta
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from subscriptions.job_qualification_checker import JobQualificationChecker
+
+from . import search, site_cache
+from .context_processors import base_context
+from .company_stats import reconcile_company_stats
+from .exports import iter_json
+from .homepage import HOMEPAGE_SNAPSHOT_KEY, build_homepage_snapshot, get_homepage_snapshot
+from .management.commands.explain_hot_queries import sequential_scans
+from .models import (
+    Company, CompanyConnection, CompanyFollower, CompanyStats, JobAnalytics, JobApplication, JobCategory,
+    JobListing, JobSkill, MailCampaign, MailFailure, Newsletter, SimilarJob, UserSkill
+)
+from .recommender import get_recommended_jobs
+from .similar_jobs import get_similar_job_ids, rebuild_similar_jobs, refresh_job
+from .view_tracker import JobViewBuffer, view_buffer
+
+
+class HomepageSnapshotTests(TestCase):
+    """Benchmarks and invalidation for the cached home page statistics."""
+
+    def setUp(self):
+        site_cache.invalidate(site_cache.CATEGORIES_KEY, HOMEPAGE_SNAPSHOT_KEY)
+        self.employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        self.company = Company.objects.create(
+            name='Acme', owner=self.employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+
+    def _add_categories(self, count, start=0):
+        for i in range(start, start + count):
+            category = JobCategory.objects.create(name=f'Category {i}', slug=f'category-{i}')
+            JobListing.objects.create(
+                title=f'Job {i}', slug=f'job-{i}', company=self.company, posted_by=self.employer,
+                category=category, description='Description', requirements='Requirements',
+                location='Accra', status='published'
+            )
+
+    def _count_build_queries(self):
+        site_cache.invalidate(site_cache.CATEGORIES_KEY, HOMEPAGE_SNAPSHOT_KEY)
+        with CaptureQueriesContext(connection) as queries:
+            snapshot = build_homepage_snapshot()
+        return len(queries.captured_queries), snapshot
+
+    def test_query_count_does_not_grow_with_categories(self):
+        self._add_categories(2)
+        small_count, snapshot = self._count_build_queries()
+        self.assertEqual(snapshot['total_categories'], 2)
+
+        self._add_categories(50, start=2)
+        large_count, snapshot = self._count_build_queries()
+        self.assertEqual(snapshot['total_categories'], 52)
+        self.assertEqual(snapshot['total_jobs'], 52)
+        self.assertEqual(snapshot['total_companies'], 1)
+
+        self.assertEqual(small_count, large_count)
+
+    def test_cached_snapshot_needs_no_queries(self):
+        self._add_categories(3)
+        get_homepage_snapshot()
+        with self.assertNumQueries(0):
+            get_homepage_snapshot()
+
+    def test_status_change_invalidates_snapshot(self):
+        self._add_categories(3)
+        self.assertEqual(get_homepage_snapshot()['total_jobs'], 3)
+
+        job = JobListing.objects.get(slug='job-0')
+        job.status = 'closed'
+        job.save(update_fields=['status'])
+
+        snapshot = get_homepage_snapshot()
+        self.assertEqual(snapshot['total_jobs'], 2)
+        self.assertEqual(snapshot['category_counts'][job.category_id], 0)
+
+    def test_refresh_command_warns_with_a_process_local_cache(self):
+        self._add_categories(1)
+        out = StringIO()
+        with mock.patch('jobs.homepage.build_homepage_snapshot') as build:
+            call_command('refresh_homepage_snapshot', stdout=out)
+        build.assert_not_called()
+        self.assertIn('local to each process', out.getvalue())
+
+    def test_refresh_command_rebuilds_with_a_shared_cache(self):
+        self._add_categories(2)
+        out = StringIO()
+        with mock.patch.object(site_cache, 'is_process_local', return_value=False):
+            call_command('refresh_homepage_snapshot', stdout=out)
+        self.assertIn('2 jobs', out.getvalue())
+        with self.assertNumQueries(0):
+            self.assertEqual(get_homepage_snapshot()['total_jobs'], 2)
+
+
+class CompanyStatsTests(TestCase):
+    """Denormalized company counters and the company list query count."""
+
+    def setUp(self):
+        self.employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        self.seeker = get_user_model().objects.create_user(
+            username='seeker', email='seeker@example.com', password='password'
+        )
+
+    def _add_companies(self, count, start=0):
+        companies = []
+        for i in range(start, start + count):
+            company = Company.objects.create(
+                name=f'Company {i}', slug=f'company-{i}', owner=self.employer, description='Description',
+                industry='technology', company_size='1-10', headquarters='Accra', status='approved'
+            )
+            self._add_job(company, f'job-{i}')
+            with self.captureOnCommitCallbacks(execute=True):
+                CompanyFollower.objects.create(user=self.seeker, company=company)
+            companies.append(company)
+        return companies
+
+    def _add_job(self, company, slug, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return JobListing.objects.create(
+                title=slug, slug=slug, company=company, posted_by=self.employer, description='Description',
+                requirements='Requirements', location='Accra', status=kwargs.pop('status', 'published'), **kwargs
+            )
+
+    def _count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('jobs:company_list'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries)
+
+    def test_company_list_query_count_does_not_grow_with_companies(self):
+        self._add_companies(2)
+        self._count_list_queries()  # warm the site-wide caches
+        small_count = self._count_list_queries()
+
+        self._add_companies(10, start=2)
+        large_count = self._count_list_queries()
+
+        self.assertEqual(small_count, large_count)
+
+    def test_signals_keep_counters_in_sync(self):
+        company = self._add_companies(1)[0]
+        stats = CompanyStats.objects.get(company=company)
+        self.assertEqual((stats.job_count, stats.active_job_count, stats.follower_count), (1, 1, 1))
+
+        job = JobListing.objects.get(slug='job-0')
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            job.status = 'closed'
+            job.save(update_fields=['status'])
+            connection_request = CompanyConnection.objects.create(user=self.seeker, company=company)
+            connection_request.status = 'approved'
+            connection_request.save()
+            # Nothing is recounted inside the writer's transaction
+            stats.refresh_from_db()
+            self.assertEqual(stats.job_count, 1)
+
+        self.assertTrue(callbacks)
+        stats.refresh_from_db()
+        self.assertEqual((stats.job_count, stats.active_job_count, stats.connection_count), (0, 0, 1))
+
+    def test_moving_a_job_recounts_both_companies(self):
+        first, second = self._add_companies(2)
+        job = JobListing.objects.get(slug='job-0')
+        job.company = second
+        with self.captureOnCommitCallbacks(execute=True):
+            job.save()
+        self.assertEqual(CompanyStats.objects.get(company=first).job_count, 0)
+        self.assertEqual(CompanyStats.objects.get(company=second).job_count, 2)
+
+        # Also for a listing saved earlier through the same instance
+        job = self._add_job(first, 'moving')
+        job.company = second
+        with self.captureOnCommitCallbacks(execute=True):
+            job.save(update_fields=['company'])
+        self.assertEqual(CompanyStats.objects.get(company=first).job_count, 0)
+        self.assertEqual(CompanyStats.objects.get(company=second).job_count, 3)
+
+    def test_passed_deadline_is_recounted_on_read(self):
+        company = self._add_companies(1)[0]
+        self._add_job(company, 'short-lived', application_deadline=timezone.now() + timedelta(days=1))
+        self.assertEqual(Company.objects.get(pk=company.pk).active_job_count, 2)
+
+        CompanyStats.objects.filter(company=company).update(next_deadline=timezone.now() - timedelta(seconds=1))
+        JobListing.objects.filter(slug='short-lived').update(application_deadline=timezone.now() - timedelta(days=1))
+
+        company = Company.objects.select_related('stats').get(pk=company.pk)
+        self.assertEqual(company.active_job_count, 1)
+        self.assertEqual(company.job_count, 2)
+
+    def test_reconcile_rebuilds_missing_rows(self):
+        self._add_companies(3)
+        CompanyStats.objects.all().delete()
+
+        self.assertEqual(reconcile_company_stats(batch_size=2), Company.objects.count())
+        self.assertEqual(CompanyStats.objects.count(), Company.objects.count())
+        self.assertEqual(CompanyStats.objects.filter(job_count=1, follower_count=1).count(), 3)
+
+
+class StreamingExportTests(TestCase):
+    """Personal data and analytics exports are streamed with a fixed number of queries."""
+
+    def setUp(self):
+        self.employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        self.seeker = get_user_model().objects.create_user(
+            username='seeker', email='seeker@example.com', password='password'
+        )
+        self.company = Company.objects.create(
+            name='Acme', slug='acme', owner=self.employer, description='Description',
+            industry='technology', company_size='1-10', headquarters='Accra', status='approved'
+        )
+
+    def _add_jobs(self, count, start=0):
+        for i in range(start, start + count):
+            job = JobListing.objects.create(
+                title=f'Job {i}', slug=f'job-{i}', company=self.company, posted_by=self.employer,
+                description='Description', requirements='Requirements', location='Accra', status='published'
+            )
+            JobApplication.objects.create(job=job, applicant=self.seeker, resume='resume.pdf')
+
+    def _download(self, user, **params):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('accounts:download_data'), params)
+            content = b''.join(response.streaming_content)
+        return response, content, len(queries.captured_queries)
+
+    def test_iter_json_streams_generators(self):
+        document = {'name': 'a', 'rows': (row for row in [{'n': 1}, {'n': 2}]), 'empty': iter([])}
+        self.assertEqual(json.loads(''.join(iter_json(document))), {'name': 'a', 'rows': [{'n': 1}, {'n': 2}], 'empty': []})
+
+    def test_employer_download_query_count_is_constant(self):
+        self._add_jobs(2)
+        _, content, few_queries = self._download(self.employer)
+        self._add_jobs(8, start=2)
+        response, content, many_queries = self._download(self.employer)
+
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="employer_data.json"')
+        self.assertEqual(few_queries, many_queries)
+        data = json.loads(content)
+        listings = data['employer_info']['job_listings']
+        self.assertEqual(len(listings), 10)
+        self.assertEqual({listing['application_count'] for listing in listings}, {1})
+        self.assertEqual(data['employer_info']['companies'][0]['name'], 'Acme')
+
+    def test_job_seeker_download_as_gzipped_ndjson(self):
+        self._add_jobs(3)
+        response, content, _ = self._download(self.seeker, format='ndjson', compress='gzip')
+
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        records = [json.loads(line) for line in gzip.decompress(content).decode().splitlines()]
+        self.assertEqual([r['type'] for r in records], ['personal_info', 'job_seeker_info'] + ['applications'] * 3)
+        self.assertEqual(records[2]['company'], 'Acme')
+
+    def test_job_analytics_csv(self):
+        self._add_jobs(3)
+        admin = get_user_model().objects.create_user(
+            username='admin', email='admin@example.com', password='password', user_type='admin'
+        )
+        self.client.force_login(admin)
+        response = self.client.get(reverse('custom_admin:export_job_analytics'), {'format': 'csv'})
+        content = b''.join(response.streaming_content).decode()
+
+        self.assertIn('Total Jobs,3\r\n', content)
+        self.assertIn('Total Applications,3\r\n', content)
+        self.assertIn('Job 0,Acme,,1\r\n', content)
+
+
+class FlakyEmailBackend(LocmemEmailBackend):
+    """In-memory backend that counts connections and rejects addresses containing 'bounce'."""
+    opened = 0
+    reject_bounces = True
+
+    def open(self):
+        FlakyEmailBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if self.reject_bounces and any('bounce' in address for address in message.to):
+                raise ConnectionError(f'Rejected {message.to[0]}')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='jobs.tests.FlakyEmailBackend', MAIL_BATCH_SIZE=10, MAIL_MAX_WORKERS=3)
+class MailerTests(TestCase):
+    """Bulk mail is batched per connection, records failures and resumes from a checkpoint."""
+
+    def setUp(self):
+        FlakyEmailBackend.opened = 0
+        FlakyEmailBackend.reject_bounces = True
+        self.employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        company = Company.objects.create(
+            name='Acme', slug='acme', owner=self.employer, description='Description',
+            industry='technology', company_size='1-10', headquarters='Accra', status='approved'
+        )
+        self.job = JobListing.objects.create(
+            title='Developer', slug='developer', company=company, posted_by=self.employer,
+            description='Description', requirements='Requirements', location='Accra', status='published',
+            application_deadline=timezone.now() + timedelta(days=2)
+        )
+        self.subscribers = [Newsletter.objects.create(email=f'reader{i}@example.com') for i in range(25)]
+
+    def _run(self, command, *args):
+        call_command(command, *args, stdout=StringIO())
+
+    def test_newsletter_reuses_connections(self):
+        self._run('send_newsletter', '--subject', 'Weekly jobs')
+
+        self.assertEqual(len(mail.outbox), 25)
+        self.assertEqual(FlakyEmailBackend.opened, 3)
+        self.assertIn('Developer', mail.outbox[0].body)
+        campaign = MailCampaign.objects.get()
+        self.assertEqual((campaign.status, campaign.sent_count, campaign.failed_count), ('completed', 25, 0))
+        self.assertEqual(campaign.checkpoint, self.subscribers[-1].pk)
+
+    def test_failures_are_recorded_and_retried(self):
+        Newsletter.objects.create(email='bounce@example.com')
+        self._run('send_newsletter')
+
+        campaign = MailCampaign.objects.get()
+        self.assertEqual((campaign.sent_count, campaign.failed_count), (25, 1))
+        failure = MailFailure.objects.get()
+        self.assertEqual(failure.recipient, 'bounce@example.com')
+        self.assertIn('Developer', failure.body)
+
+        FlakyEmailBackend.reject_bounces = False
+        self._run('retry_mail_failures', '--campaign', str(campaign.pk))
+
+        self.assertFalse(MailFailure.objects.exists())
+        campaign.refresh_from_db()
+        self.assertEqual((campaign.sent_count, campaign.failed_count), (26, 0))
+        self.assertEqual(mail.outbox[-1].to, ['bounce@example.com'])
+
+    def test_resume_from_checkpoint(self):
+        campaign = MailCampaign.objects.create(
+            kind='newsletter', subject='Weekly jobs', parameters={'message': '', 'job_ids': [self.job.pk]},
+            checkpoint=self.subscribers[19].pk, sent_count=20
+        )
+        self._run('send_newsletter', '--resume', str(campaign.pk))
+
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(s.email for s in self.subscribers[20:]))
+        campaign.refresh_from_db()
+        self.assertEqual((campaign.status, campaign.sent_count), ('completed', 25))
+
+    def test_expiration_warnings_go_to_employer(self):
+        self._run('send_expiration_warnings')
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['employer@example.com'])
+        self.assertIn('Developer', mail.outbox[0].subject)
+
+
+class HotQueryIndexTests(TestCase):
+    """The busiest queries are answered from indexes."""
+
+    def test_sequential_scans_are_recognized(self):
+        self.assertEqual(sequential_scans('Seq Scan on jobs_joblisting  (cost=0.00..1.01 rows=1)'), ['jobs_joblisting'])
+        self.assertEqual(sequential_scans('2 0 0 SCAN jobs_notification'), ['jobs_notification'])
+        self.assertEqual(sequential_scans('2 0 0 SCAN jobs_notification USING INDEX jobs_notif_user_created'), [])
+        self.assertEqual(sequential_scans('3 0 0 SEARCH jobs_joblisting USING INDEX jobs_listing_company_status'), [])
+
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command('explain_hot_queries', '--fail', stdout=out)
+        self.assertIn('0 with sequential scans', out.getvalue())
+
+
+class JobDetailTests(TestCase):
+    """The job page renders for every kind of listing."""
+
+    def setUp(self):
+        self.employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        self.company = Company.objects.create(
+            name='Acme', owner=self.employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+
+    def tearDown(self):
+        # Leave no views of this test's jobs for the background flusher
+        view_buffer.discard()
+
+    def test_job_without_category(self):
+        job = JobListing.objects.create(
+            title='Python Developer', slug='python-developer', company=self.company, posted_by=self.employer,
+            description='Description', requirements='Python', location='Accra', status='published'
+        )
+        response = self.client.get(reverse('jobs:job_detail', kwargs={'slug': job.slug}))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Category</h3>')
+
+
+class JobViewBufferTests(TestCase):
+    """Buffered job views survive failed writes and stay within the buffer cap."""
+
+    def setUp(self):
+        employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        company = Company.objects.create(
+            name='Acme', owner=employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+        self.job = JobListing.objects.create(
+            title='Python Developer', slug='python-developer', company=company, posted_by=employer,
+            description='Description', requirements='Python', location='Accra', status='published'
+        )
+        self.buffer = JobViewBuffer(flush_interval=3600, max_events=3)
+        # Keep the background flusher out of the test's transaction
+        self.buffer._ensure_flusher = lambda: None
+
+    def test_failed_flush_keeps_events(self):
+        self.buffer.record(self.job.pk, '2024-01-01', unique=True, referrer_domain='example.com')
+        with mock.patch.object(self.buffer, '_write', side_effect=RuntimeError('database is down')):
+            with self.assertLogs('jobs.view_tracker', 'ERROR'):
+                self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.pending_events, 1)
+
+        self.buffer.record(self.job.pk, '2024-01-01')
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self.buffer.pending_events, 0)
+
+        self.job.refresh_from_db()
+        analytics = JobAnalytics.objects.get(job=self.job)
+        self.assertEqual(self.job.views_count, 2)
+        self.assertEqual(analytics.unique_views, 1)
+        self.assertEqual(analytics.daily_views, {'2024-01-01': 2})
+        self.assertEqual(analytics.referral_sources, {'example.com': 1})
+
+    def test_full_buffer_wakes_the_flusher_and_drops_views(self):
+        with mock.patch.object(self.buffer, '_write') as write:
+            with self.assertLogs('jobs.view_tracker', 'WARNING'):
+                for _ in range(5):
+                    self.buffer.record(self.job.pk, '2024-01-01')
+        write.assert_not_called()
+        self.assertTrue(self.buffer._wake.is_set())
+        self.assertEqual(self.buffer.pending_events, 3)
+
+        self.assertEqual(self.buffer.flush(), 3)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views_count, 3)
+
+
+@override_settings(SIMILAR_JOBS_PER_JOB=1)
+class SimilarJobsTests(TestCase):
+    """The precomputed similar jobs follow listings as they change."""
+
+    def setUp(self):
+        self.employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        self.company = Company.objects.create(
+            name='Acme', owner=self.employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+        self.category = JobCategory.objects.create(name='Engineering', slug='engineering')
+
+    def _job(self, slug, skills='', category=None, age_days=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = JobListing.objects.create(
+                title=slug, slug=slug, company=self.company, posted_by=self.employer, description='Description',
+                requirements='Requirements', location='Accra', status='published', skills_required=skills,
+                category=category
+            )
+        JobListing.objects.filter(pk=job.pk).update(created_at=timezone.now() - timedelta(days=age_days))
+        return job
+
+    def test_refresh_waits_for_commit(self):
+        python = self._job('python', 'python, django')
+        with self.captureOnCommitCallbacks() as callbacks:
+            django = JobListing.objects.create(
+                title='django', slug='django', company=self.company, posted_by=self.employer,
+                description='Description', requirements='Requirements', location='Accra', status='published',
+                skills_required='python, django'
+            )
+            self.assertFalse(SimilarJob.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_similar_job_ids(python), [django.pk])
+        self.assertEqual(get_similar_job_ids(django), [python.pk])
+
+    def test_closing_a_job_refills_the_lists_it_leaves(self):
+        python = self._job('python', 'python, django, flask')
+        self._job('django', 'python, django')
+        flask = self._job('flask', 'flask')
+        django = JobListing.objects.get(slug='django')
+        self.assertEqual(get_similar_job_ids(python), [django.pk])
+
+        django.status = 'closed'
+        with self.captureOnCommitCallbacks(execute=True):
+            django.save()
+        self.assertEqual(get_similar_job_ids(python), [flask.pk])
+
+    def test_deleting_a_job_refills_the_lists_it_leaves(self):
+        python = self._job('python', 'python, django, flask')
+        django = self._job('django', 'python, django')
+        flask = self._job('flask', 'flask')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            django.delete()
+        self.assertEqual(get_similar_job_ids(python), [flask.pk])
+
+    @override_settings(SIMILAR_JOBS_PER_JOB=10, SIMILAR_JOBS_CATEGORY_CANDIDATES=2)
+    def test_category_only_candidates_are_the_most_recent(self):
+        newest = self._job('newest', category=self.category, age_days=0)
+        new = self._job('new', category=self.category, age_days=10)
+        old = self._job('old', category=self.category, age_days=20)
+        # A shared skill makes a listing a candidate however old it is
+        skilled = self._job('skilled', 'python', category=self.category, age_days=30)
+        also_skilled = self._job('also-skilled', 'python', category=self.category, age_days=40)
+
+        rebuild_similar_jobs()
+        rebuilt = {job.pk: get_similar_job_ids(job) for job in (old, also_skilled)}
+        self.assertEqual(set(rebuilt[old.pk]), {newest.pk, new.pk})
+        self.assertEqual(rebuilt[also_skilled.pk][0], skilled.pk)
+        self.assertEqual(set(rebuilt[also_skilled.pk]), {skilled.pk, newest.pk, new.pk})
+
+        refresh_job(old)
+        refresh_job(also_skilled)
+        self.assertEqual(set(get_similar_job_ids(old)), {newest.pk, new.pk})
+        self.assertEqual(get_similar_job_ids(also_skilled)[0], skilled.pk)
+        self.assertEqual(set(get_similar_job_ids(also_skilled)), set(rebuilt[also_skilled.pk]))
+
+
+class SkillIndexTests(TestCase):
+    """The skill index follows listings and profiles and backs the recommendations."""
+
+    def setUp(self):
+        self.employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        self.company = Company.objects.create(
+            name='Acme', owner=self.employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+        self.seeker = get_user_model().objects.create_user(
+            username='seeker', email='seeker@example.com', password='password', user_type='job_seeker',
+            skills='Python, SQL'
+        )
+
+    def _job(self, slug, skills):
+        return JobListing.objects.create(
+            title=slug, slug=slug, company=self.company, posted_by=self.employer, description='Description',
+            requirements='Requirements', location='Accra', status='published', skills_required=skills
+        )
+
+    def _job_skills(self, job):
+        return set(JobSkill.objects.filter(job=job).values_list('skill', flat=True))
+
+    def test_saving_a_job_indexes_its_skills(self):
+        job = self._job('python', 'Python,  Machine   Learning, python')
+        self.assertEqual(self._job_skills(job), {'python', 'machine learning'})
+
+        job.skills_required = 'Go'
+        job.save()
+        self.assertEqual(self._job_skills(job), {'go'})
+
+    def test_saving_a_user_indexes_their_skills(self):
+        self.assertEqual(set(self.seeker.indexed_skills.values_list('skill', flat=True)), {'python', 'sql'})
+
+        self.seeker.skills = ''
+        self.seeker.save()
+        self.assertFalse(UserSkill.objects.filter(user=self.seeker).exists())
+
+    def test_recommendations_only_read_jobs_sharing_a_skill(self):
+        python = self._job('python', 'Python, Django')
+        self._job('go', 'Go')
+
+        recommendations = get_recommended_jobs(self.seeker)
+        self.assertEqual([item['job'] for item in recommendations], [python])
+        self.assertEqual(recommendations[0]['skills_match'], 50)
+        self.assertEqual(recommendations[0]['matching_skills'], ['python'])
+
+    def test_migration_indexes_existing_rows(self):
+        job = self._job('python', 'Python, Django')
+        JobSkill.objects.all().delete()
+        UserSkill.objects.all().delete()
+
+        migration = importlib.import_module('jobs.migrations.0035_backfill_skill_index')
+        migration.index_skills(apps, None)
+        self.assertEqual(self._job_skills(job), {'python', 'django'})
+        self.assertEqual(set(self.seeker.indexed_skills.values_list('skill', flat=True)), {'python', 'sql'})
+
+
+class JobSearchTests(TestCase):
+    """Keyword search is ranked by the full-text backend and timed for staff."""
+
+    def setUp(self):
+        self.employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        company = Company.objects.create(
+            name='Acme', owner=self.employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+        for slug, title, skills in [('python', 'Python Developer', 'Python, Django'),
+                                    ('sales', 'Sales Manager', 'Sales'),
+                                    ('data', 'Data Analyst', 'SQL, Python')]:
+            JobListing.objects.create(
+                title=title, slug=slug, company=company, posted_by=self.employer, description='Description',
+                requirements='Requirements', location='Accra', status='published', skills_required=skills
+            )
+
+    def _search(self, keyword):
+        return self.client.get(reverse('jobs:job_list'), {'keyword': keyword, 'sort': 'relevance'})
+
+    def test_keyword_search_ranks_title_matches_first(self):
+        response = self._search('python')
+        self.assertEqual([job.slug for job in response.context['jobs']], ['python', 'data'])
+
+    def test_latency_is_only_shown_to_staff(self):
+        self.assertNotContains(self._search('python'), ' ms)')
+
+        self.employer.is_staff = True
+        self.employer.save()
+        self.client.force_login(self.employer)
+        self.assertContains(self._search('python'), ' ms)')
+
+    def test_backend_is_chosen_again_until_the_fts_table_exists(self):
+        self.addCleanup(setattr, search, '_backend', search._backend)
+        self.addCleanup(setattr, search, '_backend_expires', search._backend_expires)
+        search._backend = None
+
+        with mock.patch.object(connection.introspection, 'table_names', return_value=[]) as table_names:
+            self.assertIs(type(search.get_search_backend()), search.BaseSearchBackend)
+            search.get_search_backend()
+        self.assertEqual(table_names.call_count, 1)
+        self.assertIs(type(search.get_search_backend()), search.BaseSearchBackend)
+
+        later = time.monotonic() + search.FTS_RECHECK_SECONDS
+        with mock.patch('jobs.search.time.monotonic', return_value=later):
+            self.assertIs(type(search.get_search_backend()), search.SQLiteFTSBackend)
+        self.assertIsNone(search._backend_expires)
+        self.assertIs(search.get_search_backend(), search._backend)
+
+
+class SiteCacheTests(TestCase):
+    """Page chrome comes from the site cache and follows admin changes."""
+
+    CHROME_TABLES = ('jobs_sitesettings', 'jobs_jobcategory', 'jobs_herosection')
+
+    def setUp(self):
+        site_cache.invalidate(site_cache.SITE_SETTINGS_KEY, site_cache.CATEGORIES_KEY)
+        site_cache.invalidate_hero_sections()
+        self.addCleanup(site_cache.invalidate, site_cache.SITE_SETTINGS_KEY, site_cache.CATEGORIES_KEY)
+        JobCategory.objects.create(name='Engineering', slug='engineering')
+
+    def test_job_list_chrome_is_cached(self):
+        self.client.get(reverse('jobs:job_list'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('jobs:job_list'))
+        self.assertEqual(response.status_code, 200)
+        chrome_queries = [
+            query['sql'] for query in queries.captured_queries
+            if any(f'"{table}"' in query['sql'] for table in self.CHROME_TABLES)
+        ]
+        self.assertEqual(chrome_queries, [])
+
+    def test_process_local_cache_keeps_entries_for_the_local_ttl(self):
+        self.addCleanup(site_cache.invalidate, 'site_cache:test')
+        loader = mock.Mock(return_value='value')
+        site_cache.get_or_load('site_cache:test', loader)
+        site_cache._local.clear()
+
+        later = time.time() + site_cache.DEFAULT_LOCAL_TTL + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            site_cache.get_or_load('site_cache:test', loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_saving_a_category_refreshes_the_navigation(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        self.assertEqual([category.slug for category in base_context(request)['categories']], ['engineering'])
+
+        JobCategory.objects.create(name='Design', slug='design')
+        self.assertEqual(
+            sorted(category.slug for category in base_context(request)['categories']), ['design', 'engineering']
+        )
+
+
+class JobListMatchBadgeTests(TestCase):
+    """Pro job seekers see a match badge on every job of the page, computed in one batch."""
+
+    def setUp(self):
+        employer = get_user_model().objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        company = Company.objects.create(
+            name='Acme', owner=employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+        self.jobs = [
+            JobListing.objects.create(
+                title=f'Python Developer {i}', slug=f'python-developer-{i}', company=company, posted_by=employer,
+                description='Build web services in Python and Django.', requirements='3 years of Python',
+                location='Accra', status='published', skills_required='Python, Django, SQL'
+            )
+            for i in range(3)
+        ]
+        self.seeker = get_user_model().objects.create_user(
+            username='seeker', email='seeker@example.com', password='password', user_type='job_seeker',
+            skills='Python, Django', is_pro=True
+        )
+
+    def test_badges_for_the_whole_page(self):
+        self.client.force_login(self.seeker)
+        process_profile = mock.patch.object(
+            JobQualificationChecker, '_process_user_profile', autospec=True,
+            side_effect=JobQualificationChecker._process_user_profile
+        )
+        with process_profile as processed:
+            response = self.client.get(reverse('jobs:job_list'))
+
+        self.assertEqual(processed.call_count, 1)
+        badges = response.context['match_badges']
+        self.assertEqual(set(badges), {job.pk for job in self.jobs})
+        for badge in badges.values():
+            self.assertTrue(badge['display'])
+            self.assertGreater(badge['skill_match'], 0)
+        self.assertContains(response, f'{badges[self.jobs[0].pk]["percentage"]}%')
+
+    def test_no_badges_without_pro(self):
+        self.seeker.is_pro = False
+        self.seeker.save()
+        self.client.force_login(self.seeker)
+        self.assertEqual(self.client.get(reverse('jobs:job_list')).context['match_badges'], {})
@@ -0,0 +1,187 @@
+"""
+Unread notification and message counts.
+
+The navigation badge counted the user's unread notifications with a query on
+every render. The inbox counted unread messages with a join over every
+message in every conversation, then ran two more queries per conversation for
+the other participant and the last message.
+
+Each user's unread counts now live in the cache. ``get_unread_counts`` reads
+both with one cache lookup and counts from the database only for a missing
+entry. Entries expire after ``UNREAD_COUNTS_TIMEOUT`` seconds, so any drift
+is corrected from the database. A process-local cache (``LocMemCache``, the
+default without Redis) only sees the changes made by its own process, so
+these entries expire after ``LOCAL_TIMEOUT`` seconds instead. New
+notifications and messages increment the counts (see ``jobs.signals`` and
+``messaging.signals``). ``mark_notifications_read`` and
+``mark_messages_read`` decrement them by the number of rows they change.
+Other saves of a notification or message drop the affected entries, which are
+then counted again on the next read.
+
+The inbox reads each conversation's last message through
+``Conversation.last_message``, which ``messaging.signals`` moves forward
+whenever a message is sent.
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from .site_cache import is_process_local
+
+DEFAULT_TIMEOUT = 60 * 60
+LOCAL_TIMEOUT = 10
+
+NOTIFICATIONS = 'notifications'
+MESSAGES = 'messages'
+
+UNREAD_COUNT_KEY = 'unread_counts:{}:{}'
+
+UnreadCounts = namedtuple('UnreadCounts', ['notifications', 'messages'])
+
+
+def unread_count_key(kind, user_id):
+    return UNREAD_COUNT_KEY.format(kind, user_id)
+
+
+def _timeout():
+    timeout = getattr(settings, 'UNREAD_COUNTS_TIMEOUT', DEFAULT_TIMEOUT)
+    if is_process_local():
+        return min(timeout, LOCAL_TIMEOUT)
+    return timeout
+
+
+def count_unread_notifications(user_id):
+    """Count a user's unread notifications in the database."""
+    from .models import Notification
+    return Notification.objects.filter(user_id=user_id, is_read=False).count()
+
+
+def count_unread_messages(user_id):
+    """Count unread messages sent to a user in the database."""
+    from messaging.models import Message
+    return Message.objects.filter(
+        conversation__participants=user_id, is_read=False
+    ).exclude(sender_id=user_id).count()
+
+
+_COUNTERS = {
+    NOTIFICATIONS: count_unread_notifications,
+    MESSAGES: count_unread_messages,
+}
+
+
+def get_unread_counts(user_id):
+    """
+    Return a user's unread notification and message counts.
+
+    Args:
+        user_id: Primary key of the user
+
+    Returns:
+        UnreadCounts: Cached counts, read from the database where missing
+    """
+    keys = {kind: unread_count_key(kind, user_id) for kind in _COUNTERS}
+    cached = cache.get_many(keys.values())
+
+    counts = {}
+    missing = {}
+    for kind, key in keys.items():
+        if key in cached:
+            counts[kind] = cached[key]
+        else:
+            counts[kind] = missing[key] = _COUNTERS[kind](user_id)
+    if missing:
+        cache.set_many(missing, _timeout())
+    return UnreadCounts(counts[NOTIFICATIONS], counts[MESSAGES])
+
+
+def _adjust(kind, user_ids, delta):
+    """Add ``delta`` to the cached counts once the current transaction commits."""
+    user_ids = list(user_ids)
+
+    def apply():
+        for user_id in user_ids:
+            key = unread_count_key(kind, user_id)
+            try:
+                value = cache.incr(key, delta)
+            except ValueError:
+                # Not cached; it is counted from the database on the next read
+                continue
+            if value < 0:
+                cache.delete(key)
+
+    if user_ids and delta:
+        transaction.on_commit(apply)
+
+
+def invalidate(user_ids, kinds=(NOTIFICATIONS, MESSAGES)):
+    """Drop cached counts so they are read from the database again."""
+    keys = [unread_count_key(kind, user_id) for kind in kinds for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def notification_created(notification):
+    if not notification.is_read:
+        _adjust(NOTIFICATIONS, [notification.user_id], 1)
+
+
+def notification_changed(notification):
+    invalidate([notification.user_id], kinds=(NOTIFICATIONS,))
+
+
+def notification_deleted(notification):
+    if not notification.is_read:
+        _adjust(NOTIFICATIONS, [notification.user_id], -1)
+
+
+def _message_recipients(message):
+    return get_user_model().objects.filter(
+        conversations=message.conversation_id
+    ).exclude(pk=message.sender_id).values_list('pk', flat=True)
+
+
+def message_created(message):
+    if not message.is_read:
+        _adjust(MESSAGES, _message_recipients(message), 1)
+
+
+def message_changed(message):
+    invalidate(_message_recipients(message), kinds=(MESSAGES,))
+
+
+def mark_notifications_read(user, notifications=None):
+    """
+    Mark a user's unread notifications as read.
+
+    Args:
+        user: Owner of the notifications
+        notifications (QuerySet, optional): Limit to these notifications
+
+    Returns:
+        int: Number of notifications marked read
+    """
+    from .models import Notification
+    if notifications is None:
+        notifications = Notification.objects.all()
+    count = notifications.filter(user=user, is_read=False).update(is_read=True)
+    _adjust(NOTIFICATIONS, [user.pk], -count)
+    return count
+
+
+def mark_messages_read(user, conversation):
+    """
+    Mark the messages other participants sent in a conversation as read by ``user``.
+
+    Returns:
+        int: Number of messages marked read
+    """
+    from messaging.models import Message
+    count = Message.objects.filter(
+        conversation=conversation, is_read=False
+    ).exclude(sender=user).update(is_read=True)
+    _adjust(MESSAGES, [user.pk], -count)
+    return count
@@ -0,0 +1,268 @@
+"""
+Write-behind buffer for job view analytics.
+
+``job_detail`` used to save the whole ``JobListing`` row and rewrite the
+``JobAnalytics`` JSON blobs on every page view. Views are now recorded in an
+in-process buffer and a background flusher applies them in aggregate: one
+``F()`` increment per distinct view count for ``views_count`` and a single
+locked ``bulk_update`` for the analytics rows.
+
+Two settings control the trade-off between write load and durability:
+
+``JOB_VIEW_FLUSH_INTERVAL``
+    Seconds between flushes. ``0`` flushes synchronously on every view.
+``JOB_VIEW_MAX_BUFFERED_EVENTS``
+    Upper bound on the number of buffered views. Reaching it wakes the
+    flusher early, so at most this many views are lost if the process dies.
+    Views recorded while the buffer is still full are dropped; the request
+    never waits for a flush.
+
+Events whose write fails are put back into the buffer and retried with the
+next flush.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 30
+DEFAULT_MAX_BUFFERED_EVENTS = 500
+
+
+class _JobViews:
+    """Aggregated, not yet persisted view events for one job."""
+
+    __slots__ = ('views', 'unique_views', 'referral_sources', 'daily_views')
+
+    def __init__(self):
+        self.views = 0
+        self.unique_views = 0
+        self.referral_sources = Counter()
+        self.daily_views = Counter()
+
+    def merge(self, other):
+        self.views += other.views
+        self.unique_views += other.unique_views
+        self.referral_sources.update(other.referral_sources)
+        self.daily_views.update(other.daily_views)
+
+
+class JobViewBuffer:
+    """Thread-safe buffer of job view events with a background flusher."""
+
+    def __init__(self, flush_interval=None, max_events=None):
+        self._flush_interval = flush_interval
+        self._max_events = max_events
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = defaultdict(_JobViews)
+        self._event_count = 0
+        self._thread = None
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, 'JOB_VIEW_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+    @property
+    def max_events(self):
+        if self._max_events is not None:
+            return self._max_events
+        return getattr(settings, 'JOB_VIEW_MAX_BUFFERED_EVENTS', DEFAULT_MAX_BUFFERED_EVENTS)
+
+    @property
+    def pending_events(self):
+        return self._event_count
+
+    def record(self, job_id, day, unique=False, referrer_domain=None):
+        """
+        Buffer a single job view.
+
+        Args:
+            job_id: Primary key of the viewed job listing
+            day: ISO date string used for the daily views bucket
+            unique: Whether this is the first view in the visitor's session
+            referrer_domain: Domain of the HTTP referrer, if any
+        """
+        if self._event_count >= self.max_events:
+            # The flusher has not caught up, or the last write failed
+            self._wake.set()
+            logger.warning("Job view buffer is full, dropping a view of job %s", job_id)
+            return
+
+        with self._lock:
+            entry = self._pending[job_id]
+            entry.views += 1
+            if unique:
+                entry.unique_views += 1
+            if referrer_domain:
+                entry.referral_sources[referrer_domain] += 1
+            entry.daily_views[day] += 1
+            self._event_count += 1
+            event_count = self._event_count
+
+        if self.flush_interval <= 0:
+            self.flush()
+            return
+
+        self._ensure_flusher()
+        if event_count >= self.max_events:
+            self._wake.set()
+
+    def flush(self):
+        """Persist all buffered events. Returns the number of events written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, defaultdict(_JobViews)
+                event_count, self._event_count = self._event_count, 0
+
+            if not pending:
+                return 0
+
+            try:
+                self._write(pending)
+            except Exception:
+                logger.exception("Failed to flush %d buffered job view events", event_count)
+                self._restore(pending, event_count)
+                return 0
+
+            return event_count
+
+    def discard(self):
+        """Drop all buffered events without writing them. Returns how many were dropped."""
+        with self._lock:
+            self._pending = defaultdict(_JobViews)
+            event_count, self._event_count = self._event_count, 0
+        return event_count
+
+    def _restore(self, pending, event_count):
+        # Views recorded during the failed write stay in the buffer too
+        with self._lock:
+            for job_id, entry in pending.items():
+                self._pending[job_id].merge(entry)
+            self._event_count += event_count
+
+    def _write(self, pending):
+        from .models import JobAnalytics, JobListing
+
+        job_ids = list(pending)
+
+        with transaction.atomic():
+            # Jobs sharing the same increment are updated with a single query.
+            by_increment = defaultdict(list)
+            for job_id, entry in pending.items():
+                by_increment[entry.views].append(job_id)
+            for increment, ids in by_increment.items():
+                JobListing.objects.filter(pk__in=ids).update(views_count=F('views_count') + increment)
+
+            # Jobs deleted since the view was recorded are silently skipped.
+            existing_jobs = set(JobListing.objects.filter(pk__in=job_ids).values_list('pk', flat=True))
+            JobAnalytics.objects.bulk_create(
+                [JobAnalytics(job_id=job_id) for job_id in existing_jobs],
+                ignore_conflicts=True
+            )
+
+            analytics_rows = list(
+                JobAnalytics.objects.select_for_update().filter(job_id__in=existing_jobs)
+            )
+            for analytics in analytics_rows:
+                entry = pending[analytics.job_id]
+                analytics.total_views = F('total_views') + entry.views
+                analytics.unique_views = F('unique_views') + entry.unique_views
+                analytics.referral_sources = _merge_counts(analytics.referral_sources, entry.referral_sources)
+                analytics.daily_views = _merge_counts(analytics.daily_views, entry.daily_views)
+
+            JobAnalytics.objects.bulk_update(
+                analytics_rows,
+                ['total_views', 'unique_views', 'referral_sources', 'daily_views']
+            )
+
+    def _ensure_flusher(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='job-view-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        from django.db import close_old_connections
+
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            close_old_connections()
+
+
+def _merge_counts(stored, increments):
+    merged = dict(stored or {})
+    for key, count in increments.items():
+        merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+view_buffer = JobViewBuffer()
+
+
+def _flush_at_exit():
+    """Flush whatever is left when the worker shuts down cleanly."""
+    from django.db import DatabaseError, connection
+    from .models import JobListing
+
+    if not view_buffer.pending_events:
+        return
+    # The database may be gone by now, e.g. a test database destroyed at the end of the run
+    try:
+        if JobListing._meta.db_table not in connection.introspection.table_names():
+            return
+    except DatabaseError:
+        return
+    view_buffer.flush()
+
+
+atexit.register(_flush_at_exit)
+
+
+def record_job_view(job, request):
+    """
+    Record a view of ``job`` without touching the database.
+
+    Session bookkeeping (unique views and the first-view time used by the
+    application analytics) still happens here; the counters themselves are
+    written later by the buffer's flusher.
+    """
+    from django.utils import timezone
+
+    unique = False
+    session_key = f'viewed_job_{job.id}'
+    first_view_time_key = f'first_viewed_job_{job.id}_time'
+
+    if not request.session.get(session_key):
+        request.session[session_key] = True
+        unique = True
+
+        # Store the first view time for calculating time to apply later
+        if not request.session.get(first_view_time_key):
+            request.session[first_view_time_key] = timezone.now().isoformat()
+
+    referrer = request.META.get('HTTP_REFERER', '')
+    referrer_domain = None
+    if referrer:
+        referrer_domain = referrer.split('/')[2] if '/' in referrer else referrer
+
+    view_buffer.record(
+        job.id,
+        timezone.now().date().isoformat(),
+        unique=unique,
+        referrer_domain=referrer_domain,
+    )
@@ -9,6 +9,7 @@ from django.urls import reverse
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 import json
+import time
 from django.utils import timezone
 from django.template.loader import render_to_string
 from django.core.mail import send_mail
@@ -16,11 +17,13 @@ from django.conf import settings
 
 from .models import (
     JobListing, JobCategory, JobApplication, SavedJob, Notification,
-    ApplicationMessage, BlockedUser, Newsletter, Testimonial, TeamMember, TrustedCompany,
+    ApplicationMessage, BlockedUser, Newsletter, Testimonial,
     JobPackage, JobRenewal, JobAnalytics, LegalPage, Company, CompanyConnection, CompanyFollower,
     SiteSettings
 )
 from .forms import JobListingForm, JobApplicationForm, JobSearchForm
+from .company_stats import attach_company_stats, refresh_company_stats
+from .unread_counts import get_unread_counts, mark_notifications_read
 
 def home(request):
     """Home page view with featured jobs and search functionality."""
@@ -28,50 +31,27 @@ def home(request):
     from .models import HeroSection
     hero_section = HeroSection.get_section('home')
 
-    featured_jobs = JobListing.objects.filter(status='published', is_featured=True).order_by('-created_at')[:8]
-    recent_jobs = JobListing.objects.filter(status='published').order_by('-created_at')[:10]
-    categories = JobCategory.objects.all()
-
-    # Count jobs by category
-    category_counts = {}
-    for category in categories:
-        category_counts[category.id] = JobListing.objects.filter(category=category, status='published').count()
-
-    # Get statistics for the hero section
-    total_jobs = JobListing.objects.filter(status='published').count()
-    total_companies = JobListing.objects.filter(status='published').values('company').distinct().count()
-    total_categories = categories.count()
-
-    # Get testimonials if available
-    testimonials = []
-    if 'Testimonial' in globals():
-        testimonials = Testimonial.objects.filter(is_active=True).order_by('-created_at')[:5]
-
-    # Get team members if available
-    team_members = []
-    if 'TeamMember' in globals():
-        team_members = TeamMember.objects.filter(is_active=True).order_by('order')
-
-    # Get trusted companies if available
-    trusted_companies = []
-    if 'TrustedCompany' in globals():
-        trusted_companies = TrustedCompany.objects.filter(is_active=True).order_by('order')
+    # Statistics and featured content come from a cached snapshot
+    from .homepage import get_homepage_snapshot
+    from .site_cache import get_categories
+    snapshot = get_homepage_snapshot()
+    categories = get_categories()
 
     # Search form
     search_form = JobSearchForm()
 
     context = {
-        'featured_jobs': featured_jobs,
-        'recent_jobs': recent_jobs,
+        'featured_jobs': snapshot['featured_jobs'],
+        'recent_jobs': snapshot['recent_jobs'],
         'categories': categories,
-        'category_counts': category_counts,
+        'category_counts': snapshot['category_counts'],
         'search_form': search_form,
-        'total_jobs': total_jobs,
-        'total_companies': total_companies,
-        'total_categories': total_categories,
-        'testimonials': testimonials,
-        'team_members': team_members,
-        'trusted_companies': trusted_companies,
+        'total_jobs': snapshot['total_jobs'],
+        'total_companies': snapshot['total_companies'],
+        'total_categories': snapshot['total_categories'],
+        'testimonials': snapshot['testimonials'],
+        'team_members': snapshot['team_members'],
+        'trusted_companies': snapshot['trusted_companies'],
         'hero_section': hero_section,
     }
     return render(request, 'jobs/home.html', context)
@@ -83,9 +63,11 @@ def job_list(request):
     hero_section = HeroSection.get_section('jobs')
 
     jobs = JobListing.objects.filter(status='published').order_by('-created_at')
-    categories = JobCategory.objects.all()
+    from .site_cache import get_categories
+    categories = get_categories()
 
     # Process search form
+    is_keyword_search = False
     form = JobSearchForm(request.GET)
     if form.is_valid():
         keyword = form.cleaned_data.get('keyword')
@@ -103,12 +85,9 @@ def job_list(request):
 
         # Apply filters
         if keyword:
-            jobs = jobs.filter(
-                Q(title__icontains=keyword) |
-                Q(description__icontains=keyword) |
-                Q(company__name__icontains=keyword) |
-                Q(skills_required__icontains=keyword)
-            )
+            from .search import get_search_backend
+            jobs = get_search_backend().search(jobs, keyword)
+            is_keyword_search = True
 
         if location:
             jobs = jobs.filter(location__icontains=location)
@@ -164,6 +143,8 @@ def job_list(request):
         jobs = jobs.order_by('-salary_max', '-salary_min')
     elif sort_option == 'salary_low':
         jobs = jobs.order_by('salary_min', 'salary_max')
+    elif sort_option == 'relevance' and is_keyword_search:
+        jobs = jobs.order_by('-search_rank', '-created_at')
     else:  # newest first (default)
         jobs = jobs.order_by('-created_at')
 
@@ -173,18 +154,40 @@ def job_list(request):
         saved_job_ids = SavedJob.objects.filter(user=request.user).values_list('job_id', flat=True)
         saved_jobs = JobListing.objects.filter(id__in=saved_job_ids)
 
-    # Pagination
+    # Pagination; the search itself runs here, so time it for monitoring
+    search_started = time.perf_counter()
     paginator = Paginator(jobs, 10)  # Show 10 jobs per page
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    len(page_obj)  # Evaluate the page query
+    search_latency_ms = (time.perf_counter() - search_started) * 1000
+
+    if is_keyword_search:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.info(f"Job search for {form.cleaned_data.get('keyword')!r} returned {paginator.count} results in {search_latency_ms:.1f} ms")
+
+    # Match badges for pro job seekers, calculated for the whole page at once
+    match_badges = {}
+    if request.user.is_authenticated and request.user.user_type == 'job_seeker' and request.user.is_pro:
+        try:
+            from subscriptions.job_qualification_checker import JobQualificationChecker
+            match_badges = JobQualificationChecker().get_match_badges(request.user, page_obj)
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Error calculating match badges: {str(e)}")
 
     context = {
         'jobs': page_obj,
         'form': form,
         'categories': categories,
-        'total_jobs': jobs.count(),
+        'total_jobs': paginator.count,
         'saved_jobs': saved_jobs,
         'hero_section': hero_section,
+        'match_badges': match_badges,
+        'is_keyword_search': is_keyword_search,
+        'search_latency_ms': search_latency_ms,
     }
     return render(request, 'jobs/job_list.html', context)
 
@@ -192,50 +195,9 @@ def job_detail(request, slug):
     """View for displaying job details and handling job applications."""
     job = get_object_or_404(JobListing, slug=slug, status='published')
 
-    # Increment view count
-    job.views_count += 1
-    job.save()
-
-    # Track analytics
-    from jobs.models import JobAnalytics
-    import datetime
-    import json
-
-    analytics, created = JobAnalytics.objects.get_or_create(job=job)
-
-    # Update view statistics
-    analytics.total_views += 1
-
-    # Track unique views (based on session)
-    session_key = f'viewed_job_{job.id}'
-    first_view_time_key = f'first_viewed_job_{job.id}_time'
-
-    if not request.session.get(session_key):
-        request.session[session_key] = True
-        request.session.modified = True
-        analytics.unique_views += 1
-
-        # Store the first view time for calculating time to apply later
-        if not request.session.get(first_view_time_key):
-            request.session[first_view_time_key] = timezone.now().isoformat()
-            request.session.modified = True
-
-    # Track referral source if available
-    referrer = request.META.get('HTTP_REFERER', '')
-    if referrer:
-        referral_sources = analytics.referral_sources or {}
-        domain = referrer.split('/')[2] if '/' in referrer else referrer
-        referral_sources[domain] = referral_sources.get(domain, 0) + 1
-        analytics.referral_sources = referral_sources
-
-    # Track daily views
-    today = timezone.now().date().isoformat()
-    daily_views = analytics.daily_views or {}
-    daily_views[today] = daily_views.get(today, 0) + 1
-    analytics.daily_views = daily_views
-
-    # Save analytics
-    analytics.save()
+    # Buffer view analytics; they are written in aggregate by the flusher
+    from jobs.view_tracker import record_job_view
+    record_job_view(job, request)
 
     # Check if user has saved this job
     is_saved = False
@@ -404,8 +366,11 @@ def job_detail(request, slug):
                     daily_applications[today] = daily_applications.get(today, 0) + 1
                     analytics.daily_applications = daily_applications
 
-                    # Save analytics
-                    analytics.save()
+                    # Save analytics; view counters are owned by the view tracker flusher
+                    analytics.save(update_fields=[
+                        'total_applications', 'application_rate', 'time_to_first_application',
+                        'avg_time_to_apply', 'applicant_locations', 'daily_applications'
+                    ])
 
                     messages.success(request, _('Your application has been submitted successfully! You can track its status in your dashboard.'))
                     return redirect('jobs:job_seeker_dashboard')
@@ -678,7 +643,7 @@ def notifications(request):
 
     # Mark all as read if requested
     if request.GET.get('mark_all_read'):
-        notifications.update(is_read=True)
+        mark_notifications_read(request.user)
         messages.success(request, _('All notifications marked as read.'))
         return redirect('jobs:notifications')
 
@@ -689,7 +654,7 @@ def notifications(request):
 
     context = {
         'notifications': page_obj,
-        'unread_count': notifications.filter(is_read=False).count(),
+        'unread_count': get_unread_counts(request.user.pk).notifications,
         'is_paginated': page_obj.has_other_pages(),
         'page_obj': page_obj,
     }
@@ -705,8 +670,7 @@ def notifications(request):
 def mark_notification_read(request, notification_id):
     """AJAX view for marking a notification as read."""
     notification = get_object_or_404(Notification, id=notification_id, user=request.user)
-    notification.is_read = True
-    notification.save()
+    mark_notifications_read(request.user, Notification.objects.filter(pk=notification.pk))
     return JsonResponse({'status': 'success'})
 
 def about(request):
@@ -1090,8 +1054,10 @@ def bulk_update_job_status(request):
                     job.status = new_status
                     job.save()
         else:
-            # Simple status update
+            # Simple status update; update() skips the company counter signals
+            company_ids = set(jobs.values_list('company_id', flat=True))
             jobs.update(status=new_status)
+            refresh_company_stats(company_ids)
 
         status_display = dict(JobListing.STATUS_CHOICES)[new_status]
         messages.success(request, _(f'{count} jobs updated to {status_display} successfully!'))
@@ -1691,7 +1657,8 @@ def my_followed_companies(request):
     # Get all companies followed by the user
     followed_companies = CompanyFollower.objects.filter(
         user=request.user
-    ).select_related('company').order_by('-created_at')
+    ).select_related('company__stats').order_by('-created_at')
+    attach_company_stats(follower.company for follower in followed_companies)
 
     context = {
         'followed_companies': followed_companies,
@@ -8,10 +8,11 @@ from django.http import JsonResponse
 
 from .models import Company, JobListing
 from .forms import CompanyForm
+from .company_stats import attach_company_stats
 
 def company_list(request):
     """View for listing all approved companies."""
-    companies = Company.objects.filter(status='approved').order_by('-is_featured', '-created_at')
+    companies = Company.objects.filter(status='approved').select_related('stats').order_by('-is_featured', '-created_at')
 
     # Search functionality
     search_query = request.GET.get('q', '')
@@ -40,6 +41,7 @@ def company_list(request):
     paginator = Paginator(companies, 12)  # Show 12 companies per page
     page_number = request.GET.get('page', 1)
     companies_page = paginator.get_page(page_number)
+    companies_page.object_list = attach_company_stats(companies_page.object_list)
 
     context = {
         'companies': companies_page,
@@ -54,7 +56,7 @@ def company_list(request):
 
 def company_detail(request, slug):
     """View for company details and job listings."""
-    company = get_object_or_404(Company, slug=slug, status='approved')
+    company = get_object_or_404(Company.objects.select_related('stats'), slug=slug, status='approved')
 
     # Get company's active job listings
     from django.utils import timezone
@@ -85,7 +87,8 @@ def company_detail(request, slug):
         status='approved'
     ).exclude(
         id=company.id
-    ).order_by('-is_featured')[:4]
+    ).select_related('stats').order_by('-is_featured')[:4]
+    similar_companies = attach_company_stats(similar_companies)
 
     context = {
         'company': company,
@@ -173,7 +176,9 @@ def significant_changes(company, cleaned_data):
 @login_required
 def my_companies(request):
     """View for listing companies owned by the current user."""
-    companies = Company.objects.filter(owner=request.user).order_by('-created_at')
+    companies = attach_company_stats(
+        Company.objects.filter(owner=request.user).select_related('stats').order_by('-created_at')
+    )
 
     context = {
         'companies': companies,
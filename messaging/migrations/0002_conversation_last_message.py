@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-16 22:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def set_last_messages(apps, schema_editor):
+    Conversation = apps.get_model('messaging', 'Conversation')
+    Message = apps.get_model('messaging', 'Message')
+    Conversation.objects.update(last_message=Subquery(
+        Message.objects.filter(conversation=OuterRef('pk')).order_by('-created_at', '-pk').values('pk')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, help_text='Most recent message, kept up to date by messaging.signals', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.message'),
+        ),
+        migrations.RunPython(set_last_messages, migrations.RunPython.noop),
+    ]
@@ -5,6 +5,8 @@ from django.utils.translation import gettext_lazy as _
 class Conversation(models.Model):
     """Model for conversations between users."""
     participants = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='conversations')
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+                                     help_text=_('Most recent message, kept up to date by messaging.signals'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -20,6 +22,8 @@ class Conversation(models.Model):
 
     def get_last_message(self):
         """Get the last message in a conversation."""
+        if self.last_message_id:
+            return self.last_message
         return self.messages.order_by('-created_at').first()
 
 class Message(models.Model):
@@ -32,6 +36,12 @@ class Message(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # A conversation's messages in order
+            models.Index(fields=['conversation', 'created_at'], name='messaging_msg_conv_created'),
+            # Unread messages only, counted per conversation for the inbox
+            models.Index(fields=['conversation'], condition=models.Q(is_read=False), name='messaging_msg_conv_unread'),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender} at {self.created_at.strftime('%Y-%m-%d %H:%M')}"
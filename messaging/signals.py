@@ -0,0 +1,35 @@
+from django.db.models import OuterRef, Q, Subquery
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jobs import unread_counts
+
+from .models import Conversation, Message
+
+
+@receiver(post_save, sender=Message)
+def update_conversation_on_message(sender, instance, created=False, raw=False, **kwargs):
+    """Point the conversation at a new message and count it as unread for the other participants."""
+    if raw:
+        return
+    if created:
+        Conversation.objects.filter(
+            Q(last_message__isnull=True) | Q(last_message_id__lt=instance.pk), pk=instance.conversation_id
+        ).update(
+            last_message=instance, updated_at=instance.created_at
+        )
+        unread_counts.message_created(instance)
+    else:
+        unread_counts.message_changed(instance)
+
+
+@receiver(post_delete, sender=Message)
+def update_conversation_on_message_delete(sender, instance, **kwargs):
+    """Point the conversation back at its latest remaining message, and recount unread messages."""
+    Conversation.objects.filter(pk=instance.conversation_id, last_message__isnull=True).update(
+        last_message=Subquery(
+            Message.objects.filter(conversation=OuterRef('pk')).order_by('-created_at', '-pk').values('pk')[:1]
+        )
+    )
+    if not instance.is_read:
+        unread_counts.message_changed(instance)
@@ -1,3 +1,119 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from jobs.context_processors import base_context
+from jobs.models import Notification
+from jobs import unread_counts
+from jobs.unread_counts import get_unread_counts, mark_notifications_read
+
+from .models import Conversation, Message
+
+
+class UnreadCountTests(TestCase):
+    """Unread counts come from the cache and follow creates and mark-read."""
+
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username='ama', email='ama@example.com', password='password')
+        self.others = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='password')
+            for i in range(6)
+        ]
+
+    def _notify(self, count=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                Notification.objects.create(user=self.user, notification_type='system', title=f'N{i}', message='Hello')
+
+    def _conversation(self, other, messages=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            conversation = Conversation.objects.create()
+            conversation.participants.add(self.user, other)
+            for i in range(messages):
+                Message.objects.create(conversation=conversation, sender=other, content=f'Message {i}')
+        return conversation
+
+    def test_notification_badge_is_read_from_the_cache(self):
+        self._notify(2)
+        self.assertEqual(get_unread_counts(self.user.pk).notifications, 2)
+
+        self._notify()
+        request = RequestFactory().get('/')
+        request.user = self.user
+        with CaptureQueriesContext(connection) as queries:
+            context = base_context(request)
+        self.assertEqual(context['unread_notifications_count'], 3)
+        self.assertFalse([q for q in queries.captured_queries if 'jobs_notification' in q['sql']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(mark_notifications_read(self.user, Notification.objects.filter(title='N1')), 1)
+        self.assertEqual(get_unread_counts(self.user.pk).notifications, 2)
+
+        # Saving a notification directly is picked up from the database
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = Notification.objects.filter(is_read=False).first()
+            notification.is_read = True
+            notification.save()
+        self.assertEqual(get_unread_counts(self.user.pk).notifications, 1)
+
+    def test_process_local_cache_reconciles_within_seconds(self):
+        self._notify(2)
+        self.assertEqual(get_unread_counts(self.user.pk).notifications, 2)
+        # Another process marks one read; this process's cache is not told
+        Notification.objects.filter(title='N0').update(is_read=True)
+
+        later = time.time() + unread_counts.LOCAL_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertEqual(get_unread_counts(self.user.pk).notifications, 1)
+
+    def test_shared_cache_keeps_counts_for_the_full_timeout(self):
+        self._notify(2)
+        with mock.patch.object(unread_counts, 'is_process_local', return_value=False):
+            self.assertEqual(get_unread_counts(self.user.pk).notifications, 2)
+        Notification.objects.filter(title='N0').update(is_read=True)
+
+        later = time.time() + unread_counts.LOCAL_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertEqual(get_unread_counts(self.user.pk).notifications, 2)
+
+    def test_message_counts_and_last_message(self):
+        conversation = self._conversation(self.others[0], messages=3)
+        self.assertEqual(get_unread_counts(self.user.pk).messages, 3)
+        self.assertEqual(get_unread_counts(self.others[0].pk).messages, 0)
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.last_message.content, 'Message 2')
+
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('messaging:conversation_detail', args=[conversation.pk]))
+        self.assertEqual(get_unread_counts(self.user.pk).messages, 0)
+
+    def test_inbox_query_count_does_not_grow_with_conversations(self):
+        self.client.force_login(self.user)
+
+        def render_inbox():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('messaging:inbox'))
+            return response, len(queries.captured_queries)
+
+        for other in self.others[:2]:
+            self._conversation(other, messages=2)
+        render_inbox()
+        _, few = render_inbox()
+        for other in self.others[2:]:
+            self._conversation(other)
+        response, many = render_inbox()
+
+        self.assertEqual(few, many)
+        items = response.context['conversation_data']
+        self.assertEqual([item['other_user'] for item in items], list(reversed(self.others)))
+        self.assertEqual([item['unread_count'] for item in items], [1, 1, 1, 1, 2, 2])
+        self.assertEqual(response.context['unread_messages_count'], 8)
@@ -2,11 +2,13 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Q, Count, Max, F, OuterRef, Subquery
+from django.db.models import Q, Count, Prefetch
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.contrib.auth import get_user_model
 
+from jobs.unread_counts import mark_messages_read
+
 from .models import Conversation, Message, Connection
 from .forms import MessageForm, ConnectionRequestForm
 
@@ -15,27 +17,30 @@ User = get_user_model()
 @login_required
 def inbox(request):
     """View for displaying user's message inbox."""
-    # Get all conversations for the current user
-    conversations = Conversation.objects.filter(participants=request.user)
-
-    # Annotate conversations with unread message count and last message info
-    conversations = conversations.annotate(
-        unread_count=Count('messages', filter=Q(messages__is_read=False) & ~Q(messages__sender=request.user)),
-        last_message_time=Max('messages__created_at')
-    ).order_by('-last_message_time')
+    # Get all conversations for the current user, with their last message
+    # and the other participants
+    conversations = Conversation.objects.filter(
+        participants=request.user, last_message__isnull=False
+    ).select_related('last_message').prefetch_related(
+        Prefetch('participants', queryset=User.objects.exclude(pk=request.user.pk), to_attr='other_participants')
+    ).order_by('-last_message__created_at')
+
+    # Unread message counts for all of them in one query
+    unread_counts = dict(
+        Message.objects.filter(conversation__participants=request.user, is_read=False).exclude(
+            sender=request.user
+        ).values_list('conversation').annotate(total=Count('pk'))
+    )
 
     # Prepare conversation data for the template
     conversation_data = []
     for conversation in conversations:
-        other_user = conversation.get_other_participant(request.user)
-        last_message = conversation.get_last_message()
-
-        if other_user and last_message:
+        if conversation.other_participants:
             conversation_data.append({
                 'conversation': conversation,
-                'other_user': other_user,
-                'last_message': last_message,
-                'unread_count': conversation.unread_count
+                'other_user': conversation.other_participants[0],
+                'last_message': conversation.last_message,
+                'unread_count': unread_counts.get(conversation.pk, 0)
             })
 
     context = {
@@ -52,7 +57,7 @@ def conversation_detail(request, conversation_id):
     other_user = conversation.get_other_participant(request.user)
 
     # Mark all messages from the other user as read
-    Message.objects.filter(conversation=conversation, sender=other_user, is_read=False).update(is_read=True)
+    mark_messages_read(request.user, conversation)
 
     # Get all messages in the conversation
     messages_list = conversation.messages.all()
@@ -223,3 +223,107 @@ LOGGING = {
         },
     },
 }
+
+# Job view analytics are buffered in memory and written in aggregate.
+# JOB_VIEW_FLUSH_INTERVAL is in seconds (0 writes on every view) and
+# JOB_VIEW_MAX_BUFFERED_EVENTS caps how many views can be lost on a crash.
+JOB_VIEW_FLUSH_INTERVAL = env.int('JOB_VIEW_FLUSH_INTERVAL', default=30)
+JOB_VIEW_MAX_BUFFERED_EVENTS = env.int('JOB_VIEW_MAX_BUFFERED_EVENTS', default=500)
+
+# Site settings, categories and hero sections are cached per process for
+# SITE_CACHE_LOCAL_TTL seconds and in the shared cache for SITE_CACHE_TIMEOUT
+# (capped at SITE_CACHE_LOCAL_TTL with a process-local cache such as LocMemCache).
+SITE_CACHE_LOCAL_TTL = env.int('SITE_CACHE_LOCAL_TTL', default=60)
+SITE_CACHE_TIMEOUT = env.int('SITE_CACHE_TIMEOUT', default=3600)
+
+# Seconds before the home page snapshot is rebuilt even without job changes
+# (capped at SITE_CACHE_LOCAL_TTL with a process-local cache)
+HOMEPAGE_SNAPSHOT_TIMEOUT = env.int('HOMEPAGE_SNAPSHOT_TIMEOUT', default=900)
+
+# Bulk application screening runs in a pool of BULK_SCREENING_MAX_WORKERS
+# processes (0 or 1 screens in the calling process) with at most
+# BULK_SCREENING_MAX_PENDING applications in flight.
+BULK_SCREENING_MAX_WORKERS = env.int('BULK_SCREENING_MAX_WORKERS', default=4)
+BULK_SCREENING_MAX_PENDING = env.int('BULK_SCREENING_MAX_PENDING', default=32)
+
+# Unread notification and message counts are cached per user and read again
+# from the database after UNREAD_COUNTS_TIMEOUT seconds (at most 10 seconds
+# with a process-local cache such as LocMemCache).
+UNREAD_COUNTS_TIMEOUT = env.int('UNREAD_COUNTS_TIMEOUT', default=3600)
+
+# Custom admin lists show ADMIN_LIST_PER_PAGE rows per page (?per_page= can
+# ask for up to 200).
+ADMIN_LIST_PER_PAGE = env.int('ADMIN_LIST_PER_PAGE', default=50)
+
+# Paystack calls share a pooled session. They time out after
+# PAYSTACK_CONNECT_TIMEOUT/PAYSTACK_READ_TIMEOUT seconds, and failed
+# connections and GETs answered with 429/5xx are retried up to
+# PAYSTACK_MAX_RETRIES times. Successful verifications are cached for
+# PAYSTACK_VERIFY_CACHE_TIMEOUT seconds.
+PAYSTACK_CONNECT_TIMEOUT = env.float('PAYSTACK_CONNECT_TIMEOUT', default=3.05)
+PAYSTACK_READ_TIMEOUT = env.float('PAYSTACK_READ_TIMEOUT', default=15)
+PAYSTACK_MAX_RETRIES = env.int('PAYSTACK_MAX_RETRIES', default=3)
+PAYSTACK_VERIFY_CACHE_TIMEOUT = env.int('PAYSTACK_VERIFY_CACHE_TIMEOUT', default=86400)
+
+# Paystack webhook events are stored on receipt and applied by
+# process_paystack_webhooks, PAYSTACK_WEBHOOK_BATCH_SIZE per transaction.
+# An event that fails PAYSTACK_WEBHOOK_MAX_ATTEMPTS times is marked failed.
+PAYSTACK_WEBHOOK_BATCH_SIZE = env.int('PAYSTACK_WEBHOOK_BATCH_SIZE', default=100)
+PAYSTACK_WEBHOOK_MAX_ATTEMPTS = env.int('PAYSTACK_WEBHOOK_MAX_ATTEMPTS', default=5)
+
+# Uploaded PDF/DOCX documents over DOCUMENT_MAX_BYTES are not parsed, and
+# only their first DOCUMENT_MAX_PAGES pages are read. Parsing runs in
+# DOCUMENT_EXTRACTION_WORKERS processes (0 parses in the web process) and
+# gives up after DOCUMENT_EXTRACTION_TIMEOUT seconds of parsing.
+DOCUMENT_MAX_BYTES = env.int('DOCUMENT_MAX_BYTES', default=10 * 1024 * 1024)
+DOCUMENT_MAX_PAGES = env.int('DOCUMENT_MAX_PAGES', default=50)
+DOCUMENT_EXTRACTION_WORKERS = env.int('DOCUMENT_EXTRACTION_WORKERS', default=2)
+DOCUMENT_EXTRACTION_TIMEOUT = env.int('DOCUMENT_EXTRACTION_TIMEOUT', default=20)
+
+# AI analyses requested from the site are queued and run by run_ai_workers
+# with AI_TASK_WORKERS tasks at a time; idle workers look for new tasks every
+# AI_TASK_POLL_INTERVAL seconds. A failed task is retried after
+# AI_TASK_RETRY_DELAY seconds, doubling each time, up to AI_TASK_MAX_ATTEMPTS
+# attempts. A task still running after AI_TASK_LEASE_SECONDS is taken over by
+# another worker. AI_TASK_ALWAYS_EAGER runs tasks in the web process instead.
+AI_TASK_WORKERS = env.int('AI_TASK_WORKERS', default=2)
+AI_TASK_POLL_INTERVAL = env.float('AI_TASK_POLL_INTERVAL', default=2)
+AI_TASK_MAX_ATTEMPTS = env.int('AI_TASK_MAX_ATTEMPTS', default=3)
+AI_TASK_RETRY_DELAY = env.int('AI_TASK_RETRY_DELAY', default=30)
+AI_TASK_LEASE_SECONDS = env.int('AI_TASK_LEASE_SECONDS', default=600)
+AI_TASK_ALWAYS_EAGER = env.bool('AI_TASK_ALWAYS_EAGER', default=False)
+
+# Employer and job seeker analytics dashboard counts are cached per company
+# or user for ANALYTICS_DASHBOARD_TIMEOUT seconds, and dropped when an
+# application, job listing, match score or saved job changes.
+ANALYTICS_DASHBOARD_TIMEOUT = env.int('ANALYTICS_DASHBOARD_TIMEOUT', default=300)
+
+# Bulk mail goes out in batches of MAIL_BATCH_SIZE messages per SMTP
+# connection, MAIL_MAX_WORKERS batches at a time, at most MAIL_RATE_LIMIT
+# messages per second (0 for no limit).
+MAIL_BATCH_SIZE = env.int('MAIL_BATCH_SIZE', default=100)
+MAIL_MAX_WORKERS = env.int('MAIL_MAX_WORKERS', default=4)
+MAIL_RATE_LIMIT = env.int('MAIL_RATE_LIMIT', default=0)
+
+# Extracted text, processed documents and AI analysis results are cached by
+# content hash: up to ANALYSIS_CACHE_MAX_ENTRIES entries (ANALYSIS_CACHE_MAX_BYTES
+# in total) per process, and on disk in ANALYSIS_CACHE_DIR (default
+# BASE_DIR/cache/analysis) for all workers.
+ANALYSIS_CACHE_MAX_ENTRIES = env.int('ANALYSIS_CACHE_MAX_ENTRIES', default=256)
+ANALYSIS_CACHE_MAX_BYTES = env.int('ANALYSIS_CACHE_MAX_BYTES', default=32 * 1024 * 1024)
+ANALYSIS_CACHE_TIMEOUT = env.int('ANALYSIS_CACHE_TIMEOUT', default=7 * 24 * 60 * 60)
+ANALYSIS_CACHE_ALIAS = 'analysis'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'analysis': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': env('ANALYSIS_CACHE_DIR', default=os.path.join(BASE_DIR, 'cache', 'analysis')),
+        'TIMEOUT': ANALYSIS_CACHE_TIMEOUT,
+        'OPTIONS': {
+            'MAX_ENTRIES': env.int('ANALYSIS_CACHE_DISK_ENTRIES', default=10000),
+        },
+    },
+}
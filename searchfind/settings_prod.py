@@ -220,6 +220,107 @@ DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL')
 # Site URL for absolute URLs in emails
 SITE_URL = os.environ.get('SITE_URL')
 
+# Job view analytics are buffered in memory and written in aggregate.
+# JOB_VIEW_FLUSH_INTERVAL is in seconds (0 writes on every view) and
+# JOB_VIEW_MAX_BUFFERED_EVENTS caps how many views can be lost on a crash.
+JOB_VIEW_FLUSH_INTERVAL = int(os.environ.get('JOB_VIEW_FLUSH_INTERVAL', 30))
+JOB_VIEW_MAX_BUFFERED_EVENTS = int(os.environ.get('JOB_VIEW_MAX_BUFFERED_EVENTS', 500))
+
+# Site settings, categories and hero sections are cached per process for
+# SITE_CACHE_LOCAL_TTL seconds and in the shared cache for SITE_CACHE_TIMEOUT
+# (capped at SITE_CACHE_LOCAL_TTL with a process-local cache such as LocMemCache).
+SITE_CACHE_LOCAL_TTL = int(os.environ.get('SITE_CACHE_LOCAL_TTL', 60))
+SITE_CACHE_TIMEOUT = int(os.environ.get('SITE_CACHE_TIMEOUT', 3600))
+
+# Seconds before the home page snapshot is rebuilt even without job changes
+# (capped at SITE_CACHE_LOCAL_TTL with a process-local cache)
+HOMEPAGE_SNAPSHOT_TIMEOUT = int(os.environ.get('HOMEPAGE_SNAPSHOT_TIMEOUT', 900))
+
+# Bulk application screening runs in a pool of BULK_SCREENING_MAX_WORKERS
+# processes (0 or 1 screens in the calling process) with at most
+# BULK_SCREENING_MAX_PENDING applications in flight.
+BULK_SCREENING_MAX_WORKERS = int(os.environ.get('BULK_SCREENING_MAX_WORKERS', 4))
+BULK_SCREENING_MAX_PENDING = int(os.environ.get('BULK_SCREENING_MAX_PENDING', 32))
+
+# Unread notification and message counts are cached per user and read again
+# from the database after UNREAD_COUNTS_TIMEOUT seconds (at most 10 seconds
+# with a process-local cache such as LocMemCache).
+UNREAD_COUNTS_TIMEOUT = int(os.environ.get('UNREAD_COUNTS_TIMEOUT', 3600))
+
+# Custom admin lists show ADMIN_LIST_PER_PAGE rows per page (?per_page= can
+# ask for up to 200).
+ADMIN_LIST_PER_PAGE = int(os.environ.get('ADMIN_LIST_PER_PAGE', 50))
+
+# Paystack calls share a pooled session. They time out after
+# PAYSTACK_CONNECT_TIMEOUT/PAYSTACK_READ_TIMEOUT seconds, and failed
+# connections and GETs answered with 429/5xx are retried up to
+# PAYSTACK_MAX_RETRIES times. Successful verifications are cached for
+# PAYSTACK_VERIFY_CACHE_TIMEOUT seconds.
+PAYSTACK_CONNECT_TIMEOUT = float(os.environ.get('PAYSTACK_CONNECT_TIMEOUT', 3.05))
+PAYSTACK_READ_TIMEOUT = float(os.environ.get('PAYSTACK_READ_TIMEOUT', 15))
+PAYSTACK_MAX_RETRIES = int(os.environ.get('PAYSTACK_MAX_RETRIES', 3))
+PAYSTACK_VERIFY_CACHE_TIMEOUT = int(os.environ.get('PAYSTACK_VERIFY_CACHE_TIMEOUT', 86400))
+
+# Paystack webhook events are stored on receipt and applied by
+# process_paystack_webhooks, PAYSTACK_WEBHOOK_BATCH_SIZE per transaction.
+# An event that fails PAYSTACK_WEBHOOK_MAX_ATTEMPTS times is marked failed.
+PAYSTACK_WEBHOOK_BATCH_SIZE = int(os.environ.get('PAYSTACK_WEBHOOK_BATCH_SIZE', 100))
+PAYSTACK_WEBHOOK_MAX_ATTEMPTS = int(os.environ.get('PAYSTACK_WEBHOOK_MAX_ATTEMPTS', 5))
+
+# Uploaded PDF/DOCX documents over DOCUMENT_MAX_BYTES are not parsed, and
+# only their first DOCUMENT_MAX_PAGES pages are read. Parsing runs in
+# DOCUMENT_EXTRACTION_WORKERS processes (0 parses in the web process) and
+# gives up after DOCUMENT_EXTRACTION_TIMEOUT seconds of parsing.
+DOCUMENT_MAX_BYTES = int(os.environ.get('DOCUMENT_MAX_BYTES', 10 * 1024 * 1024))
+DOCUMENT_MAX_PAGES = int(os.environ.get('DOCUMENT_MAX_PAGES', 50))
+DOCUMENT_EXTRACTION_WORKERS = int(os.environ.get('DOCUMENT_EXTRACTION_WORKERS', 2))
+DOCUMENT_EXTRACTION_TIMEOUT = int(os.environ.get('DOCUMENT_EXTRACTION_TIMEOUT', 20))
+
+# AI analyses requested from the site are queued and run by run_ai_workers
+# with AI_TASK_WORKERS tasks at a time; idle workers look for new tasks every
+# AI_TASK_POLL_INTERVAL seconds. A failed task is retried after
+# AI_TASK_RETRY_DELAY seconds, doubling each time, up to AI_TASK_MAX_ATTEMPTS
+# attempts. A task still running after AI_TASK_LEASE_SECONDS is taken over by
+# another worker. AI_TASK_ALWAYS_EAGER runs tasks in the web process instead.
+AI_TASK_WORKERS = int(os.environ.get('AI_TASK_WORKERS', 2))
+AI_TASK_POLL_INTERVAL = float(os.environ.get('AI_TASK_POLL_INTERVAL', 2))
+AI_TASK_MAX_ATTEMPTS = int(os.environ.get('AI_TASK_MAX_ATTEMPTS', 3))
+AI_TASK_RETRY_DELAY = int(os.environ.get('AI_TASK_RETRY_DELAY', 30))
+AI_TASK_LEASE_SECONDS = int(os.environ.get('AI_TASK_LEASE_SECONDS', 600))
+AI_TASK_ALWAYS_EAGER = os.environ.get('AI_TASK_ALWAYS_EAGER', 'False') == 'True'
+
+# Employer and job seeker analytics dashboard counts are cached per company
+# or user for ANALYTICS_DASHBOARD_TIMEOUT seconds, and dropped when an
+# application, job listing, match score or saved job changes.
+ANALYTICS_DASHBOARD_TIMEOUT = int(os.environ.get('ANALYTICS_DASHBOARD_TIMEOUT', 300))
+
+# Bulk mail goes out in batches of MAIL_BATCH_SIZE messages per SMTP
+# connection, MAIL_MAX_WORKERS batches at a time, at most MAIL_RATE_LIMIT
+# messages per second (0 for no limit).
+MAIL_BATCH_SIZE = int(os.environ.get('MAIL_BATCH_SIZE', 100))
+MAIL_MAX_WORKERS = int(os.environ.get('MAIL_MAX_WORKERS', 4))
+MAIL_RATE_LIMIT = int(os.environ.get('MAIL_RATE_LIMIT', 0))
+
+# Extracted text, processed documents and AI analysis results are cached by
+# content hash: up to ANALYSIS_CACHE_MAX_ENTRIES entries (ANALYSIS_CACHE_MAX_BYTES
+# in total) per process, and in the 'analysis' cache for all workers. That is
+# Redis when REDIS_URL is set and a directory on disk otherwise.
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get('ANALYSIS_CACHE_MAX_ENTRIES', 256))
+ANALYSIS_CACHE_MAX_BYTES = int(os.environ.get('ANALYSIS_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+ANALYSIS_CACHE_TIMEOUT = int(os.environ.get('ANALYSIS_CACHE_TIMEOUT', 7 * 24 * 60 * 60))
+ANALYSIS_CACHE_ALIAS = 'analysis'
+if REDIS_URL:
+    CACHES['analysis'] = dict(CACHES['default'], TIMEOUT=ANALYSIS_CACHE_TIMEOUT)
+else:
+    CACHES['analysis'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('ANALYSIS_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'analysis')),
+        'TIMEOUT': ANALYSIS_CACHE_TIMEOUT,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('ANALYSIS_CACHE_DISK_ENTRIES', 10000)),
+        },
+    }
+
 # Robots.txt is handled by a custom view
 
 # Django Compressor settings
@@ -1,7 +1,8 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from .models import SubscriptionPlan, UserSubscription, PaystackConfig
-from .ai_models import ResumeAnalysis, JobMatchScore, CompanyMatchScore, ResumeBuilder
+from .models import SubscriptionPlan, UserSubscription, PaystackConfig, PaystackWebhookEvent
+from .ai_models import ResumeAnalysis, JobMatchScore, CompanyMatchScore, ResumeBuilder, BulkScreeningRun, AITask
 
 @admin.register(SubscriptionPlan)
 class SubscriptionPlanAdmin(admin.ModelAdmin):
@@ -61,6 +62,20 @@ class PaystackConfigAdmin(admin.ModelAdmin):
         return PaystackConfig.objects.count() == 0
 
 
+@admin.register(PaystackWebhookEvent)
+class PaystackWebhookEventAdmin(admin.ModelAdmin):
+    list_display = ('event', 'event_id', 'status', 'attempts', 'received_at', 'processed_at')
+    list_filter = ('status', 'event')
+    search_fields = ('event_id',)
+    readonly_fields = ('event_id', 'event', 'payload', 'attempts', 'error', 'received_at', 'processed_at')
+    actions = ['requeue_events']
+
+    def requeue_events(self, request, queryset):
+        queryset.exclude(status='pending').update(status='pending', attempts=0)
+        self.message_user(request, _('Selected events will be processed again.'))
+    requeue_events.short_description = _('Process selected events again')
+
+
 @admin.register(ResumeAnalysis)
 class ResumeAnalysisAdmin(admin.ModelAdmin):
     list_display = ('user', 'overall_score', 'created_at')
@@ -91,3 +106,28 @@ class ResumeBuilderAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
     search_fields = ('user__email', 'user__username', 'job_listing__title')
     readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(BulkScreeningRun)
+class BulkScreeningRunAdmin(admin.ModelAdmin):
+    list_display = ('job', 'requested_by', 'status', 'processed_applications', 'total_applications', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('job__title', 'requested_by__email')
+    readonly_fields = ('created_at', 'updated_at', 'completed_at')
+
+
+@admin.register(AITask)
+class AITaskAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'user', 'status', 'attempts', 'locked_by', 'created_at', 'completed_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('user__email', 'user__username')
+    readonly_fields = ('params', 'attempts', 'error', 'result_id', 'locked_by', 'locked_at',
+                       'created_at', 'updated_at', 'completed_at')
+    actions = ['requeue_tasks']
+
+    def requeue_tasks(self, request, queryset):
+        queryset.filter(status='failed').update(
+            status='pending', attempts=0, run_after=timezone.now(), locked_by='', locked_at=None
+        )
+        self.message_user(request, _('Selected failed tasks will be run again.'))
+    requeue_tasks.short_description = _('Run selected failed tasks again')
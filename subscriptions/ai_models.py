@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from jobs.models import JobListing, Company
 
@@ -57,6 +58,10 @@ class JobMatchScore(models.Model):
         verbose_name_plural = _('Job Match Scores')
         ordering = ['-overall_match']
         unique_together = ['user', 'job']
+        indexes = [
+            # A user's match scores by band, for the job seeker dashboard
+            models.Index(fields=['user', 'overall_match'], name='subs_jobmatch_user_overall'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.job.title} ({self.overall_match}%)"
@@ -143,3 +148,94 @@ class ResumeBuilder(models.Model):
     def __str__(self):
         job_info = f" for {self.job_listing.title}" if self.job_listing else ""
         return f"Resume Builder - {self.user.email}{job_info}"
+
+
+class BulkScreeningRun(models.Model):
+    """Background screening of all applications for a job listing."""
+    STATUS_CHOICES = (
+        ('pending', _('Pending')),
+        ('running', _('Running')),
+        ('completed', _('Completed')),
+        ('failed', _('Failed')),
+    )
+
+    job = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name='screening_runs')
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='screening_runs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+
+    # Progress
+    total_applications = models.PositiveIntegerField(default=0)
+    processed_applications = models.PositiveIntegerField(default=0)
+    valid_applications = models.PositiveIntegerField(default=0)
+
+    # Ranked results, written when the run completes
+    results = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Bulk Screening Run')
+        verbose_name_plural = _('Bulk Screening Runs')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Screening of {self.job.title} ({self.status})"
+
+    @property
+    def progress(self):
+        """Percentage of applications processed so far."""
+        if not self.total_applications:
+            return 100 if self.status == 'completed' else 0
+        return round(self.processed_applications * 100 / self.total_applications)
+
+
+class AITask(models.Model):
+    """An AI analysis queued by a view and run by run_ai_workers."""
+    STATUS_CHOICES = (
+        ('pending', _('Pending')),
+        ('running', _('Running')),
+        ('completed', _('Completed')),
+        ('failed', _('Failed')),
+    )
+
+    KIND_CHOICES = (
+        ('resume_analysis', _('Resume Analysis')),
+        ('cover_letter', _('Cover Letter')),
+        ('interview_questions', _('Interview Questions')),
+        ('salary_insights', _('Salary Insights')),
+        ('bulk_screening', _('Bulk Screening')),
+    )
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='ai_tasks')
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    # Primary key of the ResumeAnalysis, CoverLetterAnalysis, etc. the task produced
+    result_id = models.PositiveIntegerField(null=True, blank=True)
+
+    # Not claimed before this time; pushed back when a failed task is retried
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('AI Task')
+        verbose_name_plural = _('AI Tasks')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='subs_aitask_status_run_after'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.user.email} ({self.status})"
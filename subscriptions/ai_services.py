@@ -1,17 +1,8 @@
 import json
 import logging
 
-# Import real AI analysis components
-from .resume_analyzer import ResumeAnalyzer
-from .resume_builder import ResumeBuilder
-from .cover_letter_analyzer import CoverLetterAnalyzer
-from .interview_preparation import InterviewPreparation
-from .job_posting_analyzer import JobPostingAnalyzer
-from .candidate_matching import CandidateMatchingSystem
-from .job_description_generator import JobDescriptionGenerator
-from .application_screener import ApplicationScreener
-from .salary_insights import SalaryInsights
-from .career_path_planner import CareerPathPlanner
+# The AI analysis components hold large data tables, so each service imports
+# its component on first use rather than at module import time.
 
 logger = logging.getLogger(__name__)
 
@@ -211,6 +202,7 @@ class ResumeAnalysisService(AIService):
     def _get_analyzer(cls):
         """Get or create a ResumeAnalyzer instance."""
         if cls._resume_analyzer is None:
+            from .resume_analyzer import ResumeAnalyzer
             cls._resume_analyzer = ResumeAnalyzer()
         return cls._resume_analyzer
 
@@ -293,6 +285,7 @@ class ResumeBuilderService(AIService):
     def _get_builder(cls):
         """Get or create a ResumeBuilder instance."""
         if cls._resume_builder is None:
+            from .resume_builder import ResumeBuilder
             cls._resume_builder = ResumeBuilder()
         return cls._resume_builder
 
@@ -365,6 +358,7 @@ class JobMatchService(AIService):
     def _get_matching_system(cls):
         """Get or create a CandidateMatchingSystem instance."""
         if cls._candidate_matching is None:
+            from .candidate_matching import CandidateMatchingSystem
             cls._candidate_matching = CandidateMatchingSystem()
         return cls._candidate_matching
 
@@ -654,6 +648,7 @@ class InterviewPrepService(AIService):
     def _get_interview_prep(cls):
         """Get or create an InterviewPreparation instance."""
         if cls._interview_prep is None:
+            from .interview_preparation import InterviewPreparation
             cls._interview_prep = InterviewPreparation()
         return cls._interview_prep
 
@@ -800,6 +795,7 @@ class SalaryInsightsService(AIService):
     def _get_insights_engine(cls):
         """Get or create a SalaryInsights instance."""
         if cls._salary_insights is None:
+            from .salary_insights import SalaryInsights
             cls._salary_insights = SalaryInsights()
         return cls._salary_insights
 
@@ -998,6 +994,7 @@ class CoverLetterAnalysisService(AIService):
     def _get_analyzer(cls):
         """Get or create a CoverLetterAnalyzer instance."""
         if cls._cover_letter_analyzer is None:
+            from .cover_letter_analyzer import CoverLetterAnalyzer
             cls._cover_letter_analyzer = CoverLetterAnalyzer()
         return cls._cover_letter_analyzer
 
@@ -1183,6 +1180,7 @@ class JobPostingAnalysisService(AIService):
     def _get_analyzer(cls):
         """Get or create a JobPostingAnalyzer instance."""
         if cls._job_posting_analyzer is None:
+            from .job_posting_analyzer import JobPostingAnalyzer
             cls._job_posting_analyzer = JobPostingAnalyzer()
         return cls._job_posting_analyzer
 
@@ -1418,6 +1416,7 @@ class JobDescriptionGeneratorService(AIService):
     def _get_generator(cls):
         """Get or create a JobDescriptionGenerator instance."""
         if cls._job_description_generator is None:
+            from .job_description_generator import JobDescriptionGenerator
             cls._job_description_generator = JobDescriptionGenerator()
         return cls._job_description_generator
 
@@ -1597,9 +1596,24 @@ class ApplicationScreeningService(AIService):
     def _get_screener(cls):
         """Get or create an ApplicationScreener instance."""
         if cls._application_screener is None:
+            from .application_screener import ApplicationScreener
             cls._application_screener = ApplicationScreener()
         return cls._application_screener
 
+    @staticmethod
+    def _job_listing_to_dict(job_listing):
+        """Convert a JobListing object to the dict the screener expects."""
+        return {
+            'title': job_listing.title,
+            'description': job_listing.description,
+            'requirements': job_listing.requirements,
+            'skills_required': job_listing.skills_required,
+            'location': job_listing.location,
+            'min_experience': job_listing.min_experience if hasattr(job_listing, 'min_experience') else None,
+            'education_required': job_listing.education_required if hasattr(job_listing, 'education_required') else None,
+            'company_name': job_listing.company.name if hasattr(job_listing, 'company') and job_listing.company else ''
+        }
+
     @classmethod
     def screen_application(cls, job_listing, application_data):
         """
@@ -1616,16 +1630,7 @@ class ApplicationScreeningService(AIService):
             screener = cls._get_screener()
 
             # Convert job_listing object to dict
-            job_dict = {
-                'title': job_listing.title,
-                'description': job_listing.description,
-                'requirements': job_listing.requirements,
-                'skills_required': job_listing.skills_required,
-                'location': job_listing.location,
-                'min_experience': job_listing.min_experience if hasattr(job_listing, 'min_experience') else None,
-                'education_required': job_listing.education_required if hasattr(job_listing, 'education_required') else None,
-                'company_name': job_listing.company.name if hasattr(job_listing, 'company') and job_listing.company else ''
-            }
+            job_dict = cls._job_listing_to_dict(job_listing)
 
             # Screen the application using the real implementation
             result = screener.screen_application(job_dict, application_data)
@@ -1654,16 +1659,7 @@ class ApplicationScreeningService(AIService):
             screener = cls._get_screener()
 
             # Convert job_listing object to dict
-            job_dict = {
-                'title': job_listing.title,
-                'description': job_listing.description,
-                'requirements': job_listing.requirements,
-                'skills_required': job_listing.skills_required,
-                'location': job_listing.location,
-                'min_experience': job_listing.min_experience if hasattr(job_listing, 'min_experience') else None,
-                'education_required': job_listing.education_required if hasattr(job_listing, 'education_required') else None,
-                'company_name': job_listing.company.name if hasattr(job_listing, 'company') and job_listing.company else ''
-            }
+            job_dict = cls._job_listing_to_dict(job_listing)
 
             # Screen all applications using the real implementation
             result = screener.bulk_screen_applications(job_dict, applications)
@@ -1691,6 +1687,26 @@ class ApplicationScreeningService(AIService):
                 }
             }
 
+    @classmethod
+    def start_bulk_screening(cls, job_listing, requested_by=None, applications=None):
+        """
+        Screen applications for a job listing in the background.
+
+        Args:
+            job_listing: JobListing object
+            requested_by: User who started the screening
+            applications (queryset, optional): JobApplications to screen.
+                Defaults to all applications that have not been withdrawn.
+
+        Returns:
+            BulkScreeningRun: The run to poll for progress and results
+        """
+        from .bulk_screening import start_bulk_screening
+        return start_bulk_screening(
+            job_listing, cls._job_listing_to_dict(job_listing),
+            requested_by=requested_by, applications=applications
+        )
+
     @classmethod
     def generate_screening_criteria(cls, job_listing):
         """
@@ -1706,16 +1722,7 @@ class ApplicationScreeningService(AIService):
             screener = cls._get_screener()
 
             # Convert job_listing object to dict
-            job_dict = {
-                'title': job_listing.title,
-                'description': job_listing.description,
-                'requirements': job_listing.requirements,
-                'skills_required': job_listing.skills_required,
-                'location': job_listing.location,
-                'min_experience': job_listing.min_experience if hasattr(job_listing, 'min_experience') else None,
-                'education_required': job_listing.education_required if hasattr(job_listing, 'education_required') else None,
-                'company_name': job_listing.company.name if hasattr(job_listing, 'company') and job_listing.company else ''
-            }
+            job_dict = cls._job_listing_to_dict(job_listing)
 
             # Generate criteria using the real implementation
             result = screener.generate_screening_criteria(job_dict)
@@ -1871,6 +1878,7 @@ class CareerPathService(AIService):
     def _get_planner(cls):
         """Get or create a CareerPathPlanner instance."""
         if cls._career_path_planner is None:
+            from .career_path_planner import CareerPathPlanner
             cls._career_path_planner = CareerPathPlanner()
         return cls._career_path_planner
 
@@ -0,0 +1,382 @@
+"""
+Background queue for AI analyses.
+
+Resume analysis, cover letter generation, interview questions and salary
+insights used to run inside the request that asked for them, so one slow
+document held a web worker for as long as the analyzer took. Bulk
+screening runs (``subscriptions.bulk_screening``) are queued here too. The
+views now call ``enqueue``, which stores an ``AITask`` row, and redirect to the
+``ai_task`` page. That page polls ``ai_task_status`` and moves on to the
+result once the task has completed.
+
+``manage.py run_ai_workers`` runs the tasks. ``claim_tasks`` hands each task
+to one worker: on databases with ``SELECT ... FOR UPDATE SKIP LOCKED``
+(PostgreSQL) workers lock the rows they take and skip rows other workers
+hold. SQLite has no row locks, so there a task is claimed by a conditional
+``UPDATE`` that only succeeds for the worker that still finds it pending.
+
+A task that raises is tried again after ``AI_TASK_RETRY_DELAY`` seconds,
+doubling after every attempt, and marked failed after
+``AI_TASK_MAX_ATTEMPTS`` attempts. ``AITaskError`` fails it at once, for
+input that will never succeed (e.g. a file that is not a resume), and so
+does a missing object (e.g. a job deleted since the task was queued). A task
+left running for ``AI_TASK_LEASE_SECONDS`` by a worker that died is claimed
+again; handlers that run longer than that call ``renew_lease`` as they go. With ``AI_TASK_ALWAYS_EAGER`` tasks run inside ``enqueue``, for
+development without a worker.
+"""
+import json
+import logging
+import os
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .ai_models import AITask
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 30
+DEFAULT_LEASE_SECONDS = 600
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+# ``handler(task)`` runs the task and returns the primary key of its result;
+# ``result_url(task)`` and ``form_url(task)`` are where the user goes next
+TaskKind = namedtuple('TaskKind', ['handler', 'result_url', 'form_url'])
+
+
+class AITaskError(Exception):
+    """The task cannot succeed; it is marked failed without being retried."""
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def run_resume_analysis(task):
+    from .ai_models import ResumeAnalysis
+    from .ai_services import ResumeAnalysisService
+
+    analysis = ResumeAnalysis.objects.get(pk=task.params['analysis_id'], user_id=task.user_id)
+    with analysis.resume_file.open('rb') as resume_file:
+        results = ResumeAnalysisService.analyze_resume(
+            resume_file=resume_file, file_name=os.path.basename(analysis.resume_file.name)
+        )
+
+    if not results.get('is_valid', False):
+        analysis.delete()
+        raise AITaskError(results.get('error', 'The uploaded file does not appear to be a valid resume.'))
+
+    analysis.skill_score = results.get('skill_score', 0)
+    analysis.experience_score = results.get('experience_score', 0)
+    analysis.education_score = results.get('education_score', 0)
+    analysis.overall_score = results.get('overall_score', 0)
+    analysis.parsed_skills = results.get('parsed_skills', {})
+    analysis.parsed_experience = results.get('parsed_experience', [])
+    analysis.parsed_education = results.get('parsed_education', [])
+    analysis.suggestions = results.get('suggestions', [])
+    analysis.save()
+    return analysis.pk
+
+
+def run_cover_letter(task):
+    from jobs.models import JobListing
+    from .ai_models import CoverLetterAnalysis
+    from .ai_services import CoverLetterAnalysisService
+
+    params = task.params
+    job = JobListing.objects.get(pk=params['job_id'])
+    result = CoverLetterAnalysisService.generate_cover_letter(
+        user_name=params['user_name'],
+        job_title=job.title,
+        company_name=params['company_name'],
+        skills=params['skills'],
+        experience_level=params['experience_level'],
+        job_type=params['job_type'],
+        industry=params['industry'],
+        template_style=params['template_style'],
+        region=params['region']
+    )
+
+    analysis = CoverLetterAnalysis.objects.create(
+        user_id=task.user_id,
+        job=job,
+        original_content=params['current_cover_letter'],
+        improved_content=result.get('full_text', ''),
+        analysis_data={
+            'template_used': result.get('template_used', ''),
+            'sections': result.get('sections', {}),
+            'word_count': result.get('word_count', 0)
+        }
+    )
+    return analysis.pk
+
+
+def run_interview_questions(task):
+    from jobs.models import JobListing
+    from .enhanced_ai_services import EnhancedInterviewPrepService
+    from .models_pro_features import InterviewPrep
+
+    job = JobListing.objects.get(pk=task.params['job_id'])
+    interview_prep, _ = InterviewPrep.objects.get_or_create(user_id=task.user_id, job_listing=job)
+
+    user_skills = getattr(task.user, 'skills', None)
+    questions = EnhancedInterviewPrepService.generate_interview_questions(job, {'skills': user_skills})
+    if questions:
+        interview_prep.technical_questions = questions.get('technical_questions', [])
+        interview_prep.behavioral_questions = questions.get('behavioral_questions', [])
+        interview_prep.company_questions = questions.get('company_questions', [])
+        interview_prep.save()
+    return interview_prep.pk
+
+
+def run_salary_insights(task):
+    from .enhanced_ai_services import EnhancedAIService
+    from .models_pro_features import SalaryInsights
+
+    params = task.params
+    user = task.user
+    user_experience = []
+    if hasattr(user, 'jobseeker') and hasattr(user.jobseeker, 'experience'):
+        user_experience = user.jobseeker.experience
+
+    insights_json = EnhancedAIService.get_ai_response(
+        f"Provide salary insights for {params['job_title']} in {params['location']} "
+        f"with {params['experience_level']} experience level",
+        user_data={'skills': getattr(user, 'skills', None), 'experience': user_experience},
+        context={'job_title': params['job_title'], 'industry': params['experience_level']}
+    )
+    try:
+        insights = json.loads(insights_json)
+    except (TypeError, json.JSONDecodeError):
+        insights = None
+    if not insights:
+        raise AITaskError('Failed to generate salary insights. Please try again.')
+
+    salary_insight = SalaryInsights.objects.create(
+        user=user,
+        job_title=params['job_title'],
+        location=params['location'],
+        experience_level=params['experience_level'],
+        salary_range_min=insights.get('salary_range', {}).get('min', 0),
+        salary_range_max=insights.get('salary_range', {}).get('max', 0),
+        median_salary=insights.get('median_salary', 0),
+        factors=insights.get('factors', []),
+        negotiation_tips=insights.get('negotiation_tips', []),
+        industry_trends=insights.get('industry_trends', '')
+    )
+    return salary_insight.pk
+
+
+def run_bulk_screening_task(task):
+    from .ai_models import BulkScreeningRun
+    from .bulk_screening import run_bulk_screening
+
+    params = task.params
+    if task.attempts > 1:
+        # Taken over from a worker whose lease ran out; it stops at its next renewal
+        BulkScreeningRun.objects.filter(pk=params['run_id'], status='running').update(status='pending')
+    run_bulk_screening(params['run_id'], params['job'], params['application_ids'],
+                       renew_lease=lambda: renew_lease(task))
+    return params['run_id']
+
+
+TASK_KINDS = {
+    'resume_analysis': TaskKind(
+        run_resume_analysis,
+        lambda task: reverse('subscriptions:resume_analysis_result', args=[task.result_id]),
+        lambda task: reverse('subscriptions:resume_analysis'),
+    ),
+    'cover_letter': TaskKind(
+        run_cover_letter,
+        lambda task: reverse('subscriptions:cover_letter_result', args=[task.result_id]),
+        lambda task: reverse('subscriptions:generate_cover_letter', args=[task.params['job_id']]),
+    ),
+    'interview_questions': TaskKind(
+        run_interview_questions,
+        lambda task: reverse('subscriptions:interview_questions', args=[task.params['job_id']]),
+        lambda task: reverse('subscriptions:interview_preparation'),
+    ),
+    'salary_insights': TaskKind(
+        run_salary_insights,
+        lambda task: reverse('subscriptions:salary_insights_result', args=[task.result_id]),
+        lambda task: reverse('subscriptions:salary_insights'),
+    ),
+    'bulk_screening': TaskKind(
+        run_bulk_screening_task,
+        lambda task: reverse('subscriptions:bulk_screening_status', args=[task.params['run_id']]),
+        lambda task: reverse('jobs:applications_list', args=[task.params['job_id']]),
+    ),
+}
+
+
+def result_url(task):
+    """Where to send the user once ``task`` has completed."""
+    return TASK_KINDS[task.kind].result_url(task)
+
+
+def form_url(task):
+    """Where the user can ask for ``task`` again."""
+    return TASK_KINDS[task.kind].form_url(task)
+
+
+def enqueue(user, kind, **params):
+    """
+    Queue an AI task.
+
+    A task of the same kind with the same parameters that is still pending
+    or running is returned instead of queueing a second one.
+
+    Args:
+        user: User the task runs for
+        kind (str): Key of ``TASK_KINDS``
+        **params: JSON-serializable arguments for the handler
+
+    Returns:
+        AITask: The queued task
+    """
+    if kind not in TASK_KINDS:
+        raise ValueError(f"Unknown AI task kind: {kind}")
+
+    task = AITask.objects.filter(user=user, kind=kind, params=params, status__in=ACTIVE_STATUSES).first()
+    if task is not None:
+        return task
+
+    if _setting('AI_TASK_ALWAYS_EAGER', False):
+        task = AITask.objects.create(
+            user=user, kind=kind, params=params, status='running', attempts=1,
+            locked_by='eager', locked_at=timezone.now()
+        )
+        run_task(task)
+        return task
+
+    return AITask.objects.create(user=user, kind=kind, params=params)
+
+
+def _claimed(worker_id, now):
+    # Attempts are counted on claim, so a task whose worker died counts too
+    return {'status': 'running', 'locked_by': worker_id, 'locked_at': now, 'attempts': F('attempts') + 1}
+
+
+def _claim_with_skip_locked(ready, worker_id, limit, now):
+    with transaction.atomic():
+        pks = list(ready.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+        AITask.objects.filter(pk__in=pks).update(**_claimed(worker_id, now))
+    return pks
+
+
+def _claim_with_update(ready, worker_id, limit, now):
+    # Each UPDATE only matches while the task is as we read it, so when two
+    # workers read the same task only the first one's UPDATE changes a row
+    pks = []
+    for pk, status, locked_at in ready.values_list('pk', 'status', 'locked_at')[:limit]:
+        if AITask.objects.filter(pk=pk, status=status, locked_at=locked_at).update(**_claimed(worker_id, now)):
+            pks.append(pk)
+    return pks
+
+
+def claim_tasks(worker_id, limit=1):
+    """
+    Claim up to ``limit`` tasks that are due, oldest first.
+
+    Pending tasks whose ``run_after`` has passed are claimed, and so are
+    running tasks whose worker has not finished them within
+    ``AI_TASK_LEASE_SECONDS``.
+
+    Args:
+        worker_id (str): Recorded in ``locked_by``
+        limit (int): Maximum number of tasks to claim
+
+    Returns:
+        list: Claimed ``AITask`` objects, already marked running
+    """
+    now = timezone.now()
+    lease_expired = now - timezone.timedelta(seconds=_setting('AI_TASK_LEASE_SECONDS', DEFAULT_LEASE_SECONDS))
+    ready = AITask.objects.filter(
+        Q(status='pending', run_after__lte=now) | Q(status='running', locked_at__lt=lease_expired)
+    ).order_by('run_after', 'pk')
+
+    if connection.features.has_select_for_update_skip_locked:
+        pks = _claim_with_skip_locked(ready, worker_id, limit, now)
+    else:
+        pks = _claim_with_update(ready, worker_id, limit, now)
+    if not pks:
+        return []
+    return list(AITask.objects.filter(pk__in=pks).select_related('user').order_by('run_after', 'pk'))
+
+
+def renew_lease(task):
+    """
+    Extend the lease on a running task by another ``AI_TASK_LEASE_SECONDS``.
+
+    Returns:
+        bool: False if another worker has taken the task over
+    """
+    now = timezone.now()
+    renewed = AITask.objects.filter(pk=task.pk, status='running', locked_at=task.locked_at).update(
+        locked_at=now, updated_at=now
+    )
+    if renewed:
+        task.locked_at = now
+    return bool(renewed)
+
+
+def _finish(task, **fields):
+    # Only the worker holding the task writes its outcome; if its lease ran
+    # out and another worker took the task over, this write is dropped
+    locked_at = task.locked_at
+    fields.update(locked_by='', locked_at=None)
+    for name, value in fields.items():
+        setattr(task, name, value)
+    return AITask.objects.filter(pk=task.pk, status='running', locked_at=locked_at).update(
+        updated_at=timezone.now(), **fields
+    )
+
+
+def run_task(task, max_attempts=None, retry_delay=None):
+    """
+    Run a claimed task and record its outcome.
+
+    Args:
+        task (AITask): Task returned by ``claim_tasks``
+        max_attempts (int, optional): Defaults to ``AI_TASK_MAX_ATTEMPTS``
+        retry_delay (float, optional): Seconds before the first retry,
+            defaults to ``AI_TASK_RETRY_DELAY``
+
+    Returns:
+        str: The task's new status
+    """
+    if max_attempts is None:
+        max_attempts = _setting('AI_TASK_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    if retry_delay is None:
+        retry_delay = _setting('AI_TASK_RETRY_DELAY', DEFAULT_RETRY_DELAY)
+
+    if task.attempts > max_attempts:
+        # Claimed again after its worker stopped on the last attempt
+        _finish(task, status='failed', error='The worker stopped before the task finished.',
+                completed_at=timezone.now())
+        return task.status
+
+    try:
+        result_id = TASK_KINDS[task.kind].handler(task)
+    except (AITaskError, ObjectDoesNotExist) as e:
+        logger.info(f"AI task {task.pk} ({task.kind}) failed: {str(e)}")
+        fields = {'status': 'failed', 'error': str(e), 'completed_at': timezone.now()}
+    except Exception as e:
+        logger.exception(f"Error running AI task {task.pk} ({task.kind}): {str(e)}")
+        if task.attempts >= max_attempts:
+            fields = {'status': 'failed', 'error': str(e), 'completed_at': timezone.now()}
+        else:
+            delay = retry_delay * 2 ** (task.attempts - 1)
+            fields = {'status': 'pending', 'error': str(e), 'run_after': timezone.now() + timezone.timedelta(seconds=delay)}
+    else:
+        fields = {'status': 'completed', 'error': '', 'result_id': result_id, 'completed_at': timezone.now()}
+
+    _finish(task, **fields)
+    return task.status
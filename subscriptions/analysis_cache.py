@@ -0,0 +1,188 @@
+"""
+Content-addressed cache for document extraction and analysis results.
+
+Users resubmit the same documents all the time, most often the same resume
+for every job they apply to, and each submission used to run text extraction,
+``TextProcessor.process_document`` and the full scoring again. Those steps
+are deterministic, so their results are cached under a SHA-256 of the file
+bytes or of the normalized text, together with the version of the component
+that produced them. Bumping a component's ``VERSION`` retires its old entries.
+
+Entries are kept in two tiers:
+
+* a per-process LRU, bounded by ``ANALYSIS_CACHE_MAX_ENTRIES`` and
+  ``ANALYSIS_CACHE_MAX_BYTES``, which holds pickled copies so callers can
+  modify the results they get back;
+* the Django cache named by ``ANALYSIS_CACHE_ALIAS`` (falling back to
+  ``default``), shared by every worker, for ``ANALYSIS_CACHE_TIMEOUT``
+  seconds.
+"""
+import hashlib
+import logging
+import pickle
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_TIMEOUT = 7 * 24 * 60 * 60
+DEFAULT_ALIAS = 'analysis'
+
+KEY_PREFIX = 'analysis_cache'
+
+_TRAILING_SPACE = re.compile(r'[ \t]+$', re.MULTILINE)
+
+
+def normalize_text(text):
+    """
+    Normalize line endings and trailing whitespace.
+
+    Texts that differ only in these ways share cache entries, so analyzers
+    work on the normalized text whether or not it came from the cache.
+    """
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return _TRAILING_SPACE.sub('', text).strip()
+
+
+def content_hash(content):
+    """Return the SHA-256 hex digest of bytes, or of normalized text."""
+    if isinstance(content, str):
+        content = normalize_text(content).encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def make_key(namespace, version, *parts):
+    """Build a cache key from a namespace, a component version and content hashes or parameters."""
+    digest = hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+    return f'{KEY_PREFIX}:{namespace}:v{version}:{digest}'
+
+
+class AnalysisCache:
+    """Two-tier cache: a bounded in-process LRU in front of a shared Django cache."""
+
+    def __init__(self, max_entries=None, max_bytes=None, timeout=None, alias=None):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._timeout = timeout
+        self._alias = alias
+        self._local = OrderedDict()
+        self._local_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_entries(self):
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, 'ANALYSIS_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+
+    @property
+    def max_bytes(self):
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return getattr(settings, 'ANALYSIS_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, 'ANALYSIS_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+    @property
+    def shared(self):
+        """The shared Django cache backend."""
+        alias = self._alias or getattr(settings, 'ANALYSIS_CACHE_ALIAS', DEFAULT_ALIAS)
+        if alias not in settings.CACHES:
+            alias = 'default'
+        return caches[alias]
+
+    def get(self, key):
+        """Return a copy of the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            blob = self._local.get(key)
+            if blob is not None:
+                self._local.move_to_end(key)
+        if blob is not None:
+            return pickle.loads(blob)
+
+        value = self.shared.get(key)
+        if value is not None:
+            self._store_local(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        return value
+
+    def set(self, key, value):
+        """Store ``value`` in both tiers. None cannot be cached."""
+        if value is None:
+            return
+        self._store_local(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self.shared.set(key, value, self.timeout)
+
+    def get_or_compute(self, key, compute, cache_if=None):
+        """
+        Return the cached value for ``key``, calling ``compute()`` on a miss.
+
+        Args:
+            key: Cache key from make_key
+            compute: Callable producing the value
+            cache_if (callable, optional): Only cache values for which this returns True
+
+        Returns:
+            The cached or freshly computed value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        value = compute()
+        if cache_if is None or cache_if(value):
+            self.set(key, value)
+        return value
+
+    def clear_local(self):
+        """Empty this process's tier."""
+        with self._lock:
+            self._local.clear()
+            self._local_bytes = 0
+
+    def __len__(self):
+        return len(self._local)
+
+    def _store_local(self, key, blob):
+        max_bytes = self.max_bytes
+        if len(blob) > max_bytes:
+            return
+        with self._lock:
+            previous = self._local.pop(key, None)
+            if previous is not None:
+                self._local_bytes -= len(previous)
+            self._local[key] = blob
+            self._local_bytes += len(blob)
+            while self._local and (len(self._local) > self.max_entries or self._local_bytes > max_bytes):
+                _, evicted = self._local.popitem(last=False)
+                self._local_bytes -= len(evicted)
+
+
+analysis_cache = AnalysisCache()
+
+
+def cached_analysis(analyzer, text, compute, *params):
+    """
+    Run ``compute(normalized_text)`` once per analyzer version, text and parameters.
+
+    Args:
+        analyzer: Analyzer instance; its class name and VERSION are part of the key
+        text (str): Document text
+        compute: Callable taking the normalized text and returning the analysis dict
+        *params: Extra arguments that change the result (job description, etc.)
+
+    Returns:
+        dict: The analysis
+    """
+    text = normalize_text(text or '')
+    key = make_key(type(analyzer).__name__, analyzer.VERSION, content_hash(text), *params)
+    return analysis_cache.get_or_compute(key, lambda: compute(text))
@@ -110,3 +110,18 @@ class JobListingAnalytics(models.Model):
 
     def __str__(self):
         return f"Analytics for {self.job.title} on {self.date}"
+
+
+class AnalyticsRollupState(models.Model):
+    """How far the daily analytics rows have been filled in by ``rollup_analytics``."""
+    name = models.CharField(max_length=50, unique=True)
+    # Rows for earlier days are final; this day and later are read from the source tables
+    rolled_up_until = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Analytics Rollup State')
+        verbose_name_plural = _('Analytics Rollup States')
+
+    def __str__(self):
+        return f"{self.name} rolled up until {self.rolled_up_until}"
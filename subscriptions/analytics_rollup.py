@@ -0,0 +1,125 @@
+"""
+Daily application counts for the analytics dashboards.
+
+The dashboard trends grouped every ``JobApplication`` in the selected range
+by day on each page view, so a 365-day chart cost more the longer a company
+had been hiring. ``rollup`` (run by the ``rollup_analytics`` command) writes
+each day's new applications to ``EmployerAnalytics``, ``JobSeekerAnalytics``
+and ``JobListingAnalytics`` instead, and ``dashboard_stats.application_trend``
+reads those rows.
+
+A run starts at the watermark in ``AnalyticsRollupState``, counts every day
+from there to today again and upserts the rows, so repeating a run, or
+rolling up days that are already done, leaves the same rows behind. The
+watermark then moves to today: today's count is not final and is read from
+``JobApplication`` until the next run. Applications deleted after their day
+was rolled up are only taken off by rolling up again with ``since``.
+
+Only application counts are rolled up. Application status, views and
+visitors have no per-day history to roll up from, so the other columns of
+these tables are left alone.
+"""
+import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from jobs.models import JobApplication
+from .analytics_models import AnalyticsRollupState, EmployerAnalytics, JobListingAnalytics, JobSeekerAnalytics
+from .dashboard_stats import APPLICATIONS_ROLLUP, ROLLUP_WATERMARK_KEY, day_start
+
+DEFAULT_WINDOW_DAYS = 31
+BATCH_SIZE = 1000
+
+# Rollup model, its owner field, the JobApplication field giving the owner, and its count field
+TARGETS = (
+    (EmployerAnalytics, 'company', 'job__company_id', 'new_applications'),
+    (JobSeekerAnalytics, 'user', 'applicant_id', 'new_applications'),
+    (JobListingAnalytics, 'job', 'job_id', 'applications'),
+)
+
+
+def get_watermark():
+    """The first day without final rollup rows, or None before the first rollup."""
+    return AnalyticsRollupState.objects.filter(
+        name=APPLICATIONS_ROLLUP
+    ).values_list('rolled_up_until', flat=True).first()
+
+
+def _set_watermark(day):
+    AnalyticsRollupState.objects.update_or_create(name=APPLICATIONS_ROLLUP, defaults={'rolled_up_until': day})
+    transaction.on_commit(lambda: cache.delete(ROLLUP_WATERMARK_KEY))
+
+
+def rollup_days(start, end):
+    """
+    Count the applications of each day from ``start`` to ``end`` into the rollup tables.
+
+    Existing counts for those days are replaced, so days can be rolled up any
+    number of times.
+
+    Args:
+        start: First day, inclusive
+        end: Last day, inclusive
+
+    Returns:
+        int: Rollup rows written
+    """
+    applications = JobApplication.objects.filter(
+        applied_at__gte=day_start(start),
+        applied_at__lt=day_start(end + datetime.timedelta(days=1)),
+    ).annotate(day=TruncDate('applied_at'))
+    now = timezone.now()
+    written = 0
+    for model, owner, source, field in TARGETS:
+        # Days whose applications have since been deleted count zero
+        model.objects.filter(date__gte=start, date__lte=end).exclude(**{field: 0}).update(
+            **{field: 0, 'updated_at': now}
+        )
+        rows = applications.values(source, 'day').annotate(count=Count('pk')).order_by()
+        objects = [model(**{f'{owner}_id': row[source], 'date': row['day'], field: row['count']}) for row in rows]
+        model.objects.bulk_create(
+            objects,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=[owner, 'date'],
+            update_fields=[field, 'updated_at'],
+        )
+        written += len(objects)
+    return written
+
+
+def rollup(since=None, today=None, window_days=DEFAULT_WINDOW_DAYS):
+    """
+    Bring the rollup tables up to date.
+
+    Days are rolled up ``window_days`` at a time, each window in its own
+    transaction that also moves the watermark, so an interrupted run carries
+    on from the last finished window.
+
+    Args:
+        since: Roll up again from this day instead of from the watermark
+        today: Last day to roll up (defaults to the current date)
+        window_days: Days per transaction
+
+    Returns:
+        tuple: (days rolled up, rollup rows written)
+    """
+    today = today or timezone.localdate()
+    start = since or get_watermark()
+    if start is None:
+        first = JobApplication.objects.order_by('applied_at').values_list('applied_at', flat=True).first()
+        start = timezone.localdate(first) if first else today
+
+    days = written = 0
+    while start <= today:
+        end = min(start + datetime.timedelta(days=window_days - 1), today)
+        with transaction.atomic():
+            written += rollup_days(start, end)
+            _set_watermark(min(end + datetime.timedelta(days=1), today))
+        days += (end - start).days + 1
+        start = end + datetime.timedelta(days=1)
+    return days, written
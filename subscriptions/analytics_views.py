@@ -3,12 +3,14 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
-from django.db.models import Count, Avg, Sum, F, Q
+from django.db.models import Count, Sum, F, Q
 from datetime import timedelta, date
 
 from .models import UserSubscription
 from .analytics_models import EmployerAnalytics, JobSeekerAnalytics, JobListingAnalytics
-from jobs.models import JobListing, JobApplication, SavedJob, Company
+from .dashboard_stats import APPLICATION_STATUSES, application_trend, employer_stats, job_seeker_stats
+from jobs.aggregation import bucket_counts, choice_buckets
+from jobs.models import JobListing, JobApplication, Company
 
 
 @login_required
@@ -59,22 +61,20 @@ def employer_analytics_dashboard(request):
     elif date_range == '365':
         start_date = end_date - timedelta(days=365)
     
-    # Get job listings for the selected company
-    job_listings = JobListing.objects.filter(company=selected_company)
+    # Counts by status, cached per company
+    stats = employer_stats(selected_company.pk)
+    job_counts = stats['jobs']
+    application_counts = stats['applications']
     
-    # Get applications for the job listings
-    applications = JobApplication.objects.filter(job__company=selected_company)
+    total_job_listings = job_counts['total']
+    active_job_listings = job_counts['published']
+    expired_job_listings = job_counts['expired']
     
-    # Calculate metrics
-    total_job_listings = job_listings.count()
-    active_job_listings = job_listings.filter(status='published').count()
-    expired_job_listings = job_listings.filter(status='expired').count()
-    
-    total_applications = applications.count()
-    new_applications = applications.filter(status='pending').count()
-    reviewed_applications = applications.filter(status='reviewed').count()
-    shortlisted_applications = applications.filter(status='shortlisted').count()
-    rejected_applications = applications.filter(status='rejected').count()
+    total_applications = application_counts['total']
+    new_applications = application_counts['pending']
+    reviewed_applications = application_counts['reviewed']
+    shortlisted_applications = application_counts['shortlisted']
+    rejected_applications = application_counts['rejected']
     
     # Calculate application status distribution
     application_status_data = {
@@ -88,26 +88,17 @@ def employer_analytics_dashboard(request):
     job_status_data = {
         'published': active_job_listings,
         'expired': expired_job_listings,
-        'draft': job_listings.filter(status='draft').count()
+        'draft': job_counts['draft']
     }
     
     # Get top performing job listings
-    top_jobs = job_listings.annotate(
-        application_count=Count('applications')
-    ).order_by('-application_count')[:5]
+    top_jobs = stats['top_jobs']
     
     # Get application trend data
-    application_trend = applications.filter(
-        created_at__date__gte=start_date,
-        created_at__date__lte=end_date
-    ).values('created_at__date').annotate(
-        count=Count('id')
-    ).order_by('created_at__date')
-    
-    application_trend_data = {
-        'labels': [str(item['created_at__date']) for item in application_trend],
-        'data': [item['count'] for item in application_trend]
-    }
+    application_trend_data = application_trend(
+        JobApplication.objects.filter(job__company=selected_company), start_date, end_date,
+        rollups=EmployerAnalytics.objects.filter(company=selected_company)
+    )
     
     context = {
         'companies': companies,
@@ -172,11 +163,12 @@ def job_listing_analytics(request, job_id):
     applications = JobApplication.objects.filter(job=job)
     
     # Calculate metrics
-    total_applications = applications.count()
-    new_applications = applications.filter(status='pending').count()
-    reviewed_applications = applications.filter(status='reviewed').count()
-    shortlisted_applications = applications.filter(status='shortlisted').count()
-    rejected_applications = applications.filter(status='rejected').count()
+    counts = bucket_counts(applications, choice_buckets('status', APPLICATION_STATUSES))
+    total_applications = counts['total']
+    new_applications = counts['pending']
+    reviewed_applications = counts['reviewed']
+    shortlisted_applications = counts['shortlisted']
+    rejected_applications = counts['rejected']
     
     # Calculate application status distribution
     application_status_data = {
@@ -187,17 +179,10 @@ def job_listing_analytics(request, job_id):
     }
     
     # Get application trend data
-    application_trend = applications.filter(
-        created_at__date__gte=start_date,
-        created_at__date__lte=end_date
-    ).values('created_at__date').annotate(
-        count=Count('id')
-    ).order_by('created_at__date')
-    
-    application_trend_data = {
-        'labels': [str(item['created_at__date']) for item in application_trend],
-        'data': [item['count'] for item in application_trend]
-    }
+    application_trend_data = application_trend(
+        applications, start_date, end_date,
+        rollups=JobListingAnalytics.objects.filter(job=job), field='applications'
+    )
     
     # Get top applicant locations
     top_locations = applications.values(
@@ -269,64 +254,45 @@ def job_seeker_analytics_dashboard(request):
         start_date = end_date - timedelta(days=7)
     elif date_range == '90':
         start_date = end_date - timedelta(days=90)
+    elif date_range == '180':
+        start_date = end_date - timedelta(days=180)
+    elif date_range == '365':
+        start_date = end_date - timedelta(days=365)
     
-    # Get applications for the user
-    applications = JobApplication.objects.filter(applicant=request.user)
+    # Counts by status and match band, cached per user
+    stats = job_seeker_stats(request.user.pk)
+    application_counts = stats['applications']
     
-    # Calculate metrics
-    total_applications = applications.count()
-    new_applications = applications.filter(
-        created_at__date__gte=start_date,
-        created_at__date__lte=end_date
-    ).count()
-    viewed_applications = applications.filter(status__in=['reviewed', 'shortlisted', 'rejected']).count()
-    shortlisted_applications = applications.filter(status='shortlisted').count()
-    rejected_applications = applications.filter(status='rejected').count()
+    total_applications = application_counts['total']
+    viewed_applications = application_counts['viewed']
+    shortlisted_applications = application_counts['shortlisted']
+    rejected_applications = application_counts['rejected']
     
     # Calculate application status distribution
     application_status_data = {
-        'pending': applications.filter(status='pending').count(),
-        'reviewed': applications.filter(status='reviewed').count(),
+        'pending': application_counts['pending'],
+        'reviewed': application_counts['reviewed'],
         'shortlisted': shortlisted_applications,
         'rejected': rejected_applications
     }
     
     # Get application trend data
-    application_trend = applications.filter(
-        created_at__date__gte=start_date,
-        created_at__date__lte=end_date
-    ).values('created_at__date').annotate(
-        count=Count('id')
-    ).order_by('created_at__date')
-    
-    application_trend_data = {
-        'labels': [str(item['created_at__date']) for item in application_trend],
-        'data': [item['count'] for item in application_trend]
-    }
+    application_trend_data = application_trend(
+        JobApplication.objects.filter(applicant=request.user), start_date, end_date,
+        rollups=JobSeekerAnalytics.objects.filter(user=request.user)
+    )
+    new_applications = sum(application_trend_data['data'])
     
     # Get job match scores
-    from .ai_models import JobMatchScore
-    job_matches = JobMatchScore.objects.filter(user=request.user)
-    
-    average_match = job_matches.aggregate(avg=Avg('overall_match'))['avg'] or 0
-    high_match_jobs = job_matches.filter(overall_match__gte=80).count()
-    
-    # Get match score distribution
-    match_distribution = {
-        'high': job_matches.filter(overall_match__gte=80).count(),
-        'medium': job_matches.filter(overall_match__gte=50, overall_match__lt=80).count(),
-        'low': job_matches.filter(overall_match__lt=50).count()
-    }
+    average_match = stats['average_match']
+    match_distribution = stats['match_distribution']
+    high_match_jobs = match_distribution['high']
     
     # Get top job categories applied to
-    top_categories = applications.values(
-        'job__category'
-    ).annotate(
-        count=Count('id')
-    ).order_by('-count')[:5]
+    top_categories = stats['top_categories']
     
     # Get saved jobs
-    saved_jobs = SavedJob.objects.filter(user=request.user).count()
+    saved_jobs = stats['saved_jobs']
     
     context = {
         'date_range': date_range,
@@ -9,7 +9,7 @@ the most qualified candidates efficiently.
 
 import logging
 import re
-from collections import defaultdict, Counter
+from collections import Counter
 import math
 from operator import itemgetter
 
@@ -66,7 +66,7 @@ class ApplicationScreener:
             'poor': (0, 39)
         }
     
-    def screen_application(self, job_listing, application_data):
+    def screen_application(self, job_listing, application_data, job_requirements=None):
         """
         Screen a job application against job requirements.
         
@@ -89,6 +89,10 @@ class ApplicationScreener:
                 - cover_letter_file_name (str, optional): Name of cover letter file
                 - candidate_name (str, optional): Name of the candidate
                 - application_note (str, optional): Additional application notes
+
+            job_requirements (dict, optional): Requirements already extracted from
+                job_listing with _extract_job_requirements. Bulk screening passes
+                them in so they are extracted once per job, not once per applicant.
                 
         Returns:
             dict: Screening results
@@ -139,7 +143,8 @@ class ApplicationScreener:
                     processed_cover_letter = self.text_processor.process_document(cover_letter_text, 'cover_letter')
             
             # Extract job requirements
-            job_requirements = self._extract_job_requirements(job_listing)
+            if job_requirements is None:
+                job_requirements = self._extract_job_requirements(job_listing)
             
             # Calculate scores
             scores = self._calculate_scores(
@@ -200,67 +205,26 @@ class ApplicationScreener:
                 'is_valid': False
             }
     
-    def bulk_screen_applications(self, job_listing, applications):
+    def bulk_screen_applications(self, job_listing, applications, max_workers=None):
         """
         Screen multiple applications and provide ranked results.
+
+        Job requirements are extracted once and the resumes are screened in
+        parallel by BulkScreeningEngine.
         
         Args:
             job_listing (dict): Job listing information
             applications (list): List of application data dicts
+            max_workers (int, optional): Worker processes to use. Defaults to
+                the BULK_SCREENING_MAX_WORKERS setting; 0 or 1 screens serially.
                 
         Returns:
             dict: Screening results for all applications, ranked by score
         """
         try:
-            # Validate inputs
-            if not job_listing:
-                return {
-                    'error': 'No job listing provided for screening',
-                    'is_valid': False
-                }
-                
-            if not applications or not isinstance(applications, list):
-                return {
-                    'error': 'No applications provided for screening',
-                    'is_valid': False
-                }
-            
-            # Screen each application
-            screening_results = []
-            for application in applications:
-                result = self.screen_application(job_listing, application)
-                if result.get('is_valid', False):
-                    result['application_id'] = application.get('id')
-                    screening_results.append(result)
-            
-            # Sort by overall score
-            screening_results.sort(key=lambda x: x['overall_score'], reverse=True)
-            
-            # Group candidates by tier
-            candidates_by_tier = defaultdict(list)
-            for result in screening_results:
-                candidates_by_tier[result['candidate_tier']].append(result)
-            
-            # Calculate stats
-            stats = {
-                'total_applications': len(applications),
-                'valid_applications': len(screening_results),
-                'tier_distribution': {tier: len(candidates) for tier, candidates in candidates_by_tier.items()},
-                'average_score': sum(r['overall_score'] for r in screening_results) / max(1, len(screening_results))
-            }
-            
-            return {
-                'is_valid': True,
-                'job_title': job_listing.get('title', 'Unknown Position'),
-                'screening_results': screening_results,
-                'candidates_by_tier': {tier: [
-                    {'candidate_name': r['candidate_name'], 
-                     'overall_score': r['overall_score'],
-                     'application_id': r.get('application_id')} 
-                    for r in candidates
-                ] for tier, candidates in candidates_by_tier.items()},
-                'stats': stats
-            }
+            from .bulk_screening import BulkScreeningEngine
+            engine = BulkScreeningEngine(self, max_workers=max_workers)
+            return engine.screen(job_listing, applications)
             
         except Exception as e:
             logger.error(f"Error in bulk application screening: {str(e)}")
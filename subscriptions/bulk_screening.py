@@ -0,0 +1,385 @@
+"""
+Bulk application screening.
+
+``ApplicationScreener.bulk_screen_applications`` used to call
+``screen_application`` once per applicant inside the web request, extracting
+the job requirements again for every resume. ``BulkScreeningEngine`` extracts
+them once and fans the resumes out over a process pool. At most
+``max_pending`` applications are in flight at a time and results are yielded
+as soon as each one completes.
+
+``start_bulk_screening`` queues the same engine as a ``bulk_screening``
+``AITask`` (see ``subscriptions.ai_tasks``), so ``run_ai_workers`` runs it
+outside the web process and takes it over if its worker dies. Progress is
+recorded on a ``BulkScreeningRun`` row, which employers poll through the
+``bulk_screening_status`` endpoint, and each progress write renews the
+task's lease. A run only starts from ``pending``, so a run is screened by
+one worker at a time. ``fail_stale_runs`` marks runs failed once their task
+is gone, has failed or has let its lease run out, so the job can be screened
+again.
+
+Two settings control the pool:
+
+``BULK_SCREENING_MAX_WORKERS``
+    Worker processes. ``0`` or ``1`` screens in the calling process, as a
+    pool of one process would only add overhead.
+``BULK_SCREENING_MAX_PENDING``
+    Applications submitted to the pool but not yet finished.
+"""
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_PENDING = 32
+
+# Number of finished applications between progress writes
+PROGRESS_UPDATE_EVERY = 10
+
+# Keys that hold open file objects, which cannot be sent to a worker process
+_FILE_KEYS = {
+    'resume': ('resume_file', 'resume_file_name', 'resume_file_path', 'resume_text'),
+    'cover_letter': ('cover_letter_file', 'cover_letter_file_name', 'cover_letter_file_path', 'cover_letter_text'),
+}
+
+# Screener owned by each worker process, built once by _init_worker
+_worker_screener = None
+
+
+def _init_worker():
+    global _worker_screener
+    from .application_screener import ApplicationScreener
+    _worker_screener = ApplicationScreener()
+
+
+def _screen_in_worker(job_listing, job_requirements, application):
+    result = _worker_screener.screen_application(job_listing, application, job_requirements=job_requirements)
+    result['application_id'] = application.get('id')
+    return result
+
+
+class BulkScreeningEngine:
+    """Screen many applications for one job listing in parallel."""
+
+    def __init__(self, screener=None, max_workers=None, max_pending=None):
+        if screener is None:
+            from .application_screener import ApplicationScreener
+            screener = ApplicationScreener()
+        self.screener = screener
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+
+    @property
+    def max_workers(self):
+        if self._max_workers is not None:
+            return self._max_workers
+        return getattr(settings, 'BULK_SCREENING_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+
+    @property
+    def max_pending(self):
+        if self._max_pending is not None:
+            return self._max_pending
+        return getattr(settings, 'BULK_SCREENING_MAX_PENDING', DEFAULT_MAX_PENDING)
+
+    def iter_results(self, job_listing, applications):
+        """
+        Screen applications and yield each result as soon as it is ready.
+
+        Results come back in completion order, not submission order. Invalid
+        applications are yielded too, with ``is_valid`` set to False.
+
+        Args:
+            job_listing (dict): Job listing information
+            applications (iterable): Application data dicts
+
+        Yields:
+            dict: Screening result with the application's ``id`` as ``application_id``
+        """
+        job_requirements = self.screener._extract_job_requirements(job_listing)
+        applications = (self._prepare_application(application) for application in applications)
+
+        # A single worker process would only add overhead
+        if self.max_workers <= 1:
+            for application in applications:
+                yield self._screen_locally(job_listing, job_requirements, application)
+            return
+
+        try:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"Process pool unavailable, screening applications serially: {str(e)}")
+            for application in applications:
+                yield self._screen_locally(job_listing, job_requirements, application)
+            return
+
+        max_pending = max(self.max_pending, self.max_workers)
+        with executor:
+            pending = {}
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max_pending:
+                    application = next(applications, None)
+                    if application is None:
+                        exhausted = True
+                        break
+                    future = executor.submit(_screen_in_worker, job_listing, job_requirements, application)
+                    pending[future] = application
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    application = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        logger.error(f"Error screening application {application.get('id')}: {str(e)}")
+                        yield {
+                            'error': f"Error screening application: {str(e)}",
+                            'is_valid': False,
+                            'application_id': application.get('id')
+                        }
+
+    def screen(self, job_listing, applications):
+        """
+        Screen all applications and return the ranked summary.
+
+        Args:
+            job_listing (dict): Job listing information
+            applications (list): List of application data dicts
+
+        Returns:
+            dict: Screening results for all applications, ranked by score
+        """
+        if not job_listing:
+            return {
+                'error': 'No job listing provided for screening',
+                'is_valid': False
+            }
+
+        if not applications or not isinstance(applications, list):
+            return {
+                'error': 'No applications provided for screening',
+                'is_valid': False
+            }
+
+        results = [r for r in self.iter_results(job_listing, applications) if r.get('is_valid', False)]
+        return summarize_screening(job_listing, results, len(applications))
+
+    def _screen_locally(self, job_listing, job_requirements, application):
+        result = self.screener.screen_application(job_listing, application, job_requirements=job_requirements)
+        result['application_id'] = application.get('id')
+        return result
+
+    def _prepare_application(self, application):
+        """
+        Make an application safe to send to a worker process.
+
+        Files with a local path are passed by path. Other file objects (uploads,
+        remote storage) are read here and passed on as text.
+        """
+        application = dict(application)
+        extractors = {
+            'resume': self.screener._extract_resume_text,
+            'cover_letter': self.screener._extract_cover_letter_text,
+        }
+        for kind, (file_key, name_key, path_key, text_key) in _FILE_KEYS.items():
+            file_object = application.pop(file_key, None)
+            if not file_object or application.get(text_key) or application.get(path_key):
+                continue
+            try:
+                application[path_key] = file_object.path
+                continue
+            except (AttributeError, NotImplementedError):
+                pass
+            application[text_key] = extractors[kind]({file_key: file_object, name_key: application.get(name_key)
+                                                      or getattr(file_object, 'name', '')})
+        return application
+
+
+def summarize_screening(job_listing, screening_results, total_applications):
+    """
+    Rank valid screening results and group them by candidate tier.
+
+    Args:
+        job_listing (dict): Job listing information
+        screening_results (list): Valid results from screen_application
+        total_applications (int): Number of applications that were screened
+
+    Returns:
+        dict: Ranked results, candidates grouped by tier and summary stats
+    """
+    screening_results = sorted(screening_results, key=lambda x: x['overall_score'], reverse=True)
+
+    candidates_by_tier = defaultdict(list)
+    for result in screening_results:
+        candidates_by_tier[result['candidate_tier']].append(result)
+
+    stats = {
+        'total_applications': total_applications,
+        'valid_applications': len(screening_results),
+        'tier_distribution': {tier: len(candidates) for tier, candidates in candidates_by_tier.items()},
+        'average_score': sum(r['overall_score'] for r in screening_results) / max(1, len(screening_results))
+    }
+
+    return {
+        'is_valid': True,
+        'job_title': job_listing.get('title', 'Unknown Position'),
+        'screening_results': screening_results,
+        'candidates_by_tier': {tier: [
+            {'candidate_name': r['candidate_name'],
+             'overall_score': r['overall_score'],
+             'application_id': r.get('application_id')}
+            for r in candidates
+        ] for tier, candidates in candidates_by_tier.items()},
+        'stats': stats
+    }
+
+
+def application_data_for(job_application):
+    """Build the screener's application data dict for a JobApplication."""
+    applicant = job_application.applicant
+    data = {
+        'id': job_application.pk,
+        'candidate_name': applicant.get_full_name() or applicant.email,
+        'cover_letter_text': job_application.cover_letter or '',
+    }
+    if job_application.resume:
+        data['resume_file'] = job_application.resume
+        data['resume_file_name'] = job_application.resume.name
+    return data
+
+
+def start_bulk_screening(job_listing, job_dict, requested_by=None, applications=None):
+    """
+    Create a BulkScreeningRun and queue the screening of its applications.
+
+    Args:
+        job_listing: JobListing being screened
+        job_dict (dict): Job listing information for the screener
+        requested_by: User who started the run
+        applications (queryset, optional): JobApplications to screen. Defaults to
+            every application for the listing that has not been withdrawn.
+
+    Returns:
+        BulkScreeningRun: The run, in the ``pending`` state
+    """
+    from .ai_models import BulkScreeningRun
+    from .ai_tasks import enqueue
+
+    if applications is None:
+        applications = job_listing.applications.filter(is_withdrawn=False)
+    application_ids = list(applications.values_list('pk', flat=True))
+
+    run = BulkScreeningRun.objects.create(
+        job=job_listing,
+        requested_by=requested_by,
+        total_applications=len(application_ids),
+    )
+    enqueue(
+        requested_by or job_listing.posted_by, 'bulk_screening',
+        run_id=run.pk, job_id=job_listing.pk, job=job_dict, application_ids=application_ids
+    )
+    run.refresh_from_db()
+    return run
+
+
+def _lease_seconds():
+    from .ai_tasks import DEFAULT_LEASE_SECONDS
+    return getattr(settings, 'AI_TASK_LEASE_SECONDS', DEFAULT_LEASE_SECONDS)
+
+
+def fail_stale_runs(runs):
+    """
+    Mark runs failed that no worker will finish.
+
+    A run is stale when its ``bulk_screening`` task is gone, has failed or
+    completed without finishing the run, or is running on a lease that has
+    run out. Runs still waiting in the queue are left alone.
+
+    Args:
+        runs: BulkScreeningRun queryset to check
+
+    Returns:
+        int: Number of runs marked failed
+    """
+    from django.db.models import Q
+    from django.utils import timezone
+    from .ai_models import AITask
+
+    now = timezone.now()
+    lease_expired = now - timezone.timedelta(seconds=_lease_seconds())
+    active_run_ids = AITask.objects.filter(kind='bulk_screening').filter(
+        Q(status='pending') | Q(status='running', locked_at__gte=lease_expired)
+    ).values_list('params__run_id', flat=True)
+    return runs.filter(status__in=['pending', 'running']).exclude(pk__in=list(active_run_ids)).update(
+        status='failed', error='Screening stopped before it finished. Please try again.',
+        updated_at=now, completed_at=now
+    )
+
+
+def run_bulk_screening(run_id, job_dict, application_ids, engine=None, renew_lease=None):
+    """
+    Screen the given applications and record progress and results on the run.
+
+    Progress counters are written every PROGRESS_UPDATE_EVERY applications, and
+    at least every third of the lease; the ranked results are written once,
+    when the run completes. Only a ``pending`` run is screened.
+
+    Args:
+        renew_lease (callable, optional): Called with every progress write;
+            returning False means another worker has taken the run over, and
+            this one stops
+    """
+    import time
+    from django.utils import timezone
+    from jobs.models import JobApplication
+    from .ai_models import BulkScreeningRun
+
+    engine = engine or BulkScreeningEngine()
+    runs = BulkScreeningRun.objects.filter(pk=run_id)
+    if not runs.filter(status='pending').update(status='running', updated_at=timezone.now()):
+        logger.info(f"Bulk screening run {run_id} is no longer pending, not screening it")
+        return
+
+    renew_every = _lease_seconds() / 3
+    last_renewed = time.monotonic()
+    try:
+        applications = (
+            application_data_for(application)
+            for application in JobApplication.objects.filter(pk__in=application_ids)
+            .select_related('applicant').iterator()
+        )
+
+        processed = 0
+        valid_results = []
+        for result in engine.iter_results(job_dict, applications):
+            processed += 1
+            if result.get('is_valid', False):
+                valid_results.append(result)
+            if processed % PROGRESS_UPDATE_EVERY == 0 or time.monotonic() - last_renewed > renew_every:
+                if renew_lease is not None and not renew_lease():
+                    logger.warning(f"Bulk screening run {run_id} was taken over by another worker")
+                    return
+                last_renewed = time.monotonic()
+                runs.update(processed_applications=processed, valid_applications=len(valid_results),
+                            updated_at=timezone.now())
+
+        summary = summarize_screening(job_dict, valid_results, len(application_ids))
+        runs.update(
+            status='completed',
+            processed_applications=processed,
+            valid_applications=len(valid_results),
+            results=summary,
+            updated_at=timezone.now(),
+            completed_at=timezone.now(),
+        )
+    except Exception as e:
+        logger.error(f"Bulk screening run {run_id} failed: {str(e)}")
+        runs.update(status='failed', error=str(e), updated_at=timezone.now(), completed_at=timezone.now())
@@ -1,5 +1,4 @@
-from .models import UserSubscription
-from django.utils import timezone
+from .utils import get_subscription_status
 
 def subscription_context(request):
     """
@@ -8,17 +7,15 @@ def subscription_context(request):
     context = {
         'has_pro': False,
         'active_subscription': None,
+        'subscription_capabilities': {},
     }
     
     if request.user.is_authenticated:
-        # Check if user has an active subscription
-        active_subscription = UserSubscription.objects.filter(
-            user=request.user,
-            status='active',
-            end_date__gt=timezone.now()
-        ).first()
-        
-        context['active_subscription'] = active_subscription
+        # Shares the status resolved by has_active_pro() for this request
+        status = get_subscription_status(request.user)
+
+        context['active_subscription'] = status.active_subscription
+        context['subscription_capabilities'] = status.capabilities
         context['has_pro'] = request.user.has_active_pro()
     
     return context
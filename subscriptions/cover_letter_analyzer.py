@@ -16,8 +16,10 @@ from typing import Dict, List, Any, Optional
 
 from .document_parser import DocumentParser
 from .text_processor import TextProcessor
+from .analysis_cache import cached_analysis
 from .content_validator import ContentValidator
 from .data_resources import get_all_skills, get_all_job_titles
+from .skill_matcher import get_skill_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,9 @@ class CoverLetterAnalyzer:
     actionable recommendations. It also provides dynamic cover letter generation
     with templates for different job types, industries, and experience levels.
     """
+
+    # Bump when the analysis output changes, so cached results are not reused
+    VERSION = 1
     
     def __init__(self):
         """Initialize the CoverLetterAnalyzer with necessary components."""
@@ -162,6 +167,12 @@ class CoverLetterAnalyzer:
         Returns:
             dict: Analysis results
         """
+        return cached_analysis(
+            self, text, lambda t: self._analyze_cover_letter_text(t, job_description, company_name),
+            job_description, company_name
+        )
+
+    def _analyze_cover_letter_text(self, text, job_description, company_name):
         # First validate that this is a cover letter
         validation = self._validate_cover_letter(text)
         
@@ -221,7 +232,8 @@ class CoverLetterAnalyzer:
             },
             'overall_score': overall_score,
             'suggestions': recommendations,
-            'word_count': len(text.split())
+            'word_count': len(text.split()),
+            'extracted_text': text
         }
         
         # Add job relevance if job description was provided
@@ -497,10 +509,7 @@ class CoverLetterAnalyzer:
         content_results['achievement_count'] = len(content_results['achievements'])
         
         # Check for skills mentioned
-        mentioned_skills = []
-        for skill in self.all_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
-                mentioned_skills.append(skill)
+        mentioned_skills = get_skill_matcher().find_skills(text)
         
         content_results['skills_mentioned'] = mentioned_skills[:10]  # Limit to top 10
         content_results['skill_count'] = len(content_results['skills_mentioned'])
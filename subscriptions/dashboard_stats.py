@@ -0,0 +1,197 @@
+"""
+Numbers behind the employer and job seeker analytics dashboards.
+
+Each dashboard counted every job status, application status and match score
+band with its own query, 10 to 15 round trips per page view. The counts for
+a table now come from one query (see ``jobs.aggregation``) and the results
+are cached per company or per user for ``ANALYTICS_DASHBOARD_TIMEOUT``
+seconds. ``subscriptions.signals`` drops an entry when one of its
+applications, job listings, match scores or saved jobs is saved or deleted;
+bulk ``update()`` calls send no signals and show up once the entry expires.
+
+The application trend depends on the selected date range and is not cached.
+It reads the daily rows that ``rollup_analytics`` writes for the days before
+its watermark and counts only the later days from ``JobApplication``, so its
+cost does not grow with the length of the range (see
+``subscriptions.analytics_rollup``).
+"""
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from jobs.aggregation import bucket_counts, choice_buckets
+
+DEFAULT_TIMEOUT = 5 * 60
+
+EMPLOYER_KEY = 'dashboard_stats:employer:{}'
+JOB_SEEKER_KEY = 'dashboard_stats:job_seeker:{}'
+ROLLUP_WATERMARK_KEY = 'dashboard_stats:rolled_up_until'
+
+# AnalyticsRollupState.name of the daily application counts
+APPLICATIONS_ROLLUP = 'applications'
+
+JOB_STATUSES = ('published', 'expired', 'draft')
+APPLICATION_STATUSES = ('pending', 'reviewed', 'shortlisted', 'rejected')
+
+# Match score bands, by overall match percentage
+MATCH_BANDS = {
+    'high': Q(overall_match__gte=80),
+    'medium': Q(overall_match__gte=50, overall_match__lt=80),
+    'low': Q(overall_match__lt=50),
+}
+
+
+def employer_key(company_id):
+    return EMPLOYER_KEY.format(company_id)
+
+
+def job_seeker_key(user_id):
+    return JOB_SEEKER_KEY.format(user_id)
+
+
+def _cached(key, loader):
+    stats = cache.get(key)
+    if stats is None:
+        stats = loader()
+        cache.set(key, stats, getattr(settings, 'ANALYTICS_DASHBOARD_TIMEOUT', DEFAULT_TIMEOUT))
+    return stats
+
+
+def _load_employer_stats(company_id):
+    from jobs.models import JobApplication, JobListing
+
+    job_listings = JobListing.objects.filter(company_id=company_id)
+    top_jobs = job_listings.annotate(application_count=Count('applications')).order_by('-application_count')[:5]
+    return {
+        'jobs': bucket_counts(job_listings, choice_buckets('status', JOB_STATUSES)),
+        'applications': bucket_counts(
+            JobApplication.objects.filter(job__company_id=company_id),
+            choice_buckets('status', APPLICATION_STATUSES),
+        ),
+        'top_jobs': list(top_jobs),
+    }
+
+
+def employer_stats(company_id):
+    """
+    Job and application counts for a company's dashboard.
+
+    Args:
+        company_id: Primary key of the company
+
+    Returns:
+        dict: ``jobs`` and ``applications`` counts by status (plus ``total``),
+        and ``top_jobs``, the five listings with the most applications
+    """
+    return _cached(employer_key(company_id), lambda: _load_employer_stats(company_id))
+
+
+def _load_job_seeker_stats(user_id):
+    from jobs.models import JobApplication, SavedJob
+    from .ai_models import JobMatchScore
+
+    applications = JobApplication.objects.filter(applicant_id=user_id)
+    buckets = choice_buckets('status', APPLICATION_STATUSES)
+    buckets['viewed'] = Q(status__in=['reviewed', 'shortlisted', 'rejected'])
+    matches = bucket_counts(
+        JobMatchScore.objects.filter(user_id=user_id), MATCH_BANDS, total=None,
+        average=Avg('overall_match'),
+    )
+    top_categories = applications.values('job__category').annotate(count=Count('id')).order_by('-count')[:5]
+    return {
+        'applications': bucket_counts(applications, buckets),
+        'average_match': matches.pop('average') or 0,
+        'match_distribution': matches,
+        'top_categories': list(top_categories),
+        'saved_jobs': SavedJob.objects.filter(user_id=user_id).count(),
+    }
+
+
+def job_seeker_stats(user_id):
+    """
+    Application, match score and saved job counts for a job seeker's dashboard.
+
+    Args:
+        user_id: Primary key of the job seeker
+
+    Returns:
+        dict: ``applications`` counts by status (plus ``total`` and ``viewed``),
+        ``average_match``, ``match_distribution`` by band, ``top_categories``
+        and ``saved_jobs``
+    """
+    return _cached(job_seeker_key(user_id), lambda: _load_job_seeker_stats(user_id))
+
+
+def invalidate_employer(*company_ids):
+    cache.delete_many([employer_key(company_id) for company_id in company_ids])
+
+
+def invalidate_job_seeker(*user_ids):
+    cache.delete_many([job_seeker_key(user_id) for user_id in user_ids])
+
+
+def day_start(day):
+    """The first moment of ``day`` in the current time zone."""
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def rolled_up_until():
+    """
+    The first day the rollup tables do not hold final counts for.
+
+    Returns:
+        date: The rollup watermark, or None before the first rollup
+    """
+    from .analytics_models import AnalyticsRollupState
+
+    # '' stands for "no rollup yet", as None is a cache miss
+    return _cached(ROLLUP_WATERMARK_KEY, lambda: AnalyticsRollupState.objects.filter(
+        name=APPLICATIONS_ROLLUP
+    ).values_list('rolled_up_until', flat=True).first() or '') or None
+
+
+def application_trend(applications, start_date, end_date, rollups=None, field='new_applications'):
+    """
+    Applications per day between two dates, in the shape the dashboard charts use.
+
+    Args:
+        applications: JobApplication queryset
+        start_date: First day, inclusive
+        end_date: Last day, inclusive
+        rollups: Daily analytics rows for the same applications, read for the
+            days before the rollup watermark
+        field: Field of ``rollups`` holding the day's application count
+
+    Returns:
+        dict: ``labels`` (ISO dates) and ``data`` (counts) for the days with applications
+    """
+    counts = {}
+    counted_from = start_date
+    until = rolled_up_until() if rollups is not None else None
+    if until is not None and until > start_date:
+        counts.update(rollups.filter(
+            date__gte=start_date,
+            date__lt=until,
+            date__lte=end_date,
+            **{f'{field}__gt': 0}
+        ).order_by().values_list('date', field))
+        counted_from = until
+
+    if counted_from <= end_date:
+        # Bounds on applied_at itself, rather than on its date, can use its index
+        trend = applications.filter(
+            applied_at__gte=day_start(counted_from),
+            applied_at__lt=day_start(end_date + datetime.timedelta(days=1))
+        ).values('applied_at__date').annotate(
+            count=Count('id')
+        ).order_by()
+        counts.update((item['applied_at__date'], item['count']) for item in trend)
+
+    days = sorted(counts)
+    return {
+        'labels': [str(day) for day in days],
+        'data': [counts[day] for day in days]
+    }
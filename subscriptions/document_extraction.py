@@ -0,0 +1,295 @@
+"""
+Text extraction from PDF, DOCX and TXT documents.
+
+``DocumentParser`` used to return canned text for every PDF and DOCX, so
+every analyzer worked on the same sample resume. This module does the real
+extraction.
+
+``read_document`` reads a file or upload in chunks (``UploadedFile.chunks``
+for Django uploads) and computes its SHA-256 as it goes. Files over
+``DOCUMENT_MAX_BYTES`` are rejected before they are parsed. Uploads Django
+has already spooled to disk, and files on disk, are passed to the extractor
+by path; smaller uploads are passed as bytes.
+
+``extract_text`` parses PDFs page by page with PyPDF2, and DOCX files
+paragraph by paragraph (tables included, in document order) with
+python-docx. It stops after ``DOCUMENT_MAX_PAGES`` pages (DOCX:
+``PARAGRAPHS_PER_PAGE`` paragraphs per page), so a 200-page upload costs no
+more than the cap. Parsing is CPU-bound, so it runs in a pool of
+``DOCUMENT_EXTRACTION_WORKERS`` processes (``0`` parses in the calling
+process). A document whose parsing runs longer than
+``DOCUMENT_EXTRACTION_TIMEOUT`` seconds yields no text. The limit is enforced
+inside the worker with a timer, so time spent waiting for a free worker does
+not count and the other documents in the pool are unaffected. Only a worker
+that does not come back shortly after its deadline (stuck outside Python
+code) gets the pool discarded and a new one started.
+"""
+import hashlib
+import io
+import logging
+import os
+import signal
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_PAGES = 50
+DEFAULT_TIMEOUT = 20
+DEFAULT_WORKERS = min(2, os.cpu_count() or 1)
+
+# How long past its deadline a worker may take to report the timeout
+TIMEOUT_GRACE_SECONDS = 5
+
+# DOCX has no pages; this many paragraphs count as one for DOCUMENT_MAX_PAGES
+PARAGRAPHS_PER_PAGE = 40
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+_CHUNK_SIZE = 64 * 1024
+
+# ``source`` is a path, or the document's bytes
+Document = namedtuple('Document', ['source', 'digest', 'size'])
+
+
+class DocumentTooLarge(ValueError):
+    """The document is larger than DOCUMENT_MAX_BYTES."""
+
+
+class ExtractionTimeout(Exception):
+    """Parsing ran longer than DOCUMENT_EXTRACTION_TIMEOUT."""
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _chunks(file_object):
+    if hasattr(file_object, 'chunks'):
+        # Django File/UploadedFile; rewinds first
+        yield from file_object.chunks(_CHUNK_SIZE)
+        return
+    if hasattr(file_object, 'seek'):
+        file_object.seek(0)
+    for chunk in iter(lambda: file_object.read(_CHUNK_SIZE), b''):
+        if not chunk:
+            break
+        yield chunk
+
+
+def read_document(file_object, path=None, max_bytes=None):
+    """
+    Read a document in chunks, hashing it on the way.
+
+    Args:
+        file_object: Open file or Django upload
+        path (str, optional): Where the file is on disk, if it is
+        max_bytes (int, optional): Defaults to ``DOCUMENT_MAX_BYTES``
+
+    Returns:
+        Document: Source for ``extract_text``, SHA-256 hex digest and size
+
+    Raises:
+        DocumentTooLarge: If the document exceeds ``max_bytes``
+    """
+    if max_bytes is None:
+        max_bytes = _setting('DOCUMENT_MAX_BYTES', DEFAULT_MAX_BYTES)
+    if path is None and hasattr(file_object, 'temporary_file_path'):
+        path = file_object.temporary_file_path()
+
+    digest = hashlib.sha256()
+    buffer = None if path else bytearray()
+    size = 0
+    for chunk in _chunks(file_object):
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        size += len(chunk)
+        if size > max_bytes:
+            raise DocumentTooLarge(f"Document is larger than {max_bytes} bytes")
+        digest.update(chunk)
+        if buffer is not None:
+            buffer.extend(chunk)
+
+    if hasattr(file_object, 'seek'):
+        try:
+            file_object.seek(0)
+        except (OSError, ValueError):
+            pass
+    return Document(path or bytes(buffer), digest.hexdigest(), size)
+
+
+def _open(source):
+    return source if isinstance(source, str) else io.BytesIO(source)
+
+
+def extract_pdf(source, max_pages):
+    """Extract the text of the first ``max_pages`` pages of a PDF."""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(_open(source))
+    pages = []
+    for number, page in enumerate(reader.pages):
+        if number >= max_pages:
+            logger.info(f"Stopped PDF extraction after {max_pages} pages")
+            break
+        pages.append(page.extract_text() or '')
+    return '\n'.join(pages)
+
+
+def extract_docx(source, max_pages):
+    """Extract paragraphs and table cells of a DOCX, in document order."""
+    from docx import Document as load_docx
+    from docx.oxml.ns import qn
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = load_docx(_open(source))
+    max_paragraphs = max_pages * PARAGRAPHS_PER_PAGE
+    lines = []
+    for child in document.element.body.iterchildren():
+        if child.tag not in (qn('w:p'), qn('w:tbl')):
+            continue
+        if len(lines) >= max_paragraphs:
+            logger.info(f"Stopped DOCX extraction after {max_paragraphs} paragraphs")
+            break
+        if child.tag == qn('w:p'):
+            lines.append(Paragraph(child, document).text)
+        elif child.tag == qn('w:tbl'):
+            for row in Table(child, document).rows:
+                cells = [cell.text.strip() for cell in row.cells]
+                lines.append(' | '.join(cell for cell in cells if cell))
+    return '\n'.join(lines)
+
+
+def extract_txt(source, max_pages=None):
+    """Decode a text file as UTF-8, falling back to Latin-1."""
+    if isinstance(source, str):
+        with open(source, 'rb') as file:
+            source = file.read()
+    try:
+        return source.decode('utf-8')
+    except UnicodeDecodeError:
+        return source.decode('latin-1')
+
+
+_EXTRACTORS = {
+    '.pdf': extract_pdf,
+    '.docx': extract_docx,
+    '.txt': extract_txt,
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def discard_pool(pool=None):
+    """
+    Stop the worker pool; the next extraction starts a new one.
+
+    Args:
+        pool (optional): Only discard the pool if it is still this one
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or (pool is not None and _pool is not pool):
+            return
+        pool, _pool = _pool, None
+    # A stuck worker would keep shutdown() waiting, so stop the processes
+    processes = getattr(pool, '_processes', None) or {}
+    for process in list(processes.values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+
+def _extract_with_deadline(extractor, source, max_pages, timeout):
+    """Run ``extractor`` in a pool worker, raising ExtractionTimeout after ``timeout`` seconds."""
+    if not hasattr(signal, 'setitimer'):
+        return extractor(source, max_pages)
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        return extractor(source, max_pages)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _wait(future, timeout, poll=0.05):
+    """Return the result of ``future``, counting only the time it has been running."""
+    started = None
+    while True:
+        try:
+            return future.result(timeout=poll)
+        except FutureTimeoutError:
+            if started is None and future.running():
+                started = time.monotonic()
+            if started is not None and time.monotonic() - started >= timeout:
+                raise
+
+
+def extract_text(extension, source, max_pages=None, timeout=None, workers=None):
+    """
+    Extract the text of a document.
+
+    Args:
+        extension (str): '.pdf', '.docx' or '.txt'
+        source: Path or bytes, from ``read_document``
+        max_pages (int, optional): Defaults to ``DOCUMENT_MAX_PAGES``
+        timeout (float, optional): Defaults to ``DOCUMENT_EXTRACTION_TIMEOUT``
+        workers (int, optional): Defaults to ``DOCUMENT_EXTRACTION_WORKERS``
+
+    Returns:
+        str: Extracted text, empty if parsing timed out
+
+    Raises:
+        ValueError: If the extension is not supported
+        Exception: Whatever the parser raised for a corrupt document
+    """
+    extractor = _EXTRACTORS.get(extension)
+    if extractor is None:
+        raise ValueError(f"Unsupported file format: {extension}")
+    if max_pages is None:
+        max_pages = _setting('DOCUMENT_MAX_PAGES', DEFAULT_MAX_PAGES)
+    if workers is None:
+        workers = _setting('DOCUMENT_EXTRACTION_WORKERS', DEFAULT_WORKERS)
+
+    # Text files only need decoding
+    if extension == '.txt' or workers <= 0:
+        return extractor(source, max_pages)
+
+    if timeout is None:
+        timeout = _setting('DOCUMENT_EXTRACTION_TIMEOUT', DEFAULT_TIMEOUT)
+    pool = _get_pool(workers)
+    try:
+        future = pool.submit(_extract_with_deadline, extractor, source, max_pages, timeout)
+        return _wait(future, timeout + TIMEOUT_GRACE_SECONDS)
+    except ExtractionTimeout:
+        logger.warning(f"Document extraction timed out after {timeout} seconds")
+        return ''
+    except FutureTimeoutError:
+        logger.warning(f"Document extraction worker did not stop after {timeout} seconds")
+        discard_pool(pool)
+        return ''
+    except BrokenProcessPool as e:
+        logger.error(f"Document extraction worker failed: {str(e)}")
+        discard_pool(pool)
+        return ''
@@ -1,6 +1,9 @@
 import os
 import logging
 
+from .analysis_cache import analysis_cache, make_key
+from .document_extraction import SUPPORTED_EXTENSIONS, DocumentTooLarge, extract_text, read_document
+
 logger = logging.getLogger(__name__)
 
 class DocumentParser:
@@ -11,10 +14,13 @@ class DocumentParser:
     different file formats (PDF, DOCX, TXT) and pre-processing
     the text for further analysis.
 
-    NOTE: This is a temporary dummy implementation for testing purposes.
-    The actual implementation requires PyPDF2 and python-docx packages.
+    PDF and DOCX files are parsed by ``document_extraction`` with PyPDF2 and
+    python-docx, within the configured size, page and time limits.
     """
 
+    # Bump when extraction output changes, so cached text is not reused
+    VERSION = 2
+
     @staticmethod
     def extract_text(file_path):
         """
@@ -45,43 +51,39 @@ class DocumentParser:
             raise ValueError(f"Unsupported file format: {file_extension}")
 
     @staticmethod
-    def extract_text_from_pdf(pdf_path):
+    def _extract(file_object, file_name, path=None):
         """
-        Extract text from a PDF file.
+        Extract text through the extraction engine, cached by content hash.
 
         Args:
-            pdf_path (str): Path to the PDF file
+            file_object: Open file or Django upload
+            file_name (str): Name with extension
+            path (str, optional): Where the file is on disk, if it is
 
         Returns:
-            str: Extracted text from the PDF
-        """
-        logger.info(f"Using dummy implementation for PDF extraction: {pdf_path}")
-        # Return dummy text for testing
-        return """
-        John Doe
-        Software Developer
-
-        Experience:
-        Senior Developer at Tech Company (2018-Present)
-        - Developed web applications using Python and JavaScript
-        - Led a team of 5 developers
-
-        Junior Developer at Startup Inc (2015-2018)
-        - Worked on frontend development using React
-
-        Education:
-        Bachelor of Science in Computer Science
-        University of Technology (2015)
-
-        Skills:
-        Python, JavaScript, React, HTML, CSS, Git, Agile, Communication, Teamwork
+            str: Extracted text, empty if the document could not be read
         """
+        extension = os.path.splitext(file_name or '')[1].lower()
+        try:
+            document = read_document(file_object, path=path)
+        except DocumentTooLarge as e:
+            logger.warning(f"Not extracting text from {file_name}: {str(e)}")
+            return ""
+
+        def extract():
+            try:
+                return extract_text(extension, document.source)
+            except Exception as e:
+                logger.error(f"Error extracting text from {file_name}: {str(e)}")
+                return ""
+
+        key = make_key('text', DocumentParser.VERSION, extension, document.digest)
+        return analysis_cache.get_or_compute(key, extract, cache_if=bool)
 
     @staticmethod
-    def _extract_text_from_pdf_alternative(pdf_path):
+    def extract_text_from_pdf(pdf_path):
         """
-        Alternative method to extract text from a PDF file.
-        This is a fallback method when the primary method fails.
+        Extract text from a PDF file.
 
         Args:
             pdf_path (str): Path to the PDF file
@@ -89,8 +91,8 @@ class DocumentParser:
         Returns:
             str: Extracted text from the PDF
         """
-        logger.info(f"Using dummy alternative implementation for PDF extraction: {pdf_path}")
-        return ""
+        with open(pdf_path, 'rb') as file:
+            return DocumentParser._extract(file, pdf_path, path=pdf_path)
 
     @staticmethod
     def extract_text_from_docx(docx_path):
@@ -103,43 +105,8 @@ class DocumentParser:
         Returns:
             str: Extracted text from the DOCX
         """
-        logger.info(f"Using dummy implementation for DOCX extraction: {docx_path}")
-        # Return dummy text for testing
-        return """
-        John Smith
-        Cybersecurity Specialist
-
-        Experience:
-        Senior Security Analyst at Tech Solutions (2019-Present)
-        - Implemented security protocols and conducted risk assessments
-        - Led a team of security professionals
-
-        Security Consultant at SecureIT (2016-2019)
-        - Provided security consulting services to clients
-
-        Education:
-        Master of Science in Cybersecurity
-        University of Technology (2016)
-
-        Skills:
-        Cybersecurity, Risk Management, Penetration Testing, Network Security,
-        Incident Response, Security Auditing, Organization, Communication
-        """
-
-    @staticmethod
-    def _extract_text_from_docx_alternative(docx_path):
-        """
-        Alternative method to extract text from a DOCX file.
-        This is a fallback method when the primary method fails.
-
-        Args:
-            docx_path (str): Path to the DOCX file
-
-        Returns:
-            str: Extracted text from the DOCX
-        """
-        logger.info(f"Using dummy alternative implementation for DOCX extraction: {docx_path}")
-        return ""
+        with open(docx_path, 'rb') as file:
+            return DocumentParser._extract(file, docx_path, path=docx_path)
 
     @staticmethod
     def extract_text_from_txt(txt_path):
@@ -180,14 +147,6 @@ class DocumentParser:
             str: Extracted text from the file
         """
         file_extension = os.path.splitext(file_name)[1].lower()
-        logger.info(f"Using dummy implementation for file object extraction: {file_name}")
-
-        # Return dummy text based on file extension
-        if file_extension == '.pdf':
-            return DocumentParser.extract_text_from_pdf("")
-        elif file_extension == '.docx':
-            return DocumentParser.extract_text_from_docx("")
-        elif file_extension == '.txt':
-            return "This is a sample text file content for testing purposes."
-        else:
-            return "Unsupported file format: " + file_extension
\ No newline at end of file
+        if file_extension not in SUPPORTED_EXTENSIONS:
+            return "Unsupported file format: " + file_extension
+        return DocumentParser._extract(file_object, file_name)
@@ -3,17 +3,8 @@ import random
 import logging
 from datetime import datetime
 
-# Import our real AI implementations
-from .resume_analyzer import ResumeAnalyzer
-from .resume_builder import ResumeBuilder
-from .cover_letter_analyzer import CoverLetterAnalyzer
-from .interview_preparation import InterviewPreparation
-from .salary_insights import SalaryInsights
-from .career_path_planner import CareerPathPlanner
-from .job_posting_analyzer import JobPostingAnalyzer
-from .candidate_matching import CandidateMatchingSystem
-from .job_description_generator import JobDescriptionGenerator
-from .application_screener import ApplicationScreener
+# Our real AI implementations are imported on first use by the getters below,
+# since they hold large data tables that slow down process startup.
 
 # Import document parsing functionality
 from .document_parser import DocumentParser
@@ -42,6 +33,7 @@ class EnhancedAIService:
             try:
                 from .text_processor import TextProcessor
                 from .content_validator import ContentValidator
+                from .resume_analyzer import ResumeAnalyzer
                 
                 text_processor = TextProcessor()
                 content_validator = ContentValidator(text_processor)
@@ -58,6 +50,7 @@ class EnhancedAIService:
         """Get or create the ResumeBuilder singleton instance."""
         if cls._resume_builder is None:
             try:
+                from .resume_builder import ResumeBuilder
                 cls._resume_builder = ResumeBuilder()
             except Exception as e:
                 logger.error(f"Failed to initialize ResumeBuilder: {str(e)}")
@@ -69,6 +62,7 @@ class EnhancedAIService:
         """Get or create the CoverLetterAnalyzer singleton instance."""
         if cls._cover_letter_analyzer is None:
             try:
+                from .cover_letter_analyzer import CoverLetterAnalyzer
                 cls._cover_letter_analyzer = CoverLetterAnalyzer()
             except Exception as e:
                 logger.error(f"Failed to initialize CoverLetterAnalyzer: {str(e)}")
@@ -80,6 +74,7 @@ class EnhancedAIService:
         """Get or create the InterviewPreparation singleton instance."""
         if cls._interview_preparation is None:
             try:
+                from .interview_preparation import InterviewPreparation
                 cls._interview_preparation = InterviewPreparation()
             except Exception as e:
                 logger.error(f"Failed to initialize InterviewPreparation: {str(e)}")
@@ -91,6 +86,7 @@ class EnhancedAIService:
         """Get or create the SalaryInsights singleton instance."""
         if cls._salary_insights is None:
             try:
+                from .salary_insights import SalaryInsights
                 cls._salary_insights = SalaryInsights()
             except Exception as e:
                 logger.error(f"Failed to initialize SalaryInsights: {str(e)}")
@@ -102,6 +98,7 @@ class EnhancedAIService:
         """Get or create the CareerPathPlanner singleton instance."""
         if cls._career_path_planner is None:
             try:
+                from .career_path_planner import CareerPathPlanner
                 cls._career_path_planner = CareerPathPlanner()
             except Exception as e:
                 logger.error(f"Failed to initialize CareerPathPlanner: {str(e)}")
@@ -113,6 +110,7 @@ class EnhancedAIService:
         """Get or create the JobPostingAnalyzer singleton instance."""
         if cls._job_posting_analyzer is None:
             try:
+                from .job_posting_analyzer import JobPostingAnalyzer
                 cls._job_posting_analyzer = JobPostingAnalyzer()
             except Exception as e:
                 logger.error(f"Failed to initialize JobPostingAnalyzer: {str(e)}")
@@ -124,6 +122,7 @@ class EnhancedAIService:
         """Get or create the CandidateMatchingSystem singleton instance."""
         if cls._candidate_matching is None:
             try:
+                from .candidate_matching import CandidateMatchingSystem
                 cls._candidate_matching = CandidateMatchingSystem()
             except Exception as e:
                 logger.error(f"Failed to initialize CandidateMatchingSystem: {str(e)}")
@@ -135,6 +134,7 @@ class EnhancedAIService:
         """Get or create the JobDescriptionGenerator singleton instance."""
         if cls._job_description_generator is None:
             try:
+                from .job_description_generator import JobDescriptionGenerator
                 cls._job_description_generator = JobDescriptionGenerator()
             except Exception as e:
                 logger.error(f"Failed to initialize JobDescriptionGenerator: {str(e)}")
@@ -146,6 +146,7 @@ class EnhancedAIService:
         """Get or create the ApplicationScreener singleton instance."""
         if cls._application_screener is None:
             try:
+                from .application_screener import ApplicationScreener
                 cls._application_screener = ApplicationScreener()
             except Exception as e:
                 logger.error(f"Failed to initialize ApplicationScreener: {str(e)}")
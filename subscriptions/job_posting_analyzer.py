@@ -13,6 +13,7 @@ from collections import defaultdict, Counter
 
 from .document_parser import DocumentParser
 from .text_processor import TextProcessor
+from .analysis_cache import cached_analysis
 from .content_validator import ContentValidator
 from .data_resources import (
     get_all_skills, 
@@ -22,6 +23,7 @@ from .data_resources import (
     get_exclusive_language_patterns,
     get_job_posting_templates
 )
+from .skill_matcher import get_skill_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +35,9 @@ class JobPostingAnalyzer:
     to provide comprehensive job posting analysis with detailed feedback and
     actionable recommendations for improvement.
     """
+
+    # Bump when the analysis output changes, so cached results are not reused
+    VERSION = 2
     
     def __init__(self):
         """Initialize the JobPostingAnalyzer with necessary components."""
@@ -213,6 +218,9 @@ class JobPostingAnalyzer:
         Returns:
             dict: Analysis results
         """
+        return cached_analysis(self, text, self._analyze_job_posting_text)
+
+    def _analyze_job_posting_text(self, text):
         # First validate that this is a job posting
         validation = self._validate_job_posting(text)
         
@@ -738,7 +746,7 @@ class JobPostingAnalyzer:
                     break
             
             # Check for specificity (tech stack or specialization)
-            tech_matches = [tech for tech in self.technical_skills if tech.lower() in job_title.lower()]
+            tech_matches = get_skill_matcher().find_skills(job_title, kind='technical')
             specialization_terms = ['frontend', 'backend', 'full stack', 'devops', 'data', 'machine learning', 'ai', 'mobile', 'web']
             specialization_matches = [term for term in specialization_terms if term in job_title.lower()]
             
@@ -7,10 +7,37 @@ that can be displayed in job listings to help job seekers find appropriate oppor
 """
 
 import logging
+import threading
+
+from django.core.cache import cache
+
 from .candidate_matching import CandidateMatchingSystem
 
 logger = logging.getLogger(__name__)
 
+# Job requirements only change when the listing is edited, so they are cached
+# per job and per ``updated_at`` value.
+JOB_REQUIREMENTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher():
+    """
+    Return the process-wide CandidateMatchingSystem.
+
+    Building a matcher loads the skills tables and creates a TextProcessor and
+    ContentValidator, so it is done once per process and shared by all callers.
+    """
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = CandidateMatchingSystem()
+    return _matcher
+
+
 class JobQualificationChecker:
     """
     Provides efficient qualification checking for job listings.
@@ -20,8 +47,142 @@ class JobQualificationChecker:
     """
     
     def __init__(self):
-        """Initialize the checker with a candidate matching system."""
-        self.matcher = CandidateMatchingSystem()
+        """Initialize the checker with the shared candidate matching system."""
+        self.matcher = get_matcher()
+
+    def get_match_badges(self, user, jobs):
+        """
+        Calculate match badge data for one user against a page of jobs.
+
+        The user's profile is processed once and reused for every job, and job
+        requirements are read from the cache when available.
+
+        Args:
+            user: The job seeker viewing the jobs
+            jobs: Iterable of JobListing objects (e.g. one page of results)
+
+        Returns:
+            dict: Badge data keyed by job ID, in the format expected by
+                  ``jobs/partials/match_percentage_badge.html``
+        """
+        if not user or not user.is_authenticated or user.user_type != 'job_seeker':
+            return {}
+
+        try:
+            processed_profile = self._process_user_profile(user)
+        except Exception as e:
+            logger.error(f"Error processing user profile for matching: {str(e)}")
+            return {}
+
+        badges = {}
+        for job in jobs:
+            try:
+                job_requirements = self._get_job_requirements(job)
+                match_results = self.matcher._calculate_match_scores(processed_profile, job_requirements)
+
+                badges[job.id] = {
+                    'display': True,
+                    'percentage': int(match_results['overall_match']),
+                    'skill_match': int(match_results['skills_match']['score']),
+                    'experience_match': int(match_results['experience_match']['score']),
+                    'education_match': int(match_results['education_match']['score']),
+                    'job_id': job.id
+                }
+            except Exception as e:
+                logger.error(f"Error calculating match for job {job.id}: {str(e)}")
+                badges[job.id] = {'display': False}
+
+        return badges
+
+    def get_detailed_match_data(self, user, job):
+        """
+        Calculate the match breakdown between a user's profile and a single job.
+
+        Returns:
+            dict: Overall, skill, experience and education match percentages
+        """
+        badge = self.get_match_badges(user, [job]).get(job.id)
+        if not badge or not badge['display']:
+            raise ValueError("Unable to calculate match data for this job")
+
+        return {
+            'overall_percentage': badge['percentage'],
+            'skill_match_percentage': badge['skill_match'],
+            'experience_match_percentage': badge['experience_match'],
+            'education_match_percentage': badge['education_match'],
+        }
+
+    def calculate_job_match_percentage(self, user, job):
+        """Calculate the overall match percentage between a user's profile and a job."""
+        return self.get_detailed_match_data(user, job)['overall_percentage']
+
+    def _process_user_profile(self, user):
+        """
+        Build processed resume data from the user's profile fields.
+
+        Profile fields are already structured, so they are mapped directly to
+        the keys the matcher scores against instead of being re-extracted.
+        """
+        profile_sections = [
+            ('Summary', user.bio),
+            ('Skills', user.skills),
+            ('Experience', user.experience),
+            ('Education', user.education),
+        ]
+        profile_text = '\n'.join(
+            f"{header}:\n{content}" for header, content in profile_sections if content
+        )
+        if user.job_title:
+            profile_text = f"{user.job_title}\n{profile_text}"
+
+        processed_profile = self.matcher.text_processor.process_document(profile_text, 'resume')
+        entities = processed_profile.get('entities', {})
+
+        skills = [skill.strip() for skill in (user.skills or '').split(',') if skill.strip()]
+        for skill in entities.get('skills', []):
+            if skill not in skills:
+                skills.append(skill)
+
+        job_titles = entities.get('job_titles', [])
+        if user.job_title:
+            job_titles = [user.job_title] + job_titles
+
+        experience_lines = [line.strip() for line in (user.experience or '').splitlines() if line.strip()]
+        education_lines = [line.strip() for line in (user.education or '').splitlines() if line.strip()]
+
+        processed_profile.update({
+            'extracted_skills': skills,
+            'extracted_job_titles': job_titles,
+            'extracted_location': user.location or '',
+            'extracted_experience': [
+                {'title': '', 'company': '', 'description': line, 'years': line}
+                for line in experience_lines
+            ],
+            'extracted_education': [
+                {'degree': line, 'institution': '', 'year': ''}
+                for line in education_lines
+            ],
+        })
+        return processed_profile
+
+    def _get_job_requirements(self, job):
+        """Return the extracted requirements for a job listing, using the cache."""
+        updated_at = job.updated_at.timestamp() if job.updated_at else 0
+        cache_key = f'job_requirements:{job.pk}:{updated_at}'
+
+        job_requirements = cache.get(cache_key)
+        if job_requirements is None:
+            job_requirements = self.matcher._extract_job_requirements({
+                'id': job.pk,
+                'title': job.title,
+                'description': job.description,
+                'requirements': job.requirements,
+                'skills_required': job.skills_required,
+                'location': job.location,
+            })
+            cache.set(cache_key, job_requirements, JOB_REQUIREMENTS_CACHE_TIMEOUT)
+
+        return job_requirements
         
     def check_qualification(self, resume_text, job_listing):
         """
@@ -0,0 +1,162 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from subscriptions.analysis_cache import analysis_cache
+from subscriptions.document_extraction import (
+    PARAGRAPHS_PER_PAGE, DEFAULT_WORKERS, discard_pool, extract_text, read_document,
+)
+from subscriptions.document_parser import DocumentParser
+
+from .benchmark_skill_matcher import SAMPLE_RESUME
+
+_RESUME_LINES = [line.strip() for line in SAMPLE_RESUME.strip().splitlines() if line.strip()]
+
+
+def _page_lines(page, count, document=0):
+    lines = [f'Resume {document} page {page}']
+    while len(lines) < count:
+        lines.extend(_RESUME_LINES)
+    return lines[:count]
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(pages, document=0, lines_per_page=50):
+    """Build a PDF of ``pages`` pages of resume text, each starting with "Resume D page N"."""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page in range(1, pages + 1):
+        text = ' '.join(f'({_pdf_escape(line)}) Tj T*' for line in _page_lines(page, lines_per_page, document))
+        stream = f'BT /F1 10 Tf 14 TL 50 760 Td {text} ET'.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append((
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>'
+        ).encode('latin-1'))
+        kids.append(len(objects))
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(f"{kid} 0 R" for kid in kids)}] /Count {pages} >>'.encode('latin-1')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+def make_docx(pages, document=0):
+    """Build a DOCX of ``pages`` pages' worth of paragraphs, each starting with "Resume D page N"."""
+    from docx import Document
+
+    docx = Document()
+    for page in range(1, pages + 1):
+        for line in _page_lines(page, PARAGRAPHS_PER_PAGE, document):
+            docx.add_paragraph(line)
+    output = io.BytesIO()
+    docx.save(output)
+    return output.getvalue()
+
+
+class Command(BaseCommand):
+    help = 'Measures PDF and DOCX extraction throughput on a generated corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--documents',
+            type=int,
+            default=20,
+            help='Documents of each format in the corpus'
+        )
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=10,
+            help='Pages per document'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help='Worker processes for the pooled run'
+        )
+        parser.add_argument(
+            '--corpus',
+            help='Write the corpus to this directory and keep it'
+        )
+
+    def handle(self, *args, **options):
+        count, pages, workers = options['documents'], options['pages'], options['workers']
+        if count < 1 or pages < 1 or workers < 1:
+            raise CommandError('--documents, --pages and --workers must be at least 1')
+
+        directory = options['corpus'] or tempfile.mkdtemp(prefix='extraction-corpus-')
+        os.makedirs(directory, exist_ok=True)
+        try:
+            corpus = {'.pdf': make_pdf, '.docx': make_docx}
+            paths = {extension: [] for extension in corpus}
+            for extension, make in corpus.items():
+                for i in range(count):
+                    path = os.path.join(directory, f'resume_{i}{extension}')
+                    with open(path, 'wb') as file:
+                        file.write(make(pages, i))
+                    paths[extension].append(path)
+            self.stdout.write(f'Corpus: {count} PDF and {count} DOCX files of {pages} pages in {directory}')
+
+            for extension, files in paths.items():
+                sources = []
+                for path in files:
+                    with open(path, 'rb') as file:
+                        sources.append(read_document(file, path=path).source)
+
+                start = time.perf_counter()
+                for source in sources:
+                    extract_text(extension, source, max_pages=pages, workers=0)
+                serial = time.perf_counter() - start
+
+                # Start the workers before timing the pool
+                extract_text(extension, sources[0], max_pages=1, workers=workers)
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(
+                        lambda source: extract_text(extension, source, max_pages=pages, workers=workers), sources
+                    ))
+                pooled = time.perf_counter() - start
+                discard_pool()
+
+                total = count * pages
+                self.stdout.write(
+                    f'{extension[1:].upper()}: {total / serial:.0f} pages/s in process, '
+                    f'{total / pooled:.0f} pages/s with {workers} workers'
+                )
+
+            # Repeated documents come from the cache
+            analysis_cache.clear_local()
+            all_files = paths['.pdf'] + paths['.docx']
+            timings = []
+            for _ in range(2):
+                start = time.perf_counter()
+                for path in all_files:
+                    DocumentParser.extract_text(path)
+                timings.append(time.perf_counter() - start)
+            self.stdout.write(
+                f'DocumentParser: {timings[0] * 1000 / len(all_files):.1f} ms per document first time, '
+                f'{timings[1] * 1000 / len(all_files):.2f} ms from the cache'
+            )
+            self.stdout.write(self.style.SUCCESS('Done'))
+        finally:
+            discard_pool()
+            if not options['corpus']:
+                shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,113 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from subscriptions.paystack import PaystackAPI, add_metrics_hook, remove_metrics_hook, reset_session
+from subscriptions.paystack_stub import PaystackStubServer
+
+
+class Command(BaseCommand):
+    help = ('Measures Paystack verification throughput against a local stub, '
+            'with the pooled client and with one connection per call')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=1000,
+            help='Number of verifications with each method'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Concurrent callers, like concurrent payment callbacks'
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0,
+            help='Milliseconds the stub waits before answering'
+        )
+        parser.add_argument(
+            '--url',
+            help='Base URL of a running stub instead of starting one'
+        )
+        parser.add_argument(
+            '--serve',
+            metavar='HOST:PORT',
+            help='Only run the stub, e.g. to point PAYSTACK_BASE_URL at it'
+        )
+
+    def handle(self, *args, **options):
+        latency = options['latency'] / 1000
+
+        if options['serve']:
+            host, _, port = options['serve'].partition(':')
+            server = PaystackStubServer((host or '127.0.0.1', int(port or 8765)), latency=latency)
+            self.stdout.write(self.style.SUCCESS(f'Paystack stub listening on {server.url}'))
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+            return
+
+        server = None
+        base_url = options['url']
+        if not base_url:
+            server = PaystackStubServer(latency=latency).start()
+            base_url = server.url
+
+        count = options['requests']
+        if count < 1 or options['workers'] < 1:
+            raise CommandError('--requests and --workers must be at least 1')
+
+        try:
+            headers = {'Authorization': 'Bearer sk_test_benchmark', 'Accept': 'application/json'}
+
+            def unpooled(i):
+                start = time.perf_counter()
+                requests.get(f'{base_url}/transaction/verify/bench_{i}', headers=headers, timeout=30).json()
+                return time.perf_counter() - start
+
+            client = PaystackAPI('sk_test_benchmark', 'pk_test_benchmark', base_url=base_url)
+
+            def pooled(i):
+                start = time.perf_counter()
+                client.verify_transaction(f'bench_{i}', use_cache=False)
+                return time.perf_counter() - start
+
+            errors = []
+            hook = add_metrics_hook(lambda metrics: metrics.error and errors.append(metrics.error))
+            reset_session()
+            try:
+                for label, call in (('One connection per call', unpooled), ('Pooled session', pooled)):
+                    connections_before = server.connections if server else None
+                    start = time.perf_counter()
+                    with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                        latencies = sorted(executor.map(call, range(count)))
+                    elapsed = time.perf_counter() - start
+
+                    line = (
+                        f'{label}: {count / elapsed:.0f} verifications/s, '
+                        f'p50 {statistics.median(latencies) * 1000:.2f} ms, '
+                        f'p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f} ms'
+                    )
+                    if server:
+                        line += f', {server.connections - connections_before} connections'
+                    self.stdout.write(line)
+            finally:
+                remove_metrics_hook(hook)
+                reset_session()
+
+            if errors:
+                self.stdout.write(self.style.WARNING(f'{len(errors)} pooled calls failed, e.g. {errors[0]}'))
+            self.stdout.write(self.style.SUCCESS('Done'))
+        finally:
+            if server:
+                server.stop()
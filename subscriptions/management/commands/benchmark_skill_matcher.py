@@ -0,0 +1,102 @@
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from subscriptions.data_resources import SOFT_SKILLS, TECHNICAL_SKILLS, get_all_skills
+from subscriptions.skill_matcher import SkillMatcher, get_skill_matcher
+
+# Used when no --file is given
+SAMPLE_RESUME = """
+Jane Doe
+Senior Software Engineer
+
+Summary:
+Software engineer with eight years of experience building web applications
+in Python, Django and React. Strong communication, mentoring and team
+leadership skills, with a focus on test automation and continuous delivery.
+
+Experience:
+Lead Developer at Tech Company (2019-Present)
+- Led a team of six engineers building REST API services with Django and PostgreSQL
+- Introduced Docker, Kubernetes and Terraform for deployments on AWS
+- Improved time management and prioritization across the team with Agile practices
+
+Software Developer at Startup Inc (2015-2019)
+- Built single page applications with JavaScript, TypeScript and Vue.js
+- Wrote data pipelines in Python with Pandas and Apache Spark
+- Presented technical designs to stakeholders; strong written communication
+
+Education:
+Bachelor of Science in Computer Science, University of Technology (2015)
+
+Skills:
+Python, Django, Flask, JavaScript, TypeScript, React, Vue.js, SQL, PostgreSQL,
+Redis, Docker, Kubernetes, AWS, Git, Critical Thinking, Problem Solving,
+Collaboration, Conflict Resolution, Public Speaking
+"""
+
+
+def loop_find_skills(skills, text):
+    """The per-skill regex scan that SkillMatcher replaced."""
+    return sorted({
+        skill for skill in skills
+        if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE)
+    })
+
+
+class Command(BaseCommand):
+    help = 'Compares the compiled skill matcher with the per-skill regex loop it replaced'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            help='Text file to scan instead of the built-in sample resume'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Number of times each implementation scans the text'
+        )
+
+    def handle(self, *args, **options):
+        text = SAMPLE_RESUME
+        if options['file']:
+            try:
+                with open(options['file'], encoding='utf-8') as f:
+                    text = f.read()
+            except OSError as e:
+                raise CommandError(f"Could not read {options['file']}: {e}")
+
+        iterations = max(1, options['iterations'])
+        skills = get_all_skills()
+
+        started = time.perf_counter()
+        SkillMatcher({'technical': TECHNICAL_SKILLS, 'soft': SOFT_SKILLS})
+        build_ms = (time.perf_counter() - started) * 1000
+        matcher = get_skill_matcher()
+
+        expected = loop_find_skills(skills, text)
+        found = matcher.find_skills(text)
+        if found != expected:
+            raise CommandError(
+                f'Results differ: loop only {sorted(set(expected) - set(found))}, '
+                f'matcher only {sorted(set(found) - set(expected))}'
+            )
+
+        loop_ms = self._time(lambda: loop_find_skills(skills, text), iterations)
+        matcher_ms = self._time(lambda: matcher.find_skills(text), iterations)
+
+        self.stdout.write(f'{len(skills)} dictionary skills, {len(text)} characters, {len(found)} skills found')
+        self.stdout.write(f'Matcher build:      {build_ms:8.2f} ms (once per process)')
+        self.stdout.write(f'Per-skill loop:     {loop_ms:8.2f} ms per scan')
+        self.stdout.write(f'Compiled matcher:   {matcher_ms:8.2f} ms per scan')
+        self.stdout.write(self.style.SUCCESS(f'Speed-up: {loop_ms / max(matcher_ms, 1e-6):.1f}x'))
+
+    @staticmethod
+    def _time(func, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - started) * 1000 / iterations
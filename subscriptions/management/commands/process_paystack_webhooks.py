@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from subscriptions.models import PaystackWebhookEvent
+from subscriptions.webhooks import process_pending_events
+
+
+class Command(BaseCommand):
+    help = 'Applies the Paystack webhook events received since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Events per transaction (default: PAYSTACK_WEBHOOK_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new events instead of exiting'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between polls with --loop'
+        )
+        parser.add_argument(
+            '--purge-days',
+            type=int,
+            default=None,
+            help='Also delete processed events received more than this many days ago'
+        )
+
+    def handle(self, *args, **options):
+        if options['purge_days'] is not None:
+            cutoff = timezone.now() - timezone.timedelta(days=options['purge_days'])
+            deleted, _ = PaystackWebhookEvent.objects.filter(status='processed', received_at__lt=cutoff).delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} processed webhook events'))
+
+        while True:
+            result = process_pending_events(batch_size=options['batch_size'])
+            if result.processed or result.failed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Processed {result.processed} webhook events ({result.failed} failed)'
+                ))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
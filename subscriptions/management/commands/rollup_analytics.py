@@ -0,0 +1,35 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from subscriptions.analytics_rollup import DEFAULT_WINDOW_DAYS, get_watermark, rollup
+
+
+class Command(BaseCommand):
+    help = ('Counts each day\'s applications into the employer, job seeker and job listing analytics tables, '
+            'from where the last run stopped')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            type=datetime.date.fromisoformat,
+            help='Roll up again from this day (YYYY-MM-DD), for example after deleting applications'
+        )
+        parser.add_argument(
+            '--window-days',
+            type=int,
+            default=DEFAULT_WINDOW_DAYS,
+            help='Days rolled up per transaction'
+        )
+
+    def handle(self, *args, **options):
+        if options['window_days'] < 1:
+            raise CommandError('--window-days must be at least 1')
+        if options['since'] and options['since'] > timezone.localdate():
+            raise CommandError('--since cannot be in the future')
+
+        days, written = rollup(since=options['since'], window_days=options['window_days'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rolled up {days} days into {written} rows; days before {get_watermark()} are final'
+        ))
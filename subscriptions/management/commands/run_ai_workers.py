@@ -0,0 +1,103 @@
+import logging
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from subscriptions.ai_tasks import claim_tasks, run_task
+
+logger = logging.getLogger(__name__)
+
+# Longest wait, in seconds, after repeated errors such as a lost database connection
+MAX_BACKOFF = 60
+
+
+class Command(BaseCommand):
+    help = 'Runs queued AI analyses (resume analysis, cover letters, interview questions, salary insights)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Tasks run at the same time (default: AI_TASK_WORKERS)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=None,
+            help='Seconds a worker waits when the queue is empty (default: AI_TASK_POLL_INTERVAL)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of waiting for new tasks'
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency'] or getattr(settings, 'AI_TASK_WORKERS', 2)
+        interval = options['interval']
+        if interval is None:
+            interval = getattr(settings, 'AI_TASK_POLL_INTERVAL', 2)
+        if concurrency < 1:
+            raise CommandError('--concurrency must be at least 1')
+
+        stop = threading.Event()
+        counts = []
+        prefix = f'{socket.gethostname()}:{os.getpid()}'
+
+        def work(number):
+            worker_id = f'{prefix}:{number}'
+            ran = 0
+            errors = 0
+            try:
+                while not stop.is_set():
+                    try:
+                        tasks = claim_tasks(worker_id)
+                        for task in tasks:
+                            run_task(task)
+                            ran += 1
+                    except Exception:
+                        # Claimed tasks are picked up again once their lease expires
+                        errors += 1
+                        logger.exception('AI worker %s failed, retrying', worker_id)
+                        connection.close()
+                        stop.wait(min(max(interval, 1) * 2 ** (errors - 1), MAX_BACKOFF))
+                        continue
+                    errors = 0
+                    if not tasks:
+                        if options['once']:
+                            break
+                        stop.wait(interval)
+            finally:
+                # Each thread has its own database connection
+                connection.close()
+                counts.append(ran)
+
+        def terminate(signum, frame):
+            raise KeyboardInterrupt
+
+        threads = [threading.Thread(target=work, args=(number,), daemon=True) for number in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f'Started {concurrency} AI workers as {prefix}')
+
+        # Process managers stop workers with SIGTERM; treat it like Ctrl+C
+        previous_handler = signal.signal(signal.SIGTERM, terminate)
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(1)
+        except KeyboardInterrupt:
+            # Let running tasks finish
+            stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+        self.stdout.write(self.style.SUCCESS(f'Ran {sum(counts)} AI tasks'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-16 22:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0029_similar_jobs'),
+        ('subscriptions', '0004_coverletteranalysis_payment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkScreeningRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('total_applications', models.PositiveIntegerField(default=0)),
+                ('processed_applications', models.PositiveIntegerField(default=0)),
+                ('valid_applications', models.PositiveIntegerField(default=0)),
+                ('results', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='screening_runs', to='jobs.joblisting')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='screening_runs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Bulk Screening Run',
+                'verbose_name_plural': 'Bulk Screening Runs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-16 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0005_bulk_screening_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaystackWebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=255, unique=True)),
+                ('event', models.CharField(max_length=100)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Paystack Webhook Event',
+                'verbose_name_plural': 'Paystack Webhook Events',
+                'ordering': ['received_at'],
+                'indexes': [models.Index(fields=['status', 'received_at'], name='subs_webhook_status_received')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-16 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0033_hot_query_indexes'),
+        ('subscriptions', '0007_ai_task'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobmatchscore',
+            index=models.Index(fields=['user', 'overall_match'], name='subs_jobmatch_user_overall'),
+        ),
+        migrations.AddIndex(
+            model_name='usersubscription',
+            index=models.Index(fields=['user', 'status', 'end_date'], name='subs_usersub_user_status_end'),
+        ),
+    ]
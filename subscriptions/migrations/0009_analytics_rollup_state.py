@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-16 23:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0008_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('rolled_up_until', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Analytics Rollup State',
+                'verbose_name_plural': 'Analytics Rollup States',
+            },
+        ),
+    ]
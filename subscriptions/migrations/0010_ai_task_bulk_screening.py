@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-16 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0009_analytics_rollup_state'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aitask',
+            name='kind',
+            field=models.CharField(choices=[('resume_analysis', 'Resume Analysis'), ('cover_letter', 'Cover Letter'), ('interview_questions', 'Interview Questions'), ('salary_insights', 'Salary Insights'), ('bulk_screening', 'Bulk Screening')], max_length=50),
+        ),
+    ]
@@ -73,10 +73,24 @@ class UserSubscription(models.Model):
         verbose_name = _('User Subscription')
         verbose_name_plural = _('User Subscriptions')
         ordering = ['-created_at']
+        indexes = [
+            # A user's active subscription, latest end date first
+            models.Index(fields=['user', 'status', 'end_date'], name='subs_usersub_user_status_end'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.plan.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_saved_state()
+        return instance
+
+    def remember_saved_state(self):
+        """Record the stored status and end date, so a save can tell what it changed."""
+        self._saved_state = (self.__dict__.get('status'), self.__dict__.get('end_date'))
+
     @property
     def is_active(self):
         """Check if subscription is active."""
@@ -101,12 +115,6 @@ class UserSubscription(models.Model):
         self.status = 'cancelled'
         self.save()
 
-        # Update user's pro status
-        user = self.user
-        if hasattr(user, 'is_pro'):
-            user.is_pro = False
-            user.save(update_fields=['is_pro'])
-
         # If using Paystack, cancel the subscription there too
         if self.payment_method == 'paystack' and self.transaction_id:
             try:
@@ -114,18 +122,10 @@ class UserSubscription(models.Model):
                 paystack_config = PaystackConfig.get_config()
 
                 # Cancel subscription with Paystack
-                headers = {
-                    'Authorization': f'Bearer {paystack_config.secret_key}',
-                    'Content-Type': 'application/json'
-                }
-
-                url = f'https://api.paystack.co/subscription/{self.transaction_id}/disable'
+                from .paystack import get_paystack_client
+                response_data = get_paystack_client(paystack_config).disable_subscription(self.transaction_id)
 
-                import requests
-                response = requests.post(url, headers=headers)
-                response_data = response.json()
-
-                if not response.status_code == 200 or not response_data.get('status'):
+                if not response_data.get('status'):
                     # Log the error but continue with local cancellation
                     import logging
                     logger = logging.getLogger(__name__)
@@ -270,3 +270,32 @@ class PaystackConfig(models.Model):
             config.save()
 
         return config
+
+
+class PaystackWebhookEvent(models.Model):
+    """A Paystack webhook event, stored on receipt and processed by process_paystack_webhooks."""
+    STATUS_CHOICES = (
+        ('pending', _('Pending')),
+        ('processed', _('Processed')),
+        ('failed', _('Failed')),
+    )
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event = models.CharField(max_length=100)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Paystack Webhook Event')
+        verbose_name_plural = _('Paystack Webhook Events')
+        ordering = ['received_at']
+        indexes = [
+            models.Index(fields=['status', 'received_at'], name='subs_webhook_status_received'),
+        ]
+
+    def __str__(self):
+        return f"{self.event} ({self.event_id})"
@@ -1,132 +1,316 @@
+"""
+Client for the Paystack API.
+
+Every call used to go through ``requests.get``/``requests.post``, which opens
+a new connection (TCP and TLS handshake) per call, waits forever on a stalled
+server and gives up on the first transient error. The views also built their
+own requests rather than sharing a client.
+
+All clients now share one process-wide ``requests.Session`` whose connection
+pool keeps connections to Paystack alive between calls. Calls time out after
+``PAYSTACK_CONNECT_TIMEOUT``/``PAYSTACK_READ_TIMEOUT`` seconds. Failed
+connections, and idempotent GETs answered with 429 or 5xx, are retried up to
+``PAYSTACK_MAX_RETRIES`` times with exponential backoff. POSTs are only
+retried when the connection could not be made, since a POST that reached
+Paystack must not be sent twice.
+
+``verify_transaction`` caches a successful verification by reference for
+``PAYSTACK_VERIFY_CACHE_TIMEOUT`` seconds, so the callback, the payment form
+and repeated redirects do not verify the same payment again.
+
+Each call is reported to the metrics hooks (``add_metrics_hook`` or the
+``PAYSTACK_METRICS_HOOK`` setting) with its endpoint, status, latency and
+error. ``PAYSTACK_BASE_URL`` points the client at another server, such as the
+stub started by ``manage.py benchmark_paystack --serve``.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import namedtuple
+
 import requests
-import json
 from django.conf import settings
-import logging
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "https://api.paystack.co"
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 15
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_POOL_SIZE = 10
+DEFAULT_VERIFY_CACHE_TIMEOUT = 24 * 60 * 60
+
+VERIFY_CACHE_KEY = 'paystack:verify:{}:{}'
+
+# Reported to the metrics hooks after every call. ``endpoint`` is the path
+# without references or codes, e.g. "/transaction/verify".
+RequestMetrics = namedtuple('RequestMetrics', ['method', 'endpoint', 'status_code', 'elapsed', 'error'])
+
+_session = None
+_session_lock = threading.Lock()
+_metrics_hooks = []
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def build_session():
+    """Create a session with a keep-alive connection pool and retries."""
+    retry = Retry(
+        total=_setting('PAYSTACK_MAX_RETRIES', DEFAULT_MAX_RETRIES),
+        backoff_factor=_setting('PAYSTACK_BACKOFF_FACTOR', DEFAULT_BACKOFF_FACTOR),
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+    )
+    pool_size = _setting('PAYSTACK_POOL_SIZE', DEFAULT_POOL_SIZE)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept': 'application/json'})
+    return session
+
+
+def get_session():
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def reset_session():
+    """Close the process-wide session; the next call creates a new one."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def add_metrics_hook(hook):
+    """Call ``hook(RequestMetrics)`` after every Paystack call."""
+    _metrics_hooks.append(hook)
+    return hook
+
+
+def remove_metrics_hook(hook):
+    if hook in _metrics_hooks:
+        _metrics_hooks.remove(hook)
+
+
+def _get_hooks():
+    hooks = list(_metrics_hooks)
+    path = _setting('PAYSTACK_METRICS_HOOK', None)
+    if path:
+        hooks.append(import_string(path))
+    return hooks
+
+
+def _report(metrics):
+    for hook in _get_hooks():
+        try:
+            hook(metrics)
+        except Exception as e:
+            logger.warning(f"Paystack metrics hook failed: {str(e)}")
+
+
+def _error(message):
+    return {
+        "status": False,
+        "message": message,
+        "data": {}
+    }
+
+
 class PaystackAPI:
     """
     A class to interact with the Paystack API.
     """
-    BASE_URL = "https://api.paystack.co"
+    BASE_URL = DEFAULT_BASE_URL
 
-    def __init__(self, secret_key, public_key):
+    def __init__(self, secret_key, public_key, base_url=None, session=None):
         self.secret_key = secret_key
         self.public_key = public_key
+        self._base_url = base_url
+        self._session = session
         self.headers = {
             'Authorization': f'Bearer {self.secret_key}',
             'Content-Type': 'application/json',
             'Accept': 'application/json',
         }
 
+    @property
+    def base_url(self):
+        return (self._base_url or _setting('PAYSTACK_BASE_URL', self.BASE_URL)).rstrip('/')
+
+    @property
+    def session(self):
+        return self._session or get_session()
+
+    @property
+    def timeout(self):
+        return (
+            _setting('PAYSTACK_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
+            _setting('PAYSTACK_READ_TIMEOUT', DEFAULT_READ_TIMEOUT),
+        )
+
+    def _request(self, method, path, endpoint=None, action='calling Paystack', **kwargs):
+        """
+        Send a request and return the decoded response.
+
+        Args:
+            method (str): HTTP method
+            path (str): Path below the base URL
+            endpoint (str, optional): Path reported to the metrics hooks, without identifiers
+            action (str): Description used in log messages
+            **kwargs: Passed to ``Session.request``
+
+        Returns:
+            dict: Response from Paystack, or a dict with ``status`` False on failure
+        """
+        status_code = None
+        error = None
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, f"{self.base_url}{path}", headers=self.headers, timeout=self.timeout, **kwargs
+            )
+            status_code = response.status_code
+            if status_code == 200:
+                return response.json()
+            error = f"API Error: {status_code}"
+            logger.error(f"Paystack API error: {status_code} - {response.text}")
+            try:
+                # Paystack explains most errors, e.g. an unknown reference
+                message = response.json().get('message')
+            except (ValueError, AttributeError):
+                message = None
+            return _error(message or error)
+        except Exception as e:
+            error = f"Error: {str(e)}"
+            logger.exception(f"Error {action}: {str(e)}")
+            return _error(error)
+        finally:
+            _report(RequestMetrics(method, endpoint or path, status_code, time.perf_counter() - start, error))
+
     def initialize_transaction(self, amount, email, callback_url, metadata=None):
         """
         Initialize a transaction with Paystack.
-        
+
         Args:
             amount (int): Amount in kobo (for NGN) or cents (for USD)
             email (str): Customer's email address
             callback_url (str): URL to redirect to after payment
             metadata (dict, optional): Additional data to pass with the request
-            
+
         Returns:
             dict: Response from Paystack API
         """
         try:
             # Convert amount to kobo/cents (multiply by 100)
             amount_in_kobo = int(float(amount) * 100)
-            
-            url = f"{self.BASE_URL}/transaction/initialize"
-            payload = {
-                "amount": amount_in_kobo,
-                "email": email,
-                "callback_url": callback_url,
-            }
-            
-            if metadata:
-                payload["metadata"] = metadata
-                
-            response = requests.post(url, headers=self.headers, json=payload)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Paystack API error: {response.status_code} - {response.text}")
-                return {
-                    "status": False,
-                    "message": f"API Error: {response.status_code}",
-                    "data": {}
-                }
-                
-        except Exception as e:
-            logger.exception(f"Error initializing Paystack transaction: {str(e)}")
-            return {
-                "status": False,
-                "message": f"Error: {str(e)}",
-                "data": {}
-            }
-            
-    def verify_transaction(self, reference):
+        except (TypeError, ValueError) as e:
+            return _error(f"Error: {str(e)}")
+
+        payload = {
+            "amount": amount_in_kobo,
+            "email": email,
+            "callback_url": callback_url,
+        }
+        if metadata:
+            payload["metadata"] = metadata
+
+        return self._request('POST', '/transaction/initialize', json=payload,
+                             action='initializing Paystack transaction')
+
+    def _verify_cache_key(self, reference):
+        # Test and live keys see different transactions
+        account = hashlib.sha256(self.secret_key.encode('utf-8')).hexdigest()[:16]
+        return VERIFY_CACHE_KEY.format(account, hashlib.sha256(reference.encode('utf-8')).hexdigest())
+
+    def verify_transaction(self, reference, use_cache=True):
         """
         Verify a transaction with Paystack.
-        
+
         Args:
             reference (str): Transaction reference
-            
+            use_cache (bool): Reuse an earlier successful verification
+
         Returns:
             dict: Response from Paystack API
         """
-        try:
-            url = f"{self.BASE_URL}/transaction/verify/{reference}"
-            response = requests.get(url, headers=self.headers)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Paystack API error: {response.status_code} - {response.text}")
-                return {
-                    "status": False,
-                    "message": f"API Error: {response.status_code}",
-                    "data": {}
-                }
-                
-        except Exception as e:
-            logger.exception(f"Error verifying Paystack transaction: {str(e)}")
-            return {
-                "status": False,
-                "message": f"Error: {str(e)}",
-                "data": {}
-            }
-            
+        key = self._verify_cache_key(reference)
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = self._request('GET', f'/transaction/verify/{reference}', endpoint='/transaction/verify',
+                               action='verifying Paystack transaction')
+
+        # Only a completed payment is final; anything else may still change
+        if result.get('status') and (result.get('data') or {}).get('status') == 'success':
+            cache.set(key, result, _setting('PAYSTACK_VERIFY_CACHE_TIMEOUT', DEFAULT_VERIFY_CACHE_TIMEOUT))
+        return result
+
     def list_transactions(self, **kwargs):
         """
         List transactions from Paystack.
-        
+
         Args:
             **kwargs: Query parameters to filter transactions
-            
+
         Returns:
             dict: Response from Paystack API
         """
-        try:
-            url = f"{self.BASE_URL}/transaction"
-            response = requests.get(url, headers=self.headers, params=kwargs)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Paystack API error: {response.status_code} - {response.text}")
-                return {
-                    "status": False,
-                    "message": f"API Error: {response.status_code}",
-                    "data": {}
-                }
-                
-        except Exception as e:
-            logger.exception(f"Error listing Paystack transactions: {str(e)}")
-            return {
-                "status": False,
-                "message": f"Error: {str(e)}",
-                "data": {}
-            }
+        return self._request('GET', '/transaction', params=kwargs, action='listing Paystack transactions')
+
+    def disable_subscription(self, subscription_code):
+        """
+        Disable a subscription on Paystack.
+
+        Args:
+            subscription_code (str): Paystack subscription code
+
+        Returns:
+            dict: Response from Paystack API
+        """
+        return self._request('POST', f'/subscription/{subscription_code}/disable', endpoint='/subscription/disable',
+                             action='disabling Paystack subscription')
+
+
+_clients = {}
+
+
+def get_paystack_client(config=None):
+    """
+    Return a client for the Paystack configuration.
+
+    Clients are kept per key pair and share the process-wide session.
+
+    Args:
+        config (PaystackConfig, optional): Defaults to ``PaystackConfig.get_config()``
+
+    Returns:
+        PaystackAPI: The client
+    """
+    if config is None:
+        from .models import PaystackConfig
+        config = PaystackConfig.get_config()
+
+    key = (config.secret_key, config.public_key)
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = PaystackAPI(config.secret_key, config.public_key)
+    return client
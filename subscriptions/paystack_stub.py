@@ -0,0 +1,118 @@
+"""
+Local stand-in for the Paystack API, for benchmarks and tests.
+
+``PaystackStubServer`` answers the calls made by ``subscriptions.paystack``
+with canned successful responses, over HTTP/1.1 keep-alive, and counts the
+connections and requests it receives. Point ``PAYSTACK_BASE_URL`` at its
+``url`` to run the site or a benchmark against it. ``fail_next`` makes the
+next responses fail with a given status, to exercise retries.
+"""
+import json
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_VERIFY = re.compile(r'^/transaction/verify/(?P<reference>[^/?]+)$')
+_DISABLE = re.compile(r'^/subscription/(?P<code>[^/?]+)/disable$')
+
+
+class PaystackStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, delayed ACKs
+    # stall every response on a kept-alive connection by ~40 ms
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        status, body = self.server.respond(self.command, self.path.split('?', 1)[0])
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class PaystackStubServer(ThreadingHTTPServer):
+    """Threaded stub server; ``latency`` seconds are added to every response."""
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), latency=0):
+        super().__init__(address, PaystackStubHandler)
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self._failures = deque()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def get_request(self):
+        request = super().get_request()
+        with self._lock:
+            self.connections += 1
+        return request
+
+    def fail_next(self, status, count=1):
+        """Answer the next ``count`` requests with ``status``."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def respond(self, method, path):
+        with self._lock:
+            self.requests += 1
+            failure = self._failures.popleft() if self._failures else None
+        if self.latency:
+            time.sleep(self.latency)
+        if failure:
+            return failure, {'status': False, 'message': 'Stub failure'}
+
+        match = _VERIFY.match(path)
+        if method == 'GET' and match:
+            return 200, {
+                'status': True,
+                'message': 'Verification successful',
+                'data': {'reference': match.group('reference'), 'status': 'success', 'amount': 100000,
+                         'currency': 'GHS', 'metadata': {}},
+            }
+        if method == 'POST' and path == '/transaction/initialize':
+            reference = f'stub_{self.requests}'
+            return 200, {
+                'status': True,
+                'message': 'Authorization URL created',
+                'data': {'authorization_url': f'{self.url}/pay/{reference}', 'reference': reference},
+            }
+        if method == 'GET' and path == '/transaction':
+            return 200, {'status': True, 'message': 'Transactions retrieved', 'data': []}
+        if method == 'POST' and _DISABLE.match(path):
+            return 200, {'status': True, 'message': 'Subscription disabled successfully'}
+        return 404, {'status': False, 'message': 'Not found'}
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
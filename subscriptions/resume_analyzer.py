@@ -15,8 +15,10 @@ import re
 
 from .document_parser import DocumentParser
 from .text_processor import TextProcessor
+from .analysis_cache import cached_analysis
 from .content_validator import ContentValidator
 from .data_resources import TECHNICAL_SKILLS, SOFT_SKILLS, get_all_skills, get_all_job_titles
+from .skill_matcher import get_skill_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,9 @@ class ResumeAnalyzer:
     actionable recommendations.
     """
 
+    # Bump when the analysis output changes, so cached results are not reused
+    VERSION = 2
+
     def __init__(self):
         """Initialize the ResumeAnalyzer with necessary components."""
         self.document_parser = DocumentParser()
@@ -119,6 +124,9 @@ class ResumeAnalyzer:
         Returns:
             dict: Analysis results
         """
+        return cached_analysis(self, text, self._analyze_resume_text)
+
+    def _analyze_resume_text(self, text):
         # First validate that this is a resume
         validation = self.content_validator.validate_resume(text)
 
@@ -454,11 +462,7 @@ class ResumeAnalyzer:
         all_skills_found = set()
 
         # Check for exact skill matches
-        for skill in self.all_skills:
-            # Look for whole word matches
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                all_skills_found.add(skill)
+        all_skills_found.update(get_skill_matcher().find_skills(text))
 
         # Combine skills from different sources
         all_skills_found.update(skills_from_entities)
@@ -22,6 +22,7 @@ from .data_resources import (
     get_all_job_titles, 
     get_template
 )
+from .skill_matcher import get_skill_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -429,9 +430,7 @@ class ResumeBuilder:
         for job in user_data.get('experience', []):
             description = job.get('description', '')
             if description:
-                for skill in self.all_skills:
-                    if re.search(r'\b' + re.escape(skill) + r'\b', description, re.IGNORECASE):
-                        extracted_skills.add(skill)
+                extracted_skills.update(get_skill_matcher().find_skills(description))
         
         # Combine skills
         all_user_skills = set(user_skills) | extracted_skills
@@ -543,9 +542,7 @@ class ResumeBuilder:
         for job in user_data.get('experience', []):
             description = job.get('description', '')
             if description:
-                for skill in self.all_skills:
-                    if re.search(r'\b' + re.escape(skill) + r'\b', description, re.IGNORECASE):
-                        skills.add(skill)
+                skills.update(get_skill_matcher().find_skills(description))
         
         # If job requirements provided, add relevant skills user might have
         if job_requirements and 'skills' in job_requirements:
@@ -625,17 +622,15 @@ class ResumeBuilder:
         
         # Highlight key skills from job requirements
         if 'skills' in job_requirements and job_requirements['skills']:
-            for skill in job_requirements['skills']:
-                # Don't modify if already highlighted
-                if skill in enhanced and skill + ' ' in enhanced:
-                    continue
-                
-                # Use word boundaries for replacement to avoid partial word matches
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, enhanced, re.IGNORECASE):
-                    # Replace with the same text but ensure correct capitalization
-                    match = re.search(pattern, enhanced, re.IGNORECASE).group(0)
-                    enhanced = re.sub(pattern, skill, enhanced, flags=re.IGNORECASE)
+            wanted = {skill.lower(): skill for skill in job_requirements['skills']}
+            found = [skill for skill in get_skill_matcher().find_skills(enhanced) if skill.lower() in wanted]
+            if found:
+                # Rewrite every mention with the job's spelling, in one pass;
+                # longer skills first so "Team Leadership" wins over "Leadership"
+                found.sort(key=len, reverse=True)
+                pattern = r'\b(?:' + '|'.join(re.escape(skill) for skill in found) + r')\b'
+                enhanced = re.sub(pattern, lambda match: wanted[match.group(0).lower()], enhanced,
+                                  flags=re.IGNORECASE)
         
         return enhanced
     
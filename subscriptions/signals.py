@@ -1,67 +1,147 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
+from . import dashboard_stats
+from .ai_models import JobMatchScore
 from .models import UserSubscription
-from jobs.models import Notification
+from .utils import invalidate_subscription_status
+from jobs.models import JobApplication, JobListing, Notification, SavedJob
 
 
 @receiver(post_save, sender=UserSubscription)
-def subscription_status_changed(sender, instance, created, **kwargs):
-    """Send notifications when subscription status changes."""
-    if created:
-        # New subscription created
+@receiver(post_delete, sender=UserSubscription)
+def invalidate_cached_subscription_status(sender, instance, **kwargs):
+    """Drop the cached subscription status so the next request re-resolves it."""
+    # Avoid loading the user just to clear its memoized status
+    user = instance.user if UserSubscription.user.is_cached(instance) else None
+    invalidate_subscription_status(instance.user_id, user)
+
+
+# Notification sent when a subscription reaches a status
+STATUS_NOTIFICATIONS = {
+    'pending': ('Subscription Created',
+                'Your subscription to {plan} has been created and is pending payment.'),
+    'active': ('Subscription Activated',
+               'Your {plan} subscription is now active until {end_date}.'),
+    'cancelled': ('Subscription Cancelled',
+                  'Your {plan} subscription has been cancelled.'),
+    'expired': ('Subscription Expired',
+                'Your {plan} subscription has expired. Renew now to continue enjoying pro features.'),
+}
+
+
+@receiver(post_save, sender=UserSubscription)
+def subscription_state_changed(sender, instance, created, raw=False, **kwargs):
+    """
+    Apply a subscription's status change once.
+
+    An active subscription that has already ended is marked expired here,
+    without saving it again. If the status or end date changed, the
+    notification and the user's pro flags follow after commit.
+    """
+    if raw:
+        return
+
+    old_state = (None, None) if created else getattr(instance, '_saved_state', (None, None))
+    if instance.status == 'active' and instance.end_date and instance.end_date < timezone.now():
+        UserSubscription.objects.filter(pk=instance.pk).update(status='expired')
+        instance.status = 'expired'
+    instance.remember_saved_state()
+
+    if old_state == instance._saved_state:
+        return
+    transaction.on_commit(lambda: apply_subscription_change(instance))
+
+
+def apply_subscription_change(subscription):
+    """Send the status notification and update the user's pro flags."""
+    if subscription.status in STATUS_NOTIFICATIONS and (subscription.status != 'active' or subscription.end_date):
+        title, message = STATUS_NOTIFICATIONS[subscription.status]
         Notification.objects.create(
-            user=instance.user,
+            user_id=subscription.user_id,
             notification_type='system',
-            title='Subscription Created',
-            message=f'Your subscription to {instance.plan.name} has been created and is pending payment.'
+            title=title,
+            message=message.format(
+                plan=subscription.plan.name,
+                end_date=subscription.end_date.strftime("%B %d, %Y") if subscription.end_date else '',
+            ),
         )
+    update_user_pro_status(subscription)
+
+
+def update_user_pro_status(subscription):
+    """
+    Bring the user's is_pro/pro_expiry_date in line with their subscriptions.
+
+    Only an active subscription that is ending needs a look at the user's other
+    subscriptions; the user row is written only if the flags change.
+    """
+    User = get_user_model()
+    now = timezone.now()
+
+    if subscription.status == 'active' and subscription.end_date and subscription.end_date > now:
+        end_date = subscription.end_date
     else:
-        # Check for status changes
-        if instance.status == 'active' and instance.start_date and instance.end_date:
-            # Subscription activated
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='system',
-                title='Subscription Activated',
-                message=f'Your {instance.plan.name} subscription is now active until {instance.end_date.strftime("%B %d, %Y")}.'
-            )
-        elif instance.status == 'cancelled':
-            # Subscription cancelled
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='system',
-                title='Subscription Cancelled',
-                message=f'Your {instance.plan.name} subscription has been cancelled.'
-            )
-        elif instance.status == 'expired':
-            # Subscription expired
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='system',
-                title='Subscription Expired',
-                message=f'Your {instance.plan.name} subscription has expired. Renew now to continue enjoying pro features.'
-            )
+        end_date = UserSubscription.objects.filter(
+            user_id=subscription.user_id, status='active', end_date__gt=now
+        ).aggregate(end_date=Max('end_date'))['end_date']
 
+    users = User.objects.filter(pk=subscription.user_id)
+    if end_date:
+        flags = {'is_pro': True, 'pro_expiry_date': end_date}
+        updated = users.exclude(is_pro=True, pro_expiry_date__gte=end_date).update(**flags)
+    else:
+        flags = {'is_pro': False}
+        updated = users.filter(is_pro=True).update(**flags)
 
-@receiver(post_save, sender=UserSubscription)
-def check_subscription_expiry(sender, instance, **kwargs):
-    """Check if subscription has expired and update status."""
-    if instance.status == 'active' and instance.end_date and instance.end_date < timezone.now():
-        instance.status = 'expired'
-        instance.save(update_fields=['status'])
+    if updated:
+        user = subscription.user if UserSubscription.user.is_cached(subscription) else None
+        if user is not None:
+            for name, value in flags.items():
+                setattr(user, name, value)
+        invalidate_subscription_status(subscription.user_id, user)
 
 
-@receiver(post_save, sender=UserSubscription)
-def update_user_pro_status(sender, instance, **kwargs):
-    """Update the user's pro status based on subscription status."""
-    # Update the user's pro status
-    user = instance.user
-    user.update_pro_status()
-
-    # If this is an active subscription, make sure the user has pro status
-    if instance.status == 'active' and instance.end_date and instance.end_date > timezone.now():
-        if not user.is_pro or not user.pro_expiry_date or user.pro_expiry_date < instance.end_date:
-            user.is_pro = True
-            user.pro_expiry_date = instance.end_date
-            user.save(update_fields=['is_pro', 'pro_expiry_date'])
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_status_on_pro_flag_change(sender, instance, update_fields=None, **kwargs):
+    """The is_pro/pro_expiry_date flags feed the status too."""
+    if update_fields is not None and not {'is_pro', 'pro_expiry_date'}.intersection(update_fields):
+        return
+    invalidate_subscription_status(instance.pk, instance)
+
+
+@receiver(post_save, sender=JobApplication)
+@receiver(post_delete, sender=JobApplication)
+def invalidate_dashboards_on_application_change(sender, instance, raw=False, **kwargs):
+    """An application counts towards its company's and its applicant's dashboards."""
+    if raw:
+        return
+    if JobApplication.job.is_cached(instance):
+        company_id = instance.job.company_id
+    else:
+        company_id = JobListing.objects.filter(pk=instance.job_id).values_list('company_id', flat=True).first()
+    if company_id is not None:
+        dashboard_stats.invalidate_employer(company_id)
+    dashboard_stats.invalidate_job_seeker(instance.applicant_id)
+
+
+@receiver(post_save, sender=JobListing)
+@receiver(post_delete, sender=JobListing)
+def invalidate_employer_dashboard_on_job_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    dashboard_stats.invalidate_employer(instance.company_id)
+
+
+@receiver(post_save, sender=JobMatchScore)
+@receiver(post_delete, sender=JobMatchScore)
+@receiver(post_save, sender=SavedJob)
+@receiver(post_delete, sender=SavedJob)
+def invalidate_job_seeker_dashboard(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    dashboard_stats.invalidate_job_seeker(instance.user_id)
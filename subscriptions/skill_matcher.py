@@ -0,0 +1,155 @@
+"""
+Dictionary skill matcher shared by the AI analyzers.
+
+The analyzers used to look for known skills by running
+``re.search(r'\\b' + re.escape(skill) + r'\\b', text, re.IGNORECASE)`` once
+per entry of ``get_all_skills()``. That is several hundred patterns per
+document: more than the ``re`` module caches, so most of them were compiled
+again on every call, and each one scanned the whole text.
+
+``SkillMatcher`` compiles the skill dictionary once into a single regular
+expression. The alternation is laid out as a character trie, so the engine
+decides at each position by following one branch rather than trying every
+skill in turn. It is wrapped in a lookahead, which reports the longest skill
+starting at every position. Shorter skills contained in a longer match (for
+example "Leadership" inside "Team Leadership") are precomputed, so the result
+is the same set of skills the per-skill loop found, in one pass over the text.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from .data_resources import SOFT_SKILLS, TECHNICAL_SKILLS
+
+SkillMatch = namedtuple('SkillMatch', ['skill', 'kind', 'categories'])
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+def _build_trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+
+def _is_boundary(text, position):
+    """Whether ``\\b`` matches at ``position`` in ``text``."""
+    before = position > 0 and _WORD_CHAR.match(text[position - 1]) is not None
+    after = position < len(text) and _WORD_CHAR.match(text[position]) is not None
+    return before != after
+
+
+def _trie_occurrences(trie, text):
+    """Every trie word found in ``text`` on word boundaries, overlapping ones included."""
+    found = set()
+    for start in range(len(text)):
+        if not _is_boundary(text, start):
+            continue
+        node = trie
+        for end in range(start, len(text)):
+            node = node.get(text[end])
+            if node is None:
+                break
+            if '' in node and _is_boundary(text, end + 1):
+                found.add(text[start:end + 1])
+    return found
+
+
+def _trie_pattern(trie):
+    """Build a regex alternation shaped like the character trie."""
+    def render(node):
+        is_word_end = '' in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if is_word_end:
+            # Greedy, so the longest skill is tried first
+            return '(?:' + body + ')?'
+        return body
+
+    return render(trie)
+
+
+class SkillMatcher:
+    """Find every dictionary skill mentioned in a text, with its kind and categories."""
+
+    def __init__(self, skills_by_kind):
+        """
+        Build the matcher.
+
+        Args:
+            skills_by_kind (dict): Maps a kind ('technical', 'soft') to a dict of
+                category name -> list of skills, as in data_resources
+        """
+        self._skills = {}
+        for kind, categories in skills_by_kind.items():
+            for category, skills in categories.items():
+                for skill in skills:
+                    key = skill.lower()
+                    if key in self._skills:
+                        match = self._skills[key]
+                        if category not in match.categories:
+                            self._skills[key] = match._replace(categories=match.categories + (category,))
+                    else:
+                        self._skills[key] = SkillMatch(skill, kind, (category,))
+
+        trie = _build_trie(self._skills)
+        self._pattern = re.compile(r'(?=\b(' + _trie_pattern(trie) + r')\b)', re.IGNORECASE)
+
+        # Skills found inside each skill (itself included), so that reporting
+        # only the longest match at each position loses nothing
+        self._contained = {key: _trie_occurrences(trie, key) for key in self._skills}
+
+    def __contains__(self, skill):
+        return skill.lower() in self._skills
+
+    def get(self, skill):
+        """Return the SkillMatch for a dictionary skill, or None."""
+        return self._skills.get(skill.lower())
+
+    def find_matches(self, text):
+        """
+        Find all dictionary skills mentioned in ``text``.
+
+        Matching is case-insensitive and on word boundaries, like
+        ``re.search(r'\\b' + re.escape(skill) + r'\\b', text, re.IGNORECASE)``.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            list: SkillMatch for each skill found, sorted by skill name
+        """
+        if not text:
+            return []
+
+        found = set()
+        for match in self._pattern.finditer(text):
+            key = match.group(1).lower()
+            if key not in found and key in self._contained:
+                found.update(self._contained[key])
+        return sorted((self._skills[key] for key in found), key=lambda m: m.skill)
+
+    def find_skills(self, text, kind=None):
+        """
+        Return the names of the dictionary skills mentioned in ``text``.
+
+        Args:
+            text (str): Text to scan
+            kind (str, optional): Only return skills of this kind ('technical' or 'soft')
+
+        Returns:
+            list: Skill names as spelled in the dictionary, sorted
+        """
+        return [m.skill for m in self.find_matches(text) if kind is None or m.kind == kind]
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher():
+    """Return the process-wide matcher for the technical and soft skill dictionaries."""
+    return SkillMatcher({'technical': TECHNICAL_SKILLS, 'soft': SOFT_SKILLS})
@@ -6,10 +6,10 @@ from django.utils import timezone
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.conf import settings
-import requests
 import json
 
 from .models import SubscriptionPlan, UserSubscription, PaystackConfig
+from .paystack import get_paystack_client
 
 
 @login_required
@@ -221,27 +221,15 @@ def cancel_subscription_api(request):
                 paystack_config = PaystackConfig.get_config()
 
                 # Cancel subscription with Paystack
-                headers = {
-                    'Authorization': f'Bearer {paystack_config.secret_key}',
-                    'Content-Type': 'application/json'
-                }
+                response_data = get_paystack_client(paystack_config).disable_subscription(subscription.transaction_id)
 
-                url = f'https://api.paystack.co/subscription/{subscription.transaction_id}/disable'
-
-                response = requests.post(url, headers=headers)
-                response_data = response.json()
-
-                if not response.status_code == 200 or not response_data.get('status'):
+                if not response_data.get('status'):
                     # Log the error but continue with local cancellation
                     print(f"Error cancelling Paystack subscription: {response_data.get('message')}")
             except Exception as e:
                 # Log the error but continue with local cancellation
                 print(f"Error cancelling Paystack subscription: {str(e)}")
 
-        # Update user's pro status
-        request.user.is_pro = False
-        request.user.save(update_fields=['is_pro'])
-
         return JsonResponse({
             'success': True,
             'message': _('Your subscription has been cancelled. You will have access to pro features until the end of your current billing period.')
@@ -0,0 +1,897 @@
+import io
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Company, JobApplication, JobListing, Notification, SavedJob
+from . import ai_tasks, dashboard_stats, text_processor
+from .analytics_models import EmployerAnalytics, JobListingAnalytics, JobSeekerAnalytics
+from .ai_models import AITask, BulkScreeningRun, JobMatchScore, ResumeAnalysis
+from .ai_services import ApplicationScreeningService
+from .ai_tasks import claim_tasks, enqueue, renew_lease, run_task
+from .analysis_cache import AnalysisCache, analysis_cache
+from .bulk_screening import BulkScreeningEngine, fail_stale_runs, run_bulk_screening
+from . import document_extraction
+from .data_resources import get_all_skills
+from .document_parser import DocumentParser
+from .management.commands.benchmark_document_extraction import make_docx, make_pdf
+from .management.commands.benchmark_skill_matcher import SAMPLE_RESUME, loop_find_skills
+from .models import PaystackWebhookEvent, SubscriptionPlan, UserSubscription
+from .paystack import PaystackAPI, add_metrics_hook, remove_metrics_hook, reset_session
+from .paystack_stub import PaystackStubServer
+from .resume_analyzer import ResumeAnalyzer
+from .resume_builder import ResumeBuilder
+from .skill_matcher import get_skill_matcher
+from .text_processor import TextProcessor
+from . import utils as subscription_utils
+from .utils import get_subscription_status
+from .webhooks import process_pending_events
+
+RESUME = """Jane Doe
+Software Developer
+Email: jane@example.com Phone: 555-555-5555
+
+Experience:
+Senior Developer at Tech Company (2018-Present)
+- Developed web applications using Python and Django
+
+Education:
+Bachelor of Science in Computer Science, University of Technology (2015)
+
+Skills:
+Python, Django, SQL, JavaScript, Git, Communication
+"""
+
+
+class BulkScreeningTests(TestCase):
+    """Background bulk screening and its progress endpoint."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = self.settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        User = get_user_model()
+        self.employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='password', user_type='employer'
+        )
+        company = Company.objects.create(
+            name='Acme', owner=self.employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+        self.job = JobListing.objects.create(
+            title='Python Developer', slug='python-developer', company=company, posted_by=self.employer,
+            description='We need a Python developer with Django experience.', requirements='Python, Django',
+            skills_required='python, django', location='Accra', status='published'
+        )
+        for i in range(3):
+            applicant = User.objects.create_user(
+                username=f'seeker{i}', email=f'seeker{i}@example.com', password='password'
+            )
+            application = JobApplication(job=self.job, applicant=applicant)
+            application.resume.save(f'resume{i}.txt', ContentFile(RESUME.encode()), save=False)
+            application.save()
+
+    def _run(self):
+        run = BulkScreeningRun.objects.create(job=self.job, total_applications=3)
+        job_dict = ApplicationScreeningService._job_listing_to_dict(self.job)
+        application_ids = list(self.job.applications.values_list('pk', flat=True))
+        run_bulk_screening(run.pk, job_dict, application_ids, engine=BulkScreeningEngine(max_workers=0))
+        run.refresh_from_db()
+        return run
+
+    def test_run_records_ranked_results(self):
+        run = self._run()
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual(run.processed_applications, 3)
+        self.assertEqual(run.progress, 100)
+        self.assertEqual(run.results['stats']['total_applications'], 3)
+        self.assertEqual(run.valid_applications, 3)
+        screened_ids = {r['application_id'] for r in run.results['screening_results']}
+        self.assertTrue(screened_ids <= set(self.job.applications.values_list('pk', flat=True)))
+
+    def test_status_endpoint_is_limited_to_job_owner(self):
+        run = self._run()
+        url = reverse('subscriptions:bulk_screening_status', args=[run.pk])
+
+        self.client.login(username='seeker0', password='password')
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.login(username='employer', password='password')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'completed')
+        self.assertIn('results', response.json())
+
+    @override_settings(BULK_SCREENING_MAX_WORKERS=0)
+    def test_start_queues_run_for_ai_workers(self):
+        get_user_model().objects.filter(pk=self.employer.pk).update(is_pro=True)
+        self.client.login(username='employer', password='password')
+        response = self.client.post(reverse('subscriptions:start_bulk_screening', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 202)
+        run = BulkScreeningRun.objects.get(pk=response.json()['run_id'])
+        self.assertEqual(run.status, 'pending')
+
+        tasks = claim_tasks('worker-1')
+        self.assertEqual([task.kind for task in tasks], ['bulk_screening'])
+        self.assertEqual(run_task(tasks[0]), 'completed')
+        run.refresh_from_db()
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual(run.processed_applications, 3)
+
+    def test_stalled_run_is_failed_and_replaced(self):
+        get_user_model().objects.filter(pk=self.employer.pk).update(is_pro=True)
+        stalled = BulkScreeningRun.objects.create(job=self.job, status='running', total_applications=3)
+        BulkScreeningRun.objects.filter(pk=stalled.pk).update(updated_at=timezone.now() - timezone.timedelta(hours=1))
+
+        self.client.login(username='employer', password='password')
+        status = self.client.get(reverse('subscriptions:bulk_screening_status', args=[stalled.pk])).json()
+        self.assertEqual(status['status'], 'failed')
+
+        response = self.client.post(reverse('subscriptions:start_bulk_screening', args=[self.job.pk]))
+        self.assertNotEqual(response.json()['run_id'], stalled.pk)
+        self.assertEqual(response.json()['status'], 'pending')
+
+    def _queue(self):
+        get_user_model().objects.filter(pk=self.employer.pk).update(is_pro=True)
+        self.client.login(username='employer', password='password')
+        response = self.client.post(reverse('subscriptions:start_bulk_screening', args=[self.job.pk]))
+        return BulkScreeningRun.objects.get(pk=response.json()['run_id'])
+
+    @override_settings(BULK_SCREENING_MAX_WORKERS=0)
+    def test_queued_run_is_not_failed_while_it_waits(self):
+        run = self._queue()
+        an_hour_ago = timezone.now() - timezone.timedelta(hours=1)
+        BulkScreeningRun.objects.filter(pk=run.pk).update(updated_at=an_hour_ago)
+        self.assertEqual(fail_stale_runs(BulkScreeningRun.objects.all()), 0)
+
+        # Its worker's lease runs out
+        claim_tasks('worker-1')
+        AITask.objects.update(locked_at=an_hour_ago)
+        self.assertEqual(fail_stale_runs(BulkScreeningRun.objects.all()), 1)
+
+        # The run is not screened again once it has been reported failed
+        self.assertEqual(run_task(claim_tasks('worker-2')[0]), 'completed')
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.processed_applications), ('failed', 0))
+
+    @override_settings(BULK_SCREENING_MAX_WORKERS=0)
+    def test_run_taken_over_after_its_lease_runs_out(self):
+        run = self._queue()
+        first = claim_tasks('worker-1')[0]
+        self.assertTrue(renew_lease(first))
+        BulkScreeningRun.objects.filter(pk=run.pk).update(status='running')
+        AITask.objects.update(locked_at=timezone.now() - timezone.timedelta(hours=1))
+
+        second = claim_tasks('worker-2')[0]
+        self.assertFalse(renew_lease(first))
+        self.assertEqual(run_task(second), 'completed')
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.processed_applications), ('completed', 3))
+
+
+class SkillMatcherTests(SimpleTestCase):
+    """The compiled matcher finds exactly what the per-skill regex loop found."""
+
+    def test_matches_per_skill_loop(self):
+        skills = get_all_skills()
+        for text in (SAMPLE_RESUME, RESUME, 'C++ and C# with .NET, Node.js; CI/CD', ''):
+            self.assertEqual(get_skill_matcher().find_skills(text), loop_find_skills(skills, text))
+
+    def test_reports_overlapping_skills_and_categories(self):
+        matches = {m.skill: m for m in get_skill_matcher().find_matches('Strong team leadership and decision making')}
+        self.assertIn('Team Leadership', matches)
+        self.assertIn('Decision Making', matches)
+        self.assertEqual(matches['Decision Making'].kind, 'soft')
+        self.assertEqual(set(matches['Decision Making'].categories), {'problem_solving', 'leadership'})
+
+    def test_text_processor_reports_dictionary_skills(self):
+        processor = TextProcessor()
+        text = 'Built services in python and postgresql on AWS.'
+        self.assertEqual(processor._extract_skills(text), {'Python', 'PostgreSQL', 'AWS'})
+        self.assertEqual(processor._process_document(text, 'resume')['extracted_skills'], ['AWS', 'PostgreSQL', 'Python'])
+
+    def test_resume_builder_uses_the_job_spelling_of_skills(self):
+        enhanced = ResumeBuilder()._enhance_job_description(
+            '- Built APIs with django and postgresql', {'skills': ['Django', 'PostgreSQL', 'Kubernetes']}
+        )
+        self.assertEqual(enhanced, '- Built APIs with Django and PostgreSQL')
+
+
+class LazyLoadingTests(SimpleTestCase):
+    """NLTK and the AI analyzers stay out of startup and are never downloaded."""
+
+    def test_startup_does_not_import_nltk(self):
+        script = (
+            'import sys, django; django.setup(); '
+            'import searchfind.urls, jobs.templatetags.job_extras; '
+            'from django.urls import resolve; resolve("/"); '
+            'print(sorted(m for m in ("nltk", "subscriptions.resume_analyzer") if m in sys.modules))'
+        )
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '[]')
+
+    def test_missing_nltk_data_is_not_downloaded(self):
+        self.addCleanup(setattr, text_processor, 'NLTK_AVAILABLE', text_processor.NLTK_AVAILABLE)
+        text_processor.NLTK_AVAILABLE = None
+        with mock.patch('nltk.download') as download, mock.patch('nltk.data.find', side_effect=LookupError):
+            self.assertEqual(TextProcessor().tokenize_words('Built APIs, fast.'), ['Built', 'APIs', 'fast'])
+        download.assert_not_called()
+        self.assertFalse(text_processor.NLTK_AVAILABLE)
+
+
+@override_settings(ANALYSIS_CACHE_ALIAS='default')
+class AnalysisCacheTests(SimpleTestCase):
+    """Repeated documents are analyzed once and callers get independent copies."""
+
+    def setUp(self):
+        caches['default'].clear()
+        analysis_cache.clear_local()
+
+    def test_local_tier_evicts_least_recently_used(self):
+        cache = AnalysisCache(max_entries=2, alias='default')
+        cache.set('a', {'n': 1})
+        cache.set('b', {'n': 2})
+        cache.get('a')
+        cache.set('c', {'n': 3})
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache._local)
+        self.assertNotIn('b', cache._local)
+
+        # Evicted entries are still served by the shared tier
+        self.assertEqual(cache.get('b'), {'n': 2})
+
+    def test_resubmitted_resume_is_analyzed_once(self):
+        analyzer = ResumeAnalyzer()
+        with mock.patch.object(analyzer, '_analyze_resume_text', wraps=analyzer._analyze_resume_text) as analyze:
+            first = analyzer.analyze_resume_text(RESUME)
+            first['overall_score'] = -1
+            second = analyzer.analyze_resume_text(RESUME.replace('\n', '  \r\n'))
+
+        self.assertEqual(analyze.call_count, 1)
+        self.assertTrue(second['is_valid'])
+        self.assertNotEqual(second['overall_score'], -1)
+
+    def test_uploaded_file_is_extracted_once(self):
+        analyzer = ResumeAnalyzer()
+        with mock.patch('subscriptions.document_parser.extract_text', return_value=RESUME) as extract:
+            for _ in range(2):
+                analysis = analyzer.analyze_resume_file_object(ContentFile(b'resume bytes'), 'resume.pdf')
+            analyzer.analyze_resume_file_object(ContentFile(b'other bytes'), 'resume.pdf')
+
+        self.assertEqual(extract.call_count, 2)
+        self.assertTrue(analysis['is_valid'])
+
+
+@override_settings(ANALYSIS_CACHE_ALIAS='default', DOCUMENT_EXTRACTION_WORKERS=0)
+class DocumentExtractionTests(SimpleTestCase):
+    """Uploads are parsed for real, within the page and size caps, and once per content."""
+
+    def setUp(self):
+        caches['default'].clear()
+        analysis_cache.clear_local()
+
+    def test_pdf_pages_up_to_the_cap(self):
+        upload = SimpleUploadedFile('resume.pdf', make_pdf(3, document=1))
+        text = DocumentParser.extract_text_from_file_object(upload, upload.name)
+        self.assertIn('Resume 1 page 3', text)
+        self.assertIn('Django', text)
+
+        with override_settings(DOCUMENT_MAX_PAGES=2):
+            upload = SimpleUploadedFile('resume.pdf', make_pdf(3, document=2))
+            text = DocumentParser.extract_text_from_file_object(upload, upload.name)
+        self.assertIn('Resume 2 page 2', text)
+        self.assertNotIn('Resume 2 page 3', text)
+
+    def test_docx_paragraphs_and_tables_in_order(self):
+        from docx import Document
+
+        docx = Document()
+        docx.add_paragraph('Ama Mensah')
+        table = docx.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = 'Python'
+        table.cell(0, 1).text = 'Django'
+        docx.add_paragraph('References available')
+        output = io.BytesIO()
+        docx.save(output)
+
+        upload = SimpleUploadedFile('resume.docx', output.getvalue())
+        text = DocumentParser.extract_text_from_file_object(upload, upload.name)
+        self.assertEqual(text.split('\n'), ['Ama Mensah', 'Python | Django', 'References available'])
+        self.assertEqual(upload.read(4), b'PK\x03\x04')
+
+    @override_settings(DOCUMENT_MAX_BYTES=1024)
+    def test_oversized_upload_is_not_parsed(self):
+        upload = SimpleUploadedFile('resume.docx', make_docx(5))
+        with mock.patch.object(document_extraction, 'extract_docx') as extract:
+            self.assertEqual(DocumentParser.extract_text_from_file_object(upload, upload.name), '')
+        extract.assert_not_called()
+
+    def test_same_content_is_parsed_once(self):
+        content = make_pdf(2, document=3)
+        with mock.patch('subscriptions.document_parser.extract_text', wraps=document_extraction.extract_text) as extract:
+            texts = {
+                DocumentParser.extract_text_from_file_object(SimpleUploadedFile(name, content), name)
+                for name in ('a.pdf', 'b.pdf')
+            }
+        self.assertEqual(extract.call_count, 1)
+        self.assertEqual(len(texts), 1)
+
+    def test_pool_gives_up_after_timeout(self):
+        content = make_pdf(2, document=4)
+        self.addCleanup(document_extraction.discard_pool)
+        self.assertEqual(document_extraction.extract_text('.pdf', content, workers=1, timeout=0.0001), '')
+        pool = document_extraction._pool
+        self.assertIsNotNone(pool)
+        self.assertIn('Resume 4 page 2', document_extraction.extract_text('.pdf', content, workers=1, timeout=30))
+        self.assertIs(document_extraction._pool, pool)
+
+    def test_time_waiting_for_a_worker_does_not_count(self):
+        content = make_pdf(2, document=5)
+        self.addCleanup(document_extraction.discard_pool)
+        busy = document_extraction._get_pool(1).submit(time.sleep, 1.5)
+        self.assertIn('Resume 5 page 2', document_extraction.extract_text('.pdf', content, workers=1, timeout=1))
+        self.assertTrue(busy.done())
+
+
+class PaystackClientTests(TestCase):
+    """The Paystack client against the local stub server."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = PaystackStubServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        settings_override = override_settings(PAYSTACK_BASE_URL=self.stub.url, PAYSTACK_BACKOFF_FACTOR=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        reset_session()
+        self.addCleanup(reset_session)
+        self.metrics = []
+        hook = add_metrics_hook(self.metrics.append)
+        self.addCleanup(remove_metrics_hook, hook)
+        self.client_api = PaystackAPI('sk_test_stub', 'pk_test_stub')
+        self.connections = self.stub.connections
+        self.requests = self.stub.requests
+
+    def test_calls_reuse_one_connection(self):
+        for i in range(5):
+            result = self.client_api.verify_transaction(f'ref_{i}', use_cache=False)
+            self.assertEqual(result['data']['reference'], f'ref_{i}')
+        self.assertTrue(self.client_api.disable_subscription('SUB_1')['status'])
+
+        self.assertEqual(self.stub.connections - self.connections, 1)
+        self.assertEqual([m.endpoint for m in self.metrics], ['/transaction/verify'] * 5 + ['/subscription/disable'])
+        self.assertEqual({m.status_code for m in self.metrics}, {200})
+
+    def test_only_idempotent_calls_are_retried(self):
+        self.stub.fail_next(503, 2)
+        self.assertTrue(self.client_api.verify_transaction('ref_retry')['status'])
+        self.assertEqual(self.stub.requests - self.requests, 3)
+
+        self.stub.fail_next(503)
+        result = self.client_api.disable_subscription('SUB_1')
+        self.assertFalse(result['status'])
+        self.assertEqual(self.stub.requests - self.requests, 4)
+        self.assertEqual(self.metrics[-1].error, 'API Error: 503')
+
+    def test_successful_verification_is_cached(self):
+        self.client_api.verify_transaction('ref_cached')
+        self.client_api.verify_transaction('ref_cached')
+        self.assertEqual(self.stub.requests - self.requests, 1)
+
+        # Failures are not cached
+        self.stub.fail_next(400)
+        self.assertFalse(self.client_api.verify_transaction('ref_failed')['status'])
+        self.assertTrue(self.client_api.verify_transaction('ref_failed')['status'])
+        self.assertEqual(self.stub.requests - self.requests, 3)
+
+    def test_payment_callback_verifies_through_client(self):
+        response = self.client.get(reverse('subscriptions:payment_callback'), {'reference': 'test_callback'})
+        self.assertRedirects(response, reverse('custom_admin:paystack_config_management'),
+                             fetch_redirect_response=False)
+        self.assertEqual([m.endpoint for m in self.metrics], ['/transaction/verify'])
+
+
+class PaystackWebhookTests(TestCase):
+    """Webhook events are stored once and applied by the worker."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='kofi', email='kofi@example.com', password='password')
+        plan = SubscriptionPlan.objects.create(name='Pro', plan_type='job_seeker', description='Pro', price=50)
+        self.subscription = UserSubscription.objects.create(
+            user=self.user, plan=plan, amount_paid=50, transaction_id='sf_ref_1'
+        )
+
+    def _post(self, event, **data):
+        body = json.dumps({'event': event, 'data': data})
+        return self.client.post(reverse('subscriptions:paystack_webhook'), body, content_type='application/json')
+
+    def test_redelivered_event_is_applied_once(self):
+        for _ in range(2):
+            self.assertEqual(self._post('charge.success', id=101, reference='sf_ref_1').status_code, 200)
+
+        self.assertEqual(PaystackWebhookEvent.objects.count(), 1)
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.status, 'pending')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(process_pending_events(), (1, 0))
+        self.subscription.refresh_from_db()
+        self.user.refresh_from_db()
+        self.assertEqual(self.subscription.status, 'active')
+        self.assertTrue(self.user.is_pro)
+
+        self._post('charge.success', id=101, reference='sf_ref_1')
+        self.assertEqual(process_pending_events(), (0, 0))
+        self.assertEqual(PaystackWebhookEvent.objects.get().status, 'processed')
+
+    def test_failing_event_is_retried_then_marked_failed(self):
+        self._post('charge.success', id=101, reference='sf_ref_1')
+        self._post('subscription.create', id=102, reference='sf_ref_1', subscription_code='SUB_1')
+
+        with mock.patch.dict('subscriptions.webhooks.HANDLERS', {'charge.success': mock.Mock(side_effect=ValueError('boom'))}):
+            self.assertEqual(process_pending_events(batch_size=1, max_attempts=2), (1, 1))
+            failed = PaystackWebhookEvent.objects.get(event='charge.success')
+            self.assertEqual((failed.status, failed.attempts, failed.error), ('pending', 1, 'boom'))
+            self.subscription.refresh_from_db()
+            self.assertEqual(self.subscription.transaction_id, 'SUB_1')
+
+            self.assertEqual(process_pending_events(max_attempts=2), (0, 1))
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, 'failed')
+        self.assertEqual(process_pending_events(), (0, 0))
+
+    def test_invalid_body_is_rejected(self):
+        response = self.client.post(reverse('subscriptions:paystack_webhook'), '[]', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PaystackWebhookEvent.objects.exists())
+
+
+class SubscriptionTransitionTests(TestCase):
+    """A status change writes the user and a notification once, after commit."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='esi', email='esi@example.com', password='password')
+        self.plan = SubscriptionPlan.objects.create(name='Pro', plan_type='job_seeker', description='Pro', price=50)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subscription = UserSubscription.objects.create(user=self.user, plan=self.plan, amount_paid=50)
+
+    def _reload(self):
+        return UserSubscription.objects.get(pk=self.subscription.pk)
+
+    def _titles(self):
+        return list(Notification.objects.filter(user=self.user).order_by('pk').values_list('title', flat=True))
+
+    def test_activate_renew_cancel_query_counts(self):
+        # Load plan, save, notify, update the user
+        subscription = self._reload()
+        with self.assertNumQueries(4), self.captureOnCommitCallbacks(execute=True):
+            subscription.activate()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_pro)
+        self.assertEqual(self.user.pro_expiry_date, subscription.end_date)
+
+        subscription = self._reload()
+        with self.assertNumQueries(4), self.captureOnCommitCallbacks(execute=True):
+            subscription.renew()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.pro_expiry_date, subscription.end_date)
+
+        # Also looks for other active subscriptions
+        subscription = self._reload()
+        with self.assertNumQueries(5), self.captureOnCommitCallbacks(execute=True):
+            subscription.cancel()
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_pro)
+
+        self.assertEqual(self._titles(), ['Subscription Created', 'Subscription Activated',
+                                          'Subscription Activated', 'Subscription Cancelled'])
+
+    def test_unchanged_save_does_nothing(self):
+        subscription = self._reload()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            subscription.payment_method = 'paystack'
+            subscription.save()
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self._titles(), ['Subscription Created'])
+
+    def test_ended_subscription_is_expired_once(self):
+        subscription = self._reload()
+        with self.captureOnCommitCallbacks(execute=True):
+            subscription.status = 'active'
+            subscription.start_date = timezone.now() - timezone.timedelta(days=31)
+            subscription.end_date = timezone.now() - timezone.timedelta(days=1)
+            subscription.save()
+        self.assertEqual(self._reload().status, 'expired')
+        self.assertEqual(self._titles(), ['Subscription Created', 'Subscription Expired'])
+
+    def test_cancel_keeps_pro_from_another_subscription(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            other = UserSubscription.objects.create(user=self.user, plan=self.plan, amount_paid=50)
+            other.activate()
+            other.end_date += timezone.timedelta(days=30)
+            other.save()
+            self.subscription.activate()
+            self.subscription.cancel()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_pro)
+        self.assertEqual(self.user.pro_expiry_date, other.end_date)
+
+
+
+class SubscriptionStatusTests(TestCase):
+    """The resolved subscription status is only cached where every process sees the invalidation."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user(username='esi', email='esi@example.com', password='password')
+        plan = SubscriptionPlan.objects.create(
+            name='Pro', plan_type='job_seeker', description='Pro', price=50, resume_review=True
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSubscription.objects.create(user=self.user, plan=plan, amount_paid=50).activate()
+
+    def _fresh_user(self):
+        return get_user_model().objects.get(pk=self.user.pk)
+
+    def test_status_is_memoized_per_request(self):
+        user = self._fresh_user()
+        self.assertTrue(get_subscription_status(user).can('resume_review'))
+        with self.assertNumQueries(0):
+            get_subscription_status(user)
+
+    def test_process_local_cache_is_not_used(self):
+        self.assertTrue(get_subscription_status(self._fresh_user()).has_pro)
+        self.assertIsNone(cache.get(f'subscription_status:{self.user.pk}'))
+
+        # A cancellation saved by another process is seen on the next request
+        UserSubscription.objects.update(status='cancelled')
+        get_user_model().objects.filter(pk=self.user.pk).update(is_pro=False)
+        self.assertFalse(get_subscription_status(self._fresh_user()).has_pro)
+
+    def test_shared_cache_is_used(self):
+        with mock.patch.object(subscription_utils, '_cache_is_process_local', return_value=False):
+            self.assertTrue(get_subscription_status(self._fresh_user()).has_pro)
+            user = self._fresh_user()
+            with self.assertNumQueries(0):
+                self.assertTrue(get_subscription_status(user).has_pro)
+
+
+class AITaskQueueTests(TestCase):
+    """AI analyses are queued by the views and run by the workers."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = self.settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.user = get_user_model().objects.create_user(username='ama', email='ama@example.com', password='password')
+        plan = SubscriptionPlan.objects.create(
+            name='Pro', plan_type='job_seeker', description='Pro', price=50, resume_review=True
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSubscription.objects.create(user=self.user, plan=plan, amount_paid=50).activate()
+        self.client.login(username='ama', password='password')
+
+    def _patch_handler(self, kind, handler):
+        kinds = dict(ai_tasks.TASK_KINDS, **{kind: ai_tasks.TASK_KINDS[kind]._replace(handler=handler)})
+        return mock.patch.object(ai_tasks, 'TASK_KINDS', kinds)
+
+    def _run_next(self, worker_id='worker', **kwargs):
+        tasks = claim_tasks(worker_id)
+        for task in tasks:
+            run_task(task, **kwargs)
+        return tasks
+
+    def test_resume_analysis_is_queued_and_polled(self):
+        upload = SimpleUploadedFile('resume.txt', RESUME.encode(), content_type='text/plain')
+        response = self.client.post(reverse('subscriptions:resume_analysis'), {'resume_file': upload})
+
+        task = AITask.objects.get()
+        self.assertRedirects(response, reverse('subscriptions:ai_task', args=[task.pk]))
+        self.assertEqual(self.client.get(response.url).status_code, 200)
+        status_url = reverse('subscriptions:ai_task_status', args=[task.pk])
+        self.assertEqual(self.client.get(status_url).json()['status'], 'pending')
+
+        self.assertEqual(len(self._run_next()), 1)
+        data = self.client.get(status_url).json()
+        analysis = ResumeAnalysis.objects.get()
+        self.assertEqual(data['status'], 'completed')
+        self.assertEqual(data['result_url'], reverse('subscriptions:resume_analysis_result', args=[analysis.pk]))
+        self.assertGreater(analysis.overall_score, 0)
+        self.assertRedirects(self.client.get(response.url), data['result_url'])
+
+        self.client.logout()
+        get_user_model().objects.create_user(username='yaw', email='yaw@example.com', password='password')
+        self.client.login(username='yaw', password='password')
+        self.assertEqual(self.client.get(status_url).status_code, 404)
+
+    def test_same_request_is_queued_once(self):
+        first = enqueue(self.user, 'salary_insights', job_title='Developer', location='Accra', experience_level='mid')
+        second = enqueue(self.user, 'salary_insights', job_title='Developer', location='Accra', experience_level='mid')
+        self.assertEqual(first.pk, second.pk)
+
+    def test_failing_task_is_retried_then_marked_failed(self):
+        task = enqueue(self.user, 'salary_insights', job_title='Developer', location='Accra', experience_level='mid')
+        handler = mock.Mock(side_effect=ValueError('boom'))
+
+        with self._patch_handler('salary_insights', handler):
+            self._run_next(max_attempts=2, retry_delay=60)
+            task.refresh_from_db()
+            self.assertEqual((task.status, task.attempts, task.error), ('pending', 1, 'boom'))
+            # Not due until the retry delay has passed
+            self.assertEqual(claim_tasks('worker'), [])
+
+            AITask.objects.update(run_after=timezone.now())
+            self._run_next(max_attempts=2, retry_delay=60)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), ('failed', 2))
+        self.assertEqual(handler.call_count, 2)
+        self.assertEqual(self._run_next(), [])
+
+    def test_task_error_fails_without_retry(self):
+        upload = SimpleUploadedFile('notes.txt', b'shopping list: eggs, milk', content_type='text/plain')
+        analysis = ResumeAnalysis.objects.create(user=self.user, resume_file=upload)
+        task = enqueue(self.user, 'resume_analysis', analysis_id=analysis.pk)
+
+        with mock.patch('subscriptions.ai_services.ResumeAnalysisService.analyze_resume',
+                        return_value={'is_valid': False, 'error': 'Not a resume'}):
+            self._run_next()
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts, task.error), ('failed', 1, 'Not a resume'))
+        self.assertFalse(ResumeAnalysis.objects.exists())
+
+    def test_task_is_claimed_by_one_worker_until_its_lease_expires(self):
+        enqueue(self.user, 'salary_insights', job_title='Developer', location='Accra', experience_level='mid')
+        first = claim_tasks('first')
+        self.assertEqual(len(first), 1)
+        self.assertEqual(claim_tasks('second'), [])
+
+        AITask.objects.update(locked_at=timezone.now() - timezone.timedelta(hours=1))
+        second = claim_tasks('second')
+        self.assertEqual([task.locked_by for task in second], ['second'])
+        self.assertEqual(second[0].attempts, 2)
+
+        # The first worker no longer holds the task, so its outcome is dropped
+        with self._patch_handler('salary_insights', mock.Mock(return_value=1)):
+            run_task(first[0])
+        task = AITask.objects.get()
+        self.assertEqual((task.status, task.locked_by), ('running', 'second'))
+
+
+    def test_worker_survives_errors(self):
+        claim = mock.Mock(side_effect=[OperationalError('server closed the connection'), []])
+        out = io.StringIO()
+        with mock.patch('subscriptions.management.commands.run_ai_workers.claim_tasks', claim), \
+                self.assertLogs('subscriptions.management.commands.run_ai_workers', 'ERROR'):
+            call_command('run_ai_workers', '--once', '--concurrency', '1', '--interval', '0', stdout=out)
+        self.assertEqual(claim.call_count, 2)
+        self.assertIn('Ran 0 AI tasks', out.getvalue())
+
+    def test_sigterm_stops_workers(self):
+        out = io.StringIO()
+        timer = threading.Timer(0.5, os.kill, (os.getpid(), signal.SIGTERM))
+        previous_handler = signal.getsignal(signal.SIGTERM)
+        with mock.patch('subscriptions.management.commands.run_ai_workers.claim_tasks', return_value=[]):
+            timer.start()
+            call_command('run_ai_workers', '--concurrency', '1', '--interval', '0.1', stdout=out)
+        self.assertIn('Ran 0 AI tasks', out.getvalue())
+        self.assertIs(signal.getsignal(signal.SIGTERM), previous_handler)
+
+class AnalyticsDashboardTests(TestCase):
+    """Dashboard counts come from one query per table and are cached until something changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.employer = get_user_model().objects.create_user(
+            username='kwame', email='kwame@example.com', password='password', user_type='employer'
+        )
+        self.seeker = get_user_model().objects.create_user(
+            username='akua', email='akua@example.com', password='password', user_type='job_seeker'
+        )
+        plan = SubscriptionPlan.objects.create(
+            name='Pro', plan_type='employer', description='Pro', price=50, advanced_analytics=True
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSubscription.objects.create(user=self.employer, plan=plan, amount_paid=50).activate()
+            UserSubscription.objects.create(user=self.seeker, plan=plan, amount_paid=50).activate()
+
+        self.company = Company.objects.create(
+            name='Acme', owner=self.employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+        self.jobs = [
+            JobListing.objects.create(
+                title=f'Job {i}', slug=f'job-{i}', company=self.company, posted_by=self.employer,
+                description='Job', requirements='Python', location='Accra', status=status
+            )
+            for i, status in enumerate(['published', 'published', 'expired', 'draft'])
+        ]
+        for job, status in zip(self.jobs, ['pending', 'shortlisted', 'rejected']):
+            JobApplication.objects.create(job=job, applicant=self.seeker, resume='resume.pdf', status=status)
+        for job, score in zip(self.jobs, [90, 85, 60, 20]):
+            JobMatchScore.objects.create(user=self.seeker, job=job, overall_match=score)
+        SavedJob.objects.create(user=self.seeker, job=self.jobs[0])
+
+    def _dashboard(self, user, name, budget):
+        self.client.force_login(user)
+        with mock.patch('subscriptions.analytics_views.render', return_value=HttpResponse()) as render:
+            with self.assertNumQueries(budget):
+                self.client.get(reverse(name))
+        return render.call_args[0][2]
+
+    def test_employer_dashboard_query_budget(self):
+        # Session, user, subscription and companies, then jobs, applications,
+        # top jobs, the rollup watermark and the trend
+        context = self._dashboard(self.employer, 'subscriptions:employer_analytics', 9)
+        self.assertEqual(context['total_job_listings'], 4)
+        self.assertEqual(context['job_status_data'], {'published': 2, 'expired': 1, 'draft': 1})
+        self.assertEqual(context['application_status_data'],
+                         {'pending': 1, 'reviewed': 0, 'shortlisted': 1, 'rejected': 1})
+        self.assertEqual(context['application_trend_data']['data'], [3])
+        self.assertEqual(len(context['top_jobs']), 4)
+
+        # Cached counts leave only the trend
+        self._dashboard(self.employer, 'subscriptions:employer_analytics', 5)
+
+    def test_job_seeker_dashboard_query_budget(self):
+        # Session, user and subscription, then applications, match scores,
+        # categories, saved jobs, the rollup watermark and the trend
+        context = self._dashboard(self.seeker, 'subscriptions:job_seeker_analytics', 9)
+        self.assertEqual(context['total_applications'], 3)
+        self.assertEqual(context['new_applications'], 3)
+        self.assertEqual(context['viewed_applications'], 2)
+        self.assertEqual(context['match_distribution'], {'high': 2, 'medium': 1, 'low': 1})
+        self.assertEqual(context['high_match_jobs'], 2)
+        self.assertEqual(context['average_match'], 63.75)
+        self.assertEqual(context['saved_jobs'], 1)
+
+        self._dashboard(self.seeker, 'subscriptions:job_seeker_analytics', 4)
+
+    def test_changes_invalidate_cached_counts(self):
+        self.assertEqual(dashboard_stats.employer_stats(self.company.pk)['applications']['pending'], 1)
+        self.assertEqual(dashboard_stats.job_seeker_stats(self.seeker.pk)['applications']['total'], 3)
+
+        application = JobApplication.objects.get(status='pending')
+        application.status = 'reviewed'
+        application.save()
+        self.jobs[3].status = 'published'
+        self.jobs[3].save()
+        SavedJob.objects.create(user=self.seeker, job=self.jobs[1])
+
+        employer = dashboard_stats.employer_stats(self.company.pk)
+        self.assertEqual(employer['applications']['pending'], 0)
+        self.assertEqual(employer['applications']['reviewed'], 1)
+        self.assertEqual(employer['jobs']['published'], 3)
+        seeker = dashboard_stats.job_seeker_stats(self.seeker.pk)
+        self.assertEqual(seeker['applications']['viewed'], 3)
+        self.assertEqual(seeker['saved_jobs'], 2)
+
+        application.delete()
+        self.assertEqual(dashboard_stats.employer_stats(self.company.pk)['applications']['total'], 2)
+        self.assertEqual(dashboard_stats.job_seeker_stats(self.seeker.pk)['applications']['total'], 2)
+
+
+class AnalyticsRollupTests(TestCase):
+    """rollup_analytics fills the daily tables from its watermark and the trends read them."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.today = timezone.localdate()
+        employer = get_user_model().objects.create_user(
+            username='kwame', email='kwame@example.com', password='password', user_type='employer'
+        )
+        self.company = Company.objects.create(
+            name='Acme', owner=employer, description='Acme', industry='technology',
+            company_size='1-10', headquarters='Accra'
+        )
+        self.jobs = [
+            JobListing.objects.create(
+                title=f'Job {i}', slug=f'job-{i}', company=self.company, posted_by=employer,
+                description='Job', requirements='Python', location='Accra', status='published'
+            )
+            for i in range(2)
+        ]
+        # Applications 200, 40 (two) and 3 days ago
+        for days_ago, job in [(200, 0), (40, 0), (40, 1), (3, 1)]:
+            self._apply(self.jobs[job], days_ago)
+
+    def _apply(self, job, days_ago):
+        number = JobApplication.objects.count()
+        seeker = get_user_model().objects.create_user(
+            username=f'seeker{number}', email=f'seeker{number}@example.com', password='password'
+        )
+        application = JobApplication.objects.create(job=job, applicant=seeker, resume='resume.pdf')
+        JobApplication.objects.filter(pk=application.pk).update(
+            applied_at=timezone.now() - timezone.timedelta(days=days_ago)
+        )
+        return application
+
+    def _day(self, days_ago):
+        return self.today - timezone.timedelta(days=days_ago)
+
+    def _rows(self, model, field):
+        return sorted(model.objects.exclude(**{field: 0}).values_list('date', field))
+
+    def _rollup(self, *args):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rollup_analytics', *args, stdout=io.StringIO())
+
+    def _trend(self, days):
+        return dashboard_stats.application_trend(
+            JobApplication.objects.filter(job__company=self.company), self._day(days), self.today,
+            rollups=EmployerAnalytics.objects.filter(company=self.company)
+        )
+
+    def test_rollup_is_incremental_and_idempotent(self):
+        self._rollup('--window-days', '30')
+        expected = [(self._day(200), 1), (self._day(40), 2), (self._day(3), 1)]
+        self.assertEqual(self._rows(EmployerAnalytics, 'new_applications'), expected)
+        # One application per job seeker and per job on each day
+        per_owner = [(self._day(200), 1), (self._day(40), 1), (self._day(40), 1), (self._day(3), 1)]
+        self.assertEqual(self._rows(JobSeekerAnalytics, 'new_applications'), per_owner)
+        self.assertEqual(self._rows(JobListingAnalytics, 'applications'), per_owner)
+        self.assertEqual(dashboard_stats.rolled_up_until(), self.today)
+
+        # Running again changes nothing; a new run only counts from the watermark
+        self._rollup()
+        self.assertEqual(self._rows(EmployerAnalytics, 'new_applications'), expected)
+        self.assertEqual(EmployerAnalytics.objects.count(), 3)
+
+        self._apply(self.jobs[0], 0)
+        self._rollup()
+        self.assertEqual(self._rows(EmployerAnalytics, 'new_applications'), expected + [(self.today, 1)])
+
+        # Deleted applications come off when their days are rolled up again
+        JobApplication.objects.filter(applied_at__date=self._day(40)).first().delete()
+        self._rollup('--since', str(self._day(45)))
+        self.assertEqual(self._rows(EmployerAnalytics, 'new_applications'),
+                         [(self._day(200), 1), (self._day(40), 1), (self._day(3), 1), (self.today, 1)])
+
+    def test_trend_reads_rolled_up_days(self):
+        before = self._trend(365)
+        self.assertEqual(before['data'], [1, 2, 1])
+
+        self._rollup()
+        self._apply(self.jobs[0], 0)
+        # Final days come from the rollup rows, today from the applications
+        EmployerAnalytics.objects.filter(date=self._day(40)).update(new_applications=5)
+        self.assertEqual(dashboard_stats.rolled_up_until(), self.today)
+        with self.assertNumQueries(2):
+            trend = self._trend(365)
+        self.assertEqual(trend['labels'], before['labels'] + [str(self.today)])
+        self.assertEqual(trend['data'], [1, 5, 1, 1])
+        self.assertEqual(self._trend(30)['data'], [1, 1])
@@ -1,29 +1,79 @@
 import re
 import logging
 import string
+import threading
 from collections import defaultdict
-import nltk
 
-# Try to download NLTK data, with fallback if it fails
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-except Exception as e:
-    logging.warning(f"NLTK download error: {str(e)}. Some features may be limited.")
-
-# Import after download attempt
-try:
-    from nltk.tokenize import word_tokenize, sent_tokenize
-    from nltk.corpus import stopwords
-    from nltk.stem import WordNetLemmatizer
-    NLTK_AVAILABLE = True
-except ImportError:
-    NLTK_AVAILABLE = False
-    logging.warning("NLTK imports failed. Using basic text processing instead.")
+from .analysis_cache import analysis_cache, content_hash, make_key
+from .skill_matcher import get_skill_matcher
 
 logger = logging.getLogger(__name__)
 
+# NLTK data packages used by the text processor. They are never downloaded at
+# runtime; install them with scripts/install_ai_dependencies.py.
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+}
+
+# Populated by load_nltk() on first use
+NLTK_AVAILABLE = None
+word_tokenize = None
+sent_tokenize = None
+stopwords = None
+WordNetLemmatizer = None
+
+_nltk_lock = threading.Lock()
+
+
+def load_nltk():
+    """
+    Check for the NLTK corpora and import the NLTK helpers, once per process.
+
+    Nothing is downloaded: if NLTK or any of its corpora are missing, basic
+    text processing is used instead.
+
+    Returns:
+        bool: Whether NLTK is available
+    """
+    global NLTK_AVAILABLE, word_tokenize, sent_tokenize, stopwords, WordNetLemmatizer
+
+    if NLTK_AVAILABLE is not None:
+        return NLTK_AVAILABLE
+
+    with _nltk_lock:
+        if NLTK_AVAILABLE is not None:
+            return NLTK_AVAILABLE
+
+        try:
+            import nltk
+
+            missing = []
+            for package, path in NLTK_RESOURCES.items():
+                try:
+                    nltk.data.find(path)
+                except LookupError:
+                    missing.append(package)
+
+            if missing:
+                logger.warning(
+                    f"NLTK data not found: {', '.join(missing)}. Using basic text processing instead. "
+                    f"Run scripts/install_ai_dependencies.py to install it."
+                )
+                NLTK_AVAILABLE = False
+            else:
+                from nltk.tokenize import word_tokenize, sent_tokenize
+                from nltk.corpus import stopwords
+                from nltk.stem import WordNetLemmatizer
+                NLTK_AVAILABLE = True
+        except ImportError:
+            logger.warning("NLTK imports failed. Using basic text processing instead.")
+            NLTK_AVAILABLE = False
+
+    return NLTK_AVAILABLE
+
+
 class TextProcessor:
     """
     Class for processing and analyzing text extracted from documents.
@@ -31,6 +81,9 @@ class TextProcessor:
     This class handles text cleaning, normalization, section identification,
     and basic entity recognition for further analysis.
     """
+
+    # Bump when process_document output changes, so cached results are not reused
+    VERSION = 2
     
     # Common section headers found in resumes
     RESUME_SECTIONS = {
@@ -66,9 +119,23 @@ class TextProcessor:
     }
     
     def __init__(self):
-        """Initialize the TextProcessor with necessary components."""
-        self.lemmatizer = WordNetLemmatizer() if NLTK_AVAILABLE else None
-        self.stop_words = set(stopwords.words('english')) if NLTK_AVAILABLE else set()
+        """Initialize the TextProcessor. NLTK components are loaded on first use."""
+        self._lemmatizer = None
+        self._stop_words = None
+
+    @property
+    def lemmatizer(self):
+        """WordNet lemmatizer, or None when NLTK is unavailable."""
+        if self._lemmatizer is None and load_nltk():
+            self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+
+    @property
+    def stop_words(self):
+        """English stopwords from NLTK, or an empty set when NLTK is unavailable."""
+        if self._stop_words is None:
+            self._stop_words = set(stopwords.words('english')) if load_nltk() else set()
+        return self._stop_words
     
     def clean_text(self, text):
         """
@@ -107,7 +174,7 @@ class TextProcessor:
         Returns:
             list: List of sentences
         """
-        if NLTK_AVAILABLE:
+        if load_nltk():
             return sent_tokenize(text)
         else:
             # Basic sentence splitting
@@ -123,7 +190,7 @@ class TextProcessor:
         Returns:
             list: List of words
         """
-        if NLTK_AVAILABLE:
+        if load_nltk():
             return word_tokenize(text)
         else:
             # Basic word splitting
@@ -139,7 +206,7 @@ class TextProcessor:
         Returns:
             list: Filtered list with stopwords removed
         """
-        if NLTK_AVAILABLE:
+        if load_nltk():
             return [token for token in tokens if token.lower() not in self.stop_words]
         else:
             # Basic stopwords list
@@ -157,7 +224,7 @@ class TextProcessor:
         Returns:
             list: List of lemmatized tokens
         """
-        if NLTK_AVAILABLE and self.lemmatizer:
+        if load_nltk() and self.lemmatizer:
             return [self.lemmatizer.lemmatize(token) for token in tokens]
         else:
             # Without NLTK, return the original tokens
@@ -272,18 +339,8 @@ class TextProcessor:
                     if skill.strip():
                         skills.add(skill.strip())
         
-        # Look for common programming languages and technologies
-        tech_patterns = [
-            r'\b(?:python|java|javascript|js|typescript|ts|c\+\+|ruby|php|go|rust|swift|kotlin)\b',
-            r'\b(?:html|css|sass|less|sql|nosql|mongodb|mysql|postgresql|oracle|redis)\b',
-            r'\b(?:react|angular|vue|svelte|node\.?js|express|django|flask|spring|rails)\b',
-            r'\b(?:aws|azure|gcp|google cloud|docker|kubernetes|k8s|terraform|jenkins|git)\b',
-            r'\b(?:machine learning|ml|ai|artificial intelligence|data science|nlp|computer vision)\b'
-        ]
-        
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            skills.update([match.strip() for match in matches if match.strip()])
+        # Known skills from the skills dictionary, found in one pass
+        skills.update(get_skill_matcher().find_skills(text))
         
         return skills
     
@@ -360,6 +417,12 @@ class TextProcessor:
         Returns:
             dict: Processed document data with sections and entities
         """
+        # Whitespace is collapsed by clean_text, so the normalized text hash
+        # identifies the result
+        key = make_key('processed', self.VERSION, document_type, content_hash(text or ''))
+        return analysis_cache.get_or_compute(key, lambda: self._process_document(text, document_type))
+
+    def _process_document(self, text, document_type):
         # Clean the text
         cleaned_text = self.clean_text(text)
         
@@ -369,6 +432,12 @@ class TextProcessor:
         # Extract entities
         entities = self.extract_entities(cleaned_text)
         
+        # The dictionary skills among them, as spelled in the dictionary
+        matcher = get_skill_matcher()
+        extracted_skills = sorted({
+            matcher.get(skill).skill for skill in entities.get('skills', []) if skill in matcher
+        })
+        
         # Basic stats
         sentences = self.tokenize_sentences(cleaned_text)
         words = self.tokenize_words(cleaned_text)
@@ -380,4 +449,5 @@ class TextProcessor:
             'sentence_count': len(sentences),
             'sections': sections,
             'entities': entities,
+            'extracted_skills': extracted_skills,
         }
\ No newline at end of file
@@ -51,6 +51,14 @@ urlpatterns = [
     path('job-posting/improve/', views_enhanced_ai.improve_job_posting, name='improve_job_posting'),
     path('job-posting/improve/<int:job_id>/', views_enhanced_ai.improve_job_posting, name='improve_specific_job_posting'),
     path('job-posting/optimize-requirements/', views_enhanced_ai.optimize_requirements, name='optimize_requirements'),
+
+    # Bulk application screening
+    path('screening/bulk/<int:job_id>/', views_enhanced_ai.start_bulk_screening, name='start_bulk_screening'),
+    path('screening/runs/<int:run_id>/', views_enhanced_ai.bulk_screening_status, name='bulk_screening_status'),
+
+    # Queued AI analyses
+    path('ai-tasks/<int:task_id>/', views_enhanced_ai.ai_task, name='ai_task'),
+    path('ai-tasks/<int:task_id>/status/', views_enhanced_ai.ai_task_status, name='ai_task_status'),
     
     # Resume analysis and improvement
     path('apply-with-analysis/<int:job_id>/', views_enhanced_ai.apply_with_resume_analysis, name='apply_with_resume_analysis'),
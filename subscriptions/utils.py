@@ -1,7 +1,10 @@
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
 from django.utils import timezone
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 
+
 def check_and_update_subscription_status(user, request=None):
     """
     Check and update a user's subscription status.
@@ -44,3 +47,113 @@ def check_and_update_subscription_status(user, request=None):
             )
     
     return has_pro
+
+
+SUBSCRIPTION_STATUS_CACHE_TIMEOUT = 300  # seconds
+
+# Plan flags exposed as capabilities of an active subscription
+PLAN_CAPABILITIES = (
+    'resume_builder', 'resume_review', 'job_match_recommendations', 'company_recommendations',
+    'interview_preparation', 'salary_insights', 'career_path_planning',
+    'featured_jobs', 'priority_listing', 'candidate_matching', 'advanced_analytics',
+    'unlimited_job_posts', 'applicant_tracking',
+)
+
+
+class SubscriptionStatus:
+    """Resolved subscription state for one user."""
+
+    def __init__(self, has_pro=False, active_subscription=None, capabilities=None):
+        self.has_pro = has_pro
+        self.active_subscription = active_subscription
+        self.capabilities = capabilities or {}
+
+    def can(self, capability):
+        """Check whether the active plan includes a feature, e.g. ``can('resume_review')``."""
+        return self.capabilities.get(capability, False)
+
+
+def _subscription_status_cache_key(user_id):
+    return f'subscription_status:{user_id}'
+
+
+def _resolve_subscription_status(user):
+    from .models import UserSubscription
+
+    now = timezone.now()
+    active_subscription = UserSubscription.objects.filter(
+        user=user,
+        status='active',
+        end_date__gte=now
+    ).select_related('plan').order_by('-end_date').first()
+
+    capabilities = {}
+    if active_subscription:
+        capabilities = {name: getattr(active_subscription.plan, name) for name in PLAN_CAPABILITIES}
+
+    flag_active = bool(user.is_pro and user.pro_expiry_date and user.pro_expiry_date > now)
+    return SubscriptionStatus(
+        has_pro=flag_active or active_subscription is not None,
+        active_subscription=active_subscription,
+        capabilities=capabilities,
+    )
+
+
+def _cache_is_process_local():
+    return isinstance(caches['default'], LocMemCache)
+
+
+def get_subscription_status(user):
+    """
+    Return the user's SubscriptionStatus, resolving it at most once per request.
+
+    The result is memoized on the user object (``request.user`` lives for one
+    request) and backed by the cache, which the UserSubscription signals clear
+    whenever a subscription changes. A process-local cache is skipped, since
+    the signals would only clear the copy of the process that saved the change.
+
+    Args:
+        user: The user to check
+
+    Returns:
+        SubscriptionStatus for the user
+    """
+    status = getattr(user, '_subscription_status', None)
+    if status is not None:
+        return status
+
+    if _cache_is_process_local():
+        user._subscription_status = _resolve_subscription_status(user)
+        return user._subscription_status
+
+    cache_key = _subscription_status_cache_key(user.pk)
+    status = cache.get(cache_key)
+    if status is None:
+        status = _resolve_subscription_status(user)
+
+        # Never cache a pro status past the moment it runs out.
+        timeout = SUBSCRIPTION_STATUS_CACHE_TIMEOUT
+        expiries = [user.pro_expiry_date] if user.pro_expiry_date else []
+        if status.active_subscription:
+            expiries.append(status.active_subscription.end_date)
+        remaining = [(expiry - timezone.now()).total_seconds() for expiry in expiries]
+        remaining = [seconds for seconds in remaining if seconds > 0]
+        if remaining:
+            timeout = max(1, min(timeout, int(min(remaining))))
+        cache.set(cache_key, status, timeout)
+
+    user._subscription_status = status
+    return status
+
+
+def invalidate_subscription_status(user_id, user=None):
+    """
+    Forget the resolved subscription status for a user.
+
+    Args:
+        user_id: Primary key of the user
+        user: Optional loaded user object whose memoized status should also be cleared
+    """
+    cache.delete(_subscription_status_cache_key(user_id))
+    if user is not None:
+        user.__dict__.pop('_subscription_status', None)
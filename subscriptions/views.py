@@ -1,7 +1,6 @@
 import json
 import hmac
 import hashlib
-import requests
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
@@ -16,7 +15,10 @@ from django.db.models import Q
 
 from .models import SubscriptionPlan, UserSubscription, PaystackConfig
 from .ai_models import ResumeAnalysis, JobMatchScore, CompanyMatchScore, ResumeBuilder
+from .ai_tasks import enqueue
 from .forms import ResumeBuilderForm, ResumeUploadForm, PaystackConfigForm
+from .paystack import get_paystack_client
+from .webhooks import record_event
 from jobs.models import JobListing, Company, Notification
 
 
@@ -100,16 +102,9 @@ def process_payment(request, subscription_id):
         if paystack_reference:
             # Payment was processed on the frontend, verify the transaction
             try:
-                headers = {
-                    'Authorization': f'Bearer {paystack_config.secret_key}'
-                }
+                response_data = get_paystack_client(paystack_config).verify_transaction(paystack_reference)
 
-                url = f'https://api.paystack.co/transaction/verify/{paystack_reference}'
-
-                response = requests.get(url, headers=headers)
-                response_data = response.json()
-
-                if response.status_code == 200 and response_data.get('status'):
+                if response_data.get('status'):
                     # Transaction was successful
                     transaction_data = response_data.get('data', {})
 
@@ -121,12 +116,6 @@ def process_payment(request, subscription_id):
                     subscription.transaction_id = paystack_reference
                     subscription.save()
 
-                    # Update user's pro status if applicable
-                    if hasattr(request.user, 'is_pro'):
-                        request.user.is_pro = True
-                        request.user.pro_expiry_date = subscription.end_date
-                        request.user.save(update_fields=['is_pro', 'pro_expiry_date'])
-
                     messages.success(request, _('Payment successful! Your subscription is now active.'))
 
                     # Redirect based on user type
@@ -155,12 +144,6 @@ def process_payment(request, subscription_id):
             subscription.transaction_id = f"DEMO-{timezone.now().strftime('%Y%m%d%H%M%S')}"
             subscription.save()
 
-            # Update user's pro status if applicable
-            if hasattr(request.user, 'is_pro'):
-                request.user.is_pro = True
-                request.user.pro_expiry_date = subscription.end_date
-                request.user.save(update_fields=['is_pro', 'pro_expiry_date'])
-
             messages.success(request, _('Your subscription is now active.'))
 
             # Redirect based on user type
@@ -223,16 +206,9 @@ def payment_callback(request):
     # Verify the transaction with Paystack
     try:
         # Use the configured secret key
-        headers = {
-            'Authorization': f'Bearer {paystack_config.secret_key}'
-        }
+        response_data = get_paystack_client(paystack_config).verify_transaction(reference)
 
-        url = f'https://api.paystack.co/transaction/verify/{reference}'
-
-        response = requests.get(url, headers=headers)
-        response_data = response.json()
-
-        if response.status_code == 200 and response_data.get('status'):
+        if response_data.get('status'):
             # Transaction was successful
             transaction_data = response_data.get('data', {})
 
@@ -348,9 +324,6 @@ def paystack_webhook(request):
     if request.method != 'POST':
         return HttpResponse(status=405)
 
-    # Get Paystack configuration
-    paystack_config = PaystackConfig.get_config()
-
     # Verify webhook signature - using hardcoded test secret for consistency
     signature = request.headers.get('X-Paystack-Signature')
     if signature:
@@ -372,91 +345,16 @@ def paystack_webhook(request):
         event_data = json.loads(request.body)
     except json.JSONDecodeError:
         return HttpResponse(status=400)
+    if not isinstance(event_data, dict):
+        return HttpResponse(status=400)
 
-    event = event_data.get('event')
-
-    # Log the webhook event for debugging
+    # Store the event and acknowledge it; process_paystack_webhooks applies it
     import logging
     logger = logging.getLogger(__name__)
-    logger.info(f"Received Paystack webhook: {event}")
-
-    if event == 'charge.success':
-        # Handle successful payment
-        data = event_data.get('data', {})
-        reference = data.get('reference')
-
-        # Find the subscription with this reference
-        subscription = UserSubscription.objects.filter(transaction_id=reference).first()
-
-        if subscription:
-            # Activate the subscription
-            subscription.status = 'active'
-            subscription.start_date = timezone.now()
-            subscription.end_date = subscription.start_date + timezone.timedelta(days=subscription.plan.duration_days)
-            subscription.payment_method = 'paystack'
-            subscription.save()
-
-            # Update user's pro status
-            user = subscription.user
-            user.is_pro = True
-            user.pro_expiry_date = subscription.end_date
-            user.save(update_fields=['is_pro', 'pro_expiry_date'])
-
-            # Create notification for user
-            from jobs.models import Notification
-            Notification.objects.create(
-                user=user,
-                notification_type='system',
-                title=_('Subscription Activated'),
-                message=_(f'Your {subscription.plan.name} subscription has been activated and is valid until {subscription.end_date.strftime("%B %d, %Y")}.'),
-            )
-
-            logger.info(f"Subscription {subscription.id} activated for user {user.id}")
-
-    elif event == 'subscription.create':
-        # Handle subscription creation
-        data = event_data.get('data', {})
-        reference = data.get('reference')
-        subscription_code = data.get('subscription_code')
-
-        # Find the subscription with this reference
-        subscription = UserSubscription.objects.filter(transaction_id=reference).first()
-
-        if subscription:
-            # Update subscription with Paystack subscription code
-            subscription.transaction_id = subscription_code
-            subscription.save(update_fields=['transaction_id'])
-
-            logger.info(f"Subscription {subscription.id} updated with code {subscription_code}")
-
-    elif event == 'subscription.disable':
-        # Handle subscription cancellation
-        data = event_data.get('data', {})
-        subscription_code = data.get('subscription_code')
-
-        # Find the subscription with this code
-        subscription = UserSubscription.objects.filter(transaction_id=subscription_code).first()
-
-        if subscription:
-            # Cancel the subscription
-            subscription.status = 'cancelled'
-            subscription.save(update_fields=['status'])
-
-            # Update user's pro status
-            user = subscription.user
-            user.is_pro = False
-            user.save(update_fields=['is_pro'])
-
-            # Create notification for user
-            from jobs.models import Notification
-            Notification.objects.create(
-                user=user,
-                notification_type='system',
-                title=_('Subscription Cancelled'),
-                message=_(f'Your {subscription.plan.name} subscription has been cancelled.'),
-            )
-
-            logger.info(f"Subscription {subscription.id} cancelled for user {user.id}")
+    if record_event(event_data, request.body):
+        logger.info(f"Received Paystack webhook: {event_data.get('event')}")
+    else:
+        logger.info(f"Ignored repeated Paystack webhook: {event_data.get('event')}")
 
     return HttpResponse(status=200)
 
@@ -576,37 +474,9 @@ def resume_analysis(request):
                 resume_file=resume_file
             )
 
-            # Use the real AI implementation to analyze the resume
-            from .ai_services import ResumeAnalysisService
-
-            # Analyze the resume using our real AI implementation
-            analysis_results = ResumeAnalysisService.analyze_resume(resume_file=resume_file)
-
-            # Check if the file is a valid resume
-            if not analysis_results.get('is_valid', False):
-                error_message = analysis_results.get('error', 'The uploaded file does not appear to be a valid resume.')
-                messages.error(request, error_message)
-                messages.warning(request, 'Please ensure you upload a proper resume file (PDF, DOCX, or TXT) with relevant professional information.')
-                analysis.delete()  # Delete the invalid analysis
-                return redirect('subscriptions:resume_analysis')
-
-            # Update the analysis with the results
-            analysis.skill_score = analysis_results.get('skill_score', 0)
-            analysis.experience_score = analysis_results.get('experience_score', 0)
-            analysis.education_score = analysis_results.get('education_score', 0)
-            analysis.overall_score = analysis_results.get('overall_score', 0)
-
-            # Update parsed data
-            analysis.parsed_skills = analysis_results.get('parsed_skills', {})
-            analysis.parsed_experience = analysis_results.get('parsed_experience', [])
-            analysis.parsed_education = analysis_results.get('parsed_education', [])
-
-            # Update suggestions
-            analysis.suggestions = analysis_results.get('suggestions', [])
-
-            analysis.save()
-
-            return redirect('subscriptions:resume_analysis_result', analysis_id=analysis.id)
+            # The analysis runs in run_ai_workers; the task page waits for it
+            task = enqueue(request.user, 'resume_analysis', analysis_id=analysis.id)
+            return redirect('subscriptions:ai_task', task_id=task.id)
     else:
         form = ResumeUploadForm()
 
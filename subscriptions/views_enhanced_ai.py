@@ -20,8 +20,11 @@ from .models import (
     SubscriptionPlan, UserSubscription, Payment, PaystackConfig
 )
 from .ai_models import (
-    JobMatchScore, ResumeAnalysis, CoverLetterAnalysis
+    JobMatchScore, ResumeAnalysis, CoverLetterAnalysis, BulkScreeningRun, AITask
 )
+from . import ai_tasks
+from .ai_tasks import enqueue
+from .bulk_screening import fail_stale_runs
 from .models_pro_features import SalaryInsights
 from .forms import PaymentForm, SalaryInsightsForm
 from .paystack import PaystackAPI
@@ -32,8 +35,6 @@ from .ai_services import (
     SalaryInsightsService, CareerPathService,
     JobPostingAnalysisService, ApplicationScreeningService
 )
-from .resume_improvement_suggestions import ResumeImprovementSuggestions
-from .job_qualification_checker import JobQualificationChecker
 from jobs.models import JobListing, JobApplication
 
 
@@ -109,6 +110,7 @@ def apply_with_resume_analysis(request, job_id):
         match_percentage = match_score.get('overall_percentage', 0)
         if match_percentage < 70 and not skip_suggestions:
             # Get resume improvement suggestions
+            from .resume_improvement_suggestions import ResumeImprovementSuggestions
             suggestion_engine = ResumeImprovementSuggestions()
             suggestion_results = suggestion_engine.analyze_resume_for_job(
                 resume_file_object=resume_file,
@@ -351,7 +353,6 @@ def generate_improved_cover_letter(request, job_id):
         # Get form data
         current_cover_letter = request.POST.get('current_cover_letter', '')
         user_name = request.user.get_full_name() or request.user.username
-        job_title = job.title
         company_name = job.company.name if hasattr(job, 'company') and job.company else "the company"
         experience_level = request.POST.get('experience_level', 'experienced')
         job_type = request.POST.get('job_type', 'professional')
@@ -364,37 +365,22 @@ def generate_improved_cover_letter(request, job_id):
         if hasattr(request.user, 'skills') and request.user.skills:
             user_skills = [s.strip() for s in request.user.skills.split(',')]
 
-        # Call the cover letter service
-        try:
-            cover_letter_result = CoverLetterAnalysisService.generate_cover_letter(
-                user_name=user_name,
-                job_title=job_title,
-                company_name=company_name,
-                skills=user_skills,
-                experience_level=experience_level,
-                job_type=job_type,
-                industry=industry,
-                template_style=template_style,
-                region=region
-            )
-
-            # Create a record of the analysis
-            cover_letter_analysis = CoverLetterAnalysis.objects.create(
-                user=request.user,
-                job=job,
-                original_content=current_cover_letter,
-                improved_content=cover_letter_result.get('full_text', ''),
-                analysis_data={
-                    'template_used': cover_letter_result.get('template_used', ''),
-                    'sections': cover_letter_result.get('sections', {}),
-                    'word_count': cover_letter_result.get('word_count', 0)
-                }
-            )
-
-            return redirect('subscriptions:cover_letter_result', analysis_id=cover_letter_analysis.id)
-
-        except Exception as e:
-            messages.error(request, f'Error generating cover letter: {str(e)}')
+        # The cover letter is written by run_ai_workers; the task page waits for it
+        task = enqueue(
+            request.user,
+            'cover_letter',
+            job_id=job.pk,
+            current_cover_letter=current_cover_letter,
+            user_name=user_name,
+            company_name=company_name,
+            skills=user_skills,
+            experience_level=experience_level,
+            job_type=job_type,
+            industry=industry,
+            template_style=template_style,
+            region=region
+        )
+        return redirect('subscriptions:ai_task', task_id=task.pk)
 
     # Get job data for form
     context = {
@@ -706,3 +692,97 @@ def analyze_cover_letter(request):
     }
 
     return render(request, 'subscriptions/analyze_cover_letter.html', context)
+
+
+@login_required
+@require_POST
+def start_bulk_screening(request, job_id):
+    """Start screening every application for a job in the background."""
+    is_pro = hasattr(request.user, 'is_pro') and request.user.is_pro
+
+    if not is_pro:
+        return JsonResponse({'error': 'Pro subscription required'}, status=403)
+
+    job = get_object_or_404(JobListing.objects.select_related('company'), pk=job_id)
+    if job.posted_by != request.user and not request.user.is_staff:
+        return JsonResponse({'error': 'You do not have permission to screen applications for this job.'}, status=403)
+
+    # Reuse a run that is still in progress instead of starting a second one,
+    # unless it has stalled
+    fail_stale_runs(job.screening_runs.all())
+    run = job.screening_runs.filter(status__in=['pending', 'running']).first()
+    if run is None:
+        run = ApplicationScreeningService.start_bulk_screening(job, requested_by=request.user)
+
+    return JsonResponse({
+        'run_id': run.pk,
+        'status': run.status,
+        'total_applications': run.total_applications,
+        'status_url': reverse('subscriptions:bulk_screening_status', args=[run.pk])
+    }, status=202)
+
+
+@login_required
+@require_GET
+def bulk_screening_status(request, run_id):
+    """Progress of a bulk screening run, with the ranked results once it completes."""
+    run = get_object_or_404(BulkScreeningRun.objects.select_related('job'), pk=run_id)
+    if run.job.posted_by_id != request.user.pk and not request.user.is_staff:
+        return JsonResponse({'error': 'You do not have permission to view this screening run.'}, status=403)
+
+    if fail_stale_runs(BulkScreeningRun.objects.filter(pk=run.pk)):
+        run.refresh_from_db()
+
+    data = {
+        'run_id': run.pk,
+        'status': run.status,
+        'progress': run.progress,
+        'total_applications': run.total_applications,
+        'processed_applications': run.processed_applications,
+        'valid_applications': run.valid_applications,
+    }
+    if run.status == 'completed':
+        data['results'] = run.results
+    elif run.status == 'failed':
+        data['error'] = run.error
+
+    return JsonResponse(data)
+
+
+@login_required
+def ai_task(request, task_id):
+    """Wait for a queued AI task, then go on to its result."""
+    task = get_object_or_404(AITask, pk=task_id, user=request.user)
+    if task.status == 'completed':
+        return redirect(ai_tasks.result_url(task))
+
+    context = {
+        'task': task,
+        'status_url': reverse('subscriptions:ai_task_status', args=[task.pk]),
+        'form_url': ai_tasks.form_url(task),
+    }
+
+    return render(request, 'subscriptions/ai_task.html', context)
+
+
+@login_required
+@require_GET
+def ai_task_status(request, task_id):
+    """Status of a queued AI task, with the result URL once it completes."""
+    task = get_object_or_404(
+        AITask.objects.only('kind', 'params', 'status', 'attempts', 'error', 'result_id'),
+        pk=task_id, user=request.user
+    )
+
+    data = {
+        'task_id': task.pk,
+        'status': task.status,
+        'attempts': task.attempts,
+    }
+    if task.status == 'completed':
+        data['result_url'] = ai_tasks.result_url(task)
+    elif task.status == 'failed':
+        data['error'] = task.error
+        data['form_url'] = ai_tasks.form_url(task)
+
+    return JsonResponse(data)
@@ -6,7 +6,8 @@ from django.utils import timezone
 
 from .models import UserSubscription
 from .models_pro_features import InterviewPrep, SalaryInsights, CareerPath
-from .enhanced_ai_services import EnhancedInterviewPrepService, EnhancedAIService
+from .ai_tasks import enqueue
+from .enhanced_ai_services import EnhancedAIService
 from jobs.models import JobListing
 
 
@@ -101,26 +102,13 @@ def generate_interview_questions(request, job_id):
 
     job = get_object_or_404(JobListing, id=job_id, status='published')
 
-    # Check if we already have interview prep for this job
-    interview_prep, created = InterviewPrep.objects.get_or_create(
-        user=request.user,
-        job_listing=job
-    )
-
-    # If this is a new interview prep or the user requested regeneration
-    if created or request.GET.get('regenerate') == 'true':
-        # Get user skills for better question generation
-        user_skills = request.user.skills if hasattr(request.user, 'skills') else None
-
-        # Generate interview questions using enhanced AI
-        questions = EnhancedInterviewPrepService.generate_interview_questions(job, {'skills': user_skills})
-
-        if questions:
-            # Update the interview prep with the generated questions
-            interview_prep.technical_questions = questions.get('technical_questions', [])
-            interview_prep.behavioral_questions = questions.get('behavioral_questions', [])
-            interview_prep.company_questions = questions.get('company_questions', [])
-            interview_prep.save()
+    interview_prep = InterviewPrep.objects.filter(user=request.user, job_listing=job).first()
+
+    # Questions are generated by run_ai_workers for a new interview prep or
+    # when the user asks for them again; the task page waits for them
+    if interview_prep is None or request.GET.get('regenerate') == 'true':
+        task = enqueue(request.user, 'interview_questions', job_id=job.id)
+        return redirect('subscriptions:ai_task', task_id=task.id)
 
     context = {
         'job': job,
@@ -341,53 +329,15 @@ def salary_insights(request):
         experience_level = request.POST.get('experience_level')
 
         if job_title and location and experience_level:
-            # Get user skills for better insights
-            user_skills = request.user.skills if hasattr(request.user, 'skills') else None
-
-            # Get salary insights using enhanced AI
-            # Prepare context for AI
-            job_context = {
-                'job_title': job_title,
-                'industry': experience_level
-            }
-
-            # Get user experience for better insights
-            user_experience = []
-            if hasattr(request.user, 'jobseeker') and hasattr(request.user.jobseeker, 'experience'):
-                user_experience = request.user.jobseeker.experience
-
-            # Get personalized salary insights using enhanced AI
-            insights_json = EnhancedAIService.get_ai_response(
-                f"Provide salary insights for {job_title} in {location} with {experience_level} experience level",
-                user_data={'skills': user_skills, 'experience': user_experience},
-                context=job_context
+            # The insights are generated by run_ai_workers; the task page waits for them
+            task = enqueue(
+                request.user,
+                'salary_insights',
+                job_title=job_title,
+                location=location,
+                experience_level=experience_level
             )
-
-            # Parse the JSON response
-            import json
-            try:
-                insights = json.loads(insights_json)
-            except json.JSONDecodeError:
-                insights = None
-
-            if insights:
-                # Create a new salary insights record
-                salary_insight = SalaryInsights.objects.create(
-                    user=request.user,
-                    job_title=job_title,
-                    location=location,
-                    experience_level=experience_level,
-                    salary_range_min=insights.get('salary_range', {}).get('min', 0),
-                    salary_range_max=insights.get('salary_range', {}).get('max', 0),
-                    median_salary=insights.get('median_salary', 0),
-                    factors=insights.get('factors', []),
-                    negotiation_tips=insights.get('negotiation_tips', []),
-                    industry_trends=insights.get('industry_trends', '')
-                )
-
-                return redirect('subscriptions:salary_insights_result', insight_id=salary_insight.id)
-            else:
-                messages.error(request, _('Failed to generate salary insights. Please try again.'))
+            return redirect('subscriptions:ai_task', task_id=task.id)
 
     context = {
         'previous_insights': previous_insights
@@ -0,0 +1,171 @@
+"""
+Paystack webhook inbox.
+
+The webhook view used to do all the work inside Paystack's request: look up
+the subscription, save it (running every ``post_save`` receiver on
+``UserSubscription``), save the user and create notifications. A slow request
+made Paystack retry the event, and every retry was processed again.
+
+The view now only checks the signature and calls ``record_event``. That
+stores the event in ``PaystackWebhookEvent`` under a unique event ID and
+returns, and the view answers 200 at once. A redelivered event has the same
+ID and is stored once. ``process_pending_events`` (run by
+``manage.py process_paystack_webhooks``) applies pending events in order, in
+batches of ``PAYSTACK_WEBHOOK_BATCH_SIZE``, one transaction per batch. Each
+event gets its own savepoint, so a failing event is rolled back alone. It is
+tried again on the next run, up to ``PAYSTACK_WEBHOOK_MAX_ATTEMPTS`` times,
+and then marked failed. The handlers skip changes that have already been
+made, e.g. by the payment callback; the notification and the user's pro
+flags follow from the subscription save (see ``subscriptions.signals``).
+"""
+import hashlib
+import logging
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import PaystackWebhookEvent, UserSubscription
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_ATTEMPTS = 5
+
+ProcessResult = namedtuple('ProcessResult', ['processed', 'failed'])
+
+
+def webhook_event_id(payload, body):
+    """
+    Return the ID used to recognize redelivered events.
+
+    Paystack sends the same event with the same ``data.id``; events without
+    one are identified by their body.
+    """
+    data = payload.get('data')
+    if isinstance(data, dict) and data.get('id'):
+        return f"{payload.get('event')}:{data['id']}"
+    return hashlib.sha256(body).hexdigest()
+
+
+def record_event(payload, body):
+    """
+    Store a webhook event for processing.
+
+    Args:
+        payload (dict): Decoded event
+        body (bytes): Raw request body
+
+    Returns:
+        bool: False if the event had already been received
+    """
+    _, created = PaystackWebhookEvent.objects.get_or_create(
+        event_id=webhook_event_id(payload, body),
+        defaults={'event': str(payload.get('event') or '')[:100], 'payload': payload},
+    )
+    return created
+
+
+def handle_charge_success(data):
+    reference = data.get('reference')
+    subscription = UserSubscription.objects.select_for_update().select_related('plan').filter(
+        transaction_id=reference
+    ).first()
+    if not subscription or subscription.status == 'active':
+        return
+
+    subscription.status = 'active'
+    subscription.start_date = timezone.now()
+    subscription.end_date = subscription.start_date + timezone.timedelta(days=subscription.plan.duration_days)
+    subscription.payment_method = 'paystack'
+    subscription.save()
+    logger.info(f"Subscription {subscription.id} activated for user {subscription.user_id}")
+
+
+def handle_subscription_create(data):
+    subscription_code = data.get('subscription_code')
+    subscription = UserSubscription.objects.filter(transaction_id=data.get('reference')).first()
+    if not subscription or not subscription_code:
+        return
+
+    subscription.transaction_id = subscription_code
+    subscription.save(update_fields=['transaction_id'])
+    logger.info(f"Subscription {subscription.id} updated with code {subscription_code}")
+
+
+def handle_subscription_disable(data):
+    subscription = UserSubscription.objects.select_for_update().select_related('plan').filter(
+        transaction_id=data.get('subscription_code')
+    ).first()
+    if not subscription or subscription.status == 'cancelled':
+        return
+
+    subscription.status = 'cancelled'
+    subscription.save(update_fields=['status'])
+    logger.info(f"Subscription {subscription.id} cancelled for user {subscription.user_id}")
+
+
+HANDLERS = {
+    'charge.success': handle_charge_success,
+    'subscription.create': handle_subscription_create,
+    'subscription.disable': handle_subscription_disable,
+}
+
+
+def handle_event(event):
+    """Apply one event; events without a handler are only marked processed."""
+    handler = HANDLERS.get(event.event)
+    if handler:
+        handler(event.payload.get('data') or {})
+
+
+def process_pending_events(batch_size=None, max_attempts=None):
+    """
+    Process pending webhook events, oldest first.
+
+    Args:
+        batch_size (int, optional): Events per transaction, defaults to ``PAYSTACK_WEBHOOK_BATCH_SIZE``
+        max_attempts (int, optional): Attempts before an event is marked failed,
+            defaults to ``PAYSTACK_WEBHOOK_MAX_ATTEMPTS``
+
+    Returns:
+        ProcessResult: Number of events processed and failed in this run
+    """
+    batch_size = batch_size or getattr(settings, 'PAYSTACK_WEBHOOK_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    max_attempts = max_attempts or getattr(settings, 'PAYSTACK_WEBHOOK_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+
+    processed = failed = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            # Other workers skip the locked batch rather than waiting for it
+            events = list(
+                PaystackWebhookEvent.objects.select_for_update(skip_locked=True)
+                .filter(status='pending', pk__gt=last_pk)
+                .order_by('pk')[:batch_size]
+            )
+            if not events:
+                break
+
+            for event in events:
+                event.attempts += 1
+                try:
+                    with transaction.atomic():
+                        handle_event(event)
+                except Exception as e:
+                    logger.exception(f"Error processing Paystack webhook {event.event_id}: {str(e)}")
+                    event.error = str(e)
+                    if event.attempts >= max_attempts:
+                        event.status = 'failed'
+                    failed += 1
+                else:
+                    event.status = 'processed'
+                    event.error = ''
+                    event.processed_at = timezone.now()
+                    processed += 1
+
+            PaystackWebhookEvent.objects.bulk_update(events, ['status', 'attempts', 'error', 'processed_at'])
+            last_pk = events[-1].pk
+
+    return ProcessResult(processed, failed)